@@ -0,0 +1,66 @@
+"""
+Rebuild or verify bank account cash positions.
+
+Usage:
+    python manage.py rebuild_cash_positions              # rebuild all orgs
+    python manage.py rebuild_cash_positions --verify     # report drift only
+    python manage.py rebuild_cash_positions --org <uuid>
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.core.models import Organisation
+from apps.banking.services import CashPositionService
+
+
+class Command(BaseCommand):
+    help = "Rebuild banking.cash_position from banking.payment, or verify it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", dest="org_id", help="Only process this organisation ID")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare cash positions against a full recomputation without writing",
+        )
+
+    def handle(self, *args, **options):
+        org_ids = (
+            [options["org_id"]]
+            if options["org_id"]
+            else list(Organisation.objects.values_list("id", flat=True))
+        )
+
+        drifted = 0
+        for org_id in org_ids:
+            with transaction.atomic():
+                # Scope RLS to the organisation being processed
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL app.current_org_id = %s", [str(org_id)])
+
+                if options["verify"]:
+                    mismatches = CashPositionService.verify(org_id)
+                    if mismatches:
+                        drifted += 1
+                        self.stdout.write(
+                            self.style.ERROR(
+                                f"{org_id}: {len(mismatches)} inconsistent cash position(s)"
+                            )
+                        )
+                        for row in mismatches:
+                            details = ", ".join(
+                                f"{column} {values['stored']} != {values['expected']}"
+                                for column, values in row["totals"].items()
+                            )
+                            self.stdout.write(f"  bank_account={row['bank_account_id']} {details}")
+                    else:
+                        self.stdout.write(f"{org_id}: OK")
+                else:
+                    written = CashPositionService.rebuild(org_id)
+                    self.stdout.write(f"{org_id}: rebuilt {written} cash position(s)")
+
+        if options["verify"] and drifted:
+            raise CommandError(f"{drifted} organisation(s) have inconsistent cash positions.")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(org_ids)} organisation(s)."))
@@ -26,6 +26,9 @@ from .bank_transaction import (
     BankTransactionImportSerializer,
     BankTransactionReconcileSerializer,
     BankTransactionMatchSerializer,
+    BankTransactionAutoMatchSerializer,
+    ReconciliationSessionQuerySerializer,
+    ReconciliationBatchSerializer,
     CSVImportRowSerializer,
 )
 
@@ -45,5 +48,8 @@ __all__ = [
     "BankTransactionImportSerializer",
     "BankTransactionReconcileSerializer",
     "BankTransactionMatchSerializer",
+    "BankTransactionAutoMatchSerializer",
+    "ReconciliationSessionQuerySerializer",
+    "ReconciliationBatchSerializer",
     "CSVImportRowSerializer",
 ]
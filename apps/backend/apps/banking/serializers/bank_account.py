@@ -10,11 +10,15 @@ from rest_framework import serializers
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.models import BankAccount, Account
+from common.decimal_utils import money
 
 
 class BankAccountSerializer(serializers.ModelSerializer):
     """Read serializer for BankAccount."""
 
+    current_balance = serializers.SerializerMethodField()
+    reconciled_balance = serializers.SerializerMethodField()
+
     class Meta:
         model = BankAccount
         fields = [
@@ -33,11 +37,25 @@ class BankAccountSerializer(serializers.ModelSerializer):
             "is_active",
             "opening_balance",
             "opening_balance_date",
+            "current_balance",
+            "reconciled_balance",
             "created_at",
             "updated_at",
         ]
         read_only_fields = ["id", "org", "created_at", "updated_at"]
 
+    def get_current_balance(self, obj) -> str:
+        """Opening balance plus net payments, from the maintained cash position."""
+        position = getattr(obj, "cash_position", None)
+        movement = position.net_movement if position else Decimal("0")
+        return str(money(obj.opening_balance + movement))
+
+    def get_reconciled_balance(self, obj) -> str:
+        """Opening balance plus net reconciled payments."""
+        position = getattr(obj, "cash_position", None)
+        movement = position.reconciled_movement if position else Decimal("0")
+        return str(money(obj.opening_balance + movement))
+
 
 class BankAccountCreateSerializer(serializers.ModelSerializer):
     """
@@ -174,6 +174,85 @@ class BankTransactionMatchSerializer(serializers.Serializer):
         return value
 
 
+class BankTransactionAutoMatchSerializer(serializers.Serializer):
+    """
+    Serializer for batch auto-matching a bank account's statement.
+
+    Validates:
+    - Bank account belongs to org
+    - Tolerance, date window and threshold are in range
+    """
+
+    bank_account_id = serializers.UUIDField()
+    tolerance = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=4,
+        default=Decimal("1.00"),
+        min_value=Decimal("0"),
+        help_text=_("Tolerance for amount matching (default: 1.00)"),
+    )
+    date_window_days = serializers.IntegerField(default=7, min_value=0, max_value=90)
+    auto_reconcile = serializers.BooleanField(default=False)
+    threshold = serializers.IntegerField(
+        default=85,
+        min_value=0,
+        max_value=100,
+        help_text=_("Minimum score to auto-reconcile (default: 85)"),
+    )
+
+    def validate_bank_account_id(self, value):
+        org_id = self.context.get("org_id")
+        if not org_id:
+            raise serializers.ValidationError(_("Organisation context required."))
+
+        if not BankAccount.objects.filter(id=value, org_id=org_id).exists():
+            raise serializers.ValidationError(_("Bank account not found in this organisation."))
+
+        return value
+
+
+class ReconciliationSessionQuerySerializer(serializers.Serializer):
+    """Query parameters for the reconciliation workspace."""
+
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    tolerance = serializers.DecimalField(
+        max_digits=10,
+        decimal_places=4,
+        default=Decimal("1.00"),
+        min_value=Decimal("0"),
+    )
+    date_window_days = serializers.IntegerField(default=7, min_value=0, max_value=90)
+
+    def validate(self, data):
+        date_from = data.get("date_from")
+        date_to = data.get("date_to")
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError(_("date_from must be on or before date_to."))
+        return data
+
+
+class ReconciliationOperationSerializer(serializers.Serializer):
+    """A single operation in a reconciliation batch."""
+
+    action = serializers.ChoiceField(choices=["reconcile", "unreconcile"])
+    transaction_id = serializers.UUIDField()
+    payment_id = serializers.UUIDField(required=False, allow_null=True)
+
+    def validate(self, data):
+        if data["action"] == "reconcile" and not data.get("payment_id"):
+            raise serializers.ValidationError(
+                {"payment_id": _("payment_id is required to reconcile.")}
+            )
+        return data
+
+
+class ReconciliationBatchSerializer(serializers.Serializer):
+    """Serializer for a batch of reconcile/unreconcile operations."""
+
+    operations = ReconciliationOperationSerializer(many=True, allow_empty=False, max_length=1000)
+
+
 class CSVImportRowSerializer(serializers.Serializer):
     """
     Serializer for validating a single CSV import row.
@@ -4,12 +4,18 @@ Banking Services for LedgerSG.
 SEC-001 Remediation: All services use validated serializers and audit logging.
 """
 
+from .auto_match_service import AutoMatchService
 from .bank_account_service import BankAccountService
+from .cash_position_service import CashPositionService
 from .payment_service import PaymentService
 from .reconciliation_service import ReconciliationService
+from .reconciliation_session_service import ReconciliationSessionService
 
 __all__ = [
+    "AutoMatchService",
     "BankAccountService",
+    "CashPositionService",
     "PaymentService",
     "ReconciliationService",
+    "ReconciliationSessionService",
 ]
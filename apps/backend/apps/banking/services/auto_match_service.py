@@ -0,0 +1,446 @@
+"""
+Auto-Matching Service for LedgerSG Banking Module.
+
+Batch matching of unreconciled bank transactions against payments.
+Candidates are found through an amount-sorted index restricted to a date
+window, then ranked on amount, date, reference and description similarity.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from uuid import UUID
+from typing import List, Optional, Dict, Any, Tuple
+from decimal import Decimal
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.models import (
+    BankTransaction,
+    BankAccount,
+    Payment,
+    AuditEventLog,
+)
+from apps.banking.services.cash_position_service import CashPositionService
+from apps.reporting.services.dashboard_service import DashboardService
+from common.exceptions import ValidationError
+from common.decimal_utils import money
+
+
+DEFAULT_TOLERANCE = Decimal("1.00")
+DEFAULT_DATE_WINDOW_DAYS = 7
+DEFAULT_AUTO_RECONCILE_THRESHOLD = 85
+MAX_MATCHES_PER_TRANSACTION = 5
+
+# Score weights (sum to 100)
+AMOUNT_WEIGHT = 50
+DATE_WEIGHT = 20
+REFERENCE_WEIGHT = 20
+DESCRIPTION_WEIGHT = 10
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(*values: Optional[str]) -> set:
+    """Lowercase alphanumeric tokens of two or more characters."""
+    found = set()
+    for value in values:
+        if value:
+            found.update(t for t in _TOKEN_RE.findall(value.lower()) if len(t) > 1)
+    return found
+
+
+def _compact(value: Optional[str]) -> str:
+    """Lowercase value with everything but letters and digits removed."""
+    return "".join(_TOKEN_RE.findall(value.lower())) if value else ""
+
+
+class _PaymentIndex:
+    """
+    Unreconciled payments of one direction, sorted by amount.
+
+    Lookup by amount range is a binary search, so matching n transactions
+    against m payments costs O((n + m) log m) plus the candidates scored.
+    """
+
+    def __init__(self, payments: List[Payment]):
+        self.payments = sorted(payments, key=lambda p: p.amount)
+        self.amounts = [p.amount for p in self.payments]
+
+    def within(self, amount: Decimal, tolerance: Decimal) -> List[Payment]:
+        lo = bisect_left(self.amounts, amount - tolerance)
+        hi = bisect_right(self.amounts, amount + tolerance)
+        return self.payments[lo:hi]
+
+
+class AutoMatchService:
+    """Service class for batch bank reconciliation matching."""
+
+    @staticmethod
+    def match_account(
+        org_id: UUID,
+        bank_account_id: UUID,
+        tolerance: Decimal = DEFAULT_TOLERANCE,
+        date_window_days: int = DEFAULT_DATE_WINDOW_DAYS,
+        auto_reconcile: bool = False,
+        threshold: int = DEFAULT_AUTO_RECONCILE_THRESHOLD,
+        user_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """
+        Match every unreconciled transaction on a bank account in one pass.
+
+        Credits (positive amounts) are matched against payments received and
+        debits against payments made. Candidates must be within `tolerance`
+        of the transaction amount and `date_window_days` of its date.
+
+        With auto_reconcile, the best pairs scoring at least `threshold` are
+        reconciled, each transaction and payment being used at most once
+        (highest scores first).
+
+        Args:
+            org_id: Organisation UUID
+            bank_account_id: Bank Account UUID
+            tolerance: Amount tolerance for matching
+            date_window_days: Maximum days between transaction and payment
+            auto_reconcile: Reconcile confident matches
+            threshold: Minimum score (0-100) to auto-reconcile
+            user_id: Reconciling user ID
+
+        Returns:
+            Dict with 'transactions', 'candidates', 'matched', 'reconciled'
+            counts and 'results': one entry per transaction with ranked
+            'matches' and the 'reconciled_payment_id' if auto-reconciled.
+        """
+        if tolerance < 0:
+            raise ValidationError("Tolerance cannot be negative.")
+        if date_window_days < 0:
+            raise ValidationError("Date window cannot be negative.")
+
+        if not BankAccount.objects.filter(id=bank_account_id, org_id=org_id).exists():
+            raise ValidationError("Bank account not found in this organisation.")
+
+        if auto_reconcile:
+            with transaction.atomic():
+                return AutoMatchService._match(
+                    org_id, bank_account_id, tolerance, date_window_days,
+                    threshold, user_id, lock=True,
+                )
+
+        return AutoMatchService._match(
+            org_id, bank_account_id, tolerance, date_window_days,
+            None, user_id, lock=False,
+        )
+
+    @staticmethod
+    def rank(
+        bank_transaction: BankTransaction,
+        index: _PaymentIndex,
+        tolerance: Decimal = DEFAULT_TOLERANCE,
+        date_window_days: Optional[int] = DEFAULT_DATE_WINDOW_DAYS,
+    ) -> List[Tuple[int, Payment]]:
+        """
+        Score indexed payments against one transaction, best first.
+
+        Args:
+            bank_transaction: Transaction to match
+            index: Payments of the transaction's direction
+            tolerance: Amount tolerance for matching
+            date_window_days: Maximum days apart, or None for no limit
+
+        Returns:
+            List of (score, payment) pairs
+        """
+        amount = abs(bank_transaction.amount)
+        txn_tokens = _tokens(bank_transaction.description, bank_transaction.reference)
+        txn_text = _compact(f"{bank_transaction.description} {bank_transaction.reference}")
+
+        ranked = []
+        for payment in index.within(amount, tolerance):
+            days = abs((payment.payment_date - bank_transaction.transaction_date).days)
+            if date_window_days is not None and days > date_window_days:
+                continue
+            score = AutoMatchService._score(
+                amount, txn_tokens, txn_text, payment, days, tolerance,
+                date_window_days if date_window_days is not None else DEFAULT_DATE_WINDOW_DAYS,
+            )
+            ranked.append((score, payment))
+
+        ranked.sort(key=lambda pair: (-pair[0], pair[1].payment_date, pair[1].payment_number))
+        return ranked
+
+    @staticmethod
+    def rank_all(
+        transactions: List[BankTransaction],
+        payments: List[Payment],
+        tolerance: Decimal = DEFAULT_TOLERANCE,
+        date_window_days: Optional[int] = DEFAULT_DATE_WINDOW_DAYS,
+    ) -> Dict[UUID, List[Tuple[int, Payment]]]:
+        """
+        Rank candidate payments for each transaction.
+
+        Args:
+            transactions: Bank transactions to match
+            payments: Candidate payments (contact preloaded)
+            tolerance: Amount tolerance for matching
+            date_window_days: Maximum days apart, or None for no limit
+
+        Returns:
+            Mapping of transaction id -> list of (score, payment), best first
+        """
+        # Transaction amounts are signed; payment amounts are not
+        indexes = {
+            "RECEIVED": AutoMatchService.build_index(
+                [p for p in payments if p.payment_type == "RECEIVED"]
+            ),
+            "MADE": AutoMatchService.build_index(
+                [p for p in payments if p.payment_type == "MADE"]
+            ),
+        }
+        return {
+            txn.id: AutoMatchService.rank(
+                txn,
+                indexes["RECEIVED"] if txn.amount >= 0 else indexes["MADE"],
+                tolerance,
+                date_window_days,
+            )
+            for txn in transactions
+        }
+
+    @staticmethod
+    def pair(
+        transactions: List[BankTransaction],
+        ranked_by_txn: Dict[UUID, List[Tuple[int, Payment]]],
+        threshold: int = 0,
+    ) -> Dict[UUID, Tuple[Payment, int]]:
+        """
+        Choose one payment per transaction from ranked candidates.
+
+        Pairs at or above the threshold are taken greedily in score order,
+        so each transaction and payment is used at most once.
+
+        Returns:
+            Mapping of transaction id -> (payment, score)
+        """
+        pairs = [
+            (score, txn, payment)
+            for txn in transactions
+            for score, payment in ranked_by_txn[txn.id]
+            if score >= threshold
+        ]
+        pairs.sort(key=lambda pair: -pair[0])
+
+        paired = {}
+        used_payments = set()
+        for score, txn, payment in pairs:
+            if txn.id in paired or payment.id in used_payments:
+                continue
+            paired[txn.id] = (payment, score)
+            used_payments.add(payment.id)
+        return paired
+
+    @staticmethod
+    def build_index(payments: List[Payment]) -> _PaymentIndex:
+        """Amount-sorted index over payments of one direction."""
+        return _PaymentIndex(payments)
+
+    @staticmethod
+    def candidate_payments(org_id: UUID, bank_account_id: UUID):
+        """Unreconciled payments on a bank account, contact joined."""
+        return (
+            Payment.objects.filter(
+                org_id=org_id,
+                bank_account_id=bank_account_id,
+                is_voided=False,
+                is_reconciled=False,
+            )
+            .select_related("contact")
+            .only(
+                "id", "bank_account_id", "payment_type", "payment_number", "payment_date", "amount",
+                "payment_reference", "contact__name", "contact__legal_name",
+            )
+        )
+
+    @staticmethod
+    def _match(
+        org_id: UUID,
+        bank_account_id: UUID,
+        tolerance: Decimal,
+        date_window_days: int,
+        threshold: Optional[int],
+        user_id: Optional[UUID],
+        lock: bool,
+    ) -> Dict[str, Any]:
+        """Build the indexes, rank candidates and optionally reconcile."""
+        transactions = BankTransaction.objects.filter(
+            org_id=org_id,
+            bank_account_id=bank_account_id,
+            is_reconciled=False,
+        ).order_by("transaction_date", "id")
+        payments = AutoMatchService.candidate_payments(org_id, bank_account_id)
+        if lock:
+            transactions = transactions.select_for_update()
+            payments = payments.select_for_update(of=("self",))
+
+        transactions = list(transactions)
+        payments = list(payments)
+
+        ranked_by_txn = AutoMatchService.rank_all(
+            transactions, payments, tolerance, date_window_days
+        )
+
+        reconciled = {}
+        if threshold is not None:
+            reconciled = AutoMatchService._reconcile_best(
+                org_id, transactions, ranked_by_txn, threshold, user_id
+            )
+
+        results = []
+        for txn in transactions:
+            ranked = ranked_by_txn[txn.id]
+            payment, _ = reconciled.get(txn.id, (None, None))
+            results.append(
+                {
+                    "transaction_id": str(txn.id),
+                    "transaction_date": txn.transaction_date.isoformat(),
+                    "amount": str(txn.amount),
+                    "description": txn.description,
+                    "reference": txn.reference,
+                    "matches": [
+                        AutoMatchService.match_data(txn.amount, score, p)
+                        for score, p in ranked[:MAX_MATCHES_PER_TRANSACTION]
+                    ],
+                    "reconciled_payment_id": str(payment.id) if payment else None,
+                }
+            )
+
+        return {
+            "bank_account_id": str(bank_account_id),
+            "transactions": len(transactions),
+            "candidates": len(payments),
+            "matched": sum(1 for r in results if r["matches"]),
+            "reconciled": len(reconciled),
+            "results": results,
+        }
+
+    @staticmethod
+    def _score(
+        amount: Decimal,
+        txn_tokens: set,
+        txn_text: str,
+        payment: Payment,
+        days: int,
+        tolerance: Decimal,
+        date_window_days: int,
+    ) -> int:
+        """
+        Score a candidate pair from 0 to 100.
+
+        Amount closeness and date proximity scale linearly within the
+        tolerance and window. A payment number or reference found in the
+        statement text earns the full reference weight, otherwise its token
+        overlap counts; the contact name is compared the same way against
+        the description.
+        """
+        diff = abs(amount - payment.amount)
+        if diff == 0:
+            score = Decimal(AMOUNT_WEIGHT)
+        else:
+            score = AMOUNT_WEIGHT * (1 - diff / tolerance)
+
+        if days == 0:
+            score += DATE_WEIGHT
+        elif date_window_days:
+            score += DATE_WEIGHT * max(0, 1 - Decimal(days) / date_window_days)
+
+        references = [r for r in (payment.payment_reference, payment.payment_number) if r]
+        if any(len(_compact(r)) > 2 and _compact(r) in txn_text for r in references):
+            score += REFERENCE_WEIGHT
+        else:
+            ref_tokens = _tokens(*references)
+            if ref_tokens:
+                score += REFERENCE_WEIGHT * Decimal(len(ref_tokens & txn_tokens)) / len(ref_tokens)
+
+        contact = payment.contact
+        if contact:
+            name_tokens = _tokens(contact.name, contact.legal_name)
+            if name_tokens:
+                overlap = Decimal(len(name_tokens & txn_tokens))
+                score += DESCRIPTION_WEIGHT * overlap / len(name_tokens)
+
+        return int(score)
+
+    @staticmethod
+    def _reconcile_best(
+        org_id: UUID,
+        transactions: List[BankTransaction],
+        ranked_by_txn: Dict[UUID, List[Tuple[int, Payment]]],
+        threshold: int,
+        user_id: Optional[UUID],
+    ) -> Dict[UUID, Tuple[Payment, int]]:
+        """
+        Reconcile the pairs chosen by pair() at or above the threshold.
+
+        Writes are batched: one UPDATE per table and one bulk INSERT of
+        audit events.
+        """
+        reconciled = AutoMatchService.pair(transactions, ranked_by_txn, threshold)
+        if not reconciled:
+            return reconciled
+        used_payments = {payment.id for payment, _ in reconciled.values()}
+
+        now = timezone.now()
+        matched = []
+        for txn in transactions:
+            if txn.id in reconciled:
+                txn.is_reconciled = True
+                txn.reconciled_at = now
+                txn.matched_payment = reconciled[txn.id][0]
+                matched.append(txn)
+
+        BankTransaction.objects.bulk_update(
+            matched, ["is_reconciled", "reconciled_at", "matched_payment"]
+        )
+        Payment.objects.filter(id__in=used_payments).update(is_reconciled=True)
+        CashPositionService.apply_payments(
+            org_id,
+            [payment for payment, _ in reconciled.values()],
+            posted=False,
+            reconciled=True,
+        )
+
+        AuditEventLog.objects.bulk_create(
+            [
+                AuditEventLog(
+                    org_id=org_id,
+                    user_id=user_id,
+                    action="RECONCILE",
+                    entity_schema="banking",
+                    entity_table="bank_transaction",
+                    entity_id=txn.id,
+                    old_data={"is_reconciled": False},
+                    new_data={
+                        "is_reconciled": True,
+                        "payment_id": str(txn.matched_payment.id),
+                        "payment_number": txn.matched_payment.payment_number,
+                        "auto_match_score": reconciled[txn.id][1],
+                    },
+                )
+                for txn in matched
+            ]
+        )
+
+        DashboardService.publish_invalidation(org_id)
+
+        return reconciled
+
+    @staticmethod
+    def match_data(txn_amount: Decimal, score: int, payment: Payment) -> Dict[str, Any]:
+        """Serialise a ranked candidate."""
+        return {
+            "payment_id": str(payment.id),
+            "payment_number": payment.payment_number,
+            "payment_date": payment.payment_date.isoformat(),
+            "amount": str(payment.amount),
+            "contact": payment.contact.name if payment.contact else None,
+            "amount_difference": str(money(abs(abs(txn_amount) - payment.amount))),
+            "score": score,
+        }
@@ -117,7 +117,8 @@ class BankAccountService:
         Returns:
             List of BankAccount instances
         """
-        queryset = BankAccount.objects.filter(org_id=org_id)
+        # Balances come from the maintained cash position (one joined row each)
+        queryset = BankAccount.objects.filter(org_id=org_id).select_related("cash_position")
 
         if is_active is not None:
             queryset = queryset.filter(is_active=is_active)
@@ -152,7 +153,9 @@ class BankAccountService:
             ResourceNotFound: If not found
         """
         try:
-            return BankAccount.objects.get(id=account_id, org_id=org_id)
+            return BankAccount.objects.select_related("cash_position").get(
+                id=account_id, org_id=org_id
+            )
         except BankAccount.DoesNotExist:
             raise ResourceNotFound(f"Bank account {account_id} not found")
 
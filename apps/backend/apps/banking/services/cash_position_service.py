@@ -0,0 +1,242 @@
+"""
+Cash position service for LedgerSG.
+
+Maintains banking.cash_position: running payment totals per bank account.
+Totals are adjusted in the same transaction as the payment change that
+causes them (creation, voiding, reconciliation), so balances are read in
+O(accounts) instead of summing the payment history on every request.
+"""
+
+from typing import Optional, List, Dict, Any, Iterable
+from uuid import UUID
+from decimal import Decimal
+
+from django.db import connection, transaction
+
+from apps.core.models import Payment
+from common.decimal_utils import money
+
+
+# Column order shared by the upsert, rebuild and verify statements
+_TOTAL_COLUMNS = (
+    "received_total",
+    "made_total",
+    "base_received_total",
+    "base_made_total",
+    "reconciled_received_total",
+    "reconciled_made_total",
+)
+
+_EXPECTED_TOTALS_SQL = """
+    SELECT
+        p.org_id,
+        p.bank_account_id,
+        COALESCE(SUM(p.amount) FILTER (WHERE p.payment_type = 'RECEIVED'), 0),
+        COALESCE(SUM(p.amount) FILTER (WHERE p.payment_type = 'MADE'), 0),
+        COALESCE(SUM(p.base_amount) FILTER (WHERE p.payment_type = 'RECEIVED'), 0),
+        COALESCE(SUM(p.base_amount) FILTER (WHERE p.payment_type = 'MADE'), 0),
+        COALESCE(SUM(p.amount) FILTER (
+            WHERE p.payment_type = 'RECEIVED' AND p.is_reconciled), 0),
+        COALESCE(SUM(p.amount) FILTER (
+            WHERE p.payment_type = 'MADE' AND p.is_reconciled), 0)
+    FROM banking.payment p
+    WHERE p.org_id = %s AND NOT p.is_voided
+    GROUP BY p.org_id, p.bank_account_id
+"""
+
+
+class CashPositionService:
+    """Service class for per-bank-account cash positions."""
+
+    @staticmethod
+    def apply_payments(
+        org_id: UUID,
+        payments: Iterable[Payment],
+        sign: int = 1,
+        posted: bool = True,
+        reconciled: bool = False,
+    ) -> None:
+        """
+        Add (sign=1) or remove (sign=-1) payments from the cash positions.
+
+        Must be called inside the transaction that changes the payments.
+
+        Args:
+            org_id: Organisation ID
+            payments: Payments being created, voided or (un)reconciled
+            sign: 1 to add, -1 to remove
+            posted: Adjust the received/made totals
+            reconciled: Adjust the reconciled totals
+        """
+        totals: Dict[UUID, List[Decimal]] = {}
+        for payment in payments:
+            bucket = totals.setdefault(payment.bank_account_id, [Decimal("0")] * 6)
+            offset = 0 if payment.payment_type == "RECEIVED" else 1
+            if posted:
+                bucket[offset] += sign * payment.amount
+                bucket[2 + offset] += sign * payment.base_amount
+            if reconciled:
+                bucket[4 + offset] += sign * payment.amount
+
+        if not totals:
+            return
+
+        values_sql = []
+        params: List[Any] = []
+        for bank_account_id, deltas in totals.items():
+            values_sql.append("(%s, %s, %s, %s, %s, %s, %s, %s)")
+            params.extend([str(org_id), str(bank_account_id)] + deltas)
+
+        columns = ", ".join(_TOTAL_COLUMNS)
+        updates = ",\n".join(
+            f"{c} = banking.cash_position.{c} + EXCLUDED.{c}" for c in _TOTAL_COLUMNS
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO banking.cash_position (org_id, bank_account_id, {columns})
+                VALUES {", ".join(values_sql)}
+                ON CONFLICT (bank_account_id) DO UPDATE SET
+                    {updates},
+                    updated_at = NOW()
+                """,
+                params,
+            )
+
+    @staticmethod
+    def get_positions(
+        org_id: UUID,
+        bank_account_ids: Optional[List[UUID]] = None,
+    ) -> Dict[UUID, Dict[str, Decimal]]:
+        """
+        Get balances per bank account from the maintained totals.
+
+        Args:
+            org_id: Organisation ID
+            bank_account_ids: Restrict to these bank accounts
+
+        Returns:
+            Mapping of bank_account_id -> {"opening_balance", "received",
+            "made", "balance", "reconciled_balance"}
+        """
+        account_filter = ""
+        params: List[Any] = [str(org_id)]
+        if bank_account_ids is not None:
+            if not bank_account_ids:
+                return {}
+            account_filter = " AND b.id = ANY(%s::uuid[])"
+            params.append([str(a) for a in bank_account_ids])
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT b.id, b.opening_balance,
+                       c.received_total, c.made_total,
+                       c.reconciled_received_total, c.reconciled_made_total
+                FROM banking.bank_account b
+                LEFT JOIN banking.cash_position c ON c.bank_account_id = b.id
+                WHERE b.org_id = %s{account_filter}
+                """,
+                params,
+            )
+            rows = cursor.fetchall()
+
+        result = {}
+        for account_id, opening, received, made, rec_received, rec_made in rows:
+            opening = money(opening or 0)
+            received = money(received or 0)
+            made = money(made or 0)
+            result[account_id] = {
+                "opening_balance": opening,
+                "received": received,
+                "made": made,
+                "balance": opening + received - made,
+                "reconciled_balance": opening + money(rec_received or 0) - money(rec_made or 0),
+            }
+        return result
+
+    @staticmethod
+    def rebuild(org_id: UUID) -> int:
+        """
+        Recompute all cash positions for an organisation from banking.payment.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            Number of cash position rows written
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM banking.cash_position WHERE org_id = %s",
+                    [str(org_id)],
+                )
+                cursor.execute(
+                    f"""
+                    INSERT INTO banking.cash_position (
+                        org_id, bank_account_id, {", ".join(_TOTAL_COLUMNS)}
+                    )
+                    {_EXPECTED_TOTALS_SQL}
+                    """,
+                    [str(org_id)],
+                )
+                return cursor.rowcount
+
+    @staticmethod
+    def verify(org_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Compare stored cash positions against a full recomputation.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            List of mismatches (empty when positions are consistent), each
+            with bank_account_id and a {column: {"stored", "expected"}}
+            mapping of the totals that differ
+        """
+        stored_columns = ", ".join(f"s.{c}" for c in _TOTAL_COLUMNS)
+        expected_columns = ", ".join(f"x.{c}" for c in _TOTAL_COLUMNS)
+        differs = "\n OR ".join(
+            f"COALESCE(s.{c}, 0) <> COALESCE(x.{c}, 0)" for c in _TOTAL_COLUMNS
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH expected (org_id, bank_account_id, {", ".join(_TOTAL_COLUMNS)}) AS (
+                    {_EXPECTED_TOTALS_SQL}
+                ),
+                stored AS (
+                    SELECT bank_account_id, {", ".join(_TOTAL_COLUMNS)}
+                    FROM banking.cash_position
+                    WHERE org_id = %s
+                )
+                SELECT
+                    COALESCE(x.bank_account_id, s.bank_account_id),
+                    {stored_columns},
+                    {expected_columns}
+                FROM expected x
+                FULL OUTER JOIN stored s ON s.bank_account_id = x.bank_account_id
+                WHERE {differs}
+                """,
+                [str(org_id), str(org_id)],
+            )
+            rows = cursor.fetchall()
+
+        width = len(_TOTAL_COLUMNS)
+        mismatches = []
+        for row in rows:
+            stored = row[1:1 + width]
+            expected = row[1 + width:]
+            mismatches.append(
+                {
+                    "bank_account_id": str(row[0]),
+                    "totals": {
+                        column: {"stored": str(s or 0), "expected": str(x or 0)}
+                        for column, s, x in zip(_TOTAL_COLUMNS, stored, expected)
+                        if (s or 0) != (x or 0)
+                    },
+                }
+            )
+        return mismatches
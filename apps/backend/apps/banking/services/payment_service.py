@@ -20,14 +20,19 @@ from apps.core.models import (
     InvoiceDocument,
     JournalEntry,
     JournalLine,
-    Account,
     AuditEventLog,
     FiscalPeriod,
 )
+from apps.reporting.services.dashboard_service import DashboardService
+from .cash_position_service import CashPositionService
 from common.exceptions import ValidationError, ResourceNotFound
 from common.decimal_utils import money
 
 
+# Document statuses that can receive payment allocations
+ALLOCATABLE_STATUSES = ("APPROVED", "SENT", "PARTIALLY_PAID", "OVERDUE")
+
+
 class PaymentService:
     """Service class for payment operations."""
 
@@ -105,6 +110,8 @@ class PaymentService:
             is_voided=False,
         )
 
+        CashPositionService.apply_payments(org_id, [payment])
+
         AuditEventLog.objects.create(
             org_id=org_id,
             user_id=user_id,
@@ -125,6 +132,8 @@ class PaymentService:
         payment.journal_entry = journal_entry
         payment.save()
 
+        DashboardService.publish_invalidation(org_id)
+
         return payment
 
     @staticmethod
@@ -175,6 +184,8 @@ class PaymentService:
             is_voided=False,
         )
 
+        CashPositionService.apply_payments(org_id, [payment])
+
         AuditEventLog.objects.create(
             org_id=org_id,
             user_id=user_id,
@@ -195,6 +206,8 @@ class PaymentService:
         payment.journal_entry = journal_entry
         payment.save()
 
+        DashboardService.publish_invalidation(org_id)
+
         return payment
 
     @staticmethod
@@ -292,7 +305,10 @@ class PaymentService:
         Raises:
             ValidationError: If payment cannot be voided
         """
-        payment = PaymentService.get(org_id, payment_id)
+        try:
+            payment = Payment.objects.select_for_update().get(id=payment_id, org_id=org_id)
+        except Payment.DoesNotExist:
+            raise ResourceNotFound(f"Payment {payment_id} not found")
 
         if payment.is_voided:
             raise ValidationError("Payment is already voided.")
@@ -315,6 +331,10 @@ class PaymentService:
         payment.notes = f"{payment.notes}\n\nVOIDED: {reason}".strip()
         payment.save()
 
+        CashPositionService.apply_payments(
+            org_id, [payment], sign=-1, reconciled=payment.is_reconciled
+        )
+
         AuditEventLog.objects.create(
             org_id=org_id,
             user_id=user_id,
@@ -329,6 +349,8 @@ class PaymentService:
             },
         )
 
+        DashboardService.publish_invalidation(org_id)
+
         return payment
 
     @staticmethod
@@ -342,6 +364,12 @@ class PaymentService:
         """
         Allocate a payment to one or more documents.
 
+        Set-based: the payment and all target documents are locked up
+        front, contact/status/duplicate checks run over the whole set,
+        allocations are bulk-inserted and document balances refreshed with
+        one aggregate UPDATE, so the query count does not grow with the
+        number of documents.
+
         Args:
             org_id: Organisation UUID
             payment_id: Payment UUID
@@ -354,18 +382,28 @@ class PaymentService:
         Raises:
             ValidationError: If validation fails
         """
-        payment = PaymentService.get(org_id, payment_id)
+        try:
+            payment = Payment.objects.select_for_update().get(id=payment_id, org_id=org_id)
+        except Payment.DoesNotExist:
+            raise ResourceNotFound(f"Payment {payment_id} not found")
 
         if payment.is_voided:
             raise ValidationError("Cannot allocate a voided payment.")
 
-        existing_allocations = PaymentAllocation.objects.filter(payment=payment)
-        already_allocated = sum(
-            (alloc.allocated_amount for alloc in existing_allocations),
-            Decimal("0"),
+        requested = {}
+        for alloc_data in allocations:
+            document_id = UUID(str(alloc_data["document_id"]))
+            if document_id in requested:
+                raise ValidationError(f"Document {document_id} appears more than once.")
+            requested[document_id] = money(alloc_data["allocated_amount"])
+
+        existing_allocations = dict(
+            PaymentAllocation.objects.filter(payment=payment).values_list(
+                "document_id", "allocated_amount"
+            )
         )
-
-        new_allocations_total = sum(money(alloc["allocated_amount"]) for alloc in allocations)
+        already_allocated = sum(existing_allocations.values(), Decimal("0"))
+        new_allocations_total = sum(requested.values(), Decimal("0"))
 
         if already_allocated + new_allocations_total > payment.amount:
             remaining = payment.amount - already_allocated
@@ -375,49 +413,51 @@ class PaymentService:
                 f"Remaining available: {remaining}"
             )
 
-        for alloc_data in allocations:
-            document_id = alloc_data["document_id"]
-            allocated_amount = money(alloc_data["allocated_amount"])
-
-            document = InvoiceDocument.objects.get(id=document_id, org_id=org_id)
-
-            if document.contact.id != payment.contact.id:
+        documents = {
+            document.id: document
+            for document in InvoiceDocument.objects.select_for_update()
+            .filter(org_id=org_id, id__in=requested)
+            .only("id", "document_number", "contact_id", "status")
+            .order_by("id")
+        }
+
+        missing = [str(document_id) for document_id in requested if document_id not in documents]
+        if missing:
+            raise ResourceNotFound(f"Documents not found: {', '.join(missing)}")
+
+        # Report the first offending document in request order
+        for document_id in requested:
+            document = documents[document_id]
+            if document.contact_id != payment.contact_id:
                 raise ValidationError(
                     f"Document {document.document_number} contact does not match payment contact."
                 )
-
-            if document.status != "APPROVED":
+            if document.status not in ALLOCATABLE_STATUSES:
                 raise ValidationError(
-                    f"Document {document.document_number} must be APPROVED for allocation."
+                    f"Document {document.document_number} is {document.status}; only "
+                    f"{', '.join(ALLOCATABLE_STATUSES)} documents can be allocated."
                 )
-
-            existing = PaymentAllocation.objects.filter(payment=payment, document=document).first()
-
-            if existing:
+            if document_id in existing_allocations:
                 raise ValidationError(
                     f"Payment is already allocated to {document.document_number}."
                 )
 
-            base_allocated = (allocated_amount * payment.exchange_rate).quantize(Decimal("0.0001"))
-
-            PaymentAllocation.objects.create(
-                org_id=org_id,
-                payment=payment,
-                document=document,
-                allocated_amount=allocated_amount,
-                base_allocated_amount=base_allocated,
-            )
-
-            document_allocations = PaymentAllocation.objects.filter(document=document)
-            total_allocated_to_doc = sum(
-                (a.allocated_amount for a in document_allocations), Decimal("0")
-            )
+        PaymentAllocation.objects.bulk_create(
+            [
+                PaymentAllocation(
+                    org_id=org_id,
+                    payment=payment,
+                    document_id=document_id,
+                    allocated_amount=allocated_amount,
+                    base_allocated_amount=(allocated_amount * payment.exchange_rate).quantize(
+                        Decimal("0.0001")
+                    ),
+                )
+                for document_id, allocated_amount in requested.items()
+            ]
+        )
 
-            if total_allocated_to_doc >= document.total_incl:
-                document.status = "PAID"
-            elif total_allocated_to_doc > 0:
-                document.status = "PARTIALLY_PAID"
-            document.save()
+        PaymentService._refresh_document_balances(org_id, list(requested))
 
         AuditEventLog.objects.create(
             org_id=org_id,
@@ -435,8 +475,54 @@ class PaymentService:
             },
         )
 
+        DashboardService.publish_invalidation(org_id)
+
         return payment
 
+    @staticmethod
+    def _refresh_document_balances(org_id: UUID, document_ids: List[UUID]) -> int:
+        """
+        Recompute amount_paid and payment status for documents.
+
+        One UPDATE joined to the per-document sum of allocations from
+        non-voided payments: fully covered documents become PAID, partly
+        covered PARTIALLY_PAID. Uncovered documents keep their status
+        (APPROVED, SENT, OVERDUE), except that a PAID or PARTIALLY_PAID one
+        goes back to APPROVED.
+
+        Returns:
+            Number of documents updated
+        """
+        if not document_ids:
+            return 0
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE invoicing.document d
+                SET amount_paid = a.total,
+                    status = (CASE
+                        WHEN a.total >= d.total_amount THEN 'PAID'
+                        WHEN a.total > 0 THEN 'PARTIALLY_PAID'
+                        WHEN d.status IN ('PAID', 'PARTIALLY_PAID') THEN 'APPROVED'
+                        ELSE d.status::text
+                    END)::invoicing.doc_status
+                FROM (
+                    SELECT doc.id AS document_id,
+                           COALESCE(SUM(pa.allocated_amount)
+                               FILTER (WHERE NOT p.is_voided), 0) AS total
+                    FROM unnest(%s::uuid[]) AS doc(id)
+                    LEFT JOIN banking.payment_allocation pa ON pa.document_id = doc.id
+                    LEFT JOIN banking.payment p ON p.id = pa.payment_id
+                    GROUP BY doc.id
+                ) a
+                WHERE d.id = a.document_id
+                  AND d.org_id = %s
+                """,
+                [[str(document_id) for document_id in document_ids], str(org_id)],
+            )
+            return cursor.rowcount
+
     @staticmethod
     def get_allocations(payment_id: UUID) -> List[PaymentAllocation]:
         """
@@ -485,13 +571,8 @@ class PaymentService:
         # Delete allocation
         allocation.delete()
 
-        # Update document status if needed
-        total_allocated = sum(
-            a.allocated_amount for a in PaymentAllocation.objects.filter(document=document)
-        )
-        if total_allocated == Decimal("0.0000"):
-            document.status = "APPROVED"
-            document.save()
+        # Update document balance and status
+        PaymentService._refresh_document_balances(org_id, [document.id])
 
         # Audit log
         AuditEventLog.objects.create(
@@ -509,6 +590,8 @@ class PaymentService:
             },
         )
 
+        DashboardService.publish_invalidation(org_id)
+
     @staticmethod
     def _create_payment_journal_entry(
         org_id: UUID,
@@ -526,22 +609,20 @@ class PaymentService:
         - Debit: Accounts Payable
         - Credit: Bank Account (GL)
         """
-        from apps.journal.services import JournalService
+        from apps.journal.services import JournalService, PostingAccountService
 
-        # Get bank account's GL account
+        # Get bank account's GL account (fall back to the org's bank clearing account)
         bank_gl_account = payment.bank_account.gl_account
+        if not bank_gl_account:
+            bank_gl_account = PostingAccountService.get_account(org_id, "bank")
 
         # Get AR/AP account for contact
         if payment.payment_type == "RECEIVED":
             ar_account = payment.contact.receivable_account
             if not ar_account:
-                # Try to find default AR account
-                from django.db.models import Q
-                ar_account = Account.objects.filter(
-                    Q(org_id=org_id) & 
-                    (Q(code="1200") | Q(account_type="ASSET") | Q(account_type="ASSET_CURRENT"))
-                ).first()
-                
+                # Fall back to the org's default AR account
+                ar_account = PostingAccountService.get_accounts(org_id).get("ar")
+
                 if not ar_account:
                     raise ValidationError(
                         f"No receivable account configured for contact {payment.contact.name}"
@@ -566,13 +647,9 @@ class PaymentService:
         else:  # MADE
             ap_account = payment.contact.payable_account
             if not ap_account:
-                # Try to find default AP account
-                from django.db.models import Q
-                ap_account = Account.objects.filter(
-                    Q(org_id=org_id) & 
-                    (Q(code="2100") | Q(account_type="LIABILITY") | Q(account_type="LIABILITY_CURRENT"))
-                ).first()
-                
+                # Fall back to the org's default AP account
+                ap_account = PostingAccountService.get_accounts(org_id).get("ap")
+
                 if not ap_account:
                     raise ValidationError(
                         f"No payable account configured for contact {payment.contact.name}"
@@ -6,13 +6,15 @@ SEC-001 Remediation: All operations validated and logged.
 """
 
 from uuid import UUID, uuid4
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from decimal import Decimal
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
+from itertools import islice
 from django.db import transaction
 from django.utils import timezone
+import codecs
 import csv
-import io
+import hashlib
 
 from apps.core.models import (
     BankTransaction,
@@ -20,10 +22,23 @@ from apps.core.models import (
     Payment,
     AuditEventLog,
 )
+from apps.banking.services.auto_match_service import AutoMatchService
+from apps.banking.services.cash_position_service import CashPositionService
+from apps.reporting.services.dashboard_service import DashboardService
 from common.exceptions import ValidationError, ResourceNotFound, DuplicateResource
 from common.decimal_utils import money
 
 
+IMPORT_CHUNK_SIZE = 1000  # rows per bulk INSERT / transaction
+IMPORT_READ_SIZE = 64 * 1024  # bytes read from the upload at a time
+
+
+def _transaction_fingerprint(transaction_date: date, amount: Decimal, description: str) -> bytes:
+    """Duplicate-detection key for a bank transaction on one account."""
+    key = f"{transaction_date.isoformat()}|{money(amount)}|{description[:500]}"
+    return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+
 class ReconciliationService:
     """Service class for bank transaction and reconciliation operations."""
 
@@ -90,7 +105,6 @@ class ReconciliationService:
             raise ResourceNotFound(f"Bank transaction {transaction_id} not found")
 
     @staticmethod
-    @transaction.atomic()
     def import_csv(
         org_id: UUID,
         bank_account_id: UUID,
@@ -108,14 +122,25 @@ class ReconciliationService:
         - value_date (optional)
         - running_balance (optional)
 
+        The file is decoded incrementally and processed in chunks of
+        IMPORT_CHUNK_SIZE rows. Duplicates (same date, amount and
+        description as an existing or earlier row) are detected against
+        fingerprints preloaded for each chunk's date range; new rows are
+        written with one bulk INSERT per chunk, each in its own transaction.
+        Memory stays bounded by the chunk size plus one 16-byte fingerprint
+        per row.
+
         Args:
             org_id: Organisation UUID
             bank_account_id: Bank Account UUID
-            csv_file: CSV file object
+            csv_file: CSV file object (binary or text)
             user_id: Importing user ID
 
         Returns:
-            Dict with import results: {'imported': int, 'skipped': int, 'errors': list}
+            Dict with import results: {'imported': int, 'skipped': int,
+            'error_count': int, 'errors': list, 'batch_id': str,
+            'chunks': [{'chunk', 'rows', 'imported', 'skipped', 'errors'}]}.
+            skipped counts duplicates and invalid rows.
         """
         bank_account = BankAccount.objects.get(id=bank_account_id, org_id=org_id)
         if not bank_account.is_active:
@@ -124,115 +149,85 @@ class ReconciliationService:
         batch_id = uuid4()
         imported = 0
         skipped = 0
+        error_count = 0
         errors = []
+        chunks = []
 
-        try:
-            decoded_file = csv_file.read().decode("utf-8")
-        except UnicodeDecodeError:
-            try:
-                decoded_file = csv_file.read().decode("latin-1")
-            except Exception as e:
-                raise ValidationError(f"Could not decode file: {e}")
-
-        reader = csv.DictReader(io.StringIO(decoded_file))
+        fingerprints = set()
+        loaded_range = None  # (date_from, date_to) already in `fingerprints`
 
-        for row_num, row in enumerate(reader, start=2):
-            try:
-                # Normalize keys to lowercase for easier lookup
-                row_lower = {k.lower().strip(): v for k, v in row.items() if k}
-                
-                transaction_date = row_lower.get("transaction_date") or row_lower.get("date")
-                if not transaction_date:
-                    errors.append(f"Row {row_num}: Missing transaction_date")
-                    skipped += 1
-                    continue
+        reader = csv.DictReader(ReconciliationService._iter_csv_lines(csv_file))
+        rows = enumerate(reader, start=2)
 
-                amount_str = row_lower.get("amount") or row_lower.get("txn_amount")
-                if not amount_str:
-                    errors.append(f"Row {row_num}: Missing amount")
-                    skipped += 1
-                    continue
-
-                description = row_lower.get("description") or row_lower.get("narration") or ""
-                if not description:
-                    errors.append(f"Row {row_num}: Missing description")
-                    skipped += 1
-                    continue
+        while True:
+            chunk = list(islice(rows, IMPORT_CHUNK_SIZE))
+            if not chunk:
+                break
 
+            parsed = []
+            chunk_errors = 0
+            for row_num, row in chunk:
                 try:
-                    from datetime import datetime as dt
-
-                    transaction_date_parsed = dt.strptime(
-                        transaction_date.strip(), "%Y-%m-%d"
-                    ).date()
-                except ValueError:
-                    try:
-                        transaction_date_parsed = dt.strptime(
-                            transaction_date.strip(), "%d/%m/%Y"
-                        ).date()
-                    except ValueError:
-                        errors.append(f"Row {row_num}: Invalid date format '{transaction_date}'")
-                        skipped += 1
-                        continue
-
-                try:
-                    amount = money(amount_str.replace(",", "").strip())
-                except ValueError:
-                    errors.append(f"Row {row_num}: Invalid amount '{amount_str}'")
-                    skipped += 1
-                    continue
-
-                reference = row_lower.get("reference", "").strip()
-                external_id = (
-                    row_lower.get("external_id") or row_lower.get("txn_id") or row_lower.get("reference_number") or ""
+                    parsed.append(ReconciliationService._parse_csv_row(row))
+                except Exception as e:
+                    chunk_errors += 1
+                    if len(errors) < 20:
+                        errors.append(f"Row {row_num}: {e}")
+
+            if parsed:
+                dates = [p["transaction_date"] for p in parsed]
+                loaded_range = ReconciliationService._load_fingerprints(
+                    bank_account, fingerprints, loaded_range, min(dates), max(dates)
                 )
 
-                existing = BankTransaction.objects.filter(
-                    bank_account=bank_account,
-                    transaction_date=transaction_date_parsed,
-                    amount=amount,
-                    description=description[:500],
-                ).first()
-
-                if existing:
-                    skipped += 1
+            new_rows = []
+            # Only trusted as duplicates of later rows once the chunk is saved
+            new_fingerprints = set()
+            duplicates = 0
+            for p in parsed:
+                fingerprint = _transaction_fingerprint(
+                    p["transaction_date"], p["amount"], p["description"]
+                )
+                if fingerprint in fingerprints or fingerprint in new_fingerprints:
+                    duplicates += 1
                     continue
-
-                value_date = None
-                value_date_str = row_lower.get("value_date")
-                if value_date_str:
-                    try:
-                        value_date = dt.strptime(value_date_str.strip(), "%Y-%m-%d").date()
-                    except ValueError:
-                        pass
-
-                running_balance = None
-                running_balance_str = row_lower.get("running_balance") or row_lower.get("balance")
-                if running_balance_str:
-                    try:
-                        running_balance = money(running_balance_str.replace(",", "").strip())
-                    except ValueError:
-                        pass
-
-                BankTransaction.objects.create(
-                    org_id=org_id,
-                    bank_account=bank_account,
-                    transaction_date=transaction_date_parsed,
-                    value_date=value_date,
-                    description=description[:500],
-                    reference=reference[:100],
-                    amount=amount,
-                    running_balance=running_balance,
-                    is_reconciled=False,
-                    import_batch_id=batch_id,
-                    import_source="CSV",
-                    external_id=external_id[:100],
+                new_fingerprints.add(fingerprint)
+                new_rows.append(
+                    BankTransaction(
+                        org_id=org_id,
+                        bank_account=bank_account,
+                        is_reconciled=False,
+                        import_batch_id=batch_id,
+                        import_source="CSV",
+                        **p,
+                    )
                 )
-                imported += 1
 
-            except Exception as e:
-                errors.append(f"Row {row_num}: {str(e)}")
-                skipped += 1
+            chunk_imported = 0
+            if new_rows:
+                try:
+                    with transaction.atomic():
+                        BankTransaction.objects.bulk_create(new_rows)
+                    chunk_imported = len(new_rows)
+                    fingerprints |= new_fingerprints
+                except Exception as e:
+                    chunk_errors += len(new_rows)
+                    if len(errors) < 20:
+                        errors.append(f"Rows {chunk[0][0]}-{chunk[-1][0]}: {str(e)}")
+
+            chunk_skipped = len(chunk) - chunk_imported
+            chunks.append(
+                {
+                    "chunk": len(chunks) + 1,
+                    "rows": len(chunk),
+                    "imported": chunk_imported,
+                    "skipped": chunk_skipped,
+                    "errors": chunk_errors,
+                }
+            )
+            imported += chunk_imported
+            skipped += chunk_skipped
+            error_count += chunk_errors
 
         AuditEventLog.objects.create(
             org_id=org_id,
@@ -252,10 +247,161 @@ class ReconciliationService:
         return {
             "imported": imported,
             "skipped": skipped,
-            "errors": errors[:20],
+            "error_count": error_count,
+            "errors": errors,
             "batch_id": str(batch_id),
+            "chunks": chunks,
         }
 
+    @staticmethod
+    def _iter_csv_lines(csv_file) -> Iterator[str]:
+        """
+        Yield lines of an uploaded CSV file, decoding incrementally.
+
+        Decodes as UTF-8 (a BOM is dropped); if invalid UTF-8 is met, the
+        rest of the file is decoded as Latin-1.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        pending = ""
+
+        while True:
+            block = csv_file.read(IMPORT_READ_SIZE)
+            final = not block
+
+            if isinstance(block, str):
+                text = block
+            else:
+                try:
+                    text = decoder.decode(block, final)
+                except UnicodeDecodeError:
+                    buffered, _ = decoder.getstate()
+                    decoder = codecs.getincrementaldecoder("latin-1")()
+                    text = decoder.decode(buffered + block, final)
+
+            pending += text
+            lines = pending.split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+
+            if final:
+                break
+
+        if pending:
+            yield pending
+
+    @staticmethod
+    def _parse_csv_row(row: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Convert a CSV row into BankTransaction field values.
+
+        Raises:
+            ValueError: With a user-facing message if the row is invalid
+        """
+        # Normalize keys to lowercase for easier lookup
+        row_lower = {k.lower().strip(): v or "" for k, v in row.items() if k}
+
+        transaction_date = row_lower.get("transaction_date") or row_lower.get("date")
+        if not transaction_date:
+            raise ValueError("Missing transaction_date")
+
+        amount_str = row_lower.get("amount") or row_lower.get("txn_amount")
+        if not amount_str:
+            raise ValueError("Missing amount")
+
+        description = row_lower.get("description") or row_lower.get("narration") or ""
+        if not description:
+            raise ValueError("Missing description")
+
+        try:
+            transaction_date_parsed = datetime.strptime(transaction_date.strip(), "%Y-%m-%d").date()
+        except ValueError:
+            try:
+                transaction_date_parsed = datetime.strptime(
+                    transaction_date.strip(), "%d/%m/%Y"
+                ).date()
+            except ValueError:
+                raise ValueError(f"Invalid date format '{transaction_date}'")
+
+        try:
+            amount = money(amount_str.replace(",", "").strip())
+        except ValueError:
+            raise ValueError(f"Invalid amount '{amount_str}'")
+
+        reference = row_lower.get("reference", "").strip()
+        external_id = (
+            row_lower.get("external_id")
+            or row_lower.get("txn_id")
+            or row_lower.get("reference_number")
+            or ""
+        )
+
+        value_date = None
+        value_date_str = row_lower.get("value_date")
+        if value_date_str:
+            try:
+                value_date = datetime.strptime(value_date_str.strip(), "%Y-%m-%d").date()
+            except ValueError:
+                pass
+
+        running_balance = None
+        running_balance_str = row_lower.get("running_balance") or row_lower.get("balance")
+        if running_balance_str:
+            try:
+                running_balance = money(running_balance_str.replace(",", "").strip())
+            except ValueError:
+                pass
+
+        return {
+            "transaction_date": transaction_date_parsed,
+            "value_date": value_date,
+            "description": description[:500],
+            "reference": reference[:100],
+            "amount": amount,
+            "running_balance": running_balance,
+            "external_id": external_id[:100],
+        }
+
+    @staticmethod
+    def _load_fingerprints(
+        bank_account: BankAccount,
+        fingerprints: set,
+        loaded_range: Optional[Tuple[date, date]],
+        date_from: date,
+        date_to: date,
+    ) -> Tuple[date, date]:
+        """
+        Add fingerprints of existing transactions in [date_from, date_to].
+
+        Only the part of the range not loaded by an earlier chunk is
+        queried; statements are usually date-ordered, so each chunk
+        typically loads a few new days.
+
+        Returns:
+            The loaded date range after this call
+        """
+        if loaded_range is None:
+            missing = [(date_from, date_to)]
+            loaded_range = (date_from, date_to)
+        else:
+            missing = []
+            if date_from < loaded_range[0]:
+                missing.append((date_from, loaded_range[0] - timedelta(days=1)))
+            if date_to > loaded_range[1]:
+                missing.append((loaded_range[1] + timedelta(days=1), date_to))
+            loaded_range = (min(date_from, loaded_range[0]), max(date_to, loaded_range[1]))
+
+        for range_from, range_to in missing:
+            existing = BankTransaction.objects.filter(
+                bank_account=bank_account,
+                transaction_date__gte=range_from,
+                transaction_date__lte=range_to,
+            ).values_list("transaction_date", "amount", "description")
+            for transaction_date, amount, description in existing.iterator(chunk_size=2000):
+                fingerprints.add(_transaction_fingerprint(transaction_date, amount, description))
+
+        return loaded_range
+
     @staticmethod
     @transaction.atomic()
     def reconcile(
@@ -285,7 +431,7 @@ class ReconciliationService:
             raise ValidationError("Transaction is already reconciled.")
 
         try:
-            payment = Payment.objects.get(id=payment_id, org_id=org_id)
+            payment = Payment.objects.select_for_update().get(id=payment_id, org_id=org_id)
         except Payment.DoesNotExist:
             raise ResourceNotFound(f"Payment {payment_id} not found")
 
@@ -296,7 +442,8 @@ class ReconciliationService:
             raise ValidationError("Payment bank account does not match transaction bank account.")
 
         tolerance = Decimal("1.00")
-        if abs(transaction_obj.amount - payment.amount) > tolerance:
+        # Statement amounts are signed (debits negative); payment amounts are not
+        if abs(abs(transaction_obj.amount) - payment.amount) > tolerance:
             raise ValidationError(
                 f"Amount mismatch: Transaction ({transaction_obj.amount}) vs "
                 f"Payment ({payment.amount}). Difference exceeds tolerance ({tolerance})."
@@ -307,8 +454,10 @@ class ReconciliationService:
         transaction_obj.matched_payment = payment
         transaction_obj.save()
 
-        payment.is_reconciled = True
-        payment.save()
+        if not payment.is_reconciled:
+            payment.is_reconciled = True
+            payment.save()
+            CashPositionService.apply_payments(org_id, [payment], posted=False, reconciled=True)
 
         AuditEventLog.objects.create(
             org_id=org_id,
@@ -325,6 +474,8 @@ class ReconciliationService:
             },
         )
 
+        DashboardService.publish_invalidation(org_id)
+
         return transaction_obj
 
     @staticmethod
@@ -358,7 +509,17 @@ class ReconciliationService:
         transaction_obj.save()
 
         if old_payment_id:
-            Payment.objects.filter(id=old_payment_id).update(is_reconciled=False)
+            payment = (
+                Payment.objects.select_for_update()
+                .filter(id=old_payment_id, is_reconciled=True)
+                .first()
+            )
+            if payment:
+                Payment.objects.filter(id=payment.id).update(is_reconciled=False)
+                if not payment.is_voided:
+                    CashPositionService.apply_payments(
+                        org_id, [payment], sign=-1, posted=False, reconciled=True
+                    )
 
         AuditEventLog.objects.create(
             org_id=org_id,
@@ -371,6 +532,8 @@ class ReconciliationService:
             new_data={"is_reconciled": False},
         )
 
+        DashboardService.publish_invalidation(org_id)
+
         return transaction_obj
 
     @staticmethod
@@ -382,6 +545,10 @@ class ReconciliationService:
         """
         Suggest payment matches for a bank transaction.
 
+        Candidates are payments in the transaction's direction within the
+        amount tolerance, ranked by AutoMatchService (amount, date,
+        reference and description similarity).
+
         Args:
             org_id: Organisation UUID
             transaction_id: BankTransaction UUID
@@ -395,30 +562,23 @@ class ReconciliationService:
         if transaction_obj.is_reconciled:
             return []
 
-        candidates = Payment.objects.filter(
-            org_id=org_id,
-            bank_account_id=transaction_obj.bank_account_id,
-            is_voided=False,
-            is_reconciled=False,
+        amount = abs(transaction_obj.amount)
+        candidates = AutoMatchService.candidate_payments(
+            org_id, transaction_obj.bank_account_id
+        ).filter(
+            payment_type="RECEIVED" if transaction_obj.amount >= 0 else "MADE",
+            amount__gte=amount - tolerance,
+            amount__lte=amount + tolerance,
         )
 
-        suggestions = []
-        for payment in candidates:
-            amount_diff = abs(transaction_obj.amount - payment.amount)
-
-            if amount_diff <= tolerance:
-                suggestions.append(
-                    {
-                        "payment_id": str(payment.id),
-                        "payment_number": payment.payment_number,
-                        "payment_date": payment.payment_date.isoformat(),
-                        "amount": str(payment.amount),
-                        "contact": payment.contact.name if payment.contact else None,
-                        "amount_difference": str(amount_diff),
-                        "score": 100 - int(amount_diff * 10),
-                    }
-                )
-
-        suggestions.sort(key=lambda x: x["score"], reverse=True)
+        ranked = AutoMatchService.rank(
+            transaction_obj,
+            AutoMatchService.build_index(list(candidates)),
+            tolerance,
+            date_window_days=None,
+        )
 
-        return suggestions[:10]
+        return [
+            AutoMatchService.match_data(transaction_obj.amount, score, payment)
+            for score, payment in ranked[:10]
+        ]
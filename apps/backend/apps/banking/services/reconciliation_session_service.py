@@ -0,0 +1,358 @@
+"""
+Reconciliation Session Service for LedgerSG Banking Module.
+
+Statement-level reconciliation: one call returns a bank account's
+statement window with candidate payments and suggested pairings, and one
+call applies a batch of reconcile/unreconcile operations atomically.
+"""
+
+from uuid import UUID
+from typing import List, Optional, Dict, Any
+from decimal import Decimal
+from datetime import date, timedelta
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.models import (
+    BankTransaction,
+    BankAccount,
+    Payment,
+    AuditEventLog,
+)
+from apps.banking.services.auto_match_service import (
+    AutoMatchService,
+    DEFAULT_DATE_WINDOW_DAYS,
+    DEFAULT_TOLERANCE,
+    MAX_MATCHES_PER_TRANSACTION,
+)
+from apps.banking.services.cash_position_service import CashPositionService
+from apps.reporting.services.dashboard_service import DashboardService
+from common.exceptions import ValidationError, ResourceNotFound
+from common.decimal_utils import money
+
+
+MAX_BATCH_OPERATIONS = 1000
+
+
+class ReconciliationSessionService:
+    """Service class for statement-level reconciliation."""
+
+    @staticmethod
+    def get_session(
+        org_id: UUID,
+        bank_account_id: UUID,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        tolerance: Decimal = DEFAULT_TOLERANCE,
+        date_window_days: int = DEFAULT_DATE_WINDOW_DAYS,
+    ) -> Dict[str, Any]:
+        """
+        Build the reconciliation workspace for a statement window.
+
+        Three queries regardless of statement size: the bank account with
+        its cash position, the transactions in the window, and unreconciled
+        payments within `date_window_days` of it. Suggestions come from
+        AutoMatchService; each transaction gets its ranked matches and at
+        most one suggested payment (no payment is suggested twice).
+
+        Args:
+            org_id: Organisation UUID
+            bank_account_id: Bank Account UUID
+            date_from: First statement date (inclusive), None for no limit
+            date_to: Last statement date (inclusive), None for no limit
+            tolerance: Amount tolerance for matching
+            date_window_days: Maximum days between transaction and payment
+
+        Returns:
+            Dict with 'bank_account', 'summary', 'transactions' and 'payments'
+        """
+        if date_from and date_to and date_from > date_to:
+            raise ValidationError("date_from must be on or before date_to.")
+
+        try:
+            bank_account = BankAccount.objects.select_related("cash_position").get(
+                id=bank_account_id, org_id=org_id
+            )
+        except BankAccount.DoesNotExist:
+            raise ResourceNotFound(f"Bank account {bank_account_id} not found")
+
+        transactions = BankTransaction.objects.filter(
+            org_id=org_id, bank_account_id=bank_account_id
+        )
+        payments = AutoMatchService.candidate_payments(org_id, bank_account_id)
+        window = timedelta(days=date_window_days)
+        if date_from:
+            transactions = transactions.filter(transaction_date__gte=date_from)
+            payments = payments.filter(payment_date__gte=date_from - window)
+        if date_to:
+            transactions = transactions.filter(transaction_date__lte=date_to)
+            payments = payments.filter(payment_date__lte=date_to + window)
+
+        transactions = list(transactions.order_by("transaction_date", "id"))
+        payments = list(payments.order_by("payment_date", "payment_number"))
+
+        open_transactions = [t for t in transactions if not t.is_reconciled]
+        ranked_by_txn = AutoMatchService.rank_all(
+            open_transactions, payments, tolerance, date_window_days
+        )
+        suggested = AutoMatchService.pair(open_transactions, ranked_by_txn)
+        suggested_txn_by_payment = {
+            payment.id: txn_id for txn_id, (payment, _) in suggested.items()
+        }
+
+        transaction_rows = []
+        for txn in transactions:
+            payment, score = suggested.get(txn.id, (None, None))
+            transaction_rows.append(
+                {
+                    "id": str(txn.id),
+                    "transaction_date": txn.transaction_date.isoformat(),
+                    "amount": str(txn.amount),
+                    "description": txn.description,
+                    "reference": txn.reference,
+                    "is_reconciled": txn.is_reconciled,
+                    "matched_payment_id": (
+                        str(txn.matched_payment_id) if txn.matched_payment_id else None
+                    ),
+                    "suggested_payment_id": str(payment.id) if payment else None,
+                    "suggested_score": score,
+                    "matches": [
+                        AutoMatchService.match_data(txn.amount, s, p)
+                        for s, p in ranked_by_txn.get(txn.id, [])[:MAX_MATCHES_PER_TRANSACTION]
+                    ],
+                }
+            )
+
+        payment_rows = []
+        for payment in payments:
+            txn_id = suggested_txn_by_payment.get(payment.id)
+            payment_rows.append(
+                {
+                    "id": str(payment.id),
+                    "payment_number": payment.payment_number,
+                    "payment_type": payment.payment_type,
+                    "payment_date": payment.payment_date.isoformat(),
+                    "amount": str(payment.amount),
+                    "reference": payment.payment_reference,
+                    "contact": payment.contact.name if payment.contact else None,
+                    "suggested_transaction_id": str(txn_id) if txn_id else None,
+                }
+            )
+
+        statement_total = sum((t.amount for t in transactions), Decimal("0"))
+        reconciled_total = sum(
+            (t.amount for t in transactions if t.is_reconciled), Decimal("0")
+        )
+        position = getattr(bank_account, "cash_position", None)
+
+        return {
+            "bank_account": {
+                "id": str(bank_account.id),
+                "account_name": bank_account.account_name,
+                "currency": bank_account.currency,
+                "balance": str(
+                    money(bank_account.opening_balance + (position.net_movement if position else 0))
+                ),
+                "reconciled_balance": str(
+                    money(
+                        bank_account.opening_balance
+                        + (position.reconciled_movement if position else 0)
+                    )
+                ),
+            },
+            "date_from": date_from.isoformat() if date_from else None,
+            "date_to": date_to.isoformat() if date_to else None,
+            "summary": {
+                "transaction_count": len(transactions),
+                "unreconciled_count": len(open_transactions),
+                "candidate_payment_count": len(payments),
+                "suggested_count": len(suggested),
+                "statement_total": str(money(statement_total)),
+                "reconciled_total": str(money(reconciled_total)),
+                "unreconciled_total": str(money(statement_total - reconciled_total)),
+            },
+            "transactions": transaction_rows,
+            "payments": payment_rows,
+        }
+
+    @staticmethod
+    @transaction.atomic()
+    def apply_operations(
+        org_id: UUID,
+        bank_account_id: UUID,
+        operations: List[Dict[str, Any]],
+        user_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """
+        Apply a batch of reconcile/unreconcile operations atomically.
+
+        Operations run in order against the batch's own view of the data,
+        so a line can be unreconciled and re-matched in one batch. Any
+        invalid operation rejects the whole batch. Writes are one UPDATE per
+        table, one cash position upsert and one audit event for the batch.
+
+        Args:
+            org_id: Organisation UUID
+            bank_account_id: Bank Account UUID
+            operations: List of {'action': 'reconcile', 'transaction_id',
+                'payment_id'} or {'action': 'unreconcile', 'transaction_id'}
+            user_id: Reconciling user ID
+
+        Returns:
+            Dict with 'applied', 'reconciled' and 'unreconciled' counts
+
+        Raises:
+            ValidationError: If any operation is invalid
+            ResourceNotFound: If a transaction or payment does not exist
+        """
+        if not operations:
+            raise ValidationError("At least one operation is required.")
+        if len(operations) > MAX_BATCH_OPERATIONS:
+            raise ValidationError(
+                f"A batch can contain at most {MAX_BATCH_OPERATIONS} operations."
+            )
+
+        if not BankAccount.objects.filter(id=bank_account_id, org_id=org_id).exists():
+            raise ResourceNotFound(f"Bank account {bank_account_id} not found")
+
+        transaction_ids = {UUID(str(op["transaction_id"])) for op in operations}
+        transactions = {
+            txn.id: txn
+            for txn in BankTransaction.objects.select_for_update()
+            .filter(org_id=org_id, bank_account_id=bank_account_id, id__in=transaction_ids)
+            .order_by("id")
+        }
+        missing = transaction_ids - set(transactions)
+        if missing:
+            raise ResourceNotFound(
+                f"Bank transactions not found: {', '.join(sorted(str(m) for m in missing))}"
+            )
+
+        payment_ids = {
+            UUID(str(op["payment_id"])) for op in operations if op.get("payment_id")
+        } | {txn.matched_payment_id for txn in transactions.values() if txn.matched_payment_id}
+        payments = {
+            payment.id: payment
+            for payment in Payment.objects.select_for_update()
+            .filter(org_id=org_id, id__in=payment_ids)
+            .order_by("id")
+        }
+
+        initially_reconciled = {pid for pid, p in payments.items() if p.is_reconciled}
+        reconciled_pairs = []
+        unreconciled_pairs = []
+
+        for index, op in enumerate(operations, start=1):
+            txn = transactions[UUID(str(op["transaction_id"]))]
+            action = op["action"]
+
+            if action == "unreconcile":
+                if not txn.is_reconciled:
+                    raise ValidationError(f"Operation {index}: Transaction is not reconciled.")
+                payment = payments.get(txn.matched_payment_id)
+                if payment:
+                    payment.is_reconciled = False
+                unreconciled_pairs.append((txn.id, txn.matched_payment_id))
+                txn.is_reconciled = False
+                txn.reconciled_at = None
+                txn.matched_payment = None
+
+            elif action == "reconcile":
+                payment_id = UUID(str(op["payment_id"]))
+                if payment_id not in payments:
+                    raise ResourceNotFound(f"Operation {index}: Payment {payment_id} not found")
+                payment = payments[payment_id]
+
+                if txn.is_reconciled:
+                    raise ValidationError(
+                        f"Operation {index}: Transaction is already reconciled."
+                    )
+                if payment.is_voided:
+                    raise ValidationError(
+                        f"Operation {index}: Cannot reconcile to a voided payment."
+                    )
+                if payment.is_reconciled:
+                    raise ValidationError(
+                        f"Operation {index}: Payment {payment.payment_number} "
+                        f"is already reconciled."
+                    )
+                if payment.bank_account_id != txn.bank_account_id:
+                    raise ValidationError(
+                        f"Operation {index}: Payment bank account does not match "
+                        f"transaction bank account."
+                    )
+                if abs(abs(txn.amount) - payment.amount) > DEFAULT_TOLERANCE:
+                    raise ValidationError(
+                        f"Operation {index}: Amount mismatch: Transaction ({txn.amount}) vs "
+                        f"Payment ({payment.amount}). Difference exceeds tolerance "
+                        f"({DEFAULT_TOLERANCE})."
+                    )
+
+                payment.is_reconciled = True
+                txn.is_reconciled = True
+                txn.reconciled_at = timezone.now()
+                txn.matched_payment = payment
+                reconciled_pairs.append((txn.id, payment.id))
+
+            else:
+                raise ValidationError(f"Operation {index}: Unknown action '{action}'.")
+
+        BankTransaction.objects.bulk_update(
+            list(transactions.values()), ["is_reconciled", "reconciled_at", "matched_payment"]
+        )
+
+        # Only payments whose final state differs from the start are written
+        newly_reconciled = [
+            p for pid, p in payments.items()
+            if p.is_reconciled and pid not in initially_reconciled
+        ]
+        newly_unreconciled = [
+            p for pid, p in payments.items()
+            if not p.is_reconciled and pid in initially_reconciled
+        ]
+        if newly_reconciled:
+            Payment.objects.filter(id__in=[p.id for p in newly_reconciled]).update(
+                is_reconciled=True
+            )
+        if newly_unreconciled:
+            Payment.objects.filter(id__in=[p.id for p in newly_unreconciled]).update(
+                is_reconciled=False
+            )
+        CashPositionService.apply_payments(
+            org_id, newly_reconciled, posted=False, reconciled=True
+        )
+        CashPositionService.apply_payments(
+            org_id,
+            [p for p in newly_unreconciled if not p.is_voided],
+            sign=-1,
+            posted=False,
+            reconciled=True,
+        )
+
+        AuditEventLog.objects.create(
+            org_id=org_id,
+            user_id=user_id,
+            action="RECONCILE",
+            entity_schema="banking",
+            entity_table="bank_account",
+            entity_id=bank_account_id,
+            new_data={
+                "operation": "RECONCILE_BATCH",
+                "reconciled": [
+                    {"transaction_id": str(t), "payment_id": str(p)}
+                    for t, p in reconciled_pairs
+                ],
+                "unreconciled": [
+                    {"transaction_id": str(t), "payment_id": str(p) if p else None}
+                    for t, p in unreconciled_pairs
+                ],
+            },
+        )
+
+        DashboardService.publish_invalidation(org_id)
+
+        return {
+            "applied": len(operations),
+            "reconciled": len(reconciled_pairs),
+            "unreconciled": len(unreconciled_pairs),
+        }
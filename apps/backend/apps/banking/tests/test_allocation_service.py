@@ -12,6 +12,8 @@ import uuid
 from datetime import date
 from decimal import Decimal
 from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.core.models import (
     AppUser,
@@ -585,3 +587,165 @@ class TestPaymentAllocation:
             )
 
         assert "exceed" in str(exc_info.value).lower()
+
+
+def _invoices(org, contact, count, start=1):
+    """Create `count` approved invoices of 109.00 each."""
+    return [
+        InvoiceDocument.objects.create(
+            org=org,
+            document_type="SALES_INVOICE",
+            document_number=f"INV-{i:05d}",
+            contact=contact,
+            issue_date=date(2024, 1, 1),
+            due_date=date(2024, 1, 31),
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+            status="APPROVED",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+class TestSetBasedAllocation:
+    """Multi-document allocation in a fixed number of queries."""
+
+    def _payment(self, org, bank_account, customer, user, amount):
+        return PaymentService.create_received(
+            org_id=org.id,
+            data={
+                "contact_id": customer.id,
+                "bank_account_id": bank_account.id,
+                "payment_date": date(2024, 1, 15),
+                "amount": amount,
+                "payment_method": "BANK_TRANSFER",
+            },
+            user_id=user.id,
+        )
+
+    def test_query_count_independent_of_document_count(
+        self, test_org, bank_account, customer, test_user
+    ):
+        def allocate(invoices):
+            payment = self._payment(
+                test_org, bank_account, customer, test_user, Decimal("109.00") * len(invoices)
+            )
+            with CaptureQueriesContext(connection) as ctx:
+                PaymentService.allocate(
+                    org_id=test_org.id,
+                    payment_id=payment.id,
+                    allocations=[
+                        {"document_id": inv.id, "allocated_amount": Decimal("109.00")}
+                        for inv in invoices
+                    ],
+                    user_id=test_user.id,
+                )
+            return len(ctx.captured_queries)
+
+        few = allocate(_invoices(test_org, customer, 3))
+        many = allocate(_invoices(test_org, customer, 60, start=100))
+
+        assert many == few
+
+    def test_amount_paid_and_status_updated(self, test_org, bank_account, customer, test_user):
+        full, partial = _invoices(test_org, customer, 2)
+        payment = self._payment(test_org, bank_account, customer, test_user, Decimal("159.00"))
+
+        PaymentService.allocate(
+            org_id=test_org.id,
+            payment_id=payment.id,
+            allocations=[
+                {"document_id": full.id, "allocated_amount": Decimal("109.00")},
+                {"document_id": partial.id, "allocated_amount": Decimal("50.00")},
+            ],
+            user_id=test_user.id,
+        )
+
+        full.refresh_from_db()
+        partial.refresh_from_db()
+        assert (full.status, full.amount_paid) == ("PAID", Decimal("109.0000"))
+        assert (partial.status, partial.amount_paid) == ("PARTIALLY_PAID", Decimal("50.0000"))
+
+        # A second payment can settle the partially paid invoice
+        second = self._payment(test_org, bank_account, customer, test_user, Decimal("59.00"))
+        PaymentService.allocate(
+            org_id=test_org.id,
+            payment_id=second.id,
+            allocations=[{"document_id": partial.id, "allocated_amount": Decimal("59.00")}],
+            user_id=test_user.id,
+        )
+        partial.refresh_from_db()
+        assert (partial.status, partial.amount_paid) == ("PAID", Decimal("109.0000"))
+
+    def test_invalid_document_rejects_whole_batch(
+        self, test_org, bank_account, customer, test_user
+    ):
+        good, other = _invoices(test_org, customer, 2)
+        other_customer = Contact.objects.create(
+            org=test_org,
+            contact_type="CUSTOMER",
+            name="Other Customer",
+            is_customer=True,
+        )
+        InvoiceDocument.objects.filter(id=other.id).update(contact=other_customer)
+        payment = self._payment(test_org, bank_account, customer, test_user, Decimal("218.00"))
+
+        with pytest.raises(ValidationError) as exc_info:
+            PaymentService.allocate(
+                org_id=test_org.id,
+                payment_id=payment.id,
+                allocations=[
+                    {"document_id": good.id, "allocated_amount": Decimal("109.00")},
+                    {"document_id": other.id, "allocated_amount": Decimal("109.00")},
+                ],
+                user_id=test_user.id,
+            )
+
+        assert "contact does not match" in str(exc_info.value)
+        assert not PaymentAllocation.objects.filter(payment=payment).exists()
+
+    def test_unallocate_restores_balance(self, test_org, bank_account, customer, test_user):
+        (invoice,) = _invoices(test_org, customer, 1)
+        payment = self._payment(test_org, bank_account, customer, test_user, Decimal("109.00"))
+        PaymentService.allocate(
+            org_id=test_org.id,
+            payment_id=payment.id,
+            allocations=[{"document_id": invoice.id, "allocated_amount": Decimal("109.00")}],
+            user_id=test_user.id,
+        )
+
+        allocation = PaymentService.get_allocations(payment_id=payment.id)[0]
+        PaymentService.unallocate(
+            org_id=test_org.id, allocation_id=allocation.id, user_id=test_user.id
+        )
+
+        invoice.refresh_from_db()
+        assert (invoice.status, invoice.amount_paid) == ("APPROVED", Decimal("0.0000"))
+
+    def test_unpaid_documents_keep_status(self, test_org, customer):
+        sent, overdue = _invoices(test_org, customer, 2)
+        InvoiceDocument.objects.filter(id=sent.id).update(status="SENT")
+        InvoiceDocument.objects.filter(id=overdue.id).update(status="OVERDUE")
+
+        PaymentService._refresh_document_balances(test_org.id, [sent.id, overdue.id])
+
+        sent.refresh_from_db()
+        overdue.refresh_from_db()
+        assert sent.status == "SENT"
+        assert overdue.status == "OVERDUE"
+
+    def test_draft_document_rejected(self, test_org, bank_account, customer, test_user):
+        (draft,) = _invoices(test_org, customer, 1)
+        InvoiceDocument.objects.filter(id=draft.id).update(status="DRAFT")
+        payment = self._payment(test_org, bank_account, customer, test_user, Decimal("109.00"))
+
+        with pytest.raises(ValidationError) as exc_info:
+            PaymentService.allocate(
+                org_id=test_org.id,
+                payment_id=payment.id,
+                allocations=[{"document_id": draft.id, "allocated_amount": Decimal("109.00")}],
+                user_id=test_user.id,
+            )
+
+        assert "is DRAFT; only APPROVED, SENT, PARTIALLY_PAID, OVERDUE" in str(exc_info.value)
@@ -0,0 +1,270 @@
+"""
+Auto-Match Service Tests
+
+Tests for batch matching of bank transactions to payments.
+Run with: pytest apps/banking/tests/test_auto_match_service.py -v
+"""
+
+import pytest
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import (
+    AppUser,
+    AuditEventLog,
+    Organisation,
+    Account,
+    Contact,
+    BankAccount,
+    BankTransaction,
+    Payment,
+)
+from apps.banking.services import AutoMatchService, ReconciliationService
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def test_user():
+    """Create and return a test user."""
+    user_id = uuid.uuid4()
+    return AppUser.objects.create(
+        id=user_id,
+        email=f"match_test_{user_id.hex[:8]}@example.com",
+        full_name="Auto Match Test User",
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def test_org():
+    """Create organisation for testing."""
+    return Organisation.objects.create(
+        id=uuid.uuid4(),
+        name="Auto Match Test Org",
+        legal_name="Auto Match Test Org Pte Ltd",
+        uen="MATCHTEST",
+        entity_type="PRIVATE_LIMITED",
+        gst_registered=False,
+        fy_start_month=1,
+        base_currency="SGD",
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def bank_account(test_org):
+    """Create a bank account."""
+    gl_account = Account.objects.create(
+        org=test_org,
+        code="1100",
+        name="DBS Bank Account",
+        account_type="ASSET",
+        is_active=True,
+        is_bank=True,
+    )
+    return BankAccount.objects.create(
+        org=test_org,
+        account_name="Main Operating Account",
+        bank_name="DBS Bank",
+        account_number="1234567890",
+        gl_account=gl_account,
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def contacts(test_org):
+    """Create a customer and a supplier."""
+    return {
+        "customer": Contact.objects.create(
+            org=test_org,
+            contact_type="CUSTOMER",
+            name="Acme Trading Pte Ltd",
+            is_customer=True,
+        ),
+        "supplier": Contact.objects.create(
+            org=test_org,
+            contact_type="SUPPLIER",
+            name="Harbour Logistics",
+            is_supplier=True,
+        ),
+    }
+
+
+def _payment(org, bank_account, contact, payment_type, number, amount, payment_date, reference=""):
+    return Payment.objects.create(
+        org=org,
+        payment_type=payment_type,
+        payment_number=number,
+        payment_date=payment_date,
+        contact=contact,
+        bank_account=bank_account,
+        currency="SGD",
+        exchange_rate=Decimal("1.000000"),
+        amount=amount,
+        base_amount=amount,
+        payment_reference=reference,
+        is_voided=False,
+    )
+
+
+def _transaction(org, bank_account, amount, transaction_date, description, reference=""):
+    return BankTransaction.objects.create(
+        org=org,
+        bank_account=bank_account,
+        transaction_date=transaction_date,
+        description=description,
+        reference=reference,
+        amount=amount,
+        is_reconciled=False,
+    )
+
+
+class TestAutoMatchService:
+    """Tests for AutoMatchService.match_account."""
+
+    def test_ranks_by_reference_and_description(self, test_org, bank_account, contacts):
+        customer = contacts["customer"]
+        expected = _payment(
+            test_org, bank_account, customer, "RECEIVED", "RCP-00002",
+            Decimal("500.0000"), date(2024, 1, 15), reference="INV-00042",
+        )
+        _payment(
+            test_org, bank_account, customer, "RECEIVED", "RCP-00001",
+            Decimal("500.0000"), date(2024, 1, 14),
+        )
+        txn = _transaction(
+            test_org, bank_account, Decimal("500.0000"), date(2024, 1, 16),
+            "GIRO ACME TRADING INV-00042",
+        )
+
+        result = AutoMatchService.match_account(test_org.id, bank_account.id)
+
+        assert result["transactions"] == 1
+        matches = result["results"][0]["matches"]
+        assert result["results"][0]["transaction_id"] == str(txn.id)
+        assert [m["payment_id"] for m in matches][0] == str(expected.id)
+        assert matches[0]["score"] > matches[1]["score"]
+        assert matches[0]["contact"] == "Acme Trading Pte Ltd"
+
+    def test_direction_and_date_window(self, test_org, bank_account, contacts):
+        made = _payment(
+            test_org, bank_account, contacts["supplier"], "MADE", "PAY-00001",
+            Decimal("250.0000"), date(2024, 1, 10),
+        )
+        _payment(
+            test_org, bank_account, contacts["customer"], "RECEIVED", "RCP-00001",
+            Decimal("250.0000"), date(2024, 1, 10),
+        )
+        _payment(
+            test_org, bank_account, contacts["supplier"], "MADE", "PAY-00002",
+            Decimal("250.0000"), date(2024, 3, 1),
+        )
+        _transaction(
+            test_org, bank_account, Decimal("-250.0000"), date(2024, 1, 11), "HARBOUR LOGISTICS"
+        )
+
+        result = AutoMatchService.match_account(test_org.id, bank_account.id, date_window_days=7)
+
+        matches = result["results"][0]["matches"]
+        assert [m["payment_id"] for m in matches] == [str(made.id)]
+
+    def test_auto_reconcile_assigns_each_payment_once(
+        self, test_org, bank_account, contacts, test_user
+    ):
+        customer = contacts["customer"]
+        payment = _payment(
+            test_org, bank_account, customer, "RECEIVED", "RCP-00001",
+            Decimal("100.0000"), date(2024, 1, 15), reference="INV-00001",
+        )
+        best = _transaction(
+            test_org, bank_account, Decimal("100.0000"), date(2024, 1, 15),
+            "ACME TRADING INV-00001",
+        )
+        other = _transaction(
+            test_org, bank_account, Decimal("100.0000"), date(2024, 1, 18), "TRANSFER"
+        )
+
+        result = AutoMatchService.match_account(
+            test_org.id, bank_account.id, auto_reconcile=True, threshold=80,
+            user_id=test_user.id,
+        )
+
+        assert result["reconciled"] == 1
+        best.refresh_from_db()
+        other.refresh_from_db()
+        payment.refresh_from_db()
+        assert best.is_reconciled is True
+        assert best.matched_payment_id == payment.id
+        assert other.is_reconciled is False
+        assert payment.is_reconciled is True
+        assert AuditEventLog.objects.filter(
+            org_id=test_org.id, action="RECONCILE", entity_id=best.id
+        ).exists()
+
+    def test_below_threshold_not_reconciled(self, test_org, bank_account, contacts):
+        _payment(
+            test_org, bank_account, contacts["customer"], "RECEIVED", "RCP-00001",
+            Decimal("100.0000"), date(2024, 1, 10),
+        )
+        txn = _transaction(
+            test_org, bank_account, Decimal("99.5000"), date(2024, 1, 16), "TRANSFER"
+        )
+
+        result = AutoMatchService.match_account(
+            test_org.id, bank_account.id, auto_reconcile=True, threshold=90
+        )
+
+        assert result["matched"] == 1
+        assert result["reconciled"] == 0
+        txn.refresh_from_db()
+        assert txn.is_reconciled is False
+
+    def test_query_count_independent_of_statement_size(self, test_org, bank_account, contacts):
+        def seed(count, start):
+            for i in range(start, start + count):
+                day = date(2024, 1, 1) + timedelta(days=i % 28)
+                _payment(
+                    test_org, bank_account, contacts["customer"], "RECEIVED",
+                    f"RCP-{i:05d}", Decimal(100 + i), day,
+                )
+                _transaction(test_org, bank_account, Decimal(100 + i), day, f"RECEIPT {i}")
+
+        def run():
+            with CaptureQueriesContext(connection) as ctx:
+                result = AutoMatchService.match_account(test_org.id, bank_account.id)
+            return result, len(ctx.captured_queries)
+
+        seed(5, 0)
+        _, small = run()
+        seed(45, 5)
+        result, large = run()
+
+        assert large == small
+        assert result["matched"] == 50
+
+
+class TestSuggestMatches:
+    """ReconciliationService.suggest_matches uses the ranked matcher."""
+
+    def test_no_contact_query_per_candidate(self, test_org, bank_account, contacts):
+        for i in range(10):
+            _payment(
+                test_org, bank_account, contacts["customer"], "RECEIVED", f"RCP-{i:05d}",
+                Decimal("300.0000"), date(2024, 1, 10),
+            )
+        txn = _transaction(
+            test_org, bank_account, Decimal("300.0000"), date(2024, 1, 10), "RECEIPT"
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            suggestions = ReconciliationService.suggest_matches(test_org.id, txn.id)
+
+        assert len(suggestions) == 10
+        assert len(ctx.captured_queries) == 2
+        assert all(s["contact"] == "Acme Trading Pte Ltd" for s in suggestions)
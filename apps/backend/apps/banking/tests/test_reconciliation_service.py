@@ -12,6 +12,10 @@ import uuid
 from datetime import date
 from decimal import Decimal
 from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from io import BytesIO
 
 from apps.core.models import (
@@ -23,11 +27,13 @@ from apps.core.models import (
     Contact,
     BankAccount,
     BankTransaction,
+    CashPosition,
     Payment,
     FiscalYear,
     FiscalPeriod,
 )
-from apps.banking.services import ReconciliationService, PaymentService
+from apps.banking.services import ReconciliationService, PaymentService, CashPositionService
+from apps.banking.services import reconciliation_service
 from common.exceptions import ValidationError, ResourceNotFound
 
 
@@ -499,3 +505,209 @@ class TestReconciliationService:
             )
 
         assert "already reconciled" in str(exc_info.value).lower()
+
+
+def _statement(rows, start=0):
+    """Build a CSV statement with one 10.00 credit per row, three rows per day."""
+    lines = ["transaction_date,amount,description,reference"]
+    for i in range(start, start + rows):
+        lines.append(f"{date(2024, 1, 1 + (i // 3) % 28).isoformat()},10.00,Receipt {i},REF-{i}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class TestStreamingImport:
+    """Chunked, streaming CSV import."""
+
+    def test_chunked_import(self, monkeypatch, test_org, bank_account, test_user):
+        monkeypatch.setattr(reconciliation_service, "IMPORT_CHUNK_SIZE", 4)
+        monkeypatch.setattr(reconciliation_service, "IMPORT_READ_SIZE", 16)
+
+        result = ReconciliationService.import_csv(
+            org_id=test_org.id,
+            bank_account_id=bank_account.id,
+            csv_file=BytesIO(_statement(10)),
+            user_id=test_user.id,
+        )
+
+        assert result["imported"] == 10
+        assert [c["rows"] for c in result["chunks"]] == [4, 4, 2]
+        assert BankTransaction.objects.filter(bank_account=bank_account).count() == 10
+
+    def test_duplicates_in_file_and_database(self, monkeypatch, test_org, bank_account, test_user):
+        monkeypatch.setattr(reconciliation_service, "IMPORT_CHUNK_SIZE", 4)
+        ReconciliationService.import_csv(
+            org_id=test_org.id,
+            bank_account_id=bank_account.id,
+            csv_file=BytesIO(_statement(5)),
+            user_id=test_user.id,
+        )
+
+        # Rows 3-7 overlap the first import; row 7 is repeated within the file
+        csv_content = _statement(5, start=3) + b"2024-01-03,10.00,Receipt 7,REF-7\n"
+        result = ReconciliationService.import_csv(
+            org_id=test_org.id,
+            bank_account_id=bank_account.id,
+            csv_file=BytesIO(csv_content),
+            user_id=test_user.id,
+        )
+
+        assert result["imported"] == 3
+        assert result["skipped"] == 3
+        assert result["error_count"] == 0
+        assert BankTransaction.objects.filter(bank_account=bank_account).count() == 8
+
+    def test_failed_chunk_rows_not_treated_as_duplicates(
+        self, monkeypatch, test_org, bank_account, test_user
+    ):
+        monkeypatch.setattr(reconciliation_service, "IMPORT_CHUNK_SIZE", 4)
+        manager = type(BankTransaction.objects)
+        bulk_create = manager.bulk_create
+        calls = []
+
+        def fail_first_chunk(self, objs, *args, **kwargs):
+            calls.append(len(objs))
+            if len(calls) == 1:
+                raise RuntimeError("insert failed")
+            return bulk_create(self, objs, *args, **kwargs)
+
+        monkeypatch.setattr(manager, "bulk_create", fail_first_chunk)
+
+        # The second chunk repeats the first, whose insert fails
+        csv_content = _statement(4) + _statement(4).split(b"\n", 1)[1]
+        result = ReconciliationService.import_csv(
+            org_id=test_org.id,
+            bank_account_id=bank_account.id,
+            csv_file=BytesIO(csv_content),
+            user_id=test_user.id,
+        )
+
+        assert [c["imported"] for c in result["chunks"]] == [0, 4]
+        assert result["error_count"] == 4
+        assert BankTransaction.objects.filter(bank_account=bank_account).count() == 4
+
+    def test_invalid_rows_reported(self, test_org, bank_account, test_user):
+        csv_content = b"""transaction_date,amount,description
+2024-01-15,abc,Bad amount
+15-01-2024,10.00,Bad date
+2024-01-16,20.00,Good row
+"""
+        result = ReconciliationService.import_csv(
+            org_id=test_org.id,
+            bank_account_id=bank_account.id,
+            csv_file=BytesIO(csv_content),
+            user_id=test_user.id,
+        )
+
+        assert result["imported"] == 1
+        assert result["error_count"] == 2
+        assert result["errors"][0].startswith("Row 2: Invalid amount")
+        assert result["errors"][1].startswith("Row 3: Invalid date format")
+
+    def test_latin1_file(self, monkeypatch, test_org, bank_account, test_user):
+        monkeypatch.setattr(reconciliation_service, "IMPORT_READ_SIZE", 40)
+        csv_content = (
+            "transaction_date,amount,description\n"
+            "2024-01-15,10.00,Plain row\n"
+            "2024-01-16,20.00,Caf\u00e9 Ren\u00e9e\n"
+        ).encode("latin-1")
+
+        result = ReconciliationService.import_csv(
+            org_id=test_org.id,
+            bank_account_id=bank_account.id,
+            csv_file=BytesIO(csv_content),
+            user_id=test_user.id,
+        )
+
+        assert result["imported"] == 2
+        assert BankTransaction.objects.filter(description="Caf\u00e9 Ren\u00e9e").exists()
+
+    def test_query_count_per_chunk_is_constant(
+        self, monkeypatch, test_org, bank_account, test_user
+    ):
+        monkeypatch.setattr(reconciliation_service, "IMPORT_CHUNK_SIZE", 50)
+
+        def run(rows, start):
+            with CaptureQueriesContext(connection) as ctx:
+                ReconciliationService.import_csv(
+                    org_id=test_org.id,
+                    bank_account_id=bank_account.id,
+                    csv_file=BytesIO(_statement(rows, start=start)),
+                    user_id=test_user.id,
+                )
+            return len(ctx.captured_queries)
+
+        one_chunk = run(50, 0)
+        four_chunks = run(200, 1000)
+
+        # Each extra chunk costs at most a fingerprint preload and a bulk INSERT
+        # (plus savepoint statements), never a query per row
+        assert four_chunks - one_chunk <= 3 * 5
+
+
+class TestCashPosition:
+    """Cash positions follow payments and reconciliation."""
+
+    def _receive(self, org, bank_account, customer, user, amount):
+        return PaymentService.create_received(
+            org_id=org.id,
+            data={
+                "contact_id": customer.id,
+                "bank_account_id": bank_account.id,
+                "payment_date": date(2024, 1, 15),
+                "amount": amount,
+                "payment_method": "BANK_TRANSFER",
+            },
+            user_id=user.id,
+        )
+
+    def _position(self, org, bank_account):
+        return CashPositionService.get_positions(org.id, [bank_account.id])[bank_account.id]
+
+    def test_payments_and_void_update_balance(self, test_org, bank_account, customer, test_user):
+        self._receive(test_org, bank_account, customer, test_user, Decimal("300.00"))
+        voided = self._receive(test_org, bank_account, customer, test_user, Decimal("200.00"))
+
+        assert self._position(test_org, bank_account)["balance"] == Decimal("500.0000")
+
+        PaymentService.void(test_org.id, voided.id, "Duplicate", test_user.id)
+
+        position = self._position(test_org, bank_account)
+        assert position["balance"] == Decimal("300.0000")
+        assert position["reconciled_balance"] == Decimal("0.0000")
+        assert CashPositionService.verify(test_org.id) == []
+
+    def test_reconcile_and_unreconcile_update_reconciled_balance(
+        self, test_org, bank_account, customer, test_user
+    ):
+        payment = self._receive(test_org, bank_account, customer, test_user, Decimal("150.00"))
+        transaction = BankTransaction.objects.create(
+            org=test_org,
+            bank_account=bank_account,
+            transaction_date=date(2024, 1, 15),
+            description="Receipt",
+            amount=Decimal("150.0000"),
+            is_reconciled=False,
+        )
+
+        ReconciliationService.reconcile(test_org.id, transaction.id, payment.id, test_user.id)
+        assert self._position(test_org, bank_account)["reconciled_balance"] == Decimal("150.0000")
+
+        ReconciliationService.unreconcile(test_org.id, transaction.id, test_user.id)
+        assert self._position(test_org, bank_account)["reconciled_balance"] == Decimal("0.0000")
+        assert CashPositionService.verify(test_org.id) == []
+
+    def test_verify_command_detects_and_rebuild_repairs_drift(
+        self, test_org, bank_account, customer, test_user
+    ):
+        self._receive(test_org, bank_account, customer, test_user, Decimal("100.00"))
+        CashPosition.objects.filter(bank_account=bank_account).update(
+            received_total=Decimal("999.0000")
+        )
+
+        with pytest.raises(CommandError):
+            call_command("rebuild_cash_positions", "--verify", "--org", str(test_org.id))
+
+        call_command("rebuild_cash_positions", "--org", str(test_org.id))
+
+        assert CashPositionService.verify(test_org.id) == []
+        assert self._position(test_org, bank_account)["balance"] == Decimal("100.0000")
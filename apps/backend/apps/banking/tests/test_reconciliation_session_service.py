@@ -0,0 +1,251 @@
+"""
+Reconciliation Session Service Tests
+
+Tests for the statement-level reconciliation workspace and batch operations.
+Run with: pytest apps/banking/tests/test_reconciliation_session_service.py -v
+"""
+
+import pytest
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import (
+    AppUser,
+    AuditEventLog,
+    Organisation,
+    Account,
+    Contact,
+    BankAccount,
+    BankTransaction,
+    Payment,
+)
+from apps.banking.services import CashPositionService, ReconciliationSessionService
+from common.exceptions import ValidationError
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def test_user():
+    """Create and return a test user."""
+    user_id = uuid.uuid4()
+    return AppUser.objects.create(
+        id=user_id,
+        email=f"session_test_{user_id.hex[:8]}@example.com",
+        full_name="Reconciliation Session Test User",
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def test_org():
+    """Create organisation for testing."""
+    return Organisation.objects.create(
+        id=uuid.uuid4(),
+        name="Reconciliation Session Test Org",
+        legal_name="Reconciliation Session Test Org Pte Ltd",
+        uen="RECSESSION",
+        entity_type="PRIVATE_LIMITED",
+        gst_registered=False,
+        fy_start_month=1,
+        base_currency="SGD",
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def bank_account(test_org):
+    """Create a bank account."""
+    gl_account = Account.objects.create(
+        org=test_org,
+        code="1100",
+        name="DBS Bank Account",
+        account_type="ASSET",
+        is_active=True,
+        is_bank=True,
+    )
+    return BankAccount.objects.create(
+        org=test_org,
+        account_name="Main Operating Account",
+        bank_name="DBS Bank",
+        account_number="1234567890",
+        gl_account=gl_account,
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def customer(test_org):
+    """Create a customer contact."""
+    return Contact.objects.create(
+        org=test_org,
+        contact_type="CUSTOMER",
+        name="Acme Trading Pte Ltd",
+        is_customer=True,
+    )
+
+
+def _payment(org, bank_account, contact, number, amount, payment_date):
+    return Payment.objects.create(
+        org=org,
+        payment_type="RECEIVED",
+        payment_number=number,
+        payment_date=payment_date,
+        contact=contact,
+        bank_account=bank_account,
+        currency="SGD",
+        exchange_rate=Decimal("1.000000"),
+        amount=amount,
+        base_amount=amount,
+        is_voided=False,
+    )
+
+
+def _transaction(org, bank_account, amount, transaction_date, description):
+    return BankTransaction.objects.create(
+        org=org,
+        bank_account=bank_account,
+        transaction_date=transaction_date,
+        description=description,
+        amount=amount,
+        is_reconciled=False,
+    )
+
+
+def _seed(org, bank_account, contact, count, start=0):
+    pairs = []
+    for i in range(start, start + count):
+        day = date(2024, 1, 1) + timedelta(days=i % 28)
+        payment = _payment(org, bank_account, contact, f"RCP-{i:05d}", Decimal(100 + i), day)
+        txn = _transaction(org, bank_account, Decimal(100 + i), day, f"RECEIPT {i}")
+        pairs.append((txn, payment))
+    CashPositionService.rebuild(org.id)
+    return pairs
+
+
+class TestReconciliationSession:
+    """Tests for ReconciliationSessionService.get_session."""
+
+    def test_session_payload(self, test_org, bank_account, customer):
+        (txn, payment), (other_txn, _) = _seed(test_org, bank_account, customer, 2)
+
+        session = ReconciliationSessionService.get_session(
+            test_org.id, bank_account.id, date(2024, 1, 1), date(2024, 1, 31)
+        )
+
+        assert session["summary"]["transaction_count"] == 2
+        assert session["summary"]["suggested_count"] == 2
+        assert session["summary"]["statement_total"] == "201.0000"
+        rows = {row["id"]: row for row in session["transactions"]}
+        assert rows[str(txn.id)]["suggested_payment_id"] == str(payment.id)
+        suggested = {p["suggested_transaction_id"] for p in session["payments"]}
+        assert suggested == {str(txn.id), str(other_txn.id)}
+
+    def test_query_count_independent_of_statement_size(self, test_org, bank_account, customer):
+        def run():
+            with CaptureQueriesContext(connection) as ctx:
+                session = ReconciliationSessionService.get_session(test_org.id, bank_account.id)
+            return session, len(ctx.captured_queries)
+
+        _seed(test_org, bank_account, customer, 5)
+        _, small = run()
+        _seed(test_org, bank_account, customer, 45, start=5)
+        session, large = run()
+
+        assert large == small == 3
+        assert session["summary"]["suggested_count"] == 50
+
+    def test_invalid_window(self, test_org, bank_account):
+        with pytest.raises(ValidationError):
+            ReconciliationSessionService.get_session(
+                test_org.id, bank_account.id, date(2024, 2, 1), date(2024, 1, 1)
+            )
+
+
+class TestApplyOperations:
+    """Tests for ReconciliationSessionService.apply_operations."""
+
+    def test_batch_reconciles_with_one_audit_event(
+        self, test_org, bank_account, customer, test_user
+    ):
+        pairs = _seed(test_org, bank_account, customer, 3)
+
+        result = ReconciliationSessionService.apply_operations(
+            test_org.id,
+            bank_account.id,
+            [
+                {"action": "reconcile", "transaction_id": t.id, "payment_id": p.id}
+                for t, p in pairs
+            ],
+            user_id=test_user.id,
+        )
+
+        assert result == {"applied": 3, "reconciled": 3, "unreconciled": 0}
+        for txn, payment in pairs:
+            txn.refresh_from_db()
+            payment.refresh_from_db()
+            assert txn.is_reconciled is True
+            assert txn.matched_payment_id == payment.id
+            assert payment.is_reconciled is True
+        events = AuditEventLog.objects.filter(
+            org_id=test_org.id, action="RECONCILE", entity_id=bank_account.id
+        )
+        assert events.count() == 1
+        assert len(events.get().new_data["reconciled"]) == 3
+        position = CashPositionService.get_positions(test_org.id)[bank_account.id]
+        assert position["reconciled_balance"] == Decimal("303.0000")
+        assert CashPositionService.verify(test_org.id) == []
+
+    def test_invalid_operation_rolls_back_batch(self, test_org, bank_account, customer):
+        (txn, payment), (other_txn, _) = _seed(test_org, bank_account, customer, 2)
+
+        with pytest.raises(ValidationError, match="Operation 2"):
+            ReconciliationSessionService.apply_operations(
+                test_org.id,
+                bank_account.id,
+                [
+                    {"action": "reconcile", "transaction_id": txn.id, "payment_id": payment.id},
+                    {"action": "unreconcile", "transaction_id": other_txn.id},
+                ],
+            )
+
+        txn.refresh_from_db()
+        payment.refresh_from_db()
+        assert txn.is_reconciled is False
+        assert payment.is_reconciled is False
+        assert CashPositionService.verify(test_org.id) == []
+
+    def test_rematch_in_one_batch(self, test_org, bank_account, customer):
+        (txn, payment), (other_txn, other_payment) = _seed(
+            test_org, bank_account, customer, 2
+        )
+        ReconciliationSessionService.apply_operations(
+            test_org.id,
+            bank_account.id,
+            [{"action": "reconcile", "transaction_id": txn.id, "payment_id": other_payment.id}],
+        )
+
+        result = ReconciliationSessionService.apply_operations(
+            test_org.id,
+            bank_account.id,
+            [
+                {"action": "unreconcile", "transaction_id": txn.id},
+                {"action": "reconcile", "transaction_id": txn.id, "payment_id": payment.id},
+                {
+                    "action": "reconcile",
+                    "transaction_id": other_txn.id,
+                    "payment_id": other_payment.id,
+                },
+            ],
+        )
+
+        assert result == {"applied": 3, "reconciled": 2, "unreconciled": 1}
+        txn.refresh_from_db()
+        other_txn.refresh_from_db()
+        assert txn.matched_payment_id == payment.id
+        assert other_txn.matched_payment_id == other_payment.id
+        assert CashPositionService.verify(test_org.id) == []
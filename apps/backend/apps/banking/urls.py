@@ -21,6 +21,8 @@ from .views import (
     BankTransactionReconcileView,
     BankTransactionUnreconcileView,
     BankTransactionSuggestMatchesView,
+    BankTransactionAutoMatchView,
+    BankAccountReconciliationView,
 )
 
 app_name = "banking"
@@ -33,6 +35,11 @@ urlpatterns = [
         BankAccountDetailView.as_view(),
         name="bank-account-detail",
     ),
+    path(
+        "bank-accounts/<str:account_id>/reconciliation/",
+        BankAccountReconciliationView.as_view(),
+        name="bank-account-reconciliation",
+    ),
     # Payments
     path("payments/", PaymentListView.as_view(), name="payment-list"),
     path("payments/receive/", ReceivePaymentView.as_view(), name="payment-receive"),
@@ -63,6 +70,11 @@ urlpatterns = [
         BankTransactionImportView.as_view(),
         name="bank-transaction-import",
     ),
+    path(
+        "bank-transactions/auto-match/",
+        BankTransactionAutoMatchView.as_view(),
+        name="bank-transaction-auto-match",
+    ),
     path(
         "bank-transactions/<str:transaction_id>/reconcile/",
         BankTransactionReconcileView.as_view(),
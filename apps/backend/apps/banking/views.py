@@ -28,8 +28,17 @@ from apps.banking.serializers import (
     BankTransactionSerializer,
     BankTransactionImportSerializer,
     BankTransactionReconcileSerializer,
+    BankTransactionAutoMatchSerializer,
+    ReconciliationSessionQuerySerializer,
+    ReconciliationBatchSerializer,
+)
+from apps.banking.services import (
+    AutoMatchService,
+    BankAccountService,
+    PaymentService,
+    ReconciliationService,
+    ReconciliationSessionService,
 )
-from apps.banking.services import BankAccountService, PaymentService, ReconciliationService
 from common.views import wrap_response
 from common.exceptions import ValidationError as AppValidationError
 
@@ -604,3 +613,94 @@ class BankTransactionSuggestMatchesView(APIView):
         )
 
         return Response({"results": suggestions, "count": len(suggestions)})
+
+
+class BankTransactionAutoMatchView(APIView):
+    """
+    POST: Match all unreconciled transactions of a bank account.
+
+    Returns ranked payment matches per transaction; with auto_reconcile,
+    matches at or above the threshold are reconciled.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember]
+
+    @wrap_response
+    def post(self, request, org_id: str) -> Response:
+        """Run the batch matcher for a bank account."""
+        serializer = BankTransactionAutoMatchSerializer(
+            data=request.data,
+            context={"org_id": org_id},
+        )
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if data["auto_reconcile"] and not CanManageBanking().has_permission(request, self):
+            return Response(
+                {"error": "You do not have permission to reconcile transactions."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        result = AutoMatchService.match_account(
+            org_id=org_id,
+            bank_account_id=data["bank_account_id"],
+            tolerance=data["tolerance"],
+            date_window_days=data["date_window_days"],
+            auto_reconcile=data["auto_reconcile"],
+            threshold=data["threshold"],
+            user_id=request.user.id if request.user else None,
+        )
+
+        return Response(result)
+
+
+class BankAccountReconciliationView(APIView):
+    """
+    GET: Reconciliation workspace for a statement window.
+    POST: Apply a batch of reconcile/unreconcile operations atomically.
+
+    Replaces one reconcile and one suggest-matches request per statement line.
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember]
+
+    @wrap_response
+    def get(self, request, org_id: str, account_id: str) -> Response:
+        """Return transactions, candidate payments and suggested pairings."""
+        serializer = ReconciliationSessionQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        session = ReconciliationSessionService.get_session(
+            org_id=org_id,
+            bank_account_id=UUID(account_id),
+            date_from=params.get("date_from"),
+            date_to=params.get("date_to"),
+            tolerance=params["tolerance"],
+            date_window_days=params["date_window_days"],
+        )
+
+        return Response(session)
+
+    @wrap_response
+    def post(self, request, org_id: str, account_id: str) -> Response:
+        """Apply reconcile/unreconcile operations in one transaction."""
+        if not CanManageBanking().has_permission(request, self):
+            return Response(
+                {"error": "You do not have permission to reconcile transactions."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = ReconciliationBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = ReconciliationSessionService.apply_operations(
+            org_id=org_id,
+            bank_account_id=UUID(account_id),
+            operations=serializer.validated_data["operations"],
+            user_id=request.user.id if request.user else None,
+        )
+
+        return Response(result)
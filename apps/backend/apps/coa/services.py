@@ -11,17 +11,24 @@ Business logic for account management including:
 """
 
 from typing import Optional, List, Dict, Any
+from datetime import date
 from decimal import Decimal
 from uuid import UUID
 
-from django.db import connection
 from django.core.cache import cache
+from django.db import transaction
 
 from apps.core.models import Account
+from apps.journal.services.balance_snapshot_service import BalanceSnapshotService
+from apps.journal.services.ledger_version_service import LedgerVersionService
+from apps.journal.services.posting_account_service import PostingAccountService
+from apps.journal.services.trial_balance_service import TrialBalanceService
 from common.exceptions import ValidationError, DuplicateResource, ResourceNotFound
-from common.decimal_utils import money
 
 
+# Balances are keyed by ledger version, so the TTL only bounds memory use
+ACCOUNT_BALANCE_CACHE_TIMEOUT = 86400
+
 # Account type groups for financial statements
 ACCOUNT_TYPE_GROUPS = {
     # Assets (1xxx)
@@ -242,6 +249,9 @@ class AccountService:
             **kwargs
         )
         
+        # A new account can become a posting target
+        transaction.on_commit(lambda: PostingAccountService.invalidate(org_id))
+        
         return account
     
     @staticmethod
@@ -304,8 +314,9 @@ class AccountService:
         
         account.save()
         
-        # Clear balance cache
-        cache.delete(f"account_balance:{account_id}")
+        # Clear posting account cache once committed, so no process reloads
+        # the old row in between (balances are keyed by ledger version)
+        transaction.on_commit(lambda: PostingAccountService.invalidate(org_id))
         
         return account
     
@@ -347,6 +358,9 @@ class AccountService:
         account.is_active = False
         account.save()
         
+        # Archived accounts are no longer posting targets
+        transaction.on_commit(lambda: PostingAccountService.invalidate(org_id))
+        
         return account
     
     @staticmethod
@@ -354,7 +368,7 @@ class AccountService:
         """
         Get current balance for an account.
         
-        Uses database view account_balance with caching.
+        Reads the per-period balance snapshots, cached per ledger version.
         
         Args:
             org_id: Organisation ID
@@ -364,29 +378,15 @@ class AccountService:
             Account balance as Decimal
         """
         # Check cache first
-        cache_key = f"account_balance:{account_id}"
+        version = LedgerVersionService.get(org_id)
+        cache_key = f"account_balance:{org_id}:v{version}:{account_id}"
         cached = cache.get(cache_key)
         if cached is not None:
             return Decimal(cached)
         
-        # Query database view
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT total_debit, total_credit, balance
-                FROM coa.account_balance
-                WHERE account_id = %s
-                """,
-                [str(account_id)]
-            )
-            row = cursor.fetchone()
-            if row:
-                balance = money(row[2])  # balance column
-                # Cache for 5 minutes
-                cache.set(cache_key, str(balance), 300)
-                return balance
-        
-        return Decimal("0.0000")
+        balance = BalanceSnapshotService.get_account_balance(org_id, account_id)
+        cache.set(cache_key, str(balance), ACCOUNT_BALANCE_CACHE_TIMEOUT)
+        return balance
     
     @staticmethod
     def get_account_hierarchy(org_id: UUID, account_type: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -446,46 +446,30 @@ class AccountService:
         }
     
     @staticmethod
-    def get_trial_balance(org_id: UUID, fiscal_year_id: Optional[UUID] = None) -> List[Dict[str, Any]]:
+    def get_trial_balance(
+        org_id: UUID,
+        fiscal_year_id: Optional[UUID] = None,
+        fiscal_period_id: Optional[UUID] = None,
+        date_to: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Get trial balance for organisation.
         
         Args:
             org_id: Organisation ID
             fiscal_year_id: Optional fiscal year filter
+            fiscal_period_id: Optional fiscal period filter
+            date_to: Optional as-of date
             
         Returns:
             List of account balances
         """
-        with connection.cursor() as cursor:
-            query = """
-                SELECT 
-                    a.id,
-                    a.code,
-                    a.name,
-                    a.account_type,
-                    COALESCE(ab.total_debit, 0) as total_debit,
-                    COALESCE(ab.total_credit, 0) as total_credit,
-                    COALESCE(ab.balance, 0) as balance
-                FROM coa.account a
-                LEFT JOIN coa.account_balance ab ON ab.account_id = a.id
-                WHERE a.org_id = %s AND a.is_active = true
-            """
-            params = [str(org_id)]
-            
-            if fiscal_year_id:
-                query += " AND ab.fiscal_year_id = %s"
-                params.append(str(fiscal_year_id))
-            
-            query += " ORDER BY a.code"
-            
-            cursor.execute(query, params)
-            
-            columns = [col[0] for col in cursor.description]
-            return [
-                dict(zip(columns, row))
-                for row in cursor.fetchall()
-            ]
+        return TrialBalanceService.compute(
+            org_id=org_id,
+            date_to=date_to,
+            fiscal_year_id=fiscal_year_id,
+            fiscal_period_id=fiscal_period_id,
+        )
 
 
 # Import models at end to avoid circular imports
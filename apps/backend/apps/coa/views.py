@@ -257,11 +257,26 @@ class TrialBalanceView(APIView):
         """Get trial balance."""
         from uuid import UUID
 
+        from datetime import date
+
         fiscal_year_id = request.query_params.get("fiscal_year_id")
         if fiscal_year_id:
             fiscal_year_id = UUID(fiscal_year_id)
 
-        trial_balance = AccountService.get_trial_balance(org_id, fiscal_year_id=fiscal_year_id)
+        fiscal_period_id = request.query_params.get("fiscal_period_id")
+        if fiscal_period_id:
+            fiscal_period_id = UUID(fiscal_period_id)
+
+        date_to = request.query_params.get("date_to")
+        if date_to:
+            date_to = date.fromisoformat(date_to)
+
+        trial_balance = AccountService.get_trial_balance(
+            org_id,
+            fiscal_year_id=fiscal_year_id,
+            fiscal_period_id=fiscal_period_id,
+            date_to=date_to,
+        )
 
         # Calculate totals
         total_debit = sum(row["total_debit"] for row in trial_balance)
@@ -10,6 +10,7 @@ from .fiscal_year import FiscalYear
 from .fiscal_period import FiscalPeriod
 from .tax_code import TaxCode
 from .gst_return import GSTReturn
+from .gst_return_box_document import GSTReturnBoxDocument
 from .account import Account
 from .account_type import AccountType
 from .account_sub_type import AccountSubType
@@ -18,6 +19,8 @@ from .invoice_document import InvoiceDocument
 from .invoice_line import InvoiceLine
 from .journal_entry import JournalEntry
 from .journal_line import JournalLine
+from .account_period_balance import AccountPeriodBalance
+from .ledger_version import LedgerVersion
 from .bank_account import BankAccount
 from .payment import Payment
 from .payment_allocation import PaymentAllocation
@@ -27,6 +30,7 @@ from .audit_event_log import AuditEventLog
 from .exchange_rate import ExchangeRate
 from .organisation_setting import OrganisationSetting
 from .bank_transaction import BankTransaction
+from .cash_position import CashPosition
 
 __all__ = [
     "AppUser",
@@ -37,6 +41,7 @@ __all__ = [
     "FiscalPeriod",
     "TaxCode",
     "GSTReturn",
+    "GSTReturnBoxDocument",
     "Account",
     "AccountType",
     "AccountSubType",
@@ -45,6 +50,8 @@ __all__ = [
     "InvoiceLine",
     "JournalEntry",
     "JournalLine",
+    "AccountPeriodBalance",
+    "LedgerVersion",
     "BankAccount",
     "Payment",
     "PaymentAllocation",
@@ -54,4 +61,5 @@ __all__ = [
     "OrganisationSetting",
     "AuditEventLog",
     "BankTransaction",
+    "CashPosition",
 ]
@@ -0,0 +1,47 @@
+"""
+AccountPeriodBalance model for LedgerSG.
+
+Maps to journal.account_period_balance table.
+
+Running debit/credit totals per (org, account, fiscal period), maintained
+incrementally at posting time by BalanceSnapshotService.
+"""
+
+from django.db import models
+from uuid import uuid4
+
+
+class AccountPeriodBalance(models.Model):
+    """Per-period running totals for a GL account."""
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid4,
+        editable=False,
+        db_column="id",
+    )
+    org = models.ForeignKey("Organisation", on_delete=models.CASCADE, db_column="org_id")
+    account = models.ForeignKey(
+        "Account", on_delete=models.CASCADE, db_column="account_id", related_name="period_balances"
+    )
+    fiscal_period = models.ForeignKey(
+        "FiscalPeriod", on_delete=models.CASCADE, db_column="fiscal_period_id"
+    )
+
+    period_start = models.DateField(db_column="period_start")
+    period_end = models.DateField(db_column="period_end")
+
+    debit_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="debit_total"
+    )
+    credit_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="credit_total"
+    )
+    line_count = models.IntegerField(default=0, db_column="line_count")
+
+    updated_at = models.DateTimeField(auto_now=True, db_column="updated_at")
+
+    class Meta:
+        managed = False
+        db_table = 'journal"."account_period_balance'
+        unique_together = [["org", "account", "fiscal_period"]]
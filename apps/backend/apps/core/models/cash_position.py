@@ -0,0 +1,65 @@
+"""
+CashPosition model for LedgerSG.
+
+Maps to banking.cash_position table.
+
+Running payment totals per bank account, maintained transactionally by
+CashPositionService when payments are created, voided or reconciled.
+"""
+
+from decimal import Decimal
+from django.db import models
+from uuid import uuid4
+
+
+class CashPosition(models.Model):
+    """Running payment totals for a bank account."""
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid4,
+        editable=False,
+        db_column="id",
+    )
+    org = models.ForeignKey("Organisation", on_delete=models.CASCADE, db_column="org_id")
+    bank_account = models.OneToOneField(
+        "BankAccount",
+        on_delete=models.CASCADE,
+        db_column="bank_account_id",
+        related_name="cash_position",
+    )
+
+    received_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="received_total"
+    )
+    made_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="made_total"
+    )
+    base_received_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="base_received_total"
+    )
+    base_made_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="base_made_total"
+    )
+    reconciled_received_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="reconciled_received_total"
+    )
+    reconciled_made_total = models.DecimalField(
+        max_digits=19, decimal_places=4, default=0, db_column="reconciled_made_total"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True, db_column="updated_at")
+
+    class Meta:
+        managed = False
+        db_table = 'banking"."cash_position'
+
+    @property
+    def net_movement(self) -> Decimal:
+        """Received minus made, in the bank account currency."""
+        return self.received_total - self.made_total
+
+    @property
+    def reconciled_movement(self) -> Decimal:
+        """Reconciled received minus reconciled made."""
+        return self.reconciled_received_total - self.reconciled_made_total
@@ -0,0 +1,37 @@
+"""
+GSTReturnBoxDocument model for LedgerSG.
+
+Maps to gst.return_box_document table.
+
+F5 drill-down index: the contribution of one document to one box of a
+GST return, written by F5ComputationService.
+"""
+
+from django.db import models
+from uuid import uuid4
+
+
+class GSTReturnBoxDocument(models.Model):
+    """Contribution of a document to an F5 box."""
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid4,
+        editable=False,
+        db_column="id",
+    )
+    org = models.ForeignKey("Organisation", on_delete=models.CASCADE, db_column="org_id")
+    gst_return = models.ForeignKey(
+        "GSTReturn", on_delete=models.CASCADE, db_column="return_id", related_name="box_documents"
+    )
+    box = models.SmallIntegerField(db_column="box")
+    document = models.ForeignKey(
+        "InvoiceDocument", on_delete=models.CASCADE, db_column="document_id"
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=4, db_column="amount")
+    line_count = models.IntegerField(db_column="line_count")
+
+    class Meta:
+        managed = False
+        db_table = 'gst"."return_box_document'
+        unique_together = [["gst_return", "box", "document"]]
@@ -0,0 +1,28 @@
+"""
+LedgerVersion model for LedgerSG.
+
+Maps to journal.ledger_version table.
+
+Per-organisation change counter, bumped by LedgerVersionService in the
+same transaction as every journal posting, payment and reconciliation.
+"""
+
+from django.db import models
+
+
+class LedgerVersion(models.Model):
+    """Ledger change counter for an organisation."""
+
+    org = models.OneToOneField(
+        "Organisation",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        db_column="org_id",
+        related_name="ledger_version",
+    )
+    version = models.BigIntegerField(default=0, db_column="version")
+    updated_at = models.DateTimeField(auto_now=True, db_column="updated_at")
+
+    class Meta:
+        managed = False
+        db_table = 'journal"."ledger_version'
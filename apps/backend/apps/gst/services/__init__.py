@@ -7,6 +7,7 @@ Business logic services for GST tax codes, calculations, and returns.
 from .tax_code_service import TaxCodeService, IRAS_TAX_CODES
 from .calculation_service import GSTCalculationService, calculate_gst_summary
 from .return_service import GSTReturnService
+from .f5_service import F5ComputationService
 
 __all__ = [
     "TaxCodeService",
@@ -14,4 +15,5 @@ __all__ = [
     "GSTCalculationService",
     "calculate_gst_summary",
     "GSTReturnService",
+    "F5ComputationService",
 ]
@@ -11,6 +11,7 @@ Handles all GST calculations including:
 from typing import Optional, List, Dict, Any, Tuple
 from decimal import Decimal, ROUND_HALF_UP
 from uuid import UUID
+from datetime import date
 
 from common.decimal_utils import money
 
@@ -208,7 +209,8 @@ class GSTCalculationService:
         """
         Calculate F5 form box amounts for a period.
         
-        This queries the database for aggregated amounts by tax code.
+        Delegates to the set-based F5 engine; nothing is stored beyond
+        the ledger-version-keyed preview cache (ReportCache).
         
         Args:
             org_id: Organisation ID
@@ -216,95 +218,26 @@ class GSTCalculationService:
             period_end: Period end date (YYYY-MM-DD)
             
         Returns:
-            F5 box amounts dictionary
+            F5 box amounts dictionary ("box1" .. "box14")
         """
-        from django.db import connection
+        from apps.gst.services.f5_service import F5ComputationService
+        from apps.reporting.services.report_cache import ReportCache
         
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                SELECT 
-                    tc.code as tax_code,
-                    tc.box_mapping,
-                    SUM(il.amount) as total_amount,
-                    SUM(il.gst_amount) as total_gst,
-                    COUNT(*) as line_count
-                FROM invoicing.invoice_line il
-                JOIN invoicing.invoice i ON i.id = il.invoice_id
-                JOIN gst.tax_code tc ON tc.id = il.tax_code_id
-                WHERE i.org_id = %s
-                    AND i.document_date BETWEEN %s AND %s
-                    AND i.status IN ('APPROVED', 'SENT', 'PAID_PARTIAL', 'PAID')
-                    AND NOT il.is_voided
-                GROUP BY tc.code, tc.box_mapping
-                """,
-                [str(org_id), period_start, period_end]
+        def compute() -> Dict[str, Any]:
+            boxes = F5ComputationService.aggregate(
+                org_id,
+                date.fromisoformat(period_start),
+                date.fromisoformat(period_end),
             )
-            
-            results = cursor.fetchall()
-        
-        # Initialize all boxes
-        boxes = {
-            # Output tax boxes
-            "box1": Decimal("0.00"),  # Standard-rated supplies
-            "box2": Decimal("0.00"),  # Zero-rated supplies
-            "box3": Decimal("0.00"),  # Exempt supplies
-            "box4": Decimal("0.00"),  # Total supplies (1+2+3)
-            "box5": Decimal("0.00"),  # Output tax due
-            
-            # Input tax boxes
-            "box6": Decimal("0.00"),  # Taxable purchases
-            "box7": Decimal("0.00"),  # Input tax claims
-            "box8": Decimal("0.00"),  # Net GST (5-7)
-            
-            # Additional boxes
-            "box9": Decimal("0.00"),  # Goods imported
-            "box10": Decimal("0.00"),  # GST on imports under MG/IGDS
-            "box11": Decimal("0.00"),  # Service imports (reverse charge)
-            "box12": Decimal("0.00"),  # Output tax on reverse charge
-            "box13": Decimal("0.00"),  # Revenue
-            "box14": Decimal("0.00"),  # Exempt supplies (repeat)
-        }
-        
-        # Aggregate by box mapping
-        for row in results:
-            tax_code, box_mapping, amount, gst_amount, count = row
-            amount = Decimal(str(amount or 0))
-            gst_amount = Decimal(str(gst_amount or 0))
-            
-            if box_mapping and box_mapping in boxes:
-                if tax_code in ["SR", "ME"]:
-                    # Standard-rated: add to Box 1 and Box 5
-                    boxes["box1"] += amount
-                    boxes["box5"] += gst_amount
-                    boxes["box13"] += amount
-                elif tax_code == "ZR":
-                    # Zero-rated: Box 2
-                    boxes["box2"] += amount
-                    boxes["box13"] += amount
-                elif tax_code == "ES":
-                    # Exempt: Box 3 and 14
-                    boxes["box3"] += amount
-                    boxes["box14"] += amount
-                    boxes["box13"] += amount
-                elif tax_code == "IM":
-                    # Import: Box 9
-                    boxes["box9"] += amount
-                elif tax_code == "TX-E33":
-                    # Purchase with GST: Box 6 and 7
-                    boxes["box6"] += amount
-                    boxes["box7"] += gst_amount
-        
-        # Calculate derived boxes
-        boxes["box4"] = boxes["box1"] + boxes["box2"] + boxes["box3"]
-        boxes["box8"] = boxes["box5"] - boxes["box7"]
+            # Format for output
+            return {
+                f"box{box}": str(value.quantize(Decimal("0.01")))
+                for box, value in sorted(boxes.items())
+            }
         
-        # Format for output
-        return {
-            box: str(value.quantize(Decimal("0.01")))
-            for box, value in boxes.items()
-        }
-
+        return ReportCache.get_or_compute(
+            org_id, "f5_preview", [period_start, period_end], compute
+        )
 
 def calculate_gst_summary(
     net_amount: Decimal,
@@ -0,0 +1,282 @@
+"""
+F5 computation engine for LedgerSG.
+
+Computes GST F5 boxes in a single set-based pass over
+invoicing.document_line, classifying each line by its tax code's F5
+columns (f5_supply_box, f5_purchase_box, f5_tax_box). Semantics mirror
+gst.compute_f5_return: BCRS deposit lines are excluded, credit notes
+reduce boxes 1-3, 5-7 and 13, and boxes 4 and 8 are derived.
+
+Every computation also writes the drill-down index
+(gst.return_box_document): one row per box and contributing document.
+Box totals are sums over the index, so recomputing a DRAFT return only
+reprocesses documents not yet indexed or no longer eligible.
+"""
+
+from typing import Dict, List, Any, Optional
+from decimal import Decimal
+from datetime import date
+from uuid import UUID
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.models import GSTReturn, GSTReturnBoxDocument
+from common.exceptions import ValidationError
+
+
+# Boxes populated from document lines; 4 and 8 are derived, 10-12 and 15
+# are entered manually.
+COMPUTED_BOXES = (1, 2, 3, 5, 6, 7, 9, 13, 14)
+
+# box number -> gst.return field
+BOX_FIELDS = {
+    1: "box1_std_rated_supplies",
+    2: "box2_zero_rated_supplies",
+    3: "box3_exempt_supplies",
+    4: "box4_total_supplies",
+    5: "box5_total_taxable_purchases",
+    6: "box6_output_tax",
+    7: "box7_input_tax_claimable",
+    8: "box8_net_gst",
+    9: "box9_imports_under_schemes",
+    13: "box13_total_revenue",
+    14: "box14_reverse_charge_supplies",
+}
+
+# (box, document_id, amount, line_count) for every eligible line in the
+# period, fanned out to each box it contributes to.
+_CONTRIBUTIONS_SQL = """
+    SELECT b.box, d.id, SUM(b.amount), COUNT(*)
+    FROM invoicing.document d
+    JOIN invoicing.document_line dl ON dl.document_id = d.id
+    LEFT JOIN gst.tax_code tc ON tc.id = dl.tax_code_id
+    CROSS JOIN LATERAL (
+        SELECT
+            CASE WHEN d.document_type IN ('SALES_CREDIT_NOTE', 'PURCHASE_CREDIT_NOTE')
+                THEN -1 ELSE 1 END AS sign,
+            d.document_type IN ('SALES_INVOICE', 'SALES_DEBIT_NOTE', 'SALES_CREDIT_NOTE')
+                AS is_sale,
+            d.document_type IN ('PURCHASE_INVOICE', 'PURCHASE_DEBIT_NOTE', 'PURCHASE_CREDIT_NOTE')
+                AS is_purchase
+    ) k
+    CROSS JOIN LATERAL (VALUES
+        (1, CASE WHEN k.is_sale AND tc.f5_supply_box = 1 THEN k.sign * dl.base_line_amount END),
+        (2, CASE WHEN k.is_sale AND tc.f5_supply_box = 2 THEN k.sign * dl.base_line_amount END),
+        (3, CASE WHEN k.is_sale AND tc.f5_supply_box = 3 THEN k.sign * dl.base_line_amount END),
+        (5, CASE WHEN k.is_purchase AND tc.f5_purchase_box = 5
+            THEN k.sign * dl.base_line_amount END),
+        (6, CASE WHEN k.is_sale AND tc.f5_tax_box = 6 THEN k.sign * dl.base_gst_amount END),
+        (7, CASE WHEN k.is_purchase AND tc.f5_tax_box = 7 AND tc.is_claimable
+            THEN k.sign * dl.base_gst_amount END),
+        (9, CASE WHEN d.document_type IN ('PURCHASE_INVOICE', 'PURCHASE_DEBIT_NOTE')
+            AND tc.code = 'ZP' THEN dl.base_line_amount END),
+        (13, CASE WHEN k.is_sale THEN k.sign * dl.base_line_amount END),
+        (14, CASE WHEN tc.is_reverse_charge THEN dl.base_line_amount END)
+    ) AS b(box, amount)
+    WHERE d.org_id = %(org_id)s
+        AND d.document_date BETWEEN %(period_start)s AND %(period_end)s
+        AND d.status NOT IN ('DRAFT', 'VOID')
+        AND dl.is_bcrs_deposit = FALSE
+        AND b.amount IS NOT NULL
+        {document_filter}
+    GROUP BY b.box, d.id
+"""
+
+# Documents whose contribution may have changed since the last run:
+# eligible but not yet indexed, or indexed but no longer eligible (voided,
+# reverted or moved out of the period). The index itself is the watermark:
+# a timestamp would miss approvals that commit after a run's snapshot but
+# carry an earlier approved_at.
+_STALE_DOCUMENTS_SQL = """
+    SELECT d.id
+    FROM invoicing.document d
+    WHERE d.org_id = %(org_id)s
+        AND d.document_date BETWEEN %(period_start)s AND %(period_end)s
+        AND d.status NOT IN ('DRAFT', 'VOID')
+        AND NOT EXISTS (
+            SELECT 1 FROM gst.return_box_document r
+            WHERE r.return_id = %(return_id)s AND r.document_id = d.id
+        )
+    UNION
+    SELECT r.document_id
+    FROM gst.return_box_document r
+    JOIN invoicing.document d ON d.id = r.document_id
+    WHERE r.return_id = %(return_id)s
+        AND (
+            d.status IN ('DRAFT', 'VOID')
+            OR d.document_date NOT BETWEEN %(period_start)s AND %(period_end)s
+        )
+"""
+
+
+class F5ComputationService:
+    """Set-based F5 box computation with per-box drill-down."""
+
+    @staticmethod
+    def aggregate(org_id: UUID, period_start: date, period_end: date) -> Dict[int, Decimal]:
+        """
+        Compute F5 box totals for a period without storing anything.
+
+        Args:
+            org_id: Organisation ID
+            period_start: Period start date
+            period_end: Period end date
+
+        Returns:
+            Mapping of box number -> amount, including derived boxes 4 and 8
+        """
+        sql = "SELECT box, SUM(amount) FROM ({contributions}) c(box, document_id, amount, n) GROUP BY box".format(
+            contributions=_CONTRIBUTIONS_SQL.format(document_filter="")
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql,
+                {
+                    "org_id": str(org_id),
+                    "period_start": period_start,
+                    "period_end": period_end,
+                },
+            )
+            rows = cursor.fetchall()
+
+        return F5ComputationService._with_derived_boxes(dict(rows))
+
+    @staticmethod
+    def compute(org_id: UUID, gst_return: GSTReturn, full: bool = False) -> GSTReturn:
+        """
+        Compute a return's F5 boxes and refresh its drill-down index.
+
+        A DRAFT return that has been computed before is recomputed
+        incrementally; otherwise (or when `full` is set) the index is
+        rebuilt from scratch.
+
+        Args:
+            org_id: Organisation ID
+            gst_return: GSTReturn to compute
+            full: Rebuild the whole index instead of reprocessing stale documents
+
+        Returns:
+            Updated GSTReturn instance
+        """
+        with transaction.atomic():
+            gst_return = GSTReturn.objects.select_for_update().get(
+                id=gst_return.id, org_id=org_id
+            )
+
+            params = {
+                "org_id": str(org_id),
+                "return_id": str(gst_return.id),
+                "period_start": gst_return.period_start,
+                "period_end": gst_return.period_end,
+            }
+            incremental = (
+                not full and gst_return.status == "DRAFT" and gst_return.computed_at is not None
+            )
+
+            with connection.cursor() as cursor:
+                if incremental:
+                    cursor.execute(_STALE_DOCUMENTS_SQL, params)
+                    stale_ids = [str(row[0]) for row in cursor.fetchall()]
+                    if stale_ids:
+                        params["document_ids"] = stale_ids
+                        cursor.execute(
+                            """
+                            DELETE FROM gst.return_box_document
+                            WHERE return_id = %(return_id)s
+                                AND document_id = ANY(%(document_ids)s::uuid[])
+                            """,
+                            params,
+                        )
+                        F5ComputationService._insert_contributions(
+                            cursor, params, "AND d.id = ANY(%(document_ids)s::uuid[])"
+                        )
+                else:
+                    cursor.execute(
+                        "DELETE FROM gst.return_box_document WHERE return_id = %(return_id)s",
+                        params,
+                    )
+                    F5ComputationService._insert_contributions(cursor, params, "")
+
+                cursor.execute(
+                    """
+                    SELECT box, SUM(amount)
+                    FROM gst.return_box_document
+                    WHERE return_id = %(return_id)s
+                    GROUP BY box
+                    """,
+                    params,
+                )
+                boxes = F5ComputationService._with_derived_boxes(dict(cursor.fetchall()))
+
+            for box, field in BOX_FIELDS.items():
+                setattr(gst_return, field, boxes[box])
+            gst_return.computed_at = timezone.now()
+            gst_return.save(update_fields=[*BOX_FIELDS.values(), "computed_at"])
+
+        return gst_return
+
+    @staticmethod
+    def get_box_documents(org_id: UUID, return_id: UUID, box: int) -> List[Dict[str, Any]]:
+        """
+        Get the documents contributing to one box of a computed return.
+
+        Args:
+            org_id: Organisation ID
+            return_id: GST return ID
+            box: F5 box number (derived boxes 4 and 8 are not indexed)
+
+        Returns:
+            List of contribution dictionaries ordered by document date
+
+        Raises:
+            ValidationError: If the box is derived or not computed
+        """
+        if box not in COMPUTED_BOXES:
+            raise ValidationError(
+                f"Box {box} has no drill-down. "
+                f"Available boxes: {', '.join(str(b) for b in COMPUTED_BOXES)}"
+            )
+
+        rows = (
+            GSTReturnBoxDocument.objects.filter(org_id=org_id, gst_return_id=return_id, box=box)
+            .select_related("document__contact")
+            .order_by("document__issue_date", "document__document_number")
+        )
+
+        return [
+            {
+                "document_id": str(row.document_id),
+                "document_number": row.document.document_number,
+                "document_type": row.document.document_type,
+                "document_date": row.document.issue_date.isoformat(),
+                "contact_name": row.document.contact.name if row.document.contact else None,
+                "amount": str(row.amount),
+                "line_count": row.line_count,
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _insert_contributions(cursor, params: Dict[str, Any], document_filter: str) -> None:
+        """Write index rows for the eligible documents matching `document_filter`."""
+        cursor.execute(
+            """
+            INSERT INTO gst.return_box_document
+                (org_id, return_id, box, document_id, amount, line_count)
+            SELECT %(org_id)s, %(return_id)s, c.box, c.document_id, c.amount, c.line_count
+            FROM ({contributions}) c(box, document_id, amount, line_count)
+            """.format(
+                contributions=_CONTRIBUTIONS_SQL.format(document_filter=document_filter)
+            ),
+            params,
+        )
+
+    @staticmethod
+    def _with_derived_boxes(totals: Dict[int, Optional[Decimal]]) -> Dict[int, Decimal]:
+        """Fill missing computed boxes with zero and add boxes 4 and 8."""
+        boxes = {box: Decimal(str(totals.get(box) or 0)) for box in COMPUTED_BOXES}
+        boxes[4] = boxes[1] + boxes[2] + boxes[3]
+        boxes[8] = boxes[6] - boxes[7]
+        return boxes
@@ -13,7 +13,7 @@ from calendar import monthrange
 from django.db import connection, transaction
 
 from apps.core.models import GSTReturn, FiscalPeriod
-from apps.gst.services.calculation_service import GSTCalculationService
+from apps.gst.services.f5_service import F5ComputationService
 from common.exceptions import ValidationError, DuplicateResource, ResourceNotFound
 
 
@@ -184,28 +184,11 @@ class GSTReturnService:
                 "Use force_recalculate=true to override."
             )
         
-        # Get box amounts
-        boxes = GSTCalculationService.get_f5_box_amounts(
-            org_id=org_id,
-            period_start=gst_return.period_start.isoformat(),
-            period_end=gst_return.period_end.isoformat()
+        # DRAFT returns recompute incrementally from the drill-down index;
+        # forced recalculation rebuilds it
+        return F5ComputationService.compute(
+            org_id, gst_return, full=force_recalculate
         )
-        
-        # Update GST return
-        gst_return.box1_std_rated_supplies = Decimal(boxes["box1"])
-        gst_return.box2_zero_rated_supplies = Decimal(boxes["box2"])
-        gst_return.box3_exempt_supplies = Decimal(boxes["box3"])
-        gst_return.box4_total_supplies = Decimal(boxes["box4"])
-        gst_return.box5_output_tax = Decimal(boxes["box5"])
-        gst_return.box6_taxable_purchases = Decimal(boxes["box6"])
-        gst_return.box7_input_tax = Decimal(boxes["box7"])
-        gst_return.box8_net_gst = Decimal(boxes["box8"])
-        gst_return.box13_revenue = Decimal(boxes["box13"])
-        gst_return.box14_exempt_supplies = Decimal(boxes["box14"])
-        
-        gst_return.save()
-        
-        return gst_return
     
     @staticmethod
     def file_return(
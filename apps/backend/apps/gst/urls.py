@@ -14,6 +14,7 @@ from .views import (
     GSTCalculateDocumentView,
     GSTReturnListCreateView,
     GSTReturnDetailView,
+    GSTReturnBoxDocumentsView,
     GSTReturnFileView,
     GSTReturnAmendView,
     GSTReturnPayView,
@@ -36,6 +37,11 @@ urlpatterns = [
     path("returns/", GSTReturnListCreateView.as_view(), name="gst-return-list-create"),
     path("returns/deadlines/", GSTReturnDeadlinesView.as_view(), name="gst-return-deadlines"),
     path("returns/<str:return_id>/", GSTReturnDetailView.as_view(), name="gst-return-detail"),
+    path(
+        "returns/<str:return_id>/boxes/<int:box>/",
+        GSTReturnBoxDocumentsView.as_view(),
+        name="gst-return-box-documents",
+    ),
     path("returns/<str:return_id>/file/", GSTReturnFileView.as_view(), name="gst-return-file"),
     path("returns/<str:return_id>/amend/", GSTReturnAmendView.as_view(), name="gst-return-amend"),
     path("returns/<str:return_id>/pay/", GSTReturnPayView.as_view(), name="gst-return-pay"),
@@ -22,6 +22,7 @@ from apps.gst.services import (
     TaxCodeService,
     GSTCalculationService,
     GSTReturnService,
+    F5ComputationService,
 )
 from apps.gst.serializers import (
     TaxCodeListSerializer,
@@ -342,6 +343,35 @@ class GSTReturnDetailView(APIView):
         return Response(GSTReturnDetailSerializer(gst_return).data)
 
 
+class GSTReturnBoxDocumentsView(APIView):
+    """
+    GET: Documents contributing to one F5 box (audit drill-down)
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember, CanFileGST]
+
+    @wrap_response
+    def get(self, request, org_id: str, return_id: str, box: int) -> Response:
+        """List the drill-down index for a box of a computed return."""
+        from uuid import UUID
+
+        gst_return = GSTReturnService.get_return(org_id, UUID(return_id))
+        documents = F5ComputationService.get_box_documents(org_id, gst_return.id, box)
+
+        return Response(
+            {
+                "return_id": str(gst_return.id),
+                "box": box,
+                "computed_at": (
+                    gst_return.computed_at.isoformat() if gst_return.computed_at else None
+                ),
+                "data": documents,
+                "count": len(documents),
+            }
+        )
+
+
 class GSTReturnFileView(APIView):
     """
     POST: File a GST return
@@ -0,0 +1,91 @@
+"""
+WeasyPrint render pool for LedgerSG invoicing.
+
+Renders HTML to PDF in a pool of worker processes so that WeasyPrint's CPU
+and memory cost stays off the web request threads. Workers are started
+with the 'spawn' method and this module imports nothing from Django, so a
+worker only loads WeasyPrint. Each worker warms up once in its initializer
+(font configuration and the invoice stylesheet) and reuses its font
+configuration for every render.
+
+Processes that may not have children (Celery prefork workers are
+daemonic) and a pool size of 0 render in-process instead.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Per-worker font configuration, created by _init_worker
+_font_config = None
+
+
+def _init_worker(warmup_html: str) -> None:
+    """Pool initializer: load fonts and the stylesheet once per worker."""
+    global _font_config
+    from weasyprint.text.fonts import FontConfiguration
+
+    _font_config = FontConfiguration()
+    if warmup_html:
+        render_pdf(warmup_html)
+
+
+def render_pdf(html: str) -> bytes:
+    """Render an HTML string to PDF bytes in the current process."""
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf(font_config=_font_config)
+
+
+def _get_pool(workers: int, warmup_html: str) -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(warmup_html,),
+            )
+        return _pool
+
+
+def _reset_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def render(html: str, workers: int, warmup_html: str = "", timeout: float = 60) -> bytes:
+    """
+    Render HTML to PDF, in the pool when possible.
+
+    Args:
+        html: Complete HTML document
+        workers: Pool size; 0 renders in-process
+        warmup_html: HTML rendered once by each new worker
+        timeout: Seconds to wait for a pooled render
+
+    Returns:
+        PDF bytes
+    """
+    if workers <= 0 or multiprocessing.current_process().daemon:
+        return render_pdf(html)
+
+    try:
+        return _get_pool(workers, warmup_html).submit(render_pdf, html).result(timeout=timeout)
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start a fresh pool next time
+        logger.warning("PDF render pool broken; rendering in-process")
+        _reset_pool()
+        return render_pdf(html)
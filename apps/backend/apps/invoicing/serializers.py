@@ -191,6 +191,31 @@ class StatusTransitionSerializer(serializers.Serializer):
     reason = serializers.CharField(required=False, allow_blank=True)
 
 
+class BatchApproveSerializer(serializers.Serializer):
+    """Serializer for batch document approval."""
+    
+    document_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=5000,
+    )
+
+
+class PDFExportSerializer(serializers.Serializer):
+    """Serializer for bulk PDF export filters."""
+    
+    document_type = serializers.CharField(required=False)
+    status = serializers.CharField(required=False)
+    contact_id = serializers.UUIDField(required=False)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+    
+    def validate(self, data):
+        if data.get("date_from") and data.get("date_to") and data["date_from"] > data["date_to"]:
+            raise serializers.ValidationError("date_from must be on or before date_to.")
+        return data
+
+
 class QuoteConversionSerializer(serializers.Serializer):
     """Serializer for quote to invoice conversion."""
     
@@ -6,10 +6,14 @@ Business logic services for contacts and documents.
 
 from .contact_service import ContactService
 from .document_service import DocumentService, DOCUMENT_TYPES, STATUS_TRANSITIONS
+from .pdf_service import PDFService
+from .pdf_export_service import PDFExportService
 
 __all__ = [
     "ContactService",
     "DocumentService",
+    "PDFService",
+    "PDFExportService",
     "DOCUMENT_TYPES",
     "STATUS_TRANSITIONS",
 ]
@@ -16,15 +16,16 @@ from datetime import date, timedelta
 import io
 
 from django.db import connection, transaction
-from django.template.loader import render_to_string
 from django.utils import timezone
 from django.db import models
 
-from weasyprint import HTML
 from apps.core.models import InvoiceDocument, InvoiceLine, Contact, Account
 from apps.gst.services import TaxCodeService, GSTCalculationService
+from apps.invoicing.services.pdf_service import PDFService
+from apps.reporting.services.dashboard_service import DashboardService
 from common.exceptions import ValidationError, DuplicateResource, ResourceNotFound
 from common.decimal_utils import money, sum_money
+from common.pagination import encode_keyset_cursor, decode_keyset_cursor
 
 
 # Document type definitions - matches SQL ENUM invoicing.doc_type
@@ -50,6 +51,30 @@ STATUS_TRANSITIONS = {
     "OVERDUE": ["PAID", "VOID"],
 }
 
+# Document types that create a journal entry when approved
+POSTABLE_DOCUMENT_TYPES = (
+    "SALES_INVOICE",
+    "SALES_CREDIT_NOTE",
+    "SALES_DEBIT_NOTE",
+    "PURCHASE_INVOICE",
+    "PURCHASE_CREDIT_NOTE",
+    "PURCHASE_DEBIT_NOTE",
+)
+
+# Columns loaded for list views (InvoiceDocumentListSerializer)
+DOCUMENT_LIST_FIELDS = (
+    "id",
+    "document_type",
+    "document_number",
+    "contact_id",
+    "contact__name",
+    "issue_date",
+    "due_date",
+    "status",
+    "total_incl",
+    "currency",
+)
+
 
 class DocumentService:
     """Service class for invoice document operations."""
@@ -79,6 +104,130 @@ class DocumentService:
         Returns:
             List of InvoiceDocument instances
         """
+        queryset = DocumentService._filter_documents(
+            org_id, document_type, status, contact_id, date_from, date_to, search
+        )
+
+        return list(queryset.order_by("-issue_date", "-document_number"))
+
+    @staticmethod
+    def list_documents_page(
+        org_id: UUID,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        contact_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 50,
+    ) -> Tuple[List[InvoiceDocument], Optional[str]]:
+        """
+        List one page of invoice documents using keyset pagination.
+
+        Documents are ordered newest first by (issue_date, document_number,
+        id). The cursor encodes the last row of the previous page, so each
+        page is an index range scan from that position rather than an
+        OFFSET, and rows inserted meanwhile never shift a page. Only the
+        columns the list view renders are loaded, with the contact joined.
+
+        Args:
+            org_id: Organisation ID
+            document_type: Filter by type (INVOICE, QUOTE, etc.)
+            status: Filter by status
+            contact_id: Filter by contact
+            date_from: Filter from date
+            date_to: Filter to date
+            search: Search document number
+            cursor: Token returned as next_cursor by the previous page
+            page_size: Maximum documents per page
+
+        Returns:
+            Tuple of (documents, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValidationError: If the cursor is malformed
+        """
+        queryset = DocumentService._filter_documents(
+            org_id, document_type, status, contact_id, date_from, date_to, search
+        )
+
+        if cursor:
+            issue_date, document_number, document_id = decode_keyset_cursor(cursor, 3)
+            try:
+                issue_date = date.fromisoformat(issue_date)
+                document_id = UUID(document_id)
+            except ValueError as exc:
+                raise ValidationError("Invalid cursor.") from exc
+
+            # A row-value comparison, so Postgres starts an index range scan
+            # on idx_document_org_keyset at the cursor (an OR-expanded Q
+            # cannot be used as a range bound)
+            table = f'"{InvoiceDocument._meta.db_table}"'
+            queryset = queryset.extra(
+                where=[
+                    f"({table}.document_date, {table}.document_number, {table}.id)"
+                    " < (%s, %s, %s::uuid)"
+                ],
+                params=[issue_date, document_number, str(document_id)],
+            )
+
+        rows = list(
+            queryset.select_related("contact")
+            .only(*DOCUMENT_LIST_FIELDS)
+            .order_by("-issue_date", "-document_number", "-id")[: page_size + 1]
+        )
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = encode_keyset_cursor(
+                [last.issue_date.isoformat(), last.document_number, last.id]
+            )
+
+        return rows, next_cursor
+
+    @staticmethod
+    def count_documents(
+        org_id: UUID,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        contact_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        search: Optional[str] = None,
+    ) -> int:
+        """
+        Count the documents matching the list filters (all pages).
+
+        Args:
+            org_id: Organisation ID
+            document_type: Filter by type (INVOICE, QUOTE, etc.)
+            status: Filter by status
+            contact_id: Filter by contact
+            date_from: Filter from date
+            date_to: Filter to date
+            search: Search document number
+
+        Returns:
+            Number of matching documents
+        """
+        return DocumentService._filter_documents(
+            org_id, document_type, status, contact_id, date_from, date_to, search
+        ).count()
+
+    @staticmethod
+    def _filter_documents(
+        org_id: UUID,
+        document_type: Optional[str],
+        status: Optional[str],
+        contact_id: Optional[UUID],
+        date_from: Optional[date],
+        date_to: Optional[date],
+        search: Optional[str],
+    ) -> models.QuerySet:
+        """Build the filtered document queryset shared by the list methods."""
         queryset = InvoiceDocument.objects.filter(org_id=org_id)
 
         if document_type:
@@ -99,7 +248,7 @@ class DocumentService:
         if search:
             queryset = queryset.filter(document_number__icontains=search)
 
-        return list(queryset.order_by("-issue_date", "-document_number"))
+        return queryset
 
     @staticmethod
     def get_document(org_id: UUID, document_id: UUID) -> InvoiceDocument:
@@ -356,14 +505,7 @@ class DocumentService:
                 document.approved_by_id = user_id
 
                 # Post journal entry (for invoices/credit notes)
-                if document.document_type in [
-                    "SALES_INVOICE",
-                    "SALES_CREDIT_NOTE",
-                    "SALES_DEBIT_NOTE",
-                    "PURCHASE_INVOICE",
-                    "PURCHASE_CREDIT_NOTE",
-                    "PURCHASE_DEBIT_NOTE",
-                ]:
+                if document.document_type in POSTABLE_DOCUMENT_TYPES:
                     DocumentService._post_journal_entry(org_id, document)
 
             elif new_status == "VOID":
@@ -588,8 +730,178 @@ class DocumentService:
         if document.document_type == "SALES_INVOICE":
             DocumentService._queue_peppol_transmission(document, org_id)
 
+        DashboardService.publish_invalidation(org_id)
+
         return document
 
+    @staticmethod
+    def approve_documents(org_id: UUID, document_ids: List[UUID], user) -> Dict[str, Any]:
+        """
+        Approve a batch of documents (DRAFT → APPROVED).
+
+        The whole set is locked with one SELECT ... FOR UPDATE, open fiscal
+        periods are looked up once for the batch, posting accounts come from
+        the cached per-org resolver, and every journal entry is written
+        through JournalService.create_entries.
+        Documents that fail validation, including lines whose account no
+        longer exists in the org, are reported individually and do not
+        block the rest of the batch.
+
+        Args:
+            org_id: Organisation ID
+            document_ids: Document IDs to approve
+            user: User performing the approval
+
+        Returns:
+            Dictionary with approved/failed counts and a per-document
+            results list (document_id, success, document_number,
+            journal_entry_id or error)
+        """
+        from apps.core.models import FiscalPeriod
+        from apps.journal.services import JournalService
+
+        # De-duplicate while keeping the caller's order for the results
+        document_ids = list(dict.fromkeys(document_ids))
+        errors: Dict[UUID, str] = {}
+        approved: List[InvoiceDocument] = []
+
+        with transaction.atomic():
+            documents = {
+                document.id: document
+                for document in InvoiceDocument.objects.select_for_update(of=("self",))
+                .select_related("contact")
+                .filter(org_id=org_id, id__in=document_ids)
+            }
+
+            lines_by_document: Dict[UUID, List[InvoiceLine]] = {}
+            for line in InvoiceLine.objects.filter(document_id__in=documents.keys()).order_by(
+                "document_id", "line_number"
+            ):
+                lines_by_document.setdefault(line.document_id, []).append(line)
+
+            open_periods = list(FiscalPeriod.objects.filter(org_id=org_id, is_open=True))
+            entries = []
+
+            for document_id in document_ids:
+                document = documents.get(document_id)
+                if document is None:
+                    errors[document_id] = f"Document {document_id} not found"
+                    continue
+
+                if document.status != "DRAFT":
+                    errors[document_id] = (
+                        f"Cannot approve document with status '{document.status}'. "
+                        "Only DRAFT documents can be approved."
+                    )
+                    continue
+
+                fiscal_period = next(
+                    (
+                        period
+                        for period in open_periods
+                        if period.start_date <= document.issue_date <= period.end_date
+                    ),
+                    None,
+                )
+                if fiscal_period is None:
+                    errors[document_id] = "No open fiscal period found for the invoice date."
+                    continue
+
+                if document.document_type in POSTABLE_DOCUMENT_TYPES:
+                    try:
+                        lines = JournalService.build_invoice_lines(
+                            org_id, document, lines_by_document.get(document_id, [])
+                        )
+                        JournalService._parse_lines(lines)
+                    except ValidationError as e:
+                        errors[document_id] = e.message
+                        continue
+
+                    entries.append(
+                        {
+                            "entry_date": document.issue_date,
+                            "fiscal_period": fiscal_period,
+                            "source_type": document.document_type,
+                            "narration": f"{document.document_type} {document.document_number}",
+                            "source_id": document.id,
+                            "lines": lines,
+                            "document": document,
+                        }
+                    )
+
+                approved.append(document)
+
+            # Check every referenced account up front so a missing one fails
+            # its own document rather than the whole batch in create_entries
+            known_accounts = set(
+                Account.objects.filter(
+                    org_id=org_id,
+                    id__in={line["account_id"] for entry in entries for line in entry["lines"]},
+                ).values_list("id", flat=True)
+            )
+            valid_entries = []
+            for entry in entries:
+                missing = next(
+                    (
+                        line["account_id"]
+                        for line in entry["lines"]
+                        if line["account_id"] not in known_accounts
+                    ),
+                    None,
+                )
+                if missing is None:
+                    valid_entries.append(entry)
+                else:
+                    errors[entry["source_id"]] = f"Account {missing} not found"
+            entries = valid_entries
+            approved = [document for document in approved if document.id not in errors]
+
+            journal_entries = JournalService.create_entries(org_id, entries, user.id)
+            for entry_data, journal_entry in zip(entries, journal_entries):
+                entry_data["document"].journal_entry = journal_entry
+
+            approved_at = timezone.now()
+            for document in approved:
+                document.status = "APPROVED"
+                document.approved_by = user
+                document.approved_at = approved_at
+
+            InvoiceDocument.objects.bulk_update(
+                approved, ["status", "approved_by", "approved_at", "journal_entry"]
+            )
+
+        DocumentService._queue_peppol_transmissions(
+            org_id, [d for d in approved if d.document_type == "SALES_INVOICE"]
+        )
+        if approved:
+            DashboardService.publish_invalidation(org_id)
+
+        results = []
+        for document_id in document_ids:
+            if document_id in errors:
+                results.append(
+                    {"document_id": str(document_id), "success": False, "error": errors[document_id]}
+                )
+                continue
+
+            document = documents[document_id]
+            results.append(
+                {
+                    "document_id": str(document_id),
+                    "success": True,
+                    "document_number": document.document_number,
+                    "journal_entry_id": (
+                        str(document.journal_entry_id) if document.journal_entry_id else None
+                    ),
+                }
+            )
+
+        return {
+            "approved_count": len(approved),
+            "failed_count": len(errors),
+            "results": results,
+        }
+
     @staticmethod
     def void_document(org_id: UUID, document_id: UUID, user, reason: str) -> InvoiceDocument:
         """
@@ -646,12 +958,17 @@ class DocumentService:
             # Reverse journal entries
             DocumentService._reverse_journal_entry(org_id, document)
 
+            DashboardService.publish_invalidation(org_id)
+
             return document
 
     @staticmethod
     def generate_pdf(org_id: UUID, document_id: UUID) -> io.BytesIO:
         """
-        Generate PDF for a document using WeasyPrint.
+        Get the PDF for a document.
+
+        Delegates to PDFService, which only renders (in the WeasyPrint
+        process pool) when the document's content hash is not cached.
 
         Args:
             org_id: Organisation ID
@@ -663,35 +980,8 @@ class DocumentService:
         Raises:
             ResourceNotFound: If document doesn't exist
         """
-        context = DocumentService._get_pdf_context(org_id, document_id)
-
-        # Render HTML string
-        html_string = render_to_string("invoicing/invoice_pdf.html", context)
-
-        # Create PDF in memory
-        output = io.BytesIO()
-        HTML(string=html_string).write_pdf(target=output)
-        output.seek(0)
-
-        return output
-
-    @staticmethod
-    def _get_pdf_context(org_id: UUID, document_id: UUID) -> Dict[str, Any]:
-        """Gather all data needed for PDF rendering."""
-        from apps.core.models import Organisation
-
-        document = DocumentService.get_document(org_id, document_id)
-        org = Organisation.objects.get(id=org_id)
-        contact = document.contact
-        lines = document.lines.all().order_by("line_number")
-
-        return {
-            "document": document,
-            "org": org,
-            "contact": contact,
-            "lines": lines,
-            "generated_at": timezone.now(),
-        }
+        _, pdf = PDFService.get_pdf(org_id, document_id)
+        return io.BytesIO(pdf)
 
     @staticmethod
     def send_email(org_id: UUID, document_id: UUID, email_data: dict) -> dict:
@@ -863,3 +1153,53 @@ class DocumentService:
         # Queue async task
         task = transmit_peppol_invoice_task.delay(str(log.id), str(org_id))
         return task.id
+
+    @staticmethod
+    def _queue_peppol_transmissions(org_id, documents):
+        """
+        Queue a batch of approved sales invoices for Peppol transmission.
+
+        Same rules as _queue_peppol_transmission, but the org's Peppol
+        settings are read once, the transmission logs are created with a
+        single bulk insert and one batch task transmits them all. The task
+        is queued once the approval commits; a worker started earlier
+        would find no PENDING logs to claim.
+
+        Args:
+            org_id: Organisation ID
+            documents: Approved SALES_INVOICE documents (contact preloaded)
+
+        Returns:
+            list: IDs of the transmission logs queued
+        """
+        if not documents:
+            return []
+
+        from apps.peppol.models import OrganisationPeppolSettings, PeppolTransmissionLog
+        from apps.peppol.tasks import transmit_peppol_batch_task
+
+        settings = OrganisationPeppolSettings.objects.filter(org_id=org_id).first()
+
+        if not settings or not settings.is_configured or not settings.auto_transmit:
+            return []
+
+        logs = PeppolTransmissionLog.objects.bulk_create(
+            [
+                PeppolTransmissionLog(
+                    org_id=org_id,
+                    document_id=document.id,
+                    status="PENDING",
+                    access_point_provider=settings.access_point_provider,
+                    attempt_number=1,
+                )
+                for document in documents
+                if document.contact and document.contact.peppol_id
+            ]
+        )
+
+        if not logs:
+            return []
+
+        log_ids = [str(log.id) for log in logs]
+        transaction.on_commit(lambda: transmit_peppol_batch_task.delay(str(org_id), log_ids))
+        return log_ids
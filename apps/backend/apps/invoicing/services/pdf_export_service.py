@@ -0,0 +1,357 @@
+"""
+Bulk PDF export for LedgerSG Invoicing module.
+
+Exports a filtered set of documents (e.g. a quarter's invoices for an IRAS
+audit) as one ZIP of PDFs. Celery workers render the documents in
+parallel, one chunk per task, into the content-addressed PDF cache
+(PDFService). A final task then streams the PDFs into a ZIP on disk one
+document at a time, so memory stays bounded by a single PDF whatever the
+size of the export.
+
+Job state is kept in the cache under pdf_export:{job_id}. Chunk tasks
+update per-document counters atomically, from which the status endpoint
+reports progress and throughput.
+"""
+
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from datetime import date
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from celery import chord
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.models import InvoiceDocument, Organisation
+from apps.invoicing.services.document_service import DocumentService
+from apps.invoicing.services.pdf_service import PDFService
+from common.exceptions import ValidationError, ResourceNotFound
+
+logger = logging.getLogger(__name__)
+
+
+EXPORT_CHUNK_SIZE = 25
+MAX_EXPORT_DOCUMENTS = 5000
+JOB_TIMEOUT = 86400  # job state and ZIP files are kept for a day
+COUNTERS = ("rendered", "cached", "failed")
+MAX_REPORTED_FAILURES = 100
+
+
+def _job_key(job_id) -> str:
+    return f"pdf_export:{job_id}"
+
+
+def _counter_key(job_id, name: str) -> str:
+    return f"pdf_export:{job_id}:{name}"
+
+
+class PDFExportService:
+    """Service class for bulk PDF export jobs."""
+
+    @staticmethod
+    def start_export(
+        org_id: UUID,
+        document_type: Optional[str] = None,
+        status: Optional[str] = None,
+        contact_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        user_id: Optional[UUID] = None,
+    ) -> Dict[str, Any]:
+        """
+        Start an export job for the documents matching the filters.
+
+        Args:
+            org_id: Organisation ID
+            document_type: Filter by type
+            status: Filter by status
+            contact_id: Filter by contact
+            date_from: Filter from issue date
+            date_to: Filter to issue date
+            user_id: Requesting user ID
+
+        Returns:
+            Job status (see get_status)
+
+        Raises:
+            ValidationError: If nothing matches or the export is too large
+        """
+        document_ids = [
+            str(document_id)
+            for document_id in DocumentService._filter_documents(
+                org_id, document_type, status, contact_id, date_from, date_to, None
+            )
+            .order_by("issue_date", "document_number", "id")
+            .values_list("id", flat=True)[: MAX_EXPORT_DOCUMENTS + 1]
+        ]
+        if not document_ids:
+            raise ValidationError("No documents match the export filters.")
+        if len(document_ids) > MAX_EXPORT_DOCUMENTS:
+            raise ValidationError(
+                f"An export can contain at most {MAX_EXPORT_DOCUMENTS} documents. "
+                f"Narrow the filters."
+            )
+
+        PDFExportService._purge_expired(org_id)
+
+        job_id = str(uuid4())
+        cache.set(
+            _job_key(job_id),
+            {
+                "job_id": job_id,
+                "org_id": str(org_id),
+                "user_id": str(user_id) if user_id else None,
+                "status": "RENDERING",
+                "total": len(document_ids),
+                "filters": {
+                    "document_type": document_type,
+                    "status": status,
+                    "contact_id": str(contact_id) if contact_id else None,
+                    "date_from": date_from.isoformat() if date_from else None,
+                    "date_to": date_to.isoformat() if date_to else None,
+                },
+                "started_at": time.time(),
+                "finished_at": None,
+                "file_size": None,
+                "failed_documents": [],
+                "error": None,
+            },
+            timeout=JOB_TIMEOUT,
+        )
+        for name in COUNTERS:
+            cache.set(_counter_key(job_id, name), 0, timeout=JOB_TIMEOUT)
+
+        from apps.invoicing.tasks import (
+            build_pdf_export_task,
+            fail_pdf_export_task,
+            render_pdf_export_chunk_task,
+        )
+
+        # A failing chunk fails the chord, which runs the errback instead of
+        # the build, so the job never stays RENDERING
+        chord(
+            render_pdf_export_chunk_task.si(
+                str(org_id), job_id, document_ids[i : i + EXPORT_CHUNK_SIZE]
+            )
+            for i in range(0, len(document_ids), EXPORT_CHUNK_SIZE)
+        )(
+            build_pdf_export_task.si(str(org_id), job_id, document_ids).on_error(
+                fail_pdf_export_task.s(str(org_id), job_id)
+            )
+        )
+
+        return PDFExportService.get_status(org_id, job_id)
+
+    @staticmethod
+    def get_status(org_id: UUID, job_id: str) -> Dict[str, Any]:
+        """
+        Get an export job's progress.
+
+        Returns:
+            Dict with 'job_id', 'status' (RENDERING, PACKING, COMPLETED or
+            FAILED), 'total', 'processed', per-outcome counts ('rendered',
+            'cached', 'failed'), 'progress' (percent), 'documents_per_second',
+            'elapsed_seconds', 'file_size', 'failed_documents' and 'error'
+
+        Raises:
+            ResourceNotFound: If the job does not exist for this organisation
+        """
+        state = PDFExportService._get_job(org_id, job_id)
+        counts = {
+            name: cache.get(_counter_key(job_id, name)) or 0 for name in COUNTERS
+        }
+        processed = sum(counts.values())
+        elapsed = (state["finished_at"] or time.time()) - state["started_at"]
+
+        return {
+            "job_id": state["job_id"],
+            "status": state["status"],
+            "filters": state["filters"],
+            "total": state["total"],
+            "processed": processed,
+            **counts,
+            "progress": round(100 * processed / state["total"], 1),
+            "documents_per_second": round(processed / elapsed, 2) if elapsed > 0 else None,
+            "elapsed_seconds": round(elapsed, 1),
+            "file_size": state["file_size"],
+            "failed_documents": state["failed_documents"],
+            "error": state["error"],
+        }
+
+    @staticmethod
+    def archive_path(org_id: UUID, job_id: str) -> str:
+        """
+        Path of a completed export's ZIP file.
+
+        Raises:
+            ResourceNotFound: If the job or its file does not exist
+            ValidationError: If the export has not completed
+        """
+        state = PDFExportService._get_job(org_id, job_id)
+        if state["status"] != "COMPLETED":
+            raise ValidationError(f"Export is not ready (status: {state['status']}).")
+        path = PDFExportService._archive_path(org_id, job_id)
+        if not os.path.exists(path):
+            raise ResourceNotFound(f"Export {job_id} has expired")
+        return path
+
+    @staticmethod
+    def render_chunk(org_id: UUID, job_id: str, document_ids: List[str]) -> Dict[str, int]:
+        """
+        Render one chunk of an export into the PDF cache.
+
+        Documents, contacts and lines load in three queries per chunk.
+        A failing document is counted and skipped, never failing the job.
+
+        Returns:
+            Dict with this chunk's 'rendered', 'cached' and 'failed' counts
+        """
+        org = Organisation.objects.get(id=org_id)
+        documents = PDFService.with_render_relations(
+            InvoiceDocument.objects.filter(org_id=org_id, id__in=document_ids)
+        )
+
+        result = dict.fromkeys(COUNTERS, 0)
+        found = 0
+        for document in documents:
+            found += 1
+            try:
+                _, rendered = PDFService.render_document(document, org)
+                outcome = "rendered" if rendered else "cached"
+            except Exception as e:
+                logger.error(f"PDF export {job_id}: failed to render {document.id}: {e}")
+                outcome = "failed"
+            result[outcome] += 1
+            PDFExportService._incr(job_id, outcome)
+
+        # Documents deleted since the job started
+        missing = len(document_ids) - found
+        if missing:
+            result["failed"] += missing
+            PDFExportService._incr(job_id, "failed", missing)
+
+        return result
+
+    @staticmethod
+    def build_archive(org_id: UUID, job_id: str, document_ids: List[str]) -> Dict[str, Any]:
+        """
+        Write the export's ZIP file from the PDF cache.
+
+        PDFs are added one at a time in issue-date order (stored, since
+        PDF streams are already compressed), so memory holds at most one
+        document. A PDF missing from the cache is rendered in place.
+
+        Returns:
+            Job status (see get_status)
+        """
+        PDFExportService._update_job(job_id, status="PACKING")
+        org = Organisation.objects.get(id=org_id)
+        path = PDFExportService._archive_path(org_id, job_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+
+        failures = []
+        names = set()
+        try:
+            with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as archive:
+                documents = PDFService.with_render_relations(
+                    InvoiceDocument.objects.filter(org_id=org_id, id__in=document_ids)
+                ).order_by("issue_date", "document_number", "id")
+                for document in documents.iterator(chunk_size=EXPORT_CHUNK_SIZE * 4):
+                    try:
+                        pdf, _ = PDFService.render_document(document, org)
+                    except Exception as e:
+                        failures.append(
+                            {
+                                "document_id": str(document.id),
+                                "document_number": document.document_number,
+                                "error": str(e),
+                            }
+                        )
+                        continue
+                    name = f"{document.document_number}.pdf"
+                    if name in names:
+                        name = f"{document.document_number}-{document.id}.pdf"
+                    names.add(name)
+                    archive.writestr(name, pdf)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"PDF export {job_id} failed: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            PDFExportService._update_job(
+                job_id, status="FAILED", error=str(e), finished_at=time.time()
+            )
+            raise
+
+        PDFExportService._update_job(
+            job_id,
+            status="COMPLETED",
+            finished_at=time.time(),
+            file_size=os.path.getsize(path),
+            failed_documents=failures[:MAX_REPORTED_FAILURES],
+        )
+        status = PDFExportService.get_status(org_id, job_id)
+        logger.info(
+            f"PDF export {job_id}: {len(names)} documents in {status['elapsed_seconds']}s "
+            f"({status['documents_per_second']}/s)"
+        )
+        return status
+
+    @staticmethod
+    def fail_job(job_id: str, exc: Exception) -> None:
+        """Mark a job FAILED unless it already finished (chord errback)."""
+        logger.error(f"PDF export {job_id} failed: {exc}")
+        state = cache.get(_job_key(job_id))
+        if state is not None and state["status"] not in ("COMPLETED", "FAILED"):
+            PDFExportService._update_job(
+                job_id, status="FAILED", error=str(exc), finished_at=time.time()
+            )
+
+    @staticmethod
+    def _incr(job_id: str, name: str, delta: int = 1) -> None:
+        """Increment a progress counter, re-creating it if it was evicted."""
+        key = _counter_key(job_id, name)
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.add(key, 0, timeout=JOB_TIMEOUT)
+            cache.incr(key, delta)
+
+    @staticmethod
+    def _get_job(org_id: UUID, job_id: str) -> Dict[str, Any]:
+        state = cache.get(_job_key(job_id))
+        if state is None or state["org_id"] != str(org_id):
+            raise ResourceNotFound(f"Export job {job_id} not found")
+        return state
+
+    @staticmethod
+    def _update_job(job_id: str, **changes) -> None:
+        # Only the build task (or, if it never runs, the errback) writes job
+        # state after start, so no lost updates
+        state = cache.get(_job_key(job_id))
+        if state is not None:
+            state.update(changes)
+            cache.set(_job_key(job_id), state, timeout=JOB_TIMEOUT)
+
+    @staticmethod
+    def _archive_path(org_id: UUID, job_id: str) -> str:
+        return os.path.join(settings.PDF_EXPORT_DIR, str(org_id), f"{job_id}.zip")
+
+    @staticmethod
+    def _purge_expired(org_id: UUID) -> None:
+        """Delete this organisation's ZIP files older than JOB_TIMEOUT."""
+        directory = os.path.join(settings.PDF_EXPORT_DIR, str(org_id))
+        if not os.path.isdir(directory):
+            return
+        cutoff = time.time() - JOB_TIMEOUT
+        for entry in os.scandir(directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError as e:
+                logger.warning(f"Could not remove expired export {entry.path}: {e}")
@@ -0,0 +1,239 @@
+"""
+PDF service for LedgerSG Invoicing module.
+
+Rendered PDFs are content-addressed: the key is a SHA-256 over everything
+the template can show (document, contact, lines, organisation branding)
+plus the template source. An unchanged document is never re-rendered, and
+any edit, rebrand or template change produces a new key, so cached PDFs
+never need invalidating.
+
+Rendering runs in the WeasyPrint process pool (apps.invoicing.pdf_renderer).
+Rendered files are stored on disk under PDF_CACHE_DIR, or in the Django
+cache (for PDF_CACHE_TIMEOUT) when it is set to "".
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch, QuerySet
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+
+from apps.core.models import InvoiceDocument, InvoiceLine, Organisation
+from apps.invoicing import pdf_renderer
+from common.exceptions import ResourceNotFound
+
+logger = logging.getLogger(__name__)
+
+
+PDF_TEMPLATE = "invoicing/invoice_pdf.html"
+
+# Fields that change during a document's life but never appear on the PDF.
+# They are left out of the content hash so that payments, approval and
+# InvoiceNow transmission do not force a re-render. Remove a field from
+# this set if the template starts showing it.
+VOLATILE_FIELDS = frozenset(
+    {
+        "created_at",
+        "updated_at",
+        "status",
+        "amount_paid",
+        "journal_entry",
+        "approved_at",
+        "approved_by",
+        "voided_at",
+        "voided_by",
+        "void_reason",
+        "peppol_message_id",
+        "invoicenow_status",
+        "invoicenow_sent_at",
+        "invoicenow_error",
+        "created_by",
+    }
+)
+
+
+@lru_cache(maxsize=1)
+def template_version() -> str:
+    """Digest of the PDF template source (changes whenever the template does)."""
+    source = get_template(PDF_TEMPLATE).template.source
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=1)
+def warmup_html() -> str:
+    """Minimal page carrying the template's stylesheet, for warming pool workers."""
+    source = get_template(PDF_TEMPLATE).template.source
+    style = re.search(r"<style>.*?</style>", source, re.S)
+    return (
+        f"<html><head>{style.group(0) if style else ''}</head>"
+        f"<body><p>0</p></body></html>"
+    )
+
+
+def _field_values(obj) -> Dict[str, Any]:
+    if obj is None:
+        return {}
+    return {
+        field.attname: field.value_from_object(obj)
+        for field in obj._meta.concrete_fields
+        if field.name not in VOLATILE_FIELDS
+    }
+
+
+class PDFService:
+    """Service class for cached, pooled PDF rendering."""
+
+    @staticmethod
+    def content_hash(
+        document: InvoiceDocument, org: Organisation, lines: Iterable[InvoiceLine]
+    ) -> str:
+        """
+        Hash the document content that determines the rendered PDF.
+
+        Args:
+            document: Document (with contact loaded)
+            org: Owning organisation
+            lines: Document lines (with tax codes loaded)
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = {
+            "template": template_version(),
+            "document": _field_values(document),
+            "contact": _field_values(document.contact),
+            "org": _field_values(org),
+            "lines": [
+                {**_field_values(line), "tax_code": line.tax_code.code if line.tax_code else None}
+                for line in lines
+            ],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    @staticmethod
+    def with_render_relations(queryset: QuerySet) -> QuerySet:
+        """
+        Load what the template reads alongside the documents.
+
+        Contacts are joined and lines (with tax codes) prefetched into
+        `pdf_lines`, so any number of documents costs two queries.
+        """
+        return queryset.select_related("contact").prefetch_related(
+            Prefetch(
+                "lines",
+                queryset=InvoiceLine.objects.select_related("tax_code").order_by("line_number"),
+                to_attr="pdf_lines",
+            )
+        )
+
+    @staticmethod
+    def get_pdf(org_id: UUID, document_id: UUID) -> Tuple[InvoiceDocument, bytes]:
+        """
+        Get a document's PDF, rendering it only if its content changed.
+
+        Three queries (document with contact, lines with tax codes,
+        organisation) compute the content hash; a cache hit returns the
+        stored file without rendering.
+
+        Args:
+            org_id: Organisation ID
+            document_id: Document ID
+
+        Returns:
+            Tuple of (document, PDF bytes)
+
+        Raises:
+            ResourceNotFound: If document doesn't exist
+        """
+        document = PDFService.with_render_relations(
+            InvoiceDocument.objects.filter(id=document_id, org_id=org_id)
+        ).first()
+        if document is None:
+            raise ResourceNotFound(f"Document {document_id} not found")
+        org = Organisation.objects.get(id=org_id)
+
+        pdf, _ = PDFService.render_document(document, org)
+        return document, pdf
+
+    @staticmethod
+    def render_document(document: InvoiceDocument, org: Organisation) -> Tuple[bytes, bool]:
+        """
+        Get the PDF for a document loaded via with_render_relations.
+
+        Args:
+            document: Document with contact and pdf_lines loaded
+            org: Owning organisation
+
+        Returns:
+            Tuple of (PDF bytes, rendered); rendered is False on a cache hit
+        """
+        digest = PDFService.content_hash(document, org, document.pdf_lines)
+        pdf = PDFService._cache_get(org.id, digest)
+        if pdf is not None:
+            return pdf, False
+
+        html = render_to_string(
+            PDF_TEMPLATE,
+            {
+                "document": document,
+                "org": org,
+                "contact": document.contact,
+                "lines": document.pdf_lines,
+                "generated_at": timezone.now(),
+            },
+        )
+        pdf = pdf_renderer.render(
+            html,
+            workers=settings.PDF_RENDER_WORKERS,
+            warmup_html=warmup_html(),
+            timeout=settings.PDF_RENDER_TIMEOUT,
+        )
+        PDFService._cache_set(org.id, digest, pdf)
+        return pdf, True
+
+    @staticmethod
+    def _cache_path(org_id: UUID, digest: str) -> Optional[str]:
+        if not settings.PDF_CACHE_DIR:
+            return None
+        return os.path.join(settings.PDF_CACHE_DIR, str(org_id), f"{digest}.pdf")
+
+    @staticmethod
+    def _cache_get(org_id: UUID, digest: str) -> Optional[bytes]:
+        path = PDFService._cache_path(org_id, digest)
+        try:
+            if path:
+                with open(path, "rb") as f:
+                    return f.read()
+            return cache.get(f"pdf:{org_id}:{digest}")
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"PDF cache read failed for {digest}: {e}")
+            return None
+
+    @staticmethod
+    def _cache_set(org_id: UUID, digest: str, pdf: bytes) -> None:
+        path = PDFService._cache_path(org_id, digest)
+        try:
+            if path:
+                # Write then rename, so readers never see a partial file
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pdf)
+                os.replace(tmp_path, path)
+            else:
+                cache.set(f"pdf:{org_id}:{digest}", pdf, timeout=settings.PDF_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Failed to cache PDF {digest}: {e}")
@@ -11,7 +11,7 @@ from django.template.loader import render_to_string
 from django.conf import settings
 
 from apps.core.models import Organisation, InvoiceDocument, Contact
-from apps.invoicing.services import DocumentService
+from apps.invoicing.services import PDFService, PDFExportService
 
 logger = logging.getLogger(__name__)
 
@@ -29,13 +29,13 @@ def send_invoice_email_task(self, org_id: str, document_id: str, recipients: lis
         context = {
             "org_name": org.name,
             "contact_name": contact.name,
-            "document_number": document.sequence_number,
+            "document_number": document.document_number,
             "total_amount": document.total_incl,
             "currency": org.base_currency,
             "due_date": document.due_date,
         }
         
-        subject = f"Invoice {document.sequence_number} from {org.name}"
+        subject = f"Invoice {document.document_number} from {org.name}"
         text_content = render_to_string("invoicing/email/invoice_email.txt", context)
         html_content = render_to_string("invoicing/email/invoice_email.html", context)
         
@@ -47,11 +47,11 @@ def send_invoice_email_task(self, org_id: str, document_id: str, recipients: lis
         )
         email.attach_alternative(html_content, "text/html")
         
-        # Attach PDF
-        pdf_stream = DocumentService.generate_pdf(UUID(org_id), UUID(document_id))
+        # Attach PDF (cached unless the document changed since last render)
+        _, pdf = PDFService.get_pdf(UUID(org_id), UUID(document_id))
         email.attach(
-            f"{document.sequence_number}.pdf",
-            pdf_stream.getvalue(),
+            f"{document.document_number}.pdf",
+            pdf,
             "application/pdf"
         )
         
@@ -63,3 +63,21 @@ def send_invoice_email_task(self, org_id: str, document_id: str, recipients: lis
     except Exception as exc:
         logger.error(f"Error sending invoice email {document_id}: {exc}")
         raise self.retry(exc=exc, countdown=60)
+
+
+@shared_task
+def render_pdf_export_chunk_task(org_id: str, job_id: str, document_ids: list) -> dict:
+    """Render one chunk of a bulk PDF export into the PDF cache."""
+    return PDFExportService.render_chunk(UUID(org_id), job_id, document_ids)
+
+
+@shared_task
+def build_pdf_export_task(org_id: str, job_id: str, document_ids: list) -> dict:
+    """Write a bulk PDF export's ZIP once all chunks have rendered."""
+    return PDFExportService.build_archive(UUID(org_id), job_id, document_ids)
+
+
+@shared_task
+def fail_pdf_export_task(request, exc, traceback, org_id: str, job_id: str) -> None:
+    """Mark a bulk PDF export FAILED when a chunk or the build task raises."""
+    PDFExportService.fail_job(job_id, exc)
@@ -19,8 +19,12 @@ from .views import (
     ValidStatusTransitionsView,
     # Phase 2: Invoice workflow operations
     InvoiceApproveView,
+    InvoiceBatchApproveView,
     InvoiceVoidView,
     InvoicePDFView,
+    InvoicePDFExportView,
+    InvoicePDFExportStatusView,
+    InvoicePDFExportDownloadView,
     InvoiceSendView,
     InvoiceSendInvoiceNowView,
     InvoiceInvoiceNowStatusView,
@@ -40,6 +44,26 @@ urlpatterns = [
         ValidStatusTransitionsView.as_view(),
         name="status-transitions",
     ),
+    path(
+        "documents/batch-approve/",
+        InvoiceBatchApproveView.as_view(),
+        name="document-batch-approve",
+    ),
+    path(
+        "documents/pdf-export/",
+        InvoicePDFExportView.as_view(),
+        name="document-pdf-export",
+    ),
+    path(
+        "documents/pdf-export/<str:job_id>/",
+        InvoicePDFExportStatusView.as_view(),
+        name="document-pdf-export-status",
+    ),
+    path(
+        "documents/pdf-export/<str:job_id>/download/",
+        InvoicePDFExportDownloadView.as_view(),
+        name="document-pdf-export-download",
+    ),
     path(
         "documents/<str:document_id>/", InvoiceDocumentDetailView.as_view(), name="document-detail"
     ),
@@ -12,6 +12,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.core.permissions import (
@@ -20,12 +21,18 @@ from apps.core.permissions import (
     CanApproveInvoices,
     CanVoidInvoices,
     CanViewReports,
+    CanExportData,
 )
 from apps.core.models import Contact, InvoiceDocument
 from common.exceptions import ValidationError, ResourceNotFound
 from common.views import wrap_response
 
-from apps.invoicing.services import ContactService, DocumentService, STATUS_TRANSITIONS
+from apps.invoicing.services import (
+    ContactService,
+    DocumentService,
+    PDFExportService,
+    STATUS_TRANSITIONS,
+)
 from apps.invoicing.serializers import (
     ContactListSerializer,
     ContactDetailSerializer,
@@ -39,6 +46,8 @@ from apps.invoicing.serializers import (
     StatusTransitionSerializer,
     QuoteConversionSerializer,
     DocumentSummarySerializer,
+    BatchApproveSerializer,
+    PDFExportSerializer,
 )
 
 
@@ -162,18 +171,40 @@ class InvoiceDocumentListCreateView(APIView):
         if contact_id:
             contact_id = UUID(str(contact_id))
 
-        documents = DocumentService.list_documents(
-            org_id=UUID(str(org_id)),
-            document_type=doc_type,
-            status=status_filter,
-            contact_id=contact_id,
-            date_from=date_from,
-            date_to=date_to,
-            search=search,
+        try:
+            page_size = min(int(request.query_params.get("page_size", 50)), 200)
+        except ValueError as exc:
+            raise ValidationError("page_size must be an integer.") from exc
+
+        filters = {
+            "org_id": UUID(str(org_id)),
+            "document_type": doc_type,
+            "status": status_filter,
+            "contact_id": contact_id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "search": search,
+        }
+        documents, next_cursor = DocumentService.list_documents_page(
+            **filters,
+            cursor=request.query_params.get("cursor"),
+            page_size=max(page_size, 1),
         )
 
         serializer = InvoiceDocumentListSerializer(documents, many=True)
-        return Response({"results": serializer.data, "count": len(serializer.data)})
+        return Response(
+            {
+                "results": serializer.data,
+                # Total across all pages, not this page's length
+                "count": DocumentService.count_documents(**filters),
+                "next": (
+                    replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+                    if next_cursor
+                    else None
+                ),
+                "next_cursor": next_cursor,
+            }
+        )
 
     @wrap_response
     def post(self, request, org_id: str) -> Response:
@@ -465,6 +496,36 @@ class InvoiceApproveView(APIView):
         return Response(InvoiceDocumentDetailSerializer(document).data, status=status.HTTP_200_OK)
 
 
+class InvoiceBatchApproveView(APIView):
+    """
+    POST: Approve a batch of invoices (DRAFT → APPROVED)
+
+    Locks the documents together, posts all journal entries in bulk and
+    returns a per-document result. Invalid documents are reported in the
+    results and do not block the rest of the batch.
+    Requires: CanApproveInvoices permission
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember, CanApproveInvoices]
+
+    @wrap_response
+    def post(self, request, org_id: str) -> Response:
+        """Approve invoices and create journal entries."""
+        from uuid import UUID
+
+        serializer = BatchApproveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = DocumentService.approve_documents(
+            org_id=UUID(str(org_id)),
+            document_ids=serializer.validated_data["document_ids"],
+            user=request.user,
+        )
+
+        return Response(result, status=status.HTTP_200_OK)
+
+
 class InvoiceVoidView(APIView):
     """
     POST: Void invoice (APPROVED → VOID)
@@ -500,29 +561,99 @@ class InvoicePDFView(APIView):
     """
     GET: Generate PDF for invoice
 
-    Returns PDF file directly.
+    Returns PDF file directly. Unchanged documents are served from the
+    PDF cache; renders run in the WeasyPrint process pool.
     """
 
     authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated, IsOrgMember]
 
     def get(self, request, org_id: str, document_id: str) -> FileResponse:
-        """Generate PDF and return file response."""
+        """Return the document PDF as a file response."""
+        import io
         from uuid import UUID
-        from apps.invoicing.services import DocumentService
+        from apps.invoicing.services import PDFService
 
-        # Get document for filename
-        document = DocumentService.get_document(UUID(str(org_id)), UUID(str(document_id)))
+        document, pdf = PDFService.get_pdf(UUID(str(org_id)), UUID(str(document_id)))
 
-        # Generate PDF stream
-        pdf_stream = DocumentService.generate_pdf(
-            org_id=UUID(str(org_id)), document_id=UUID(str(document_id))
+        response = FileResponse(io.BytesIO(pdf), content_type="application/pdf")
+        response["Content-Disposition"] = f'inline; filename="{document.document_number}.pdf"'
+
+        return response
+
+
+class InvoicePDFExportView(APIView):
+    """
+    POST: Start a bulk PDF export
+
+    Renders every document matching the filters in parallel Celery
+    workers and packs them into one ZIP. Returns the job status (202);
+    poll the status endpoint and download the ZIP once COMPLETED.
+    Requires: CanExportData permission
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember, CanExportData]
+
+    @wrap_response
+    def post(self, request, org_id: str) -> Response:
+        """Start an export job."""
+        from uuid import UUID
+
+        serializer = PDFExportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        job = PDFExportService.start_export(
+            org_id=UUID(str(org_id)),
+            user_id=request.user.id,
+            **serializer.validated_data,
         )
 
-        response = FileResponse(pdf_stream, content_type="application/pdf")
-        response["Content-Disposition"] = f'inline; filename="{document.sequence_number}.pdf"'
+        return Response(job, status=status.HTTP_202_ACCEPTED)
 
-        return response
+
+class InvoicePDFExportStatusView(APIView):
+    """
+    GET: Bulk PDF export progress
+
+    Reports per-document progress and throughput.
+    Requires: CanExportData permission
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember, CanExportData]
+
+    @wrap_response
+    def get(self, request, org_id: str, job_id: str) -> Response:
+        """Get export job status."""
+        from uuid import UUID
+
+        return Response(PDFExportService.get_status(UUID(str(org_id)), job_id))
+
+
+class InvoicePDFExportDownloadView(APIView):
+    """
+    GET: Download a completed bulk PDF export as a ZIP file
+
+    Requires: CanExportData permission
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember, CanExportData]
+
+    @wrap_response
+    def get(self, request, org_id: str, job_id: str) -> FileResponse:
+        """Stream the export ZIP from disk."""
+        from uuid import UUID
+
+        path = PDFExportService.archive_path(UUID(str(org_id)), job_id)
+
+        return FileResponse(
+            open(path, "rb"),
+            as_attachment=True,
+            filename=f"documents-{job_id}.zip",
+            content_type="application/zip",
+        )
 
 
 class InvoiceSendView(APIView):
@@ -0,0 +1,65 @@
+"""
+Rebuild or verify account balance snapshots.
+
+Usage:
+    python manage.py rebuild_balance_snapshots              # rebuild all orgs
+    python manage.py rebuild_balance_snapshots --verify     # report drift only
+    python manage.py rebuild_balance_snapshots --org <uuid>
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.core.models import Organisation
+from apps.journal.services import BalanceSnapshotService
+
+
+class Command(BaseCommand):
+    help = "Rebuild journal.account_period_balance from journal.line, or verify it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", dest="org_id", help="Only process this organisation ID")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare snapshots against a full recomputation without writing",
+        )
+
+    def handle(self, *args, **options):
+        org_ids = (
+            [options["org_id"]]
+            if options["org_id"]
+            else list(Organisation.objects.values_list("id", flat=True))
+        )
+
+        drifted = 0
+        for org_id in org_ids:
+            with transaction.atomic():
+                # Scope RLS to the organisation being processed
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL app.current_org_id = %s", [str(org_id)])
+
+                if options["verify"]:
+                    mismatches = BalanceSnapshotService.verify(org_id)
+                    if mismatches:
+                        drifted += 1
+                        self.stdout.write(
+                            self.style.ERROR(f"{org_id}: {len(mismatches)} mismatched snapshot(s)")
+                        )
+                        for row in mismatches:
+                            self.stdout.write(
+                                f"  account={row['account_id']} period={row['fiscal_period_id']} "
+                                f"debit {row['stored_debit']} != {row['expected_debit']}, "
+                                f"credit {row['stored_credit']} != {row['expected_credit']}, "
+                                f"lines {row['stored_line_count']} != {row['expected_line_count']}"
+                            )
+                    else:
+                        self.stdout.write(f"{org_id}: OK")
+                else:
+                    written = BalanceSnapshotService.rebuild(org_id)
+                    self.stdout.write(f"{org_id}: rebuilt {written} snapshot row(s)")
+
+        if options["verify"] and drifted:
+            raise CommandError(f"{drifted} organisation(s) have inconsistent balance snapshots.")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(org_ids)} organisation(s)."))
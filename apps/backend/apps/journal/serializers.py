@@ -72,19 +72,29 @@ class JournalEntryListSerializer(serializers.ModelSerializer):
             "line_count",
         ]
 
+    # Totals come from JournalService.annotate_totals; entries that were not
+    # annotated fall back to querying their lines.
+
     def get_total_debits(self, obj: JournalEntry) -> str:
         """Get total debits."""
-        total = sum(line.debit for line in obj.lines.all())
+        total = getattr(obj, "total_debits", None)
+        if total is None:
+            total = sum(line.debit for line in obj.lines.all())
         return str(total)
 
     def get_total_credits(self, obj: JournalEntry) -> str:
         """Get total credits."""
-        total = sum(line.credit for line in obj.lines.all())
+        total = getattr(obj, "total_credits", None)
+        if total is None:
+            total = sum(line.credit for line in obj.lines.all())
         return str(total)
 
     def get_line_count(self, obj: JournalEntry) -> int:
         """Get number of lines."""
-        return obj.lines.count()
+        count = getattr(obj, "line_count", None)
+        if count is None:
+            count = obj.lines.count()
+        return count
 
 
 class JournalEntryDetailSerializer(serializers.ModelSerializer):
@@ -5,9 +5,17 @@ Business logic services for journal entries and double-entry bookkeeping.
 """
 
 from .journal_service import JournalService, SOURCE_TYPES, ENTRY_TYPES, ENTRY_TYPE_TO_SOURCE_TYPE
+from .trial_balance_service import TrialBalanceService
+from .balance_snapshot_service import BalanceSnapshotService
+from .posting_account_service import PostingAccountService
+from .ledger_version_service import LedgerVersionService
 
 __all__ = [
     "JournalService",
+    "TrialBalanceService",
+    "BalanceSnapshotService",
+    "PostingAccountService",
+    "LedgerVersionService",
     "SOURCE_TYPES",
     "ENTRY_TYPES",
     "ENTRY_TYPE_TO_SOURCE_TYPE",
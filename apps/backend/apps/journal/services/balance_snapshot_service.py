@@ -0,0 +1,298 @@
+"""
+Account balance snapshot service for LedgerSG.
+
+Maintains journal.account_period_balance: running debit/credit totals per
+(org, account, fiscal period). Journal lines are immutable (enforced by
+journal.prevent_line_mutation), so snapshots are updated incrementally
+when an entry is posted and never need to be decremented. Reversals are
+ordinary entries and are applied the same way.
+
+Balance lookups then sum one row per closed period plus the lines of the
+single period containing the as-of date, instead of the full line history.
+"""
+
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+from uuid import UUID
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection, transaction
+
+from apps.core.models import FiscalPeriod
+from common.decimal_utils import money
+
+
+class BalanceSnapshotService:
+    """Service class for per-period account balance snapshots."""
+
+    @staticmethod
+    def apply_lines(
+        org_id: UUID,
+        fiscal_period: FiscalPeriod,
+        lines: Iterable[Tuple[UUID, Decimal, Decimal]],
+    ) -> None:
+        """
+        Add posted lines to the period snapshots in a single upsert.
+
+        Must be called inside the transaction that inserts the lines.
+
+        Args:
+            org_id: Organisation ID
+            fiscal_period: Fiscal period the entry was posted to
+            lines: Iterable of (account_id, debit, credit)
+        """
+        totals: Dict[UUID, List[Any]] = {}
+        for account_id, debit, credit in lines:
+            bucket = totals.setdefault(account_id, [Decimal("0"), Decimal("0"), 0])
+            bucket[0] += debit
+            bucket[1] += credit
+            bucket[2] += 1
+
+        if not totals:
+            return
+
+        values_sql = []
+        params: List[Any] = []
+        for account_id, (debit, credit, count) in totals.items():
+            values_sql.append("(%s, %s, %s, %s, %s, %s, %s, %s)")
+            params.extend(
+                [
+                    str(org_id),
+                    str(account_id),
+                    str(fiscal_period.id),
+                    fiscal_period.start_date,
+                    fiscal_period.end_date,
+                    debit,
+                    credit,
+                    count,
+                ]
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO journal.account_period_balance (
+                    org_id, account_id, fiscal_period_id, period_start, period_end,
+                    debit_total, credit_total, line_count
+                )
+                VALUES {", ".join(values_sql)}
+                ON CONFLICT (org_id, account_id, fiscal_period_id) DO UPDATE SET
+                    debit_total = journal.account_period_balance.debit_total + EXCLUDED.debit_total,
+                    credit_total = journal.account_period_balance.credit_total + EXCLUDED.credit_total,
+                    line_count = journal.account_period_balance.line_count + EXCLUDED.line_count,
+                    updated_at = NOW()
+                """,
+                params,
+            )
+
+    @staticmethod
+    def get_balances(
+        org_id: UUID,
+        date_to: Optional[date] = None,
+        account_ids: Optional[List[UUID]] = None,
+    ) -> Dict[UUID, Dict[str, Decimal]]:
+        """
+        Get debit/credit totals per account from the snapshots.
+
+        Periods ending on or before date_to are read from the snapshot
+        table; only the lines of the period containing date_to are
+        scanned.
+
+        Args:
+            org_id: Organisation ID
+            date_to: Balance as of date (inclusive); None for all time
+            account_ids: Restrict to these accounts
+
+        Returns:
+            Mapping of account_id -> {"debit", "credit", "balance"}
+        """
+        snapshot_filters = ""
+        line_filters = ""
+        account_params: List[Any] = []
+        if account_ids is not None:
+            if not account_ids:
+                return {}
+            snapshot_filters = " AND s.account_id = ANY(%s::uuid[])"
+            line_filters = " AND l.account_id = ANY(%s::uuid[])"
+            account_params = [[str(a) for a in account_ids]]
+
+        if date_to is None:
+            query = f"""
+                SELECT s.account_id, SUM(s.debit_total), SUM(s.credit_total)
+                FROM journal.account_period_balance s
+                WHERE s.org_id = %s{snapshot_filters}
+                GROUP BY s.account_id
+            """
+            params = [str(org_id)] + account_params
+        else:
+            query = f"""
+                SELECT account_id, SUM(debit), SUM(credit)
+                FROM (
+                    SELECT s.account_id, s.debit_total AS debit, s.credit_total AS credit
+                    FROM journal.account_period_balance s
+                    WHERE s.org_id = %s AND s.period_end <= %s{snapshot_filters}
+
+                    UNION ALL
+
+                    SELECT l.account_id, l.debit, l.credit
+                    FROM journal.line l
+                    JOIN journal.entry e ON e.id = l.entry_id
+                    JOIN core.fiscal_period p ON p.id = e.fiscal_period_id
+                    WHERE l.org_id = %s
+                        AND p.start_date <= %s AND p.end_date > %s
+                        AND e.entry_date <= %s{line_filters}
+                ) t
+                GROUP BY account_id
+            """
+            params = (
+                [str(org_id), date_to]
+                + account_params
+                + [str(org_id), date_to, date_to, date_to]
+                + account_params
+            )
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        result = {}
+        for account_id, debit, credit in rows:
+            debits = money(debit or 0)
+            credits = money(credit or 0)
+            result[account_id] = {
+                "debit": debits,
+                "credit": credits,
+                "balance": debits - credits,
+            }
+        return result
+
+    @staticmethod
+    def get_account_balance(
+        org_id: UUID, account_id: UUID, date_to: Optional[date] = None
+    ) -> Decimal:
+        """
+        Get the debit-minus-credit balance for one account.
+
+        Args:
+            org_id: Organisation ID
+            account_id: Account ID
+            date_to: Balance as of date (inclusive)
+
+        Returns:
+            Account balance
+        """
+        balances = BalanceSnapshotService.get_balances(
+            org_id, date_to=date_to, account_ids=[account_id]
+        )
+        for totals in balances.values():
+            return totals["balance"]
+        return Decimal("0.0000")
+
+    @staticmethod
+    def rebuild(org_id: UUID) -> int:
+        """
+        Recompute all snapshots for an organisation from journal.line.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            Number of snapshot rows written
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "DELETE FROM journal.account_period_balance WHERE org_id = %s",
+                    [str(org_id)],
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO journal.account_period_balance (
+                        org_id, account_id, fiscal_period_id, period_start, period_end,
+                        debit_total, credit_total, line_count
+                    )
+                    SELECT
+                        l.org_id, l.account_id, e.fiscal_period_id, p.start_date, p.end_date,
+                        SUM(l.debit), SUM(l.credit), COUNT(*)
+                    FROM journal.line l
+                    JOIN journal.entry e ON e.id = l.entry_id
+                    JOIN core.fiscal_period p ON p.id = e.fiscal_period_id
+                    WHERE l.org_id = %s
+                    GROUP BY l.org_id, l.account_id, e.fiscal_period_id, p.start_date, p.end_date
+                    """,
+                    [str(org_id)],
+                )
+                return cursor.rowcount
+
+    @staticmethod
+    def verify(org_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Compare stored snapshots against a full recomputation.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            List of mismatches (empty when snapshots are consistent), each with
+            account_id, fiscal_period_id, and stored/expected debit, credit
+            and line count
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH expected AS (
+                    SELECT
+                        l.account_id, e.fiscal_period_id,
+                        SUM(l.debit) AS debit_total,
+                        SUM(l.credit) AS credit_total,
+                        COUNT(*) AS line_count
+                    FROM journal.line l
+                    JOIN journal.entry e ON e.id = l.entry_id
+                    WHERE l.org_id = %s
+                    GROUP BY l.account_id, e.fiscal_period_id
+                ),
+                stored AS (
+                    SELECT account_id, fiscal_period_id, debit_total, credit_total, line_count
+                    FROM journal.account_period_balance
+                    WHERE org_id = %s
+                )
+                SELECT
+                    COALESCE(x.account_id, s.account_id),
+                    COALESCE(x.fiscal_period_id, s.fiscal_period_id),
+                    s.debit_total, x.debit_total,
+                    s.credit_total, x.credit_total,
+                    s.line_count, x.line_count
+                FROM expected x
+                FULL OUTER JOIN stored s
+                    ON s.account_id = x.account_id
+                    AND s.fiscal_period_id = x.fiscal_period_id
+                WHERE COALESCE(s.debit_total, 0) <> COALESCE(x.debit_total, 0)
+                    OR COALESCE(s.credit_total, 0) <> COALESCE(x.credit_total, 0)
+                    OR COALESCE(s.line_count, 0) <> COALESCE(x.line_count, 0)
+                """,
+                [str(org_id), str(org_id)],
+            )
+            rows = cursor.fetchall()
+
+        return [
+            {
+                "account_id": str(account_id),
+                "fiscal_period_id": str(period_id),
+                "stored_debit": str(stored_debit or 0),
+                "expected_debit": str(expected_debit or 0),
+                "stored_credit": str(stored_credit or 0),
+                "expected_credit": str(expected_credit or 0),
+                "stored_line_count": stored_count or 0,
+                "expected_line_count": expected_count or 0,
+            }
+            for (
+                account_id,
+                period_id,
+                stored_debit,
+                expected_debit,
+                stored_credit,
+                expected_credit,
+                stored_count,
+                expected_count,
+            ) in rows
+        ]
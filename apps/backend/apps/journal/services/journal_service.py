@@ -14,17 +14,24 @@ FIELD ALIGNMENT (SQL Schema v1.0.2):
 - source_id: UUID - matches journal.entry.source_id
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from uuid import UUID
 from decimal import Decimal
 from datetime import date
 from django.utils import timezone
 
-from django.db import connection, transaction
+from django.db import connection, transaction, models
+from django.db.models.functions import Coalesce
 
 from apps.core.models import JournalEntry, JournalLine, Account, FiscalPeriod, InvoiceDocument
 from common.exceptions import ValidationError, DuplicateResource, ResourceNotFound
 from common.decimal_utils import money, sum_money
+from common.pagination import encode_keyset_cursor, decode_keyset_cursor
+
+from .balance_snapshot_service import BalanceSnapshotService
+from .ledger_version_service import LedgerVersionService
+from .posting_account_service import PostingAccountService
+from .trial_balance_service import TrialBalanceService
 
 
 # Journal source types (aligned with SQL schema journal.entry.source_type CHECK constraint)
@@ -75,10 +82,13 @@ class JournalService:
         source_id: Optional[UUID] = None,
         entry_type: Optional[str] = None,
         source_document_id: Optional[UUID] = None,
-    ) -> List[JournalEntry]:
+    ) -> models.QuerySet:
         """
         List journal entries.
 
+        Entries are annotated with total_debits, total_credits and
+        line_count in the same query (see annotate_totals).
+
         Args:
             org_id: Organisation ID
             source_type: Filter by source type (SQL schema field)
@@ -91,8 +101,139 @@ class JournalService:
             source_document_id: (Deprecated) Use source_id instead
 
         Returns:
-            List of JournalEntry instances
+            QuerySet of annotated JournalEntry instances, newest first
+        """
+        queryset = JournalService._filter_entries(
+            org_id,
+            source_type,
+            fiscal_period_id,
+            account_id,
+            date_from,
+            date_to,
+            source_id,
+            entry_type,
+            source_document_id,
+        )
+        return JournalService.annotate_totals(queryset).order_by("-entry_date", "-entry_number")
+
+    @staticmethod
+    def list_entries_page(
+        org_id: UUID,
+        source_type: Optional[str] = None,
+        fiscal_period_id: Optional[UUID] = None,
+        account_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        source_id: Optional[UUID] = None,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+    ) -> Tuple[List[JournalEntry], Optional[str]]:
+        """
+        List one page of journal entries using keyset pagination.
+
+        Entries are ordered newest first by (entry_date, entry_number, id),
+        a unique key, so ties on entry_date never repeat or skip rows across
+        pages. The cursor encodes the last row of the previous page and each
+        page is an index range scan on idx_journal_entry_org_keyset.
+
+        Args:
+            org_id: Organisation ID
+            source_type: Filter by source type
+            fiscal_period_id: Filter by fiscal period
+            account_id: Filter by account (lines)
+            date_from: Filter from date
+            date_to: Filter to date
+            source_id: Filter by source document ID
+            cursor: Token returned as next_cursor by the previous page
+            page_size: Maximum entries per page
+
+        Returns:
+            Tuple of (annotated entries, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValidationError: If the cursor is malformed
         """
+        queryset = JournalService._filter_entries(
+            org_id, source_type, fiscal_period_id, account_id, date_from, date_to, source_id
+        )
+
+        if cursor:
+            entry_date, entry_number, entry_id = decode_keyset_cursor(cursor, 3)
+            try:
+                entry_date = date.fromisoformat(entry_date)
+                entry_number = int(entry_number)
+                entry_id = UUID(entry_id)
+            except ValueError as exc:
+                raise ValidationError("Invalid cursor.") from exc
+
+            # Row-value comparison so the cursor bounds an index range scan
+            table = f'"{JournalEntry._meta.db_table}"'
+            queryset = queryset.extra(
+                where=[
+                    f"({table}.entry_date, {table}.entry_number, {table}.id)"
+                    " < (%s, %s, %s::uuid)"
+                ],
+                params=[entry_date, entry_number, str(entry_id)],
+            )
+
+        rows = list(
+            JournalService.annotate_totals(queryset).order_by(
+                "-entry_date", "-entry_number", "-id"
+            )[: page_size + 1]
+        )
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_cursor = encode_keyset_cursor(
+                [last.entry_date.isoformat(), last.entry_number, last.id]
+            )
+
+        return rows, next_cursor
+
+    @staticmethod
+    def count_entries(
+        org_id: UUID,
+        source_type: Optional[str] = None,
+        fiscal_period_id: Optional[UUID] = None,
+        account_id: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        source_id: Optional[UUID] = None,
+    ) -> int:
+        """
+        Count the journal entries matching the list filters (all pages).
+
+        Args:
+            org_id: Organisation ID
+            source_type: Filter by source type
+            fiscal_period_id: Filter by fiscal period
+            account_id: Filter by account (lines)
+            date_from: Filter from date
+            date_to: Filter to date
+            source_id: Filter by source document ID
+
+        Returns:
+            Number of matching entries
+        """
+        return JournalService._filter_entries(
+            org_id, source_type, fiscal_period_id, account_id, date_from, date_to, source_id
+        ).count()
+
+    @staticmethod
+    def _filter_entries(
+        org_id: UUID,
+        source_type: Optional[str],
+        fiscal_period_id: Optional[UUID],
+        account_id: Optional[UUID],
+        date_from: Optional[date],
+        date_to: Optional[date],
+        source_id: Optional[UUID],
+        entry_type: Optional[str] = None,
+        source_document_id: Optional[UUID] = None,
+    ) -> models.QuerySet:
+        """Build the filtered journal entry queryset shared by the list methods."""
         queryset = JournalEntry.objects.filter(org_id=org_id)
 
         # Handle backwards compatibility
@@ -118,12 +259,35 @@ class JournalService:
             queryset = queryset.filter(source_id=effective_source_id)
 
         if account_id:
-            entry_ids = JournalLine.objects.filter(account_id=account_id).values_list(
-                "entry_id", flat=True
+            # Semi-join: stop at the first matching line per entry
+            queryset = queryset.filter(
+                models.Exists(
+                    JournalLine.objects.filter(entry_id=models.OuterRef("pk"), account_id=account_id)
+                )
             )
-            queryset = queryset.filter(id__in=entry_ids)
 
-        return list(queryset.order_by("-entry_date", "-entry_number"))
+        return queryset
+
+    @staticmethod
+    def annotate_totals(queryset: models.QuerySet) -> models.QuerySet:
+        """
+        Annotate journal entries with their line totals.
+
+        Adds total_debits, total_credits and line_count, aggregated in SQL
+        so list serializers do not query lines per entry.
+
+        Args:
+            queryset: JournalEntry queryset
+
+        Returns:
+            Annotated queryset
+        """
+        zero = models.Value(Decimal("0.0000"), output_field=models.DecimalField())
+        return queryset.annotate(
+            total_debits=Coalesce(models.Sum("lines__debit"), zero),
+            total_credits=Coalesce(models.Sum("lines__credit"), zero),
+            line_count=models.Count("lines"),
+        )
 
     @staticmethod
     def get_entry(org_id: UUID, entry_id: UUID) -> JournalEntry:
@@ -195,14 +359,8 @@ class JournalService:
             valid_types = ", ".join(SOURCE_TYPES.keys())
             raise ValidationError(f"Invalid source type. Valid: {valid_types}")
 
-        if len(lines) < 2:
-            raise ValidationError("Journal entry must have at least 2 lines.")
-
-        total_debits = sum_money(line.get("debit", 0) for line in lines)
-        total_credits = sum_money(line.get("credit", 0) for line in lines)
-
-        if abs(total_debits - total_credits) > Decimal("0.001"):
-            raise ValidationError(f"Debits ({total_debits}) must equal credits ({total_credits}).")
+        # Validate all lines before touching the database
+        parsed_lines = JournalService._parse_lines(lines)
 
         if not fiscal_period_id:
             fiscal_period = JournalService._get_fiscal_period(org_id, entry_date)
@@ -212,12 +370,15 @@ class JournalService:
         else:
             fiscal_period = JournalService._validate_fiscal_period(org_id, fiscal_period_id)
 
+        # Resolve accounts as a set (one query)
+        JournalService._resolve_accounts(org_id, [line[0] for line in parsed_lines])
+
         with transaction.atomic():
             entry_number = JournalService._get_next_entry_number(org_id)
 
             journal_entry = JournalEntry.objects.create(
                 org_id=org_id,
-                fiscal_year_id=fiscal_period.fiscal_year.id,
+                fiscal_year_id=fiscal_period.fiscal_year_id,
                 fiscal_period_id=fiscal_period_id,
                 entry_number=entry_number,
                 entry_date=entry_date,
@@ -228,34 +389,135 @@ class JournalService:
                 posted_at=timezone.now(),
             )
 
-            for line_data in lines:
-                account_id = line_data.get("account_id")
-                if not account_id:
-                    raise ValidationError("Each line must have an account_id.")
-
-                try:
-                    account = Account.objects.get(id=account_id, org_id=org_id)
-                except Account.DoesNotExist:
-                    raise ResourceNotFound(f"Account {account_id} not found")
-
-                debit = money(line_data.get("debit", 0))
-                credit = money(line_data.get("credit", 0))
-
-                if debit == 0 and credit == 0:
-                    raise ValidationError("Line must have either debit or credit amount.")
-
-                JournalLine.objects.create(
-                    entry=journal_entry,
-                    org_id=org_id,
-                    account=account,
-                    description=line_data.get("description", ""),
-                    debit=debit,
-                    credit=credit,
-                    line_number=lines.index(line_data) + 1,
-                )
+            # Single multi-row INSERT. The deferred balance trigger
+            # (journal.validate_entry_balance_on_line) still fires per row at COMMIT.
+            JournalLine.objects.bulk_create(
+                [
+                    JournalLine(
+                        entry=journal_entry,
+                        org_id=org_id,
+                        account_id=account_id,
+                        description=description,
+                        debit=debit,
+                        credit=credit,
+                        line_number=line_number,
+                    )
+                    for line_number, (account_id, debit, credit, description) in enumerate(
+                        parsed_lines, start=1
+                    )
+                ]
+            )
+
+            BalanceSnapshotService.apply_lines(
+                org_id,
+                fiscal_period,
+                [(account_id, debit, credit) for account_id, debit, credit, _ in parsed_lines],
+            )
+            LedgerVersionService.bump(org_id)
 
             return journal_entry
 
+    @staticmethod
+    def create_entries(
+        org_id: UUID,
+        entries: List[Dict[str, Any]],
+        user_id: Optional[UUID] = None,
+    ) -> List[JournalEntry]:
+        """
+        Create many journal entries in a fixed number of statements.
+
+        Used by batch posting. Entry numbers are reserved as one block,
+        headers and lines are each written with a single multi-row INSERT,
+        and balance snapshots are upserted once per fiscal period touched.
+
+        Args:
+            org_id: Organisation ID
+            entries: List of entry dictionaries with:
+                - entry_date: Entry date
+                - fiscal_period: Open FiscalPeriod instance for entry_date
+                - source_type: Source type per SQL schema
+                - narration: Entry narration
+                - source_id: Source document ID (optional)
+                - lines: Line dictionaries as accepted by create_entry
+            user_id: Posting user ID
+
+        Returns:
+            Created JournalEntry instances, in input order
+
+        Raises:
+            ValidationError: If any entry is invalid (nothing is written)
+            ResourceNotFound: If any referenced account doesn't exist
+        """
+        if not entries:
+            return []
+
+        parsed_entries = []
+        for entry_data in entries:
+            if entry_data["source_type"] not in SOURCE_TYPES:
+                valid_types = ", ".join(SOURCE_TYPES.keys())
+                raise ValidationError(f"Invalid source type. Valid: {valid_types}")
+            parsed_entries.append(JournalService._parse_lines(entry_data["lines"]))
+
+        JournalService._resolve_accounts(
+            org_id, [line[0] for parsed in parsed_entries for line in parsed]
+        )
+
+        with transaction.atomic():
+            first_number = JournalService._reserve_entry_numbers(org_id, len(entries))
+            posted_at = timezone.now()
+
+            journal_entries = JournalEntry.objects.bulk_create(
+                [
+                    JournalEntry(
+                        org_id=org_id,
+                        fiscal_year_id=entry_data["fiscal_period"].fiscal_year_id,
+                        fiscal_period_id=entry_data["fiscal_period"].id,
+                        entry_number=first_number + offset,
+                        entry_date=entry_data["entry_date"],
+                        source_type=entry_data["source_type"],
+                        narration=entry_data.get("narration", ""),
+                        source_id=entry_data.get("source_id"),
+                        posted_by_id=user_id,
+                        posted_at=posted_at,
+                    )
+                    for offset, entry_data in enumerate(entries)
+                ]
+            )
+
+            journal_lines = []
+            period_lines: Dict[UUID, List[Tuple[UUID, Decimal, Decimal]]] = {}
+            periods: Dict[UUID, FiscalPeriod] = {}
+            for journal_entry, entry_data, parsed_lines in zip(
+                journal_entries, entries, parsed_entries
+            ):
+                fiscal_period = entry_data["fiscal_period"]
+                periods[fiscal_period.id] = fiscal_period
+                snapshot_lines = period_lines.setdefault(fiscal_period.id, [])
+
+                for line_number, (account_id, debit, credit, description) in enumerate(
+                    parsed_lines, start=1
+                ):
+                    journal_lines.append(
+                        JournalLine(
+                            entry=journal_entry,
+                            org_id=org_id,
+                            account_id=account_id,
+                            description=description,
+                            debit=debit,
+                            credit=credit,
+                            line_number=line_number,
+                        )
+                    )
+                    snapshot_lines.append((account_id, debit, credit))
+
+            JournalLine.objects.bulk_create(journal_lines)
+
+            for period_id, snapshot_lines in period_lines.items():
+                BalanceSnapshotService.apply_lines(org_id, periods[period_id], snapshot_lines)
+            LedgerVersionService.bump(org_id)
+
+            return journal_entries
+
     @staticmethod
     def post_invoice(
         org_id: UUID, invoice: InvoiceDocument, user_id: Optional[UUID] = None
@@ -271,18 +533,52 @@ class JournalService:
         Returns:
             Created JournalEntry instance
         """
+        lines = JournalService.build_invoice_lines(org_id, invoice, invoice.lines.all())
+
+        journal_entry = JournalService.create_entry(
+            org_id=org_id,
+            entry_date=invoice.issue_date,
+            source_type=invoice.document_type,
+            narration=f"{invoice.document_type} {invoice.document_number}",
+            lines=lines,
+            source_id=invoice.id,
+            user_id=user_id,
+        )
+
+        invoice.journal_entry = journal_entry
+        invoice.save()
+
+        return journal_entry
+
+    @staticmethod
+    def build_invoice_lines(
+        org_id: UUID,
+        invoice: InvoiceDocument,
+        invoice_lines: Iterable[Any],
+    ) -> List[Dict[str, Any]]:
+        """
+        Build the journal lines for an invoice or purchase document.
+
+        Args:
+            org_id: Organisation ID
+            invoice: InvoiceDocument instance
+            invoice_lines: The document's InvoiceLine rows
+
+        Returns:
+            List of line dictionaries for create_entry / create_entries
+        """
         is_purchase = invoice.document_type in ("PURCHASE_INVOICE", "PURCHASE_CREDIT_NOTE", "PURCHASE_DEBIT_NOTE")
-        
+
         if is_purchase:
-            main_account = JournalService._get_ap_account(org_id)
+            main_account = PostingAccountService.get_account(org_id, "ap")
         else:
-            main_account = JournalService._get_ar_account(org_id)
+            main_account = PostingAccountService.get_account(org_id, "ar")
 
         lines = []
         expense_revenue_accounts = {}
         gst_amount = Decimal("0.00")
 
-        for line in invoice.lines.all():
+        for line in invoice_lines:
             account_id = line.account_id
             amount = line.line_amount
 
@@ -293,7 +589,7 @@ class JournalService:
             gst_amount += line.gst_amount
 
         total_with_gst = invoice.total_incl
-        
+
         # Main AR/AP line
         if is_purchase:
             # Liability increases (Credit)
@@ -335,7 +631,7 @@ class JournalService:
         if gst_amount > 0:
             if is_purchase:
                 # Input tax (Asset increases - Debit)
-                gst_account = JournalService._get_gst_input_account(org_id)
+                gst_account = PostingAccountService.get_account(org_id, "gst_input")
                 lines.append({
                     "account_id": gst_account.id,
                     "debit": gst_amount,
@@ -344,7 +640,7 @@ class JournalService:
                 })
             else:
                 # Output tax (Liability increases - Credit)
-                gst_account = JournalService._get_gst_output_account(org_id)
+                gst_account = PostingAccountService.get_account(org_id, "gst_output")
                 lines.append({
                     "account_id": gst_account.id,
                     "debit": Decimal("0.00"),
@@ -352,23 +648,7 @@ class JournalService:
                     "description": f"GST Output for {invoice.document_number}",
                 })
 
-        # Determine source_type
-        source_type = invoice.document_type
-
-        journal_entry = JournalService.create_entry(
-            org_id=org_id,
-            entry_date=invoice.issue_date,
-            source_type=source_type,
-            narration=f"{invoice.document_type} {invoice.document_number}",
-            lines=lines,
-            source_id=invoice.id,
-            user_id=user_id,
-        )
-
-        invoice.journal_entry = journal_entry
-        invoice.save()
-
-        return journal_entry
+        return lines
 
     @staticmethod
     def create_reversal(
@@ -451,6 +731,8 @@ class JournalService:
         """
         Get running balance for an account.
 
+        Reads per-period snapshots rather than re-summing every line.
+
         Args:
             org_id: Organisation ID
             account_id: Account ID
@@ -459,66 +741,134 @@ class JournalService:
         Returns:
             Account balance
         """
-        from django.db.models import Sum
+        return BalanceSnapshotService.get_account_balance(org_id, account_id, date_to=date_to)
 
-        lines = JournalLine.objects.filter(
-            journal_entry__org_id=org_id, account_id=account_id, journal_entry__is_posted=True
-        )
+    @staticmethod
+    def get_trial_balance(
+        org_id: UUID,
+        date_to: Optional[date] = None,
+        fiscal_year_id: Optional[UUID] = None,
+        fiscal_period_id: Optional[UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get trial balance.
 
-        if date_to:
-            lines = lines.filter(journal_entry__entry_date__lte=date_to)
+        Delegates to TrialBalanceService, which computes all accounts
+        in a single grouped query. Results are cached under the ledger
+        version (ReportCache).
 
-        totals = lines.aggregate(total_debits=Sum("debit"), total_credits=Sum("credit"))
+        Args:
+            org_id: Organisation ID
+            date_to: Balance as of date
+            fiscal_year_id: Restrict to a fiscal year
+            fiscal_period_id: Restrict to a fiscal period
 
-        debits = totals["total_debits"] or Decimal("0.00")
-        credits = totals["total_credits"] or Decimal("0.00")
+        Returns:
+            List of account balances
+        """
+        from apps.reporting.services.report_cache import ReportCache
+
+        return ReportCache.get_or_compute(
+            org_id,
+            "trial_balance",
+            [date_to, fiscal_year_id, fiscal_period_id],
+            lambda: JournalService._compute_trial_balance(
+                org_id, date_to, fiscal_year_id, fiscal_period_id
+            ),
+        )
+
+    @staticmethod
+    def _compute_trial_balance(
+        org_id: UUID,
+        date_to: Optional[date],
+        fiscal_year_id: Optional[UUID],
+        fiscal_period_id: Optional[UUID],
+    ) -> List[Dict[str, Any]]:
+        rows = TrialBalanceService.compute(
+            org_id=org_id,
+            date_to=date_to,
+            fiscal_year_id=fiscal_year_id,
+            fiscal_period_id=fiscal_period_id,
+        )
 
-        return debits - credits
+        return [
+            {
+                "account_id": str(row["id"]),
+                "account_code": row["code"],
+                "account_name": row["name"],
+                "account_type": row["account_type"],
+                "total_debits": str(row["total_debit"]),
+                "total_credits": str(row["total_credit"]),
+                "balance": str(row["balance"]),
+            }
+            for row in rows
+        ]
 
     @staticmethod
-    def get_trial_balance(org_id: UUID, date_to: Optional[date] = None) -> List[Dict[str, Any]]:
+    def _parse_lines(lines: List[Dict[str, Any]]) -> List[Tuple[UUID, Decimal, Decimal, str]]:
         """
-        Get trial balance.
+        Validate entry lines and normalise them for insertion.
 
         Args:
-            org_id: Organisation ID
-            date_to: Balance as of date
+            lines: List of line dictionaries (account_id, debit, credit, description)
 
         Returns:
-            List of account balances
+            List of (account_id, debit, credit, description) tuples in input order
+
+        Raises:
+            ValidationError: If the entry has fewer than 2 lines, is unbalanced,
+                or a line is missing an account or amount
         """
-        from django.db.models import Sum
+        if len(lines) < 2:
+            raise ValidationError("Journal entry must have at least 2 lines.")
 
-        accounts = Account.objects.filter(org_id=org_id, is_active=True)
+        total_debits = sum_money(line.get("debit", 0) for line in lines)
+        total_credits = sum_money(line.get("credit", 0) for line in lines)
 
-        result = []
-        for account in accounts:
-            lines = JournalLine.objects.filter(
-                journal_entry__org_id=org_id, account=account, journal_entry__is_posted=True
-            )
+        if abs(total_debits - total_credits) > Decimal("0.001"):
+            raise ValidationError(f"Debits ({total_debits}) must equal credits ({total_credits}).")
 
-            if date_to:
-                lines = lines.filter(journal_entry__entry_date__lte=date_to)
+        parsed_lines = []
+        for line_data in lines:
+            account_id = line_data.get("account_id")
+            if not account_id:
+                raise ValidationError("Each line must have an account_id.")
 
-            totals = lines.aggregate(total_debits=Sum("debit"), total_credits=Sum("credit"))
+            try:
+                account_id = UUID(str(account_id))
+            except ValueError:
+                raise ValidationError(f"Invalid account_id: {account_id}")
 
-            debits = totals["total_debits"] or Decimal("0.00")
-            credits = totals["total_credits"] or Decimal("0.00")
-            balance = debits - credits
+            debit = money(line_data.get("debit", 0))
+            credit = money(line_data.get("credit", 0))
 
-            result.append(
-                {
-                    "account_id": str(account.id),
-                    "account_code": account.code,
-                    "account_name": account.name,
-                    "account_type": account.account_type,
-                    "total_debits": str(debits),
-                    "total_credits": str(credits),
-                    "balance": str(balance),
-                }
-            )
+            if debit == 0 and credit == 0:
+                raise ValidationError("Line must have either debit or credit amount.")
 
-        return result
+            parsed_lines.append((account_id, debit, credit, line_data.get("description", "")))
+
+        return parsed_lines
+
+    @staticmethod
+    def _resolve_accounts(org_id: UUID, account_ids: List[UUID]) -> None:
+        """
+        Verify that every referenced account belongs to the organisation.
+
+        Args:
+            org_id: Organisation ID
+            account_ids: Account IDs referenced by the entry lines
+
+        Raises:
+            ResourceNotFound: If any account doesn't exist in the org
+        """
+        wanted = set(account_ids)
+        found = set(
+            Account.objects.filter(org_id=org_id, id__in=wanted).values_list("id", flat=True)
+        )
+
+        for account_id in account_ids:
+            if account_id not in found:
+                raise ResourceNotFound(f"Account {account_id} not found")
 
     @staticmethod
     def _get_next_entry_number(org_id: UUID) -> int:
@@ -539,6 +889,27 @@ class JournalService:
 
         return next_num
 
+    @staticmethod
+    def _reserve_entry_numbers(org_id: UUID, count: int) -> int:
+        """
+        Reserve a contiguous block of journal entry numbers.
+
+        Args:
+            org_id: Organisation ID
+            count: Number of entry numbers to reserve
+
+        Returns:
+            First entry number in the block
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT core.reserve_document_numbers(%s, %s, %s)",
+                [str(org_id), "JOURNAL_ENTRY", count],
+            )
+            first_num = cursor.fetchone()[0]
+
+        return first_num
+
     @staticmethod
     def _get_fiscal_period(org_id: UUID, entry_date: date) -> Optional[FiscalPeriod]:
         """
@@ -593,18 +964,7 @@ class JournalService:
         Returns:
             Account instance
         """
-        from django.db.models import Q
-        ap_account = Account.objects.filter(
-            Q(org_id=org_id) & 
-            (Q(code="2100") | Q(account_type="LIABILITY_CURRENT") | Q(account_type="LIABILITY"))
-        ).first()
-
-        if not ap_account:
-            raise ValidationError(
-                "No Accounts Payable account found. Please set up Chart of Accounts."
-            )
-
-        return ap_account
+        return PostingAccountService.get_account(org_id, "ap")
 
     @staticmethod
     def _get_gst_input_account(org_id: UUID) -> Account:
@@ -617,18 +977,7 @@ class JournalService:
         Returns:
             Account instance
         """
-        from django.db.models import Q
-        gst_account = Account.objects.filter(
-            Q(org_id=org_id) & 
-            (Q(code__startswith="120") | Q(account_type="ASSET_CURRENT") | Q(account_type="ASSET"))
-        ).first()
-
-        if not gst_account:
-            raise ValidationError(
-                "No GST Input Tax account found. Please set up Chart of Accounts."
-            )
-
-        return gst_account
+        return PostingAccountService.get_account(org_id, "gst_input")
 
     @staticmethod
     def _get_ar_account(org_id: UUID) -> Account:
@@ -641,18 +990,7 @@ class JournalService:
         Returns:
             Account instance
         """
-        from django.db.models import Q
-        ar_account = Account.objects.filter(
-            Q(org_id=org_id) & 
-            (Q(code="1200") | Q(account_type="ASSET_CURRENT") | Q(account_type="ASSET"))
-        ).first()
-
-        if not ar_account:
-            raise ValidationError(
-                "No Accounts Receivable account found. Please set up Chart of Accounts."
-            )
-
-        return ar_account
+        return PostingAccountService.get_account(org_id, "ar")
 
     @staticmethod
     def _get_gst_output_account(org_id: UUID) -> Account:
@@ -665,15 +1003,4 @@ class JournalService:
         Returns:
             Account instance
         """
-        from django.db.models import Q
-        gst_account = Account.objects.filter(
-            Q(org_id=org_id) & 
-            (Q(code__startswith="220") | Q(account_type="LIABILITY_CURRENT") | Q(account_type="LIABILITY"))
-        ).first()
-
-        if not gst_account:
-            raise ValidationError(
-                "No GST Output Tax account found. Please set up Chart of Accounts."
-            )
-
-        return gst_account
+        return PostingAccountService.get_account(org_id, "gst_output")
@@ -0,0 +1,67 @@
+"""
+Ledger version service for LedgerSG.
+
+Maintains journal.ledger_version: a monotonic per-organisation counter
+bumped in the same transaction as any change to the ledger (journal
+postings, reversals, payments, reconciliation). Report caches include the
+version in their keys, so a commit retires every cached report for the
+organisation at once and cached reports can never be stale. Readers pay
+one primary-key lookup per request.
+"""
+
+from uuid import UUID
+
+from django.db import connection
+
+
+class LedgerVersionService:
+    """Service class for the per-organisation ledger version."""
+
+    @staticmethod
+    def get(org_id: UUID) -> int:
+        """
+        Read the current ledger version.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            Version number (0 if the ledger has never changed)
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT version FROM journal.ledger_version WHERE org_id = %s",
+                [str(org_id)],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def bump(org_id: UUID) -> int:
+        """
+        Increment the ledger version.
+
+        Must be called inside the transaction that changes the ledger, so
+        the new version becomes visible exactly when the change commits.
+        The row lock is held until commit, which orders concurrent ledger
+        writes for the same organisation.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            The new version number
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO journal.ledger_version (org_id, version)
+                VALUES (%s, 1)
+                ON CONFLICT (org_id) DO UPDATE SET
+                    version = journal.ledger_version.version + 1,
+                    updated_at = NOW()
+                RETURNING version
+                """,
+                [str(org_id)],
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,204 @@
+"""
+Posting account resolver for LedgerSG.
+
+Resolves the control accounts every posting path needs (AR, AP, GST
+input/output and bank clearing) once per organisation. The resolved set is
+cached in-process and in Redis; both copies are keyed by a per-org version
+number held in Redis, so AccountService changes invalidate every worker by
+bumping the version.
+
+Resolution rules (first match wins, ties broken by account code):
+- ar:         code 1200, else any ASSET_CURRENT / ASSET account
+- ap:         code 2100, else any LIABILITY_CURRENT / LIABILITY account
+- gst_input:  code 1600 (seeded GST Input Tax), else any ASSET_CURRENT / ASSET account
+- gst_output: code 2600 (seeded GST Output Tax), else any LIABILITY_CURRENT / LIABILITY account
+- bank:       code 1100, else any account flagged is_bank
+
+Only active accounts are considered.
+"""
+
+import time
+from typing import Optional, Dict, Tuple, Callable
+from uuid import UUID
+
+from django.core.cache import cache
+from django.db.models import Q
+
+from apps.core.models import Account
+from common.exceptions import ValidationError
+
+
+# role -> (preferred match, fallback match, error label)
+POSTING_ACCOUNT_RULES: Dict[str, Tuple[Callable, Callable, str]] = {
+    "ar": (
+        lambda a: a.code == "1200",
+        lambda a: a.account_type in ("ASSET_CURRENT", "ASSET"),
+        "Accounts Receivable",
+    ),
+    "ap": (
+        lambda a: a.code == "2100",
+        lambda a: a.account_type in ("LIABILITY_CURRENT", "LIABILITY"),
+        "Accounts Payable",
+    ),
+    "gst_input": (
+        lambda a: a.code == "1600",
+        lambda a: a.account_type in ("ASSET_CURRENT", "ASSET"),
+        "GST Input Tax",
+    ),
+    "gst_output": (
+        lambda a: a.code == "2600",
+        lambda a: a.account_type in ("LIABILITY_CURRENT", "LIABILITY"),
+        "GST Output Tax",
+    ),
+    "bank": (
+        lambda a: a.code == "1100",
+        lambda a: a.is_bank,
+        "Bank",
+    ),
+}
+
+CACHE_TIMEOUT = 3600
+
+# In-process copy: org_id -> (version, {role: Account or None})
+_local_cache: Dict[str, Tuple[int, Dict[str, Optional[Account]]]] = {}
+_LOCAL_CACHE_MAX_ORGS = 1024
+
+
+class PostingAccountService:
+    """Per-organisation control account resolver."""
+
+    @staticmethod
+    def get_account(org_id: UUID, role: str) -> Account:
+        """
+        Get the control account for a posting role.
+
+        Args:
+            org_id: Organisation ID
+            role: One of "ar", "ap", "gst_input", "gst_output", "bank"
+
+        Returns:
+            Account instance
+
+        Raises:
+            ValidationError: If the organisation has no account for the role
+        """
+        if role not in POSTING_ACCOUNT_RULES:
+            raise ValueError(f"Unknown posting account role: {role}")
+
+        account = PostingAccountService.get_accounts(org_id).get(role)
+
+        if account is None:
+            label = POSTING_ACCOUNT_RULES[role][2]
+            raise ValidationError(
+                f"No {label} account found. Please set up Chart of Accounts."
+            )
+
+        return account
+
+    @staticmethod
+    def get_accounts(org_id: UUID) -> Dict[str, Optional[Account]]:
+        """
+        Get all control accounts for an organisation.
+
+        Served from the in-process cache when its version matches Redis,
+        then from Redis, and only then from the database (one query).
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            Mapping of role -> Account (None where no account matches)
+        """
+        org_key = str(org_id)
+        version = PostingAccountService._get_version(org_key)
+
+        local = _local_cache.get(org_key)
+        if local is not None and local[0] == version:
+            return local[1]
+
+        cache_key = f"posting_accounts:{org_key}:v{version}"
+        accounts = cache.get(cache_key)
+
+        if accounts is None:
+            accounts = PostingAccountService._load(org_id)
+            cache.set(cache_key, accounts, CACHE_TIMEOUT)
+
+        if len(_local_cache) >= _LOCAL_CACHE_MAX_ORGS:
+            _local_cache.clear()
+        _local_cache[org_key] = (version, accounts)
+
+        return accounts
+
+    @staticmethod
+    def invalidate(org_id: UUID) -> None:
+        """
+        Invalidate cached control accounts for an organisation.
+
+        Bumps the shared version so every process reloads on next use.
+
+        Args:
+            org_id: Organisation ID
+        """
+        org_key = str(org_id)
+        version_key = f"posting_accounts:version:{org_key}"
+
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Key missing (never read, or evicted): start a fresh version
+            PostingAccountService._get_version(org_key)
+            cache.incr(version_key)
+
+        _local_cache.pop(org_key, None)
+
+    @staticmethod
+    def _get_version(org_key: str) -> int:
+        """
+        Get the current cache version for an organisation.
+
+        A missing version is seeded from the clock so it never repeats a
+        version that may still be held in another process.
+
+        Args:
+            org_key: Organisation ID as a string
+
+        Returns:
+            Current version number
+        """
+        version_key = f"posting_accounts:version:{org_key}"
+        version = cache.get(version_key)
+
+        if version is None:
+            cache.add(version_key, int(time.time() * 1000), None)
+            version = cache.get(version_key)
+
+        return version
+
+    @staticmethod
+    def _load(org_id: UUID) -> Dict[str, Optional[Account]]:
+        """
+        Resolve every posting role from the database in a single query.
+
+        Args:
+            org_id: Organisation ID
+
+        Returns:
+            Mapping of role -> Account (None where no account matches)
+        """
+        candidates = list(
+            Account.objects.filter(org_id=org_id, is_active=True)
+            .filter(
+                Q(code__in=["1100", "1200", "1600", "2100", "2600"])
+                | Q(account_type__in=["ASSET_CURRENT", "ASSET", "LIABILITY_CURRENT", "LIABILITY"])
+                | Q(is_bank=True)
+            )
+            .order_by("code")
+        )
+
+        accounts = {}
+        for role, (preferred, fallback, _) in POSTING_ACCOUNT_RULES.items():
+            accounts[role] = next((a for a in candidates if preferred(a)), None) or next(
+                (a for a in candidates if fallback(a)), None
+            )
+
+        return accounts
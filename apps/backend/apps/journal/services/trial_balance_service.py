@@ -0,0 +1,108 @@
+"""
+Trial balance engine for LedgerSG.
+
+Computes per-account debit/credit totals for an organisation with a single
+grouped aggregate over journal.line joined to journal.entry. The number of
+queries is constant regardless of how many accounts the organisation has.
+
+Supported filters:
+- date_to: Balance as of a date (inclusive)
+- fiscal_year_id: Only entries posted into the fiscal year
+- fiscal_period_id: Only entries posted into the fiscal period
+"""
+
+from typing import Optional, List, Dict, Any
+from uuid import UUID
+from datetime import date
+
+from django.db import connection
+
+from common.decimal_utils import money
+
+
+class TrialBalanceService:
+    """Set-based trial balance computation."""
+
+    @staticmethod
+    def compute(
+        org_id: UUID,
+        date_to: Optional[date] = None,
+        fiscal_year_id: Optional[UUID] = None,
+        fiscal_period_id: Optional[UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute trial balance rows for every active account.
+
+        Accounts without activity in the selected window are returned
+        with zero totals so the report always lists the full chart.
+
+        Args:
+            org_id: Organisation ID
+            date_to: Include entries dated on or before this date
+            fiscal_year_id: Restrict to entries in this fiscal year
+            fiscal_period_id: Restrict to entries in this fiscal period
+
+        Returns:
+            List of dicts ordered by account code with keys:
+            id, code, name, account_type, total_debit, total_credit, balance
+        """
+        entry_filters = []
+        line_params: List[Any] = [str(org_id)]
+
+        if date_to:
+            entry_filters.append("AND e.entry_date <= %s")
+            line_params.append(date_to)
+
+        if fiscal_year_id:
+            entry_filters.append("AND e.fiscal_year_id = %s")
+            line_params.append(str(fiscal_year_id))
+
+        if fiscal_period_id:
+            entry_filters.append("AND e.fiscal_period_id = %s")
+            line_params.append(str(fiscal_period_id))
+
+        query = f"""
+            SELECT
+                a.id,
+                a.code,
+                a.name,
+                a.account_type,
+                COALESCE(t.total_debit, 0) AS total_debit,
+                COALESCE(t.total_credit, 0) AS total_credit
+            FROM coa.account a
+            LEFT JOIN (
+                SELECT
+                    l.account_id,
+                    SUM(l.debit) AS total_debit,
+                    SUM(l.credit) AS total_credit
+                FROM journal.line l
+                JOIN journal.entry e ON e.id = l.entry_id
+                WHERE l.org_id = %s
+                    {" ".join(entry_filters)}
+                GROUP BY l.account_id
+            ) t ON t.account_id = a.id
+            WHERE a.org_id = %s AND a.is_active = TRUE
+            ORDER BY a.code
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, line_params + [str(org_id)])
+            rows = cursor.fetchall()
+
+        result = []
+        for account_id, code, name, account_type, total_debit, total_credit in rows:
+            debits = money(total_debit)
+            credits = money(total_credit)
+            result.append(
+                {
+                    "id": account_id,
+                    "code": code,
+                    "name": name,
+                    "account_type": account_type,
+                    "total_debit": debits,
+                    "total_credit": credits,
+                    "balance": debits - credits,
+                }
+            )
+
+        return result
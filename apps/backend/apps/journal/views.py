@@ -11,6 +11,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from apps.core.permissions import IsOrgMember, CanCreateJournals, CanViewReports
@@ -62,18 +63,40 @@ class JournalEntryListCreateView(APIView):
         if source_id:
             source_id = UUID(source_id)
 
-        entries = JournalService.list_entries(
-            org_id=org_id,
-            source_type=source_type,
-            fiscal_period_id=fiscal_period_id,
-            account_id=account_id,
-            date_from=date_from,
-            date_to=date_to,
-            source_id=source_id,
+        try:
+            page_size = min(int(request.query_params.get("page_size", 100)), 500)
+        except ValueError as exc:
+            raise ValidationError("page_size must be an integer.") from exc
+
+        filters = {
+            "org_id": org_id,
+            "source_type": source_type,
+            "fiscal_period_id": fiscal_period_id,
+            "account_id": account_id,
+            "date_from": date_from,
+            "date_to": date_to,
+            "source_id": source_id,
+        }
+        entries, next_cursor = JournalService.list_entries_page(
+            **filters,
+            cursor=request.query_params.get("cursor"),
+            page_size=max(page_size, 1),
         )
 
         serializer = JournalEntryListSerializer(entries, many=True)
-        return Response({"results": serializer.data, "count": len(serializer.data)})
+        return Response(
+            {
+                "results": serializer.data,
+                # Total across all pages, not this page's length
+                "count": JournalService.count_entries(**filters),
+                "next": (
+                    replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+                    if next_cursor
+                    else None
+                ),
+                "next_cursor": next_cursor,
+            }
+        )
 
     @wrap_response
     def post(self, request, org_id: str) -> Response:
@@ -188,7 +211,20 @@ class TrialBalanceView(APIView):
         if date_to:
             date_to = date.fromisoformat(date_to)
 
-        entries = JournalService.get_trial_balance(org_id=org_id, date_to=date_to)
+        fiscal_year_id = request.query_params.get("fiscal_year_id")
+        if fiscal_year_id:
+            fiscal_year_id = UUID(fiscal_year_id)
+
+        fiscal_period_id = request.query_params.get("fiscal_period_id")
+        if fiscal_period_id:
+            fiscal_period_id = UUID(fiscal_period_id)
+
+        entries = JournalService.get_trial_balance(
+            org_id=org_id,
+            date_to=date_to,
+            fiscal_year_id=fiscal_year_id,
+            fiscal_period_id=fiscal_period_id,
+        )
 
         total_debits = sum(Decimal(e["total_debits"]) for e in entries)
         total_credits = sum(Decimal(e["total_credits"]) for e in entries)
@@ -291,7 +327,9 @@ class JournalEntrySummaryView(APIView):
             .order_by("-fiscal_period__start_date")[:6]
         )
 
-        recent_entries = JournalEntry.objects.filter(org_id=org_uuid).order_by("-created_at")[:5]
+        recent_entries = JournalService.annotate_totals(
+            JournalEntry.objects.filter(org_id=org_uuid)
+        ).order_by("-created_at")[:5]
 
         return Response(
             {
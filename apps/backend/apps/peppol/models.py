@@ -109,6 +109,18 @@ class PeppolTransmissionLog(models.Model):
         blank=True,
         help_text="When response received from AP",
     )
+    claimed_at = models.DateTimeField(
+        db_column="claimed_at",
+        null=True,
+        blank=True,
+        help_text="When a batch claimed the log for transmission",
+    )
+    next_attempt_at = models.DateTimeField(
+        db_column="next_attempt_at",
+        null=True,
+        blank=True,
+        help_text="Earliest time a retry may be sent (exponential backoff)",
+    )
 
     # Access Point
     access_point_provider = models.CharField(
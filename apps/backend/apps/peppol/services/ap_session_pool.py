@@ -0,0 +1,75 @@
+"""
+HTTP session pool for Access Point providers.
+
+Keeps one keep-alive requests.Session per access point (scheme and host),
+shared by every adapter in the process. Creating a Session per
+transmission meant a fresh TCP connection and TLS handshake for every
+invoice; with a shared session consecutive transmissions to the same AP
+reuse pooled connections.
+
+Sessions carry no credentials: adapters send their organisation's
+Authorization header with each request, so organisations using the same
+AP share connections but never credentials.
+
+The pool is created lazily in each process, so Celery's forked workers
+never share sockets with their parent.
+"""
+
+import threading
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class APSessionPool:
+    """
+    Process-wide keep-alive sessions, one per access point.
+
+    Usage:
+        session = APSessionPool.get("https://api.storecove.com")
+        adapter = StorecoveAdapter(api_key, client_id, base_url, session=session)
+    """
+
+    _lock = threading.Lock()
+    _sessions: Dict[str, requests.Session] = {}
+
+    @classmethod
+    def get(cls, base_url: str) -> requests.Session:
+        """
+        Get the shared session for an access point.
+
+        Args:
+            base_url: AP API base URL (only scheme and host are significant)
+
+        Returns:
+            requests.Session with a connection pool sized for
+            PEPPOL_BATCH_WORKERS concurrent requests
+        """
+        parts = urlsplit(base_url)
+        key = f"{parts.scheme}://{parts.netloc}".lower()
+
+        session = cls._sessions.get(key)
+        if session is not None:
+            return session
+
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                pool_size = max(settings.PEPPOL_BATCH_WORKERS, 1)
+                # Retries are handled by the transmission tasks, not urllib3
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+                session.mount(f"{parts.scheme}://", adapter)
+                cls._sessions[key] = session
+            return session
+
+    @classmethod
+    def reset(cls) -> None:
+        """Close and drop all pooled sessions."""
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = {}
@@ -32,7 +32,8 @@ class StorecoveAdapter(APAdapterBase):
         api_key: Storecove API key for authentication
         client_id: Storecove client identifier
         base_url: Storecove API base URL
-        session: requests.Session for HTTP calls
+        session: requests.Session for HTTP calls (own, or shared from
+            APSessionPool)
 
     Example:
         adapter = StorecoveAdapter(
@@ -49,7 +50,13 @@ class StorecoveAdapter(APAdapterBase):
                 print(f"Message ID: {result.message_id}")
     """
 
-    def __init__(self, api_key: str, client_id: str, base_url: str = "https://api.storecove.com"):
+    def __init__(
+        self,
+        api_key: str,
+        client_id: str,
+        base_url: str = "https://api.storecove.com",
+        session: Optional[requests.Session] = None,
+    ):
         """
         Initialize Storecove adapter with credentials.
 
@@ -57,20 +64,24 @@ class StorecoveAdapter(APAdapterBase):
             api_key: Storecove API key
             client_id: Storecove client ID
             base_url: Storecove API base URL (defaults to production)
+            session: Shared keep-alive session (see APSessionPool); a
+                private session is created if omitted
         """
         self.api_key = api_key
         self.client_id = client_id
         self.base_url = base_url.rstrip("/")  # Remove trailing slash
-        self.session = requests.Session()
-
-        # Set default headers
-        self.session.headers.update(
-            {
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            }
-        )
+
+        # Sent with every request, since a shared session carries no credentials
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+        self.session = session
 
     def authenticate(self) -> bool:
         """
@@ -85,7 +96,9 @@ class StorecoveAdapter(APAdapterBase):
         try:
             # Make a lightweight request to validate credentials
             # Using a health check or status endpoint if available
-            response = self.session.get(f"{self.base_url}/api/v2/", timeout=10)
+            response = self.session.get(
+                f"{self.base_url}/api/v2/", headers=self.headers, timeout=10
+            )
 
             # 200 or 404 means the API is reachable and auth worked
             # (404 is expected if root endpoint doesn't exist)
@@ -128,7 +141,10 @@ class StorecoveAdapter(APAdapterBase):
 
             # Send to Storecove
             response = self.session.post(
-                f"{self.base_url}/api/v2/document_submissions", json=payload, timeout=30
+                f"{self.base_url}/api/v2/document_submissions",
+                json=payload,
+                headers=self.headers,
+                timeout=30,
             )
 
             # Parse response
@@ -162,7 +178,9 @@ class StorecoveAdapter(APAdapterBase):
         """
         try:
             response = self.session.get(
-                f"{self.base_url}/api/v2/document_submissions/{message_id}", timeout=10
+                f"{self.base_url}/api/v2/document_submissions/{message_id}",
+                headers=self.headers,
+                timeout=10,
             )
 
             return self._parse_status_response(response, message_id)
@@ -191,7 +209,9 @@ class StorecoveAdapter(APAdapterBase):
             True if API is reachable and responding, False otherwise
         """
         try:
-            response = self.session.get(f"{self.base_url}/api/v2/", timeout=5)
+            response = self.session.get(
+                f"{self.base_url}/api/v2/", headers=self.headers, timeout=5
+            )
 
             # Consider 2xx or 404 as success (API is reachable)
             return response.status_code < 500
@@ -0,0 +1,455 @@
+"""
+Batch Transmission Service for InvoiceNow/Peppol integration.
+
+Transmits an organisation's pending transmission logs in one pass instead
+of one Celery task per invoice. Month-end approval runs queue thousands of
+invoices; per-invoice transmission cost a cold TLS handshake and several
+queries each.
+
+A batch:
+1. Claims the org's PENDING logs (SELECT ... FOR UPDATE SKIP LOCKED, so
+   concurrent batches never transmit the same log)
+2. Loads the Peppol settings, invoices, contacts and lines in three queries
+3. Maps, generates and validates each invoice in a thread pool.
+   Workers only touch preloaded objects, and lxml releases the GIL while
+   serialising and validating (the generated tree is validated directly,
+   see XMLGeneratorService.generate_document)
+4. Records the request hash of every invoice about to be sent (one bulk
+   update), then sends them in the pool over the AP's keep-alive session
+   (APSessionPool). Each log's result, including the AP message ID, is
+   written as soon as its own send returns, so a crash mid-batch never
+   loses a delivery
+
+Retryable failures go back to PENDING with next_attempt_at set by the
+exponential backoff (retry_delay). The retry task is scheduled for that
+time, and batches without explicit log IDs (the periodic sweep) skip logs
+that are not yet due.
+
+Claims are stamped with claimed_at. If a worker dies mid-batch its logs
+stay TRANSMITTING, so the periodic sweep (reclaim_stale_claims) settles
+claims older than PEPPOL_CLAIM_TIMEOUT minutes: logs never sent go back to
+PENDING, and logs whose send was attempted without a recorded outcome are
+failed for review rather than sent twice.
+
+Supplier and customer parties are mapped and compiled once per version
+(PartyFragmentCache), so a batch to repeat customers skips that work; each
+summary reports the cache's hit rate over the batch.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings as django_settings
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from apps.peppol.models import OrganisationPeppolSettings, PeppolTransmissionLog
+from apps.peppol.services.ap_adapter_base import (
+    APAdapterBase,
+    TransmissionResult,
+    TransmissionStatus,
+)
+from apps.peppol.services.party_fragment_cache import PartyFragmentCache
+from apps.peppol.services.transmission_service import TransmissionService
+
+logger = logging.getLogger(__name__)
+
+
+RETRYABLE_ERRORS = ("TIMEOUT", "NETWORK_ERROR", "RATE_LIMITED")
+
+RESULT_FIELDS = [
+    "status",
+    "peppol_message_id",
+    "xml_payload_hash",
+    "response_code",
+    "error_code",
+    "error_message",
+    "response_at",
+    "next_attempt_at",
+]
+
+
+def pending_due(now: datetime) -> Q:
+    """Q selecting PENDING logs not waiting out a retry backoff."""
+    return Q(status="PENDING") & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+
+
+def retry_delay(attempt_number: int) -> int:
+    """Backoff in seconds before sending attempt `attempt_number` (2, 3, ...)."""
+    return 60 * (2 ** (attempt_number - 2))
+
+
+class BatchTransmissionService(TransmissionService):
+    """
+    Service for transmitting an organisation's pending invoices as a batch.
+
+    Usage:
+        service = BatchTransmissionService()
+
+        # Transmit everything pending for the org
+        summary = service.transmit_pending(org_id)
+
+        # Transmit specific logs (e.g. those created by a bulk approval)
+        summary = service.transmit_pending(org_id, transmission_log_ids)
+
+        # Release claims left by a batch that never finished
+        count = BatchTransmissionService.reclaim_stale_claims()
+    """
+
+    def transmit_pending(
+        self,
+        org_id: str,
+        transmission_log_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Transmit an organisation's PENDING transmission logs.
+
+        Args:
+            org_id: UUID of the organization
+            transmission_log_ids: Restrict the batch to these logs (claimed
+                whether or not their retry is due, e.g. by the scheduled retry);
+                otherwise only logs whose next_attempt_at has passed are claimed
+            limit: Maximum logs to claim (defaults to PEPPOL_BATCH_SIZE)
+
+        Returns:
+            Dict with 'total', 'delivered', 'failed', 'rejected',
+            'retry_log_ids' (retryable failures put back to PENDING),
+            'retry_attempt' (highest attempt number among them),
+            'more_pending', 'elapsed_seconds', 'documents_per_second' and
+            'party_cache' (PartyFragmentCache hits, misses and hit_rate
+            over the batch)
+
+        Raises:
+            ValueError: If organization not configured for Peppol
+        """
+        from apps.core.models import InvoiceDocument, InvoiceLine
+
+        started = time.perf_counter()
+        party_cache = PartyFragmentCache.stats()
+        limit = limit or django_settings.PEPPOL_BATCH_SIZE
+
+        settings = OrganisationPeppolSettings.objects.filter(org_id=org_id).first()
+        if not settings or not settings.is_configured:
+            raise ValueError(
+                f"Organization {org_id} is not configured for Peppol transmission. "
+                "Please configure access point settings first."
+            )
+
+        logs = self._claim_pending_logs(org_id, transmission_log_ids, limit)
+        if not logs:
+            return self._summary(org_id, [], [], started, False, party_cache)
+
+        invoices = {
+            invoice.id: invoice
+            for invoice in InvoiceDocument.objects.filter(
+                org_id=org_id, id__in=[log.document_id for log in logs]
+            )
+            .select_related("org", "contact")
+            .prefetch_related(
+                Prefetch(
+                    "lines",
+                    queryset=InvoiceLine.objects.select_related("tax_code").order_by(
+                        "line_number"
+                    ),
+                )
+            )
+        }
+
+        adapter = self.get_adapter_for_org(org_id, settings)
+        retry_log_ids = []
+
+        workers = max(django_settings.PEPPOL_BATCH_WORKERS, 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            prepared = list(
+                pool.map(lambda log: self._prepare_one(invoices.get(log.document_id), log), logs)
+            )
+
+            unsent, to_send = [], []
+            for log, (failure, xml, recipient, xml_hash) in zip(logs, prepared):
+                if failure is None:
+                    to_send.append((log, xml, recipient, xml_hash))
+                    continue
+                unsent.append(log)
+                if self._apply_result(log, failure, xml_hash, settings):
+                    retry_log_ids.append(str(log.id))
+
+            if unsent:
+                PeppolTransmissionLog.objects.bulk_update(
+                    unsent, RESULT_FIELDS + ["attempt_number"], batch_size=500
+                )
+            self._mark_sending([(log, xml_hash) for log, _, _, xml_hash in to_send])
+
+            futures = {
+                pool.submit(self._send_one, adapter, xml, recipient, log): (log, xml_hash)
+                for log, xml, recipient, xml_hash in to_send
+            }
+            for future in as_completed(futures):
+                log, xml_hash = futures[future]
+                if self._apply_result(log, future.result(), xml_hash, settings):
+                    retry_log_ids.append(str(log.id))
+                log.save(update_fields=RESULT_FIELDS + ["attempt_number"])
+
+        more_pending = (
+            transmission_log_ids is None
+            and PeppolTransmissionLog.objects.filter(pending_due(timezone.now()), org_id=org_id)
+            .exclude(id__in=retry_log_ids)
+            .exists()
+        )
+        summary = self._summary(org_id, logs, retry_log_ids, started, more_pending, party_cache)
+        logger.info(
+            f"Peppol batch for org {org_id}: {summary['delivered']}/{summary['total']} delivered "
+            f"in {summary['elapsed_seconds']}s ({summary['documents_per_second']}/s), "
+            f"party cache hit rate {summary['party_cache']['hit_rate']}"
+        )
+        return summary
+
+    def _claim_pending_logs(
+        self, org_id: str, transmission_log_ids: Optional[List[str]], limit: int
+    ) -> List[PeppolTransmissionLog]:
+        """
+        Lock up to `limit` PENDING logs and mark them TRANSMITTING.
+
+        Without explicit log IDs, retries still backing off are left alone.
+
+        Rows locked by a concurrent batch are skipped rather than waited on.
+        """
+        with transaction.atomic():
+            queryset = PeppolTransmissionLog.objects.filter(org_id=org_id, status="PENDING")
+            if transmission_log_ids is not None:
+                queryset = queryset.filter(id__in=transmission_log_ids)
+            else:
+                queryset = queryset.filter(pending_due(timezone.now()))
+            logs = list(
+                queryset.select_for_update(skip_locked=True).order_by("transmitted_at", "id")[
+                    :limit
+                ]
+            )
+            if logs:
+                PeppolTransmissionLog.objects.filter(id__in=[log.id for log in logs]).update(
+                    status="TRANSMITTING", claimed_at=timezone.now(), request_hash=""
+                )
+        for log in logs:
+            log.status = "TRANSMITTING"
+        return logs
+
+    @staticmethod
+    def reclaim_stale_claims(org_id: Optional[str] = None) -> int:
+        """
+        Settle logs claimed more than PEPPOL_CLAIM_TIMEOUT minutes ago.
+
+        A claimed log is normally settled by the same batch; one still
+        TRANSMITTING without a Peppol message ID after the timeout belongs
+        to a batch that died before writing its result. If its send was
+        never attempted (no request hash) it goes back to PENDING. If it
+        was, the AP may have received it, so it is failed for review
+        instead of risking a second delivery.
+
+        Args:
+            org_id: Restrict to one organisation
+
+        Returns:
+            Number of logs put back to PENDING
+        """
+        now = timezone.now()
+        cutoff = now - timedelta(minutes=django_settings.PEPPOL_CLAIM_TIMEOUT)
+        stale = PeppolTransmissionLog.objects.filter(
+            status="TRANSMITTING", peppol_message_id__isnull=True, claimed_at__lte=cutoff
+        )
+        if org_id is not None:
+            stale = stale.filter(org_id=org_id)
+
+        not_sent = Q(request_hash="") | Q(request_hash__isnull=True)
+        interrupted = stale.exclude(not_sent).update(
+            status="FAILED",
+            error_code="SEND_INTERRUPTED",
+            error_message="Batch stopped during the send; check the access point before resending",
+            response_at=now,
+        )
+        count = stale.filter(not_sent).update(status="PENDING", claimed_at=None)
+        if count or interrupted:
+            logger.warning(
+                f"Reclaimed {count} stale Peppol transmission claims, "
+                f"failed {interrupted} interrupted sends"
+            )
+        return count
+
+    def _prepare_one(
+        self, invoice, log: PeppolTransmissionLog
+    ) -> Tuple[Optional[TransmissionResult], str, str, str]:
+        """
+        Map, generate and validate one invoice.
+
+        Runs in a worker thread, so it must not query the database: the
+        invoice arrives with its org, contact and lines loaded.
+
+        Returns:
+            Tuple of (failure result, or None if the invoice is ready to
+            send; XML payload; recipient Peppol ID; XML payload hash)
+        """
+        if invoice is None:
+            return (
+                TransmissionResult.failure(
+                    error_code="INTERNAL_ERROR",
+                    error_message=f"Invoice {log.document_id} not found",
+                    status=TransmissionStatus.FAILED,
+                ),
+                "",
+                "",
+                "",
+            )
+
+        recipient_peppol_id = self._get_recipient_peppol_id(invoice)
+        if not recipient_peppol_id:
+            return (
+                TransmissionResult.failure(
+                    error_code="MISSING_PEPPOL_ID",
+                    error_message="Recipient does not have a Peppol ID configured",
+                    status=self._get_status_for_error("MISSING_PEPPOL_ID"),
+                ),
+                "",
+                "",
+                "",
+            )
+
+        try:
+            ubl_data = self.mapping_service.map_invoice_to_ubl(invoice)
+            document = self.generator_service.generate_document(ubl_data)
+            validation_result = self.validation_service.validate_document(
+                document.tree, ubl_data["document_type"]
+            )
+        except Exception as e:
+            logger.exception(f"Peppol batch: failed to prepare log {log.id}")
+            return (
+                TransmissionResult.failure(
+                    error_code="INTERNAL_ERROR",
+                    error_message=str(e),
+                    status=TransmissionStatus.FAILED,
+                ),
+                "",
+                "",
+                "",
+            )
+
+        if not validation_result.get("is_valid", False):
+            return (
+                TransmissionResult.failure(
+                    error_code="VALIDATION_ERROR",
+                    error_message=self._get_validation_error_message(validation_result),
+                    status=self._get_status_for_error("VALIDATION_ERROR"),
+                ),
+                "",
+                "",
+                document.sha256,
+            )
+
+        return None, document.xml, recipient_peppol_id, document.sha256
+
+    @staticmethod
+    def _send_one(
+        adapter: APAdapterBase, xml: str, recipient_peppol_id: str, log: PeppolTransmissionLog
+    ) -> TransmissionResult:
+        """Send one prepared invoice (worker thread, no database access)."""
+        try:
+            return adapter.send_invoice(xml, recipient_peppol_id)
+        except Exception as e:
+            logger.exception(f"Peppol batch: failed to transmit log {log.id}")
+            return TransmissionResult.failure(
+                error_code="INTERNAL_ERROR",
+                error_message=str(e),
+                status=TransmissionStatus.FAILED,
+            )
+
+    @staticmethod
+    def _mark_sending(sending: List[Tuple[PeppolTransmissionLog, str]]) -> None:
+        """
+        Record the request hash of each log about to be sent.
+
+        A claimed log with a request hash has had a send attempted, so
+        reclaim_stale_claims never puts it back to PENDING.
+        """
+        for log, xml_hash in sending:
+            log.request_hash = xml_hash
+        if sending:
+            PeppolTransmissionLog.objects.bulk_update(
+                [log for log, _ in sending], ["request_hash"], batch_size=500
+            )
+
+    def _apply_result(
+        self,
+        log: PeppolTransmissionLog,
+        result: TransmissionResult,
+        xml_hash: str,
+        settings: OrganisationPeppolSettings,
+    ) -> bool:
+        """
+        Set a log's result fields (the caller saves them).
+
+        Retryable failures with attempts left go back to PENDING with their
+        attempt number incremented, for the task to retry after a backoff.
+
+        Returns:
+            True if the log was put back to PENDING
+        """
+        log.xml_payload_hash = xml_hash
+        log.response_at = timezone.now()
+        log.next_attempt_at = None
+        if result.success:
+            log.status = "DELIVERED"
+            log.peppol_message_id = result.message_id
+            log.response_code = "201"
+            log.error_code = ""
+            log.error_message = ""
+            return False
+
+        log.status = result.status.value
+        log.error_code = result.error_code or ""
+        log.error_message = result.error_message or ""
+        log.response_code = self._get_http_code_for_error(result.error_code)
+
+        if (
+            result.error_code in RETRYABLE_ERRORS
+            and log.attempt_number < settings.transmission_retry_attempts
+        ):
+            log.status = "PENDING"
+            log.attempt_number += 1
+            log.next_attempt_at = log.response_at + timedelta(
+                seconds=retry_delay(log.attempt_number)
+            )
+            return True
+        return False
+
+    @staticmethod
+    def _summary(
+        org_id: str,
+        logs: List[PeppolTransmissionLog],
+        retry_log_ids: List[str],
+        started: float,
+        more_pending: bool,
+        party_cache: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        counts = {"DELIVERED": 0, "FAILED": 0, "REJECTED": 0}
+        retry_attempt = 0
+        for log in logs:
+            if log.status in counts:
+                counts[log.status] += 1
+            elif str(log.id) in retry_log_ids:
+                retry_attempt = max(retry_attempt, log.attempt_number)
+        return {
+            "org_id": str(org_id),
+            "total": len(logs),
+            "delivered": counts["DELIVERED"],
+            "failed": counts["FAILED"],
+            "rejected": counts["REJECTED"],
+            "retry_log_ids": retry_log_ids,
+            "retry_attempt": retry_attempt,
+            "more_pending": more_pending,
+            "elapsed_seconds": round(elapsed, 2),
+            "documents_per_second": round(len(logs) / elapsed, 2) if elapsed > 0 else None,
+            "party_cache": PartyFragmentCache.stats_since(party_cache),
+        }
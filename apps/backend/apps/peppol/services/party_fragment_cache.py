@@ -0,0 +1,212 @@
+"""
+Party Fragment Cache for InvoiceNow/Peppol integration.
+
+Caches each supplier/customer party once per version: the mapped party
+dictionary (XMLMappingService) and its compiled UBL subtree
+(XMLGeneratorService). Entries are keyed by role, organisation or contact
+ID and updated_at. The database bumps updated_at on every change
+(core.set_updated_at), so an edited party gets a new key and its old entry
+ages out of the LRU; nothing needs invalidating.
+
+Bulk runs send most invoices to repeat customers, so after the first
+invoice per party version both the mapping and the subtree build are
+skipped. Hits and misses are counted for the cache's hit rate (stats()).
+
+Party data without a version (mapped dictionaries built by hand) is cached
+by content instead.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from lxml import etree
+
+
+# Party versions kept per process (least recently used evicted)
+PARTY_FRAGMENT_CACHE_SIZE = 1024
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of mapped party data, used as a content cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class _Fragment:
+    """One party version: its mapped dictionary and compiled subtree."""
+
+    __slots__ = ("data", "element")
+
+    def __init__(self):
+        self.data: Optional[Dict[str, Any]] = None
+        self.element: Optional[etree._Element] = None
+
+
+class PartyFragmentCache:
+    """
+    Process-wide LRU of mapped and compiled supplier/customer parties.
+
+    Usage:
+        key = PartyFragmentCache.version_key("customer", contact)
+        data = PartyFragmentCache.get_data(key, lambda: map_customer(contact))
+        element = PartyFragmentCache.get_element(key, data, build_customer_party)
+        PartyFragmentCache.stats()  # {'hits': ..., 'misses': ..., 'hit_rate': ...}
+        PartyFragmentCache.stats_since(snapshot)  # counters since an earlier stats()
+    """
+
+    _lock = threading.Lock()
+    _fragments: "OrderedDict[Hashable, _Fragment]" = OrderedDict()
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def version_key(role: str, instance) -> Optional[Hashable]:
+        """
+        Cache key for a saved Organisation or Contact.
+
+        Returns:
+            (role, id, updated_at), or None if the instance has no
+            timestamp yet (unsaved), in which case it is not cached
+        """
+        if instance is None or not isinstance(instance.updated_at, datetime):
+            return None
+        return (role, str(instance.pk), instance.updated_at)
+
+    @staticmethod
+    def content_key(role: str, party_data: Dict[str, Any]) -> Hashable:
+        """Cache key for party data without a version."""
+        return (role, "content", _freeze(party_data))
+
+    @classmethod
+    def get_data(
+        cls, key: Optional[Hashable], mapper: Callable[[], Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Get the mapped party dictionary for this version.
+
+        The dictionary is shared by every invoice to the party, so callers
+        must treat it as read-only.
+
+        Args:
+            key: Key from version_key (None maps without caching)
+            mapper: Builds the dictionary on a miss
+        """
+        if key is None:
+            return mapper()
+
+        with cls._lock:
+            fragment = cls._lookup(key)
+            if fragment is not None and fragment.data is not None:
+                cls.hits += 1
+                return fragment.data
+            cls.misses += 1
+
+        data = mapper()
+
+        with cls._lock:
+            fragment = cls._lookup(key) or cls._store(key)
+            if fragment.data is None:
+                fragment.data = data
+            return fragment.data
+
+    @classmethod
+    def get_element(
+        cls,
+        key: Hashable,
+        party_data: Dict[str, Any],
+        builder: Callable[[Dict[str, Any]], etree._Element],
+    ) -> etree._Element:
+        """
+        Get a copy of the compiled party subtree for this version.
+
+        Subtrees are compiled once and copied into each document (a C-level
+        copy, far cheaper than rebuilding element by element).
+
+        Args:
+            key: Key from version_key or content_key
+            party_data: Mapped party dictionary, compiled on a miss
+            builder: Method compiling the subtree
+
+        Returns:
+            A new party element, free to attach to a document
+        """
+        with cls._lock:
+            fragment = cls._lookup(key)
+            if fragment is not None and fragment.element is not None:
+                cls.hits += 1
+                return copy.deepcopy(fragment.element)
+            cls.misses += 1
+
+        element = builder(party_data)
+
+        with cls._lock:
+            fragment = cls._lookup(key) or cls._store(key)
+            if fragment.element is None:
+                fragment.element = element
+            return copy.deepcopy(fragment.element)
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        """
+        Cache counters since process start (or the last reset).
+
+        Returns:
+            Dict with 'hits', 'misses', 'hit_rate' (None before any lookup)
+            and 'size' (party versions cached)
+        """
+        with cls._lock:
+            lookups = cls.hits + cls.misses
+            return {
+                "hits": cls.hits,
+                "misses": cls.misses,
+                "hit_rate": round(cls.hits / lookups, 4) if lookups else None,
+                "size": len(cls._fragments),
+            }
+
+    @classmethod
+    def stats_since(cls, before: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Counters accrued since an earlier stats() snapshot, e.g. over one batch.
+
+        Returns:
+            Dict with 'hits', 'misses' and 'hit_rate' (None if no lookups)
+        """
+        after = cls.stats()
+        hits = after["hits"] - before["hits"]
+        misses = after["misses"] - before["misses"]
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop all cached parties and zero the counters (tests)."""
+        with cls._lock:
+            cls._fragments.clear()
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def _lookup(cls, key: Hashable) -> Optional[_Fragment]:
+        """Find an entry and mark it recently used (caller holds the lock)."""
+        fragment = cls._fragments.get(key)
+        if fragment is not None:
+            cls._fragments.move_to_end(key)
+        return fragment
+
+    @classmethod
+    def _store(cls, key: Hashable) -> _Fragment:
+        """Add an empty entry, evicting the oldest (caller holds the lock)."""
+        fragment = cls._fragments[key] = _Fragment()
+        if len(cls._fragments) > PARTY_FRAGMENT_CACHE_SIZE:
+            cls._fragments.popitem(last=False)
+        return fragment
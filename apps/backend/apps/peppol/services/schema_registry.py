@@ -0,0 +1,163 @@
+"""
+Schema Registry for InvoiceNow/Peppol validation.
+
+Compiles the UBL 2.1 XSDs (Invoice, CreditNote) and the PINT-SG Schematron
+rules once per process and shares the compiled validators. Compiling the
+UBL schemas costs hundreds of milliseconds and tens of MB, so doing it per
+XMLValidationService instance made every transmission pay for it.
+
+Celery workers load the registry in the parent process at worker start
+(see config/celery.py), so forked pool processes inherit the compiled
+validators. Web processes load it on first use.
+
+lxml validators keep their error log and report on the validator object,
+so each validator is guarded by its own lock; validation itself is fast
+and the locks are uncontended in single-threaded workers.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from lxml import etree, isoschematron
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMAS_DIR = Path(__file__).resolve().parent.parent / "schemas"
+
+XSD_FILES = {
+    "INVOICE": "ubl-Invoice.xsd",
+    "CREDIT_NOTE": "ubl-CreditNote.xsd",
+}
+SCHEMATRON_FILE = "PINT-UBL-validation.sch"
+
+SVRL_NS = "http://purl.oclc.org/dsdl/svrl"
+
+
+class _Validator:
+    """A compiled validator and the lock serialising its use."""
+
+    def __init__(self, validator):
+        self.validator = validator
+        self.lock = threading.Lock()
+
+
+class SchemaRegistry:
+    """
+    Process-wide registry of compiled Peppol validators.
+
+    Usage:
+        SchemaRegistry.load()  # optional; validation loads on demand
+        errors = SchemaRegistry.validate_xsd("INVOICE", xml_doc)
+        errors = SchemaRegistry.validate_schematron(xml_doc)
+    """
+
+    _load_lock = threading.Lock()
+    _xsd: Dict[str, Optional[_Validator]] = {}
+    _schematron: Optional[_Validator] = None
+    _loaded = False
+    compile_count = 0
+
+    @classmethod
+    def load(cls) -> None:
+        """Compile all schemas, once per process (safe to call repeatedly)."""
+        if cls._loaded:
+            return
+        with cls._load_lock:
+            if cls._loaded:
+                return
+
+            xsd = {}
+            for document_type, filename in XSD_FILES.items():
+                try:
+                    xsd[document_type] = _Validator(
+                        etree.XMLSchema(etree.parse(str(SCHEMAS_DIR / filename)))
+                    )
+                except (OSError, etree.XMLSchemaParseError, etree.XMLSyntaxError) as e:
+                    logger.error(f"Failed to compile {filename}: {e}")
+                    xsd[document_type] = None
+
+            try:
+                schematron = _Validator(
+                    isoschematron.Schematron(
+                        etree.parse(str(SCHEMAS_DIR / SCHEMATRON_FILE)), store_report=True
+                    )
+                )
+            except (OSError, etree.SchematronParseError, etree.XMLSyntaxError) as e:
+                logger.error(f"Failed to compile {SCHEMATRON_FILE}: {e}")
+                schematron = None
+
+            cls._xsd = xsd
+            cls._schematron = schematron
+            cls.compile_count += 1
+            cls._loaded = True
+            logger.info("Peppol schema registry loaded")
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the compiled validators (the next use recompiles)."""
+        with cls._load_lock:
+            cls._xsd = {}
+            cls._schematron = None
+            cls._loaded = False
+
+    @classmethod
+    def validate_xsd(cls, document_type: str, xml_doc: etree._Element) -> List[Dict[str, Any]]:
+        """
+        Validate a parsed document against the XSD for its type.
+
+        Args:
+            document_type: 'INVOICE' or 'CREDIT_NOTE'
+            xml_doc: Parsed XML document
+
+        Returns:
+            List of error dictionaries ('message', 'line', 'column');
+            empty if valid or if the schema is unavailable
+        """
+        cls.load()
+        entry = cls._xsd.get(document_type)
+        if entry is None:
+            return []
+
+        with entry.lock:
+            if entry.validator.validate(xml_doc):
+                return []
+            return [
+                {"message": error.message, "line": error.line, "column": error.column}
+                for error in entry.validator.error_log
+            ]
+
+    @classmethod
+    def validate_schematron(cls, xml_doc: etree._Element) -> List[Dict[str, Any]]:
+        """
+        Validate a parsed document against the PINT-SG Schematron rules.
+
+        Args:
+            xml_doc: Parsed XML document
+
+        Returns:
+            List of failed assertions ('message', 'location', 'test');
+            empty if valid or if the rules are unavailable
+        """
+        cls.load()
+        entry = cls._schematron
+        if entry is None:
+            return []
+
+        with entry.lock:
+            if entry.validator.validate(xml_doc):
+                return []
+            report = entry.validator.validation_report
+
+        return [
+            {
+                "message": " ".join(
+                    failure.findtext(f"{{{SVRL_NS}}}text", default="").split()
+                ),
+                "location": failure.get("location", ""),
+                "test": failure.get("test", ""),
+            }
+            for failure in report.iter(f"{{{SVRL_NS}}}failed-assert")
+        ]
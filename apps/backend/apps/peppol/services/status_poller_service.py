@@ -0,0 +1,256 @@
+"""
+Status Poller Service for InvoiceNow/Peppol integration.
+
+Polls the Access Point for the delivery outcome of in-flight transmissions:
+logs still TRANSMITTING, and logs the AP accepted (DELIVERED) whose
+recipient Message Level Response has not arrived yet (blank mlr_status).
+
+Both states are covered by the partial index idx_peppol_log_status, so a
+poll reads only in-flight rows however large the log grows. Each message
+is polled on a schedule that backs off with its age (POLL_SCHEDULE); the
+schedule is applied in SQL, so only due messages are loaded. Messages
+older than the schedule are given up on without calling the AP.
+
+AP requests run in a thread pool over the keep-alive sessions in
+APSessionPool, and outcomes are written with one bulk update per poll.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from django.conf import settings as django_settings
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.peppol.models import OrganisationPeppolSettings, PeppolTransmissionLog
+from apps.peppol.services.ap_adapter_base import TransmissionResult, TransmissionStatus
+from apps.peppol.services.transmission_service import TransmissionService
+
+logger = logging.getLogger(__name__)
+
+
+# (message age below, poll interval) - a message is polled again once the
+# interval for its age has passed since the AP last answered
+POLL_SCHEDULE = (
+    (timedelta(minutes=10), timedelta(minutes=1)),
+    (timedelta(hours=1), timedelta(minutes=5)),
+    (timedelta(hours=6), timedelta(minutes=15)),
+    (timedelta(days=1), timedelta(hours=1)),
+    (timedelta(days=7), timedelta(hours=6)),
+)
+MAX_POLL_AGE = POLL_SCHEDULE[-1][0]
+
+POLL_FIELDS = [
+    "status",
+    "error_code",
+    "error_message",
+    "response_at",
+    "mlr_status",
+    "mlr_received_at",
+]
+
+# Matches the predicate of idx_peppol_log_status
+IN_FLIGHT = Q(status="TRANSMITTING") | Q(status="DELIVERED", mlr_status="")
+
+
+def due_filter(now: datetime) -> Q:
+    """Q selecting in-flight messages whose poll interval has passed."""
+    due = Q(response_at__isnull=True)
+    min_age = timedelta(0)
+    for max_age, interval in POLL_SCHEDULE:
+        due |= Q(
+            transmitted_at__gt=now - max_age,
+            transmitted_at__lte=now - min_age,
+            response_at__lte=now - interval,
+        )
+        min_age = max_age
+    return due
+
+
+class StatusPollerService(TransmissionService):
+    """
+    Service for polling the delivery status of in-flight transmissions.
+
+    Usage:
+        service = StatusPollerService()
+
+        # Scheduled poll of everything due
+        summary = service.poll()
+
+        # Poll one message now, regardless of schedule
+        log = service.poll_message(message_id)
+    """
+
+    def poll(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Poll all in-flight messages that are due.
+
+        Args:
+            limit: Maximum messages to poll (defaults to PEPPOL_POLL_BATCH_SIZE)
+
+        Returns:
+            Dict with 'polled', 'delivered', 'rejected', 'in_flight'
+            (still processing), 'errors' (AP unreachable or not configured),
+            'expired', 'more_due' and 'elapsed_seconds'
+        """
+        started = time.perf_counter()
+        limit = limit or django_settings.PEPPOL_POLL_BATCH_SIZE
+        now = timezone.now()
+
+        expired = self._expire_stale(now)
+
+        logs = list(
+            PeppolTransmissionLog.objects.filter(IN_FLIGHT, peppol_message_id__isnull=False)
+            .filter(due_filter(now))
+            .order_by("response_at")[:limit]
+        )
+        summary = self.poll_logs(logs, now)
+        summary["expired"] = expired
+        summary["more_due"] = len(logs) == limit
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 2)
+
+        if logs or expired:
+            logger.info(
+                f"Peppol status poll: {summary['polled']} polled, "
+                f"{summary['delivered']} delivered, {summary['rejected']} rejected, "
+                f"{expired} expired in {summary['elapsed_seconds']}s"
+            )
+        return summary
+
+    def poll_message(self, message_id: str) -> Optional[PeppolTransmissionLog]:
+        """
+        Poll one message immediately.
+
+        Args:
+            message_id: Peppol message ID from transmission
+
+        Returns:
+            The updated PeppolTransmissionLog, or None if no log has this ID
+        """
+        try:
+            message_id = UUID(str(message_id))
+        except ValueError:
+            return None
+
+        log = (
+            PeppolTransmissionLog.objects.filter(peppol_message_id=message_id)
+            .order_by("-attempt_number")
+            .first()
+        )
+        if log is None:
+            return None
+        if log.status in ("TRANSMITTING", "DELIVERED") and not log.mlr_status:
+            self.poll_logs([log], timezone.now())
+        return log
+
+    def poll_logs(self, logs: List[PeppolTransmissionLog], now: datetime) -> Dict[str, int]:
+        """
+        Query the AP for each log's status and write the outcomes in bulk.
+
+        Settings for every organisation involved load in one query; each
+        organisation gets one adapter, all sharing the AP's session.
+
+        Returns:
+            Outcome counts ('polled', 'delivered', 'rejected', 'in_flight', 'errors')
+        """
+        summary = dict.fromkeys(("polled", "delivered", "rejected", "in_flight", "errors"), 0)
+        if not logs:
+            return summary
+
+        adapters = {}
+        for settings in OrganisationPeppolSettings.objects.filter(
+            org_id__in={log.org_id for log in logs}
+        ):
+            if settings.is_configured:
+                try:
+                    adapters[settings.org_id] = self.get_adapter_for_org(settings.org_id, settings)
+                except ValueError as e:
+                    logger.warning(f"Peppol status poll: org {settings.org_id}: {e}")
+
+        def check(log: PeppolTransmissionLog) -> Optional[TransmissionResult]:
+            adapter = adapters.get(log.org_id)
+            if adapter is None:
+                return None
+            return adapter.check_status(str(log.peppol_message_id))
+
+        workers = max(django_settings.PEPPOL_POLL_WORKERS, 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(check, logs))
+
+        for log, result in zip(logs, results):
+            outcome = self._apply_status(log, result, now)
+            summary[outcome] += 1
+            summary["polled"] += 1
+
+        PeppolTransmissionLog.objects.bulk_update(logs, POLL_FIELDS, batch_size=500)
+        return summary
+
+    def _apply_status(
+        self, log: PeppolTransmissionLog, result: Optional[TransmissionResult], now: datetime
+    ) -> str:
+        """
+        Apply one status check to its log (unsaved).
+
+        Transient failures only move response_at forward, which backs the
+        message off until its next poll interval.
+
+        Returns:
+            Outcome name for the poll summary
+        """
+        log.response_at = now
+
+        if result is None:
+            return "errors"
+
+        if result.success:
+            log.status = "DELIVERED"
+            log.mlr_status = "ACCEPTED"
+            log.mlr_received_at = now
+            return "delivered"
+
+        if result.status == TransmissionStatus.REJECTED:
+            log.status = "REJECTED"
+            log.error_code = result.error_code
+            log.error_message = result.error_message or ""
+            log.mlr_status = "REJECTED"
+            log.mlr_received_at = now
+            return "rejected"
+
+        if result.error_code == "NOT_FOUND":
+            # The AP has no record of the message: stop polling it
+            log.mlr_status = "UNKNOWN"
+            if log.status == "TRANSMITTING":
+                log.status = "FAILED"
+                log.error_code = result.error_code
+                log.error_message = result.error_message or ""
+            return "errors"
+
+        if result.error_code:
+            # Timeout, network or HTTP error
+            return "errors"
+
+        return "in_flight"
+
+    def _expire_stale(self, now: datetime) -> int:
+        """
+        Stop polling messages older than MAX_POLL_AGE.
+
+        Returns:
+            Number of logs expired
+        """
+        stale = PeppolTransmissionLog.objects.filter(
+            peppol_message_id__isnull=False, transmitted_at__lte=now - MAX_POLL_AGE
+        )
+        expired = stale.filter(status="DELIVERED", mlr_status="").update(mlr_status="UNKNOWN")
+        expired += stale.filter(status="TRANSMITTING").update(
+            status="FAILED",
+            error_code="STATUS_UNKNOWN",
+            error_message="No delivery status from the access point",
+            mlr_status="UNKNOWN",
+            response_at=now,
+        )
+        return expired
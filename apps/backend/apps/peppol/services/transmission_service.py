@@ -15,6 +15,7 @@ from datetime import datetime
 from uuid import UUID
 
 from apps.peppol.services.ap_adapter_base import APAdapterBase, TransmissionResult
+from apps.peppol.services.ap_session_pool import APSessionPool
 from apps.peppol.services.xml_mapping_service import XMLMappingService
 from apps.peppol.services.xml_generator_service import XMLGeneratorService
 from apps.peppol.services.xml_validation_service import XMLValidationService
@@ -149,25 +150,21 @@ class TransmissionService:
         # Step 1: Map invoice to UBL structure
         ubl_data = self.mapping_service.map_invoice_to_ubl(invoice)
 
-        # Step 2: Generate XML
-        if invoice.document_type == "SALES_CREDIT_NOTE":
-            xml_payload = self.generator_service.generate_credit_note_xml(ubl_data)
-        else:
-            xml_payload = self.generator_service.generate_invoice_xml(ubl_data)
-
-        # Calculate hash for audit
-        xml_hash = self.generator_service.calculate_xml_hash(xml_payload)
-        log.xml_payload_hash = xml_hash
+        # Step 2: Generate XML (hashed as it is written, for audit)
+        document = self.generator_service.generate_document(ubl_data)
+        xml_payload = document.xml
+        log.xml_payload_hash = document.sha256
         log.save()
 
-        # Step 3: Validate XML
-        validation_result = self.validation_service.validate_invoice_xml(xml_payload)
+        # Step 3: Validate the generated tree (no re-parse)
+        validation_result = self.validation_service.validate_document(
+            document.tree, ubl_data["document_type"]
+        )
 
         if not validation_result.get("is_valid", False):
-            errors = validation_result.get("errors", ["Unknown validation error"])
             return TransmissionResult.failure(
                 error_code="VALIDATION_ERROR",
-                error_message="; ".join(errors),
+                error_message=self._get_validation_error_message(validation_result),
                 status=self._get_status_for_error("VALIDATION_ERROR"),
             )
 
@@ -218,6 +215,8 @@ class TransmissionService:
         Get appropriate AP adapter for organization.
 
         Currently supports Storecove. Future adapters can be added here.
+        Adapters share the process-wide keep-alive session for their
+        access point (APSessionPool).
 
         Args:
             org_id: Organization UUID
@@ -242,6 +241,7 @@ class TransmissionService:
                 api_key=settings.access_point_api_key,
                 client_id=settings.access_point_client_id,
                 base_url=settings.access_point_api_url,
+                session=APSessionPool.get(settings.access_point_api_url),
             )
         else:
             raise ValueError(
@@ -337,6 +337,21 @@ class TransmissionService:
             return invoice.contact.peppol_id
         return None
 
+    def _get_validation_error_message(self, validation_result: Dict[str, Any]) -> str:
+        """
+        Join the messages of a failed validation result.
+
+        Args:
+            validation_result: Result from XMLValidationService
+
+        Returns:
+            Error messages separated by '; '
+        """
+        errors = validation_result.get("schema_errors", []) + validation_result.get(
+            "schematron_errors", []
+        )
+        return "; ".join(error["message"] for error in errors) or "Unknown validation error"
+
     def _get_status_for_error(self, error_code: str) -> Any:
         """
         Map error code to transmission status.
@@ -2,12 +2,62 @@
 XML Generator Service for InvoiceNow/Peppol integration.
 
 Generates UBL 2.1 XML from mapped data structure.
+
+Two output modes share the same tree builders:
+- generate_invoice_xml / generate_credit_note_xml return a pretty-printed
+  string, for callers that only need the text.
+- generate_document writes the document with etree.xmlfile into a sink
+  that hashes the bytes as they are written, and returns the tree with the
+  XML and its SHA-256. The transmission pipeline validates that tree
+  directly (XMLValidationService.validate_document) instead of parsing the
+  string again, and stores the hash without re-encoding the payload.
+
+Party subtrees are compiled once per party version and copied into each
+document, since bulk runs send many invoices to the same parties (see
+PartyFragmentCache).
 """
 
 import hashlib
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Callable
 from lxml import etree
 
+from apps.peppol.services.party_fragment_cache import PartyFragmentCache
+
+
+@dataclass
+class GeneratedXML:
+    """
+    A generated UBL document.
+
+    Attributes:
+        xml: Serialized document (UTF-8 text, with XML declaration)
+        tree: Root element of the same document, for validation
+        sha256: SHA-256 hex digest of the UTF-8 bytes of `xml`
+    """
+
+    xml: str
+    tree: etree._Element
+    sha256: str
+
+
+class _HashingSink:
+    """File-like target for etree.xmlfile that hashes bytes as they are written."""
+
+    def __init__(self):
+        self._chunks = []
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> None:
+        self._hash.update(data)
+        self._chunks.append(data)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self._chunks)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
 
 class XMLGeneratorService:
     """
@@ -39,6 +89,70 @@ class XMLGeneratorService:
         Returns:
             XML string (UTF-8 encoded)
         """
+        return self._to_string(self._build_invoice(mapped_data))
+
+    def generate_credit_note_xml(self, mapped_data: Dict[str, Any]) -> str:
+        """
+        Generate UBL 2.1 CreditNote XML from mapped data.
+
+        Args:
+            mapped_data: Dictionary from XMLMappingService
+
+        Returns:
+            XML string (UTF-8 encoded)
+        """
+        return self._to_string(self._build_credit_note(mapped_data))
+
+    def generate_document(self, mapped_data: Dict[str, Any]) -> GeneratedXML:
+        """
+        Generate an Invoice or CreditNote (by mapped_data['document_type'])
+        with incremental output.
+
+        The tree is streamed through etree.xmlfile into a sink that hashes
+        the bytes as libxml2 flushes them, so the payload is serialized
+        exactly once, never re-encoded for hashing and never parsed back.
+        Output is compact (not pretty-printed).
+
+        Args:
+            mapped_data: Dictionary from XMLMappingService
+
+        Returns:
+            GeneratedXML with the XML text, its tree and its SHA-256
+        """
+        if mapped_data.get("document_type") == "CREDIT_NOTE":
+            root = self._build_credit_note(mapped_data)
+        else:
+            root = self._build_invoice(mapped_data)
+
+        sink = _HashingSink()
+        with etree.xmlfile(sink, encoding="UTF-8") as xf:
+            xf.write_declaration()
+            # One write, so namespaces are declared once on the root rather
+            # than copied onto every top-level child
+            xf.write(root)
+
+        return GeneratedXML(
+            xml=sink.getvalue().decode("utf-8"), tree=root, sha256=sink.hexdigest()
+        )
+
+    def _to_string(self, root: etree._Element) -> str:
+        """Serialize a document tree as pretty-printed UTF-8 text."""
+        xml_string = etree.tostring(
+            root, pretty_print=True, encoding="UTF-8", xml_declaration=True
+        )
+
+        return xml_string.decode("utf-8")
+
+    def _build_invoice(self, mapped_data: Dict[str, Any]) -> etree._Element:
+        """
+        Build the Invoice tree from mapped data.
+
+        Args:
+            mapped_data: Dictionary from XMLMappingService
+
+        Returns:
+            Invoice root element
+        """
         # Create root Invoice element
         nsmap = {
             None: self.NAMESPACE_UBL,
@@ -67,12 +181,16 @@ class XMLGeneratorService:
 
         # Supplier (AccountingSupplierParty)
         if mapped_data.get("supplier"):
-            supplier_party = self._create_supplier_party(mapped_data["supplier"])
+            supplier_party = self._party_fragment(
+                "supplier", mapped_data, self._create_supplier_party
+            )
             invoice.append(supplier_party)
 
         # Customer (AccountingCustomerParty)
         if mapped_data.get("customer"):
-            customer_party = self._create_customer_party(mapped_data["customer"])
+            customer_party = self._party_fragment(
+                "customer", mapped_data, self._create_customer_party
+            )
             invoice.append(customer_party)
 
         # Payment Terms
@@ -96,22 +214,17 @@ class XMLGeneratorService:
                 line = self._create_invoice_line(line_data)
                 invoice.append(line)
 
-        # Generate XML string
-        xml_string = etree.tostring(
-            invoice, pretty_print=True, encoding="UTF-8", xml_declaration=True
-        )
+        return invoice
 
-        return xml_string.decode("utf-8")
-
-    def generate_credit_note_xml(self, mapped_data: Dict[str, Any]) -> str:
+    def _build_credit_note(self, mapped_data: Dict[str, Any]) -> etree._Element:
         """
-        Generate UBL 2.1 CreditNote XML from mapped data.
+        Build the CreditNote tree from mapped data.
 
         Args:
             mapped_data: Dictionary from XMLMappingService
 
         Returns:
-            XML string (UTF-8 encoded)
+            CreditNote root element
         """
         # Create root CreditNote element
         nsmap = {
@@ -136,12 +249,7 @@ class XMLGeneratorService:
         self._add_element(credit_note, "DocumentCurrencyCode", mapped_data.get("currency"))
         self._add_element(credit_note, "TaxCurrencyCode", mapped_data.get("tax_currency"))
 
-        # Generate XML string
-        xml_string = etree.tostring(
-            credit_note, pretty_print=True, encoding="UTF-8", xml_declaration=True
-        )
-
-        return xml_string.decode("utf-8")
+        return credit_note
 
     def calculate_xml_hash(self, xml_string: str) -> str:
         """
@@ -182,6 +290,33 @@ class XMLGeneratorService:
         element = etree.SubElement(parent, f"{{{ns}}}{tag_name}")
         element.text = str(value)
 
+    def _party_fragment(
+        self,
+        role: str,
+        mapped_data: Dict[str, Any],
+        builder: Callable[[Dict[str, Any]], etree._Element],
+    ) -> etree._Element:
+        """
+        Get a copy of the compiled subtree for the document's party.
+
+        Looked up by the party version XMLMappingService recorded in
+        mapped_data['party_keys'], or by the party data's content when
+        there is none.
+
+        Args:
+            role: 'supplier' or 'customer'
+            mapped_data: Dictionary from XMLMappingService
+            builder: Method compiling the subtree on a cache miss
+
+        Returns:
+            A new party element, free to attach to a document
+        """
+        party_data = mapped_data[role]
+        key = (mapped_data.get("party_keys") or {}).get(role)
+        if key is None:
+            key = PartyFragmentCache.content_key(role, party_data)
+        return PartyFragmentCache.get_element(key, party_data, builder)
+
     def _create_supplier_party(self, supplier_data: Dict[str, Any]) -> etree.Element:
         """
         Create AccountingSupplierParty element.
@@ -2,12 +2,17 @@
 XML Mapping Service for InvoiceNow/Peppol integration.
 
 Maps LedgerSG InvoiceDocument to UBL 2.1 PINT-SG data structure.
+
+Supplier and customer parties are mapped once per organisation/contact
+version and shared across invoices (see PartyFragmentCache).
 """
 
 from typing import Dict, Any, Optional
 from decimal import Decimal
 from datetime import date
 
+from apps.peppol.services.party_fragment_cache import PartyFragmentCache
+
 
 class XMLMappingService:
     """
@@ -38,7 +43,9 @@ class XMLMappingService:
             invoice: InvoiceDocument instance
 
         Returns:
-            Dictionary containing UBL 2.1 mapped data
+            Dictionary containing UBL 2.1 mapped data. The 'supplier' and
+            'customer' dictionaries are shared with other invoices to the
+            same parties and must not be modified.
 
         Raises:
             ValueError: If required Peppol fields are missing
@@ -52,6 +59,10 @@ class XMLMappingService:
         # Validate mandatory fields
         XMLMappingService._validate_peppol_requirements(invoice, org, contact)
 
+        # Party versions, reused by XMLGeneratorService for the compiled subtrees
+        supplier_key = PartyFragmentCache.version_key("supplier", org)
+        customer_key = PartyFragmentCache.version_key("customer", contact)
+
         # Map to UBL structure
         return {
             # Document Header
@@ -68,9 +79,14 @@ class XMLMappingService:
             "currency": invoice.currency or "SGD",
             "tax_currency": "SGD",
             # Supplier (AccountingSupplierParty)
-            "supplier": XMLMappingService._map_supplier(org),
+            "supplier": PartyFragmentCache.get_data(
+                supplier_key, lambda: XMLMappingService._map_supplier(org)
+            ),
             # Customer (AccountingCustomerParty)
-            "customer": XMLMappingService._map_customer(contact),
+            "customer": PartyFragmentCache.get_data(
+                customer_key, lambda: XMLMappingService._map_customer(contact)
+            ),
+            "party_keys": {"supplier": supplier_key, "customer": customer_key},
             # Payment Terms
             "payment_terms": XMLMappingService._map_payment_terms(invoice),
             # Tax Totals
@@ -1,48 +1,28 @@
 """
 XML Validation Service for InvoiceNow/Peppol integration.
 
-Validates UBL 2.1 XML against XSD schemas.
+Validates UBL 2.1 XML against XSD schemas and PINT-SG Schematron rules.
 """
 
 from typing import Dict, Any, List
 from lxml import etree
 
+from apps.peppol.services.schema_registry import SchemaRegistry
+
 
 class XMLValidationService:
     """
-    Validates UBL 2.1 XML against XSD schemas.
+    Validates UBL 2.1 XML against XSD schemas and PINT-SG Schematron rules.
 
-    This service provides XML validation using lxml's XMLSchema support.
-    Validates both Invoice and CreditNote XML documents.
+    This service provides XML validation using lxml's XMLSchema and ISO
+    Schematron support. Validates both Invoice and CreditNote XML documents.
+    The compiled validators come from the process-wide SchemaRegistry, so
+    instances are cheap to create.
     """
 
-    # Schema file paths (relative to Django project root)
-    INVOICE_SCHEMA_PATH = "apps/peppol/schemas/ubl-Invoice.xsd"
-    CREDIT_NOTE_SCHEMA_PATH = "apps/peppol/schemas/ubl-CreditNote.xsd"
-
     def __init__(self):
-        """Initialize with schema loading."""
-        self._invoice_schema = None
-        self._credit_note_schema = None
-        self._load_schemas()
-
-    def _load_schemas(self):
-        """Load XSD schemas."""
-        # Load Invoice schema
-        try:
-            schema_doc = etree.parse(self.INVOICE_SCHEMA_PATH)
-            self._invoice_schema = etree.XMLSchema(schema_doc)
-        except Exception:
-            # Schema loading failed
-            pass
-
-        # Load CreditNote schema
-        try:
-            schema_doc = etree.parse(self.CREDIT_NOTE_SCHEMA_PATH)
-            self._credit_note_schema = etree.XMLSchema(schema_doc)
-        except Exception:
-            # Schema loading failed
-            pass
+        """Initialize, compiling the shared schemas on first use in this process."""
+        SchemaRegistry.load()
 
     def _parse_xml(self, xml_string: str):
         """
@@ -62,43 +42,27 @@ class XMLValidationService:
         except Exception as e:
             return None, str(e)
 
-    def _validate_xsd(self, xml_doc: etree.Element, schema) -> List[Dict[str, Any]]:
+    def _validate_xsd(self, xml_doc: etree.Element, document_type: str) -> List[Dict[str, Any]]:
         """
-        Validate XML against XSD schema.
+        Validate XML against the XSD schema for a document type.
 
         Args:
             xml_doc: Parsed XML document
-            schema: XMLSchema object
+            document_type: 'INVOICE' or 'CREDIT_NOTE'
 
         Returns:
             List of error dictionaries
         """
-        if schema is None:
-            return []
-
-        errors = []
-
         try:
-            is_valid = schema.validate(xml_doc)
-            if not is_valid:
-                for error in schema.error_log:
-                    errors.append(
-                        {
-                            "message": error.message,
-                            "line": error.line,
-                            "column": error.column,
-                        }
-                    )
+            return SchemaRegistry.validate_xsd(document_type, xml_doc)
         except Exception as e:
-            errors.append(
+            return [
                 {
                     "message": str(e),
                     "line": 0,
                     "column": 0,
                 }
-            )
-
-        return errors
+            ]
 
     def _get_document_type(self, xml_doc: etree.Element) -> str:
         """
@@ -120,6 +84,34 @@ class XMLValidationService:
             return "INVOICE"
         return "UNKNOWN"
 
+    def validate_document(self, xml_doc: etree.Element, document_type: str) -> Dict[str, Any]:
+        """
+        Validate an already-built document tree.
+
+        Used with XMLGeneratorService.generate_document, so generated
+        payloads are validated without a serialize/parse round trip.
+
+        Args:
+            xml_doc: Root element of the document
+            document_type: 'INVOICE' or 'CREDIT_NOTE' (selects the XSD)
+
+        Returns:
+            Validation result dictionary
+        """
+        result = {
+            "is_valid": False,
+            # Detect document type
+            "document_type": self._get_document_type(xml_doc),
+            # Validate against XSD and Schematron
+            "schema_errors": self._validate_xsd(xml_doc, document_type),
+            "schematron_errors": self._validate_schematron(xml_doc),
+        }
+
+        # Set is_valid based on errors
+        result["is_valid"] = not result["schema_errors"] and not result["schematron_errors"]
+
+        return result
+
     def validate_invoice_xml(self, xml_string: str) -> Dict[str, Any]:
         """
         Validate Invoice XML.
@@ -159,16 +151,7 @@ class XMLValidationService:
             )
             return result
 
-        # Detect document type
-        result["document_type"] = self._get_document_type(xml_doc)
-
-        # Validate against XSD
-        result["schema_errors"] = self._validate_xsd(xml_doc, self._invoice_schema)
-
-        # Set is_valid based on errors
-        result["is_valid"] = len(result["schema_errors"]) == 0
-
-        return result
+        return self.validate_document(xml_doc, "INVOICE")
 
     def validate_credit_note_xml(self, xml_string: str) -> Dict[str, Any]:
         """
@@ -209,27 +192,19 @@ class XMLValidationService:
             )
             return result
 
-        # Detect document type
-        result["document_type"] = self._get_document_type(xml_doc)
-
-        # Validate against XSD
-        result["schema_errors"] = self._validate_xsd(xml_doc, self._credit_note_schema)
-
-        # Set is_valid based on errors
-        result["is_valid"] = len(result["schema_errors"]) == 0
-
-        return result
+        return self.validate_document(xml_doc, "CREDIT_NOTE")
 
     def _validate_schematron(self, xml_doc: etree.Element) -> List[Dict[str, Any]]:
         """
-        Placeholder for Schematron validation.
+        Validate XML against the PINT-SG Schematron rules.
 
         Args:
             xml_doc: Parsed XML document
 
         Returns:
-            List of Schematron errors (empty for now)
+            List of failed assertions ('message', 'location', 'test')
         """
-        # Schematron validation would require additional setup
-        # This is a placeholder for future implementation
-        return []
+        try:
+            return SchemaRegistry.validate_schematron(xml_doc)
+        except Exception as e:
+            return [{"message": str(e), "location": "", "test": ""}]
@@ -164,6 +164,92 @@ def retry_failed_transmission_task(self, transmission_log_id: str) -> dict:
         return {"success": False, "message_id": None, "status": "FAILED", "error": str(exc)}
 
 
+@shared_task
+def transmit_peppol_batch_task(org_id: str, transmission_log_ids: Optional[list] = None) -> dict:
+    """
+    Async task to transmit an organisation's pending invoices as a batch.
+
+    Queued by bulk approval with the logs it created, or by
+    transmit_pending_peppol_batches_task for everything pending. Retryable
+    failures are re-queued as a batch with exponential backoff; if more
+    logs are pending than fit in one batch, the next batch is queued.
+
+    Args:
+        org_id: UUID of the organization
+        transmission_log_ids: Restrict the batch to these logs
+
+    Returns:
+        Batch summary (see BatchTransmissionService.transmit_pending)
+
+    Example:
+        transmit_peppol_batch_task.delay("6ba7b810-9dad-11d1-80b4-00c04fd430c8")
+    """
+    from apps.peppol.services.batch_transmission_service import (
+        BatchTransmissionService,
+        retry_delay,
+    )
+
+    try:
+        summary = BatchTransmissionService().transmit_pending(org_id, transmission_log_ids)
+    except ValueError as e:
+        logger.error(f"Peppol batch for org {org_id} not possible: {e}")
+        return {"org_id": org_id, "total": 0, "error": str(e)}
+
+    if summary["retry_log_ids"]:
+        countdown = retry_delay(summary["retry_attempt"])  # Exponential backoff
+        logger.info(
+            f"Retrying {len(summary['retry_log_ids'])} Peppol transmissions "
+            f"in {countdown} seconds"
+        )
+        transmit_peppol_batch_task.apply_async(
+            (org_id, summary["retry_log_ids"]), countdown=countdown
+        )
+
+    if summary["more_pending"]:
+        transmit_peppol_batch_task.delay(org_id)
+
+    return summary
+
+
+@shared_task
+def transmit_pending_peppol_batches_task() -> int:
+    """
+    Queue one batch transmission per organisation with pending logs.
+
+    Runs on the beat schedule (CELERY_BEAT_SCHEDULE), picking up logs whose
+    original task was lost (e.g. a worker restart). Claims left TRANSMITTING
+    by a batch that died are settled first. Retries still waiting out their
+    backoff (next_attempt_at) are left to their scheduled retry task.
+
+    Returns:
+        Number of organisations queued
+    """
+    from django.utils import timezone
+
+    from apps.peppol.models import PeppolTransmissionLog
+    from apps.peppol.services.batch_transmission_service import (
+        BatchTransmissionService,
+        pending_due,
+    )
+
+    BatchTransmissionService.reclaim_stale_claims()
+
+    org_ids = (
+        PeppolTransmissionLog.objects.filter(pending_due(timezone.now()))
+        .values_list("org_id", flat=True)
+        .distinct()
+    )
+
+    count = 0
+    for org_id in org_ids:
+        transmit_peppol_batch_task.delay(str(org_id))
+        count += 1
+
+    logger.info(f"Queued Peppol batch transmission for {count} organisations")
+
+    return count
+
+
 @shared_task
 def check_transmission_status_task(message_id: str) -> Optional[dict]:
     """
@@ -188,13 +274,46 @@ def check_transmission_status_task(message_id: str) -> Optional[dict]:
         # Check status
         result = check_transmission_status_task.delay("msg-abc-123").get()
     """
+    from apps.peppol.services.status_poller_service import StatusPollerService
+
     logger.info(f"Checking status for Peppol message {message_id}")
 
-    # This would typically query the AP for status
-    # For now, return a placeholder result
-    # TODO: Implement actual status checking via AP adapter
+    log = StatusPollerService().poll_message(message_id)
+    if log is None:
+        return None
+
+    return {
+        "message_id": message_id,
+        "status": log.status,
+        "delivered_at": (
+            log.mlr_received_at.isoformat()
+            if log.mlr_status == "ACCEPTED" and log.mlr_received_at
+            else None
+        ),
+        "error": log.error_message or None,
+    }
+
+
+@shared_task
+def poll_transmission_statuses_task() -> dict:
+    """
+    Poll the Access Point for in-flight transmissions that are due.
+
+    Scheduled every minute (CELERY_BEAT_SCHEDULE); each message is polled
+    on its own age-based backoff. Queues another poll straight away if
+    more messages were due than fit in one run.
+
+    Returns:
+        Poll summary (see StatusPollerService.poll)
+    """
+    from apps.peppol.services.status_poller_service import StatusPollerService
+
+    summary = StatusPollerService().poll()
+
+    if summary["more_due"]:
+        poll_transmission_statuses_task.delay()
 
-    return {"message_id": message_id, "status": "PENDING", "delivered_at": None, "error": None}
+    return summary
 
 
 @shared_task
@@ -0,0 +1,155 @@
+"""
+Tests for the versioned supplier/customer fragment cache.
+
+Covers:
+- Party mappings are reused per organisation/contact version
+- A new updated_at (an edited party) gets a fresh mapping and subtree
+- Unsaved parties are never cached
+- The generator reuses the subtree for the version the mapping recorded
+- Hit rate counters
+- A repeat-customer run misses only on its first invoice
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from lxml import etree
+
+from apps.core.models import Contact, Organisation
+from apps.peppol.services.party_fragment_cache import PartyFragmentCache
+from apps.peppol.services.xml_generator_service import XMLGeneratorService
+from apps.peppol.services.xml_mapping_service import XMLMappingService
+
+
+UPDATED_AT = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    PartyFragmentCache.reset()
+    yield
+    PartyFragmentCache.reset()
+
+
+@pytest.fixture
+def org():
+    return Organisation(
+        name="Test Org",
+        legal_name="Test Org Pte Ltd",
+        uen="202312345A",
+        gst_registered=True,
+        gst_reg_number="M90312345A",
+        updated_at=UPDATED_AT,
+    )
+
+
+@pytest.fixture
+def contact():
+    return Contact(
+        name="Test Contact",
+        legal_name="Test Company Private Limited",
+        uen="202398765B",
+        peppol_id="0195:202398765B",
+        updated_at=UPDATED_AT,
+    )
+
+
+def _party_data(org, contact):
+    """The party portion of XMLMappingService.map_invoice_to_ubl."""
+    supplier_key = PartyFragmentCache.version_key("supplier", org)
+    customer_key = PartyFragmentCache.version_key("customer", contact)
+    return {
+        "supplier": PartyFragmentCache.get_data(
+            supplier_key, lambda: XMLMappingService._map_supplier(org)
+        ),
+        "customer": PartyFragmentCache.get_data(
+            customer_key, lambda: XMLMappingService._map_customer(contact)
+        ),
+        "party_keys": {"supplier": supplier_key, "customer": customer_key},
+    }
+
+
+class TestPartyFragmentCache:
+    """Parties are mapped and compiled once per version."""
+
+    def test_mapping_reused_per_version(self, org, contact):
+        first = _party_data(org, contact)
+        second = _party_data(org, contact)
+
+        assert first["supplier"] is second["supplier"]
+        assert first["customer"] is second["customer"]
+        assert first["supplier"] == XMLMappingService._map_supplier(org)
+        assert PartyFragmentCache.stats()["hits"] == 2
+        assert PartyFragmentCache.stats()["misses"] == 2
+
+    def test_new_version_remapped(self, org, contact):
+        first = _party_data(org, contact)
+
+        contact.name = contact.legal_name = "Renamed Contact"
+        contact.updated_at = UPDATED_AT + timedelta(seconds=1)
+        second = _party_data(org, contact)
+
+        assert second["supplier"] is first["supplier"]
+        assert second["customer"]["name"] == "Renamed Contact"
+        assert first["customer"]["name"] == "Test Company Private Limited"
+
+    def test_unsaved_party_not_cached(self, org, contact):
+        contact.updated_at = None
+
+        assert PartyFragmentCache.version_key("customer", contact) is None
+        assert _party_data(org, contact)["customer"] is not _party_data(org, contact)["customer"]
+        assert PartyFragmentCache.stats()["size"] == 1  # supplier only
+
+    def test_generator_uses_versioned_subtree(self, org, contact):
+        service = XMLGeneratorService()
+        customer_tag = f"{{{XMLGeneratorService.NAMESPACE_CAC}}}AccountingCustomerParty"
+
+        first = service._build_invoice(_party_data(org, contact))
+        second = service._build_invoice(_party_data(org, contact))
+
+        assert first.find(customer_tag) is not second.find(customer_tag)
+        assert etree.tostring(first.find(customer_tag)) == etree.tostring(
+            second.find(customer_tag)
+        )
+        # Two data and two subtree lookups per invoice; the first of each missed
+        assert PartyFragmentCache.stats()["hits"] == 4
+        assert PartyFragmentCache.stats()["misses"] == 4
+
+        contact.name = contact.legal_name = "Renamed Contact"
+        contact.updated_at = UPDATED_AT + timedelta(seconds=1)
+        renamed = service._build_invoice(_party_data(org, contact))
+
+        assert b"Renamed Contact" in etree.tostring(renamed.find(customer_tag))
+
+    def test_hit_rate(self, org, contact):
+        before = PartyFragmentCache.stats()
+        assert before["hit_rate"] is None
+
+        for _ in range(10):
+            _party_data(org, contact)
+
+        assert PartyFragmentCache.stats()["hit_rate"] == 0.9
+        snapshot = PartyFragmentCache.stats()
+        _party_data(org, contact)
+        assert PartyFragmentCache.stats_since(snapshot) == {
+            "hits": 2,
+            "misses": 0,
+            "hit_rate": 1.0,
+        }
+
+
+class TestRepeatCustomerRun:
+    """A run to one customer maps and compiles each party once."""
+
+    def test_repeat_customer(self, org, contact):
+        invoice_count = 200
+        service = XMLGeneratorService()
+
+        for _ in range(invoice_count):
+            service._build_invoice(_party_data(org, contact))
+
+        stats = PartyFragmentCache.stats()
+        # Supplier and customer: one mapping and one subtree build each
+        assert stats["misses"] == 4
+        assert stats["hits"] == 4 * invoice_count - 4
+        assert stats["size"] == 2
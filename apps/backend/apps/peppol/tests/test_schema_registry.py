@@ -0,0 +1,122 @@
+"""
+Tests for the process-wide Peppol schema registry.
+
+Covers:
+- Schemas compile once per process, however many services are created
+- XSD and Schematron validation through the shared validators
+- Concurrent validation from several threads
+- Validation compiles the schemas on first use, once
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from lxml import etree
+
+from apps.peppol.services.schema_registry import SchemaRegistry
+from apps.peppol.services.transmission_service import TransmissionService
+from apps.peppol.services.xml_generator_service import XMLGeneratorService
+from apps.peppol.services.xml_validation_service import XMLValidationService
+
+
+MAPPED_INVOICE = {
+    "ubl_version": "2.1",
+    "customization_id": "urn:peppol:pint:billing-1@sg-1",
+    "profile_id": "urn:peppol:pint:billing-1@sg-1",
+    "document_id": "INV-001",
+    "issue_date": "2026-03-09",
+    "due_date": "2026-04-09",
+    "document_type": "INVOICE",
+    "currency": "SGD",
+    "tax_currency": "SGD",
+    "supplier": {"name": "Test Org", "uen": "202312345A", "address": {"country": "SG"}},
+    "customer": {"name": "Test Contact", "uen": "202398765B", "address": {"country": "SG"}},
+    "payment_terms": {},
+    "tax_totals": {"tax_categories": [], "total_tax_amount": "0.00"},
+    "monetary_totals": {
+        "line_extension_amount": "0.00",
+        "tax_exclusive_amount": "0.00",
+        "tax_inclusive_amount": "0.00",
+        "payable_amount": "0.00",
+        "prepaid_amount": "0.00",
+    },
+    "lines": [],
+}
+
+INVOICE_WITHOUT_ID = """<?xml version="1.0"?>
+<Invoice xmlns="urn:oasis:names:specification:ubl:schema:xsd:Invoice-2"
+         xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2">
+    <cbc:IssueDate>2026-03-09</cbc:IssueDate>
+</Invoice>"""
+
+
+@pytest.fixture
+def invoice_xml():
+    return XMLGeneratorService().generate_invoice_xml(MAPPED_INVOICE)
+
+
+class TestSchemaRegistry:
+    """Compiled validators are shared across the process."""
+
+    def test_services_reuse_compiled_schemas(self):
+        SchemaRegistry.load()
+        compiles = SchemaRegistry.compile_count
+
+        for _ in range(20):
+            XMLValidationService()
+            TransmissionService()
+
+        assert SchemaRegistry.compile_count == compiles
+
+    def test_xsd_errors_reported(self):
+        xml_doc = etree.fromstring(INVOICE_WITHOUT_ID.encode())
+
+        errors = SchemaRegistry.validate_xsd("INVOICE", xml_doc)
+
+        assert errors
+        assert all({"message", "line", "column"} <= set(e) for e in errors)
+
+    def test_schematron_failed_assertions_reported(self):
+        xml_doc = etree.fromstring(INVOICE_WITHOUT_ID.encode())
+
+        errors = SchemaRegistry.validate_schematron(xml_doc)
+
+        assert [e["message"] for e in errors] == ["Invoice must have an ID"]
+
+    def test_service_returns_schematron_errors(self):
+        result = XMLValidationService().validate_invoice_xml(INVOICE_WITHOUT_ID)
+
+        assert result["is_valid"] is False
+        assert result["schematron_errors"][0]["message"] == "Invoice must have an ID"
+
+    def test_concurrent_validation(self, invoice_xml):
+        service = XMLValidationService()
+        expected = service.validate_invoice_xml(invoice_xml)
+        expected_invalid = service.validate_invoice_xml(INVOICE_WITHOUT_ID)
+
+        def validate(i):
+            xml = invoice_xml if i % 2 else INVOICE_WITHOUT_ID
+            return i, service.validate_invoice_xml(xml)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(validate, range(200)))
+
+        for i, result in results:
+            assert result == (expected if i % 2 else expected_invalid)
+
+
+class TestSchemaRegistryLoad:
+    """Validation compiles on first use only."""
+
+    def test_validations_compile_once(self, invoice_xml):
+        SchemaRegistry.reset()
+        compiles = SchemaRegistry.compile_count
+        service = XMLValidationService()
+
+        service.validate_invoice_xml(invoice_xml)
+        validator = SchemaRegistry._xsd["INVOICE"]
+        for _ in range(20):
+            service.validate_invoice_xml(invoice_xml)
+
+        assert SchemaRegistry.compile_count == compiles + 1
+        assert SchemaRegistry._xsd["INVOICE"] is validator
@@ -0,0 +1,174 @@
+"""
+Tests for streamed UBL generation (XMLGeneratorService.generate_document).
+
+Covers:
+- The streamed document matches the string mode element for element
+- The incremental hash matches calculate_xml_hash of the payload
+- Validating the tree matches validating the serialized string
+- Party subtrees are compiled once and copied per document
+- A 2,000-line invoice gives the same document, hash and validation
+"""
+
+import copy
+
+from lxml import etree
+
+from apps.peppol.services.xml_generator_service import XMLGeneratorService
+from apps.peppol.services.xml_validation_service import XMLValidationService
+
+
+MAPPED_INVOICE = {
+    "ubl_version": "2.1",
+    "customization_id": "urn:peppol:pint:billing-1@sg-1",
+    "profile_id": "urn:peppol:pint:billing-1@sg-1",
+    "document_id": "INV-001",
+    "issue_date": "2026-03-09",
+    "due_date": "2026-04-09",
+    "document_type": "INVOICE",
+    "currency": "SGD",
+    "tax_currency": "SGD",
+    "supplier": {
+        "name": "Test Org",
+        "uen": "202312345A",
+        "address": {"street": "123 Main St", "city": "Singapore", "country": "SG"},
+    },
+    "customer": {
+        "name": "Test Contact",
+        "uen": "202398765B",
+        "address": {"street": "456 Oak St", "city": "Singapore", "country": "SG"},
+    },
+    "payment_terms": {"payment_due_date": "2026-04-09"},
+    "tax_totals": {
+        "tax_categories": [
+            {"category": "S", "rate": 0.09, "taxable_amount": "100.00", "tax_amount": "9.00"}
+        ],
+        "total_tax_amount": "9.00",
+    },
+    "monetary_totals": {
+        "line_extension_amount": "100.00",
+        "tax_exclusive_amount": "100.00",
+        "tax_inclusive_amount": "109.00",
+        "payable_amount": "109.00",
+        "prepaid_amount": "0.00",
+    },
+    "lines": [
+        {
+            "line_id": "1",
+            "description": "Consulting",
+            "quantity": "1",
+            "unit_code": "EA",
+            "unit_price": "100.00",
+            "line_extension_amount": "100.00",
+            "tax_amount": "9.00",
+            "tax_rate": "0.09",
+            "tax_category": "S",
+        }
+    ],
+}
+
+
+def _canonical(xml: str) -> bytes:
+    parser = etree.XMLParser(remove_blank_text=True)
+    return etree.tostring(etree.fromstring(xml.encode("utf-8"), parser), method="c14n")
+
+
+def _messages(result):
+    """Validation outcome without source positions (a built tree has no line numbers)."""
+    return (
+        result["is_valid"],
+        [error["message"] for error in result["schema_errors"]],
+        [error["message"] for error in result["schematron_errors"]],
+    )
+
+
+def _with_lines(count):
+    mapped = copy.deepcopy(MAPPED_INVOICE)
+    mapped["lines"] = [
+        dict(MAPPED_INVOICE["lines"][0], line_id=str(i), description=f"Item {i}")
+        for i in range(1, count + 1)
+    ]
+    return mapped
+
+
+class TestGenerateDocument:
+    """Streamed output, hash and tree agree with the string mode."""
+
+    def test_matches_string_mode(self):
+        service = XMLGeneratorService()
+
+        document = service.generate_document(MAPPED_INVOICE)
+
+        assert document.xml.startswith("<?xml")
+        assert _canonical(document.xml) == _canonical(service.generate_invoice_xml(MAPPED_INVOICE))
+        assert etree.tostring(document.tree, method="c14n") == _canonical(document.xml)
+
+    def test_credit_note(self):
+        service = XMLGeneratorService()
+        mapped = dict(MAPPED_INVOICE, document_type="CREDIT_NOTE")
+
+        document = service.generate_document(mapped)
+
+        assert document.tree.tag.endswith("CreditNote")
+        assert _canonical(document.xml) == _canonical(service.generate_credit_note_xml(mapped))
+
+    def test_incremental_hash(self):
+        service = XMLGeneratorService()
+
+        document = service.generate_document(MAPPED_INVOICE)
+
+        assert document.sha256 == service.calculate_xml_hash(document.xml)
+
+    def test_tree_validation_matches_string_validation(self):
+        generator = XMLGeneratorService()
+        validator = XMLValidationService()
+
+        document = generator.generate_document(MAPPED_INVOICE)
+
+        assert _messages(validator.validate_document(document.tree, "INVOICE")) == _messages(
+            validator.validate_invoice_xml(generator.generate_invoice_xml(MAPPED_INVOICE))
+        )
+
+    def test_party_fragments_copied(self):
+        service = XMLGeneratorService()
+
+        first = service.generate_document(MAPPED_INVOICE).tree
+        second = service.generate_document(MAPPED_INVOICE).tree
+
+        supplier_tag = f"{{{XMLGeneratorService.NAMESPACE_CAC}}}AccountingSupplierParty"
+        first_party = first.find(supplier_tag)
+        second_party = second.find(supplier_tag)
+        assert first_party is not second_party
+        assert etree.tostring(first_party) == etree.tostring(second_party)
+
+        # Documents own their copies
+        first.remove(first_party)
+        assert service.generate_document(MAPPED_INVOICE).tree.find(supplier_tag) is not None
+
+    def test_changed_party_not_served_stale(self):
+        service = XMLGeneratorService()
+        renamed = copy.deepcopy(MAPPED_INVOICE)
+        renamed["customer"]["name"] = "Renamed Contact"
+
+        service.generate_document(MAPPED_INVOICE)
+        document = service.generate_document(renamed)
+
+        assert "Renamed Contact" in document.xml
+        assert "Test Contact" not in document.xml
+
+
+class TestLargeDocument:
+    """A large invoice streams to the same document and hash as the string mode."""
+
+    def test_large_invoice(self):
+        mapped = _with_lines(2000)
+        generator = XMLGeneratorService()
+        validator = XMLValidationService()
+
+        xml = generator.generate_invoice_xml(mapped)
+        document = generator.generate_document(mapped)
+
+        assert _canonical(document.xml) == _canonical(xml)
+        assert document.sha256 == generator.calculate_xml_hash(document.xml)
+        assert _messages(validator.validate_document(document.tree, "INVOICE")) == _messages(
+            validator.validate_invoice_xml(xml)
+        )
@@ -0,0 +1,315 @@
+"""
+Aged receivables / payables report for LedgerSG.
+
+Open items are documents with an unpaid balance as of the report date.
+The balance is rebuilt from the payment allocations dated on or before
+that date (not the document's current amount_paid and status), so payments
+and voids made later never change a historical report. Documents paid in
+full since, or voided after the report date, are still open as of it.
+
+Amounts are totalled in SGD: each item's base balance is its
+base_total_amount less the base amount of those allocations. Item exports
+also carry the balance in the document currency.
+
+Each item is placed in a bucket by days past its due date as of the
+report date:
+
+- current: not yet due
+- 1_30, 31_60, 61_90: days overdue
+- over_90: more than 90 days overdue
+
+The summary (per contact and in total) is one grouped query over
+invoicing.document (idx_document_org_type) and is cached per (org, ledger,
+as-of date). Item-level exports are streamed
+from a server-side cursor so large ledgers never sit in memory.
+"""
+
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from uuid import UUID
+
+from django.db import connection
+from django.utils import timezone
+
+from apps.reporting.services.report_cache import ReportCache
+from common.decimal_utils import money
+from common.exceptions import ValidationError
+
+
+# (key, first day overdue, last day overdue); None means unbounded
+BUCKETS: Tuple[Tuple[str, Optional[int], Optional[int]], ...] = (
+    ("current", None, 0),
+    ("1_30", 1, 30),
+    ("31_60", 31, 60),
+    ("61_90", 61, 90),
+    ("over_90", 91, None),
+)
+
+LEDGER_DOCUMENT_TYPES = {
+    "receivables": ("SALES_INVOICE", "SALES_DEBIT_NOTE"),
+    "payables": ("PURCHASE_INVOICE", "PURCHASE_DEBIT_NOTE"),
+}
+
+# Statuses a posted, unvoided document can have; PAID documents may still
+# have been open as of an earlier date. VOID documents count only if
+# voided after the report date.
+POSTED_STATUSES = ("APPROVED", "SENT", "PARTIALLY_PAID", "OVERDUE", "PAID")
+
+STREAM_CHUNK_SIZE = 2000
+
+
+def _sql_list(values) -> str:
+    """Render module constants as a literal IN list (lets the planner match partial indexes)."""
+    return ", ".join(f"'{v}'" for v in values)
+
+
+def _bucket_sql(column: str, low: Optional[int], high: Optional[int]) -> str:
+    conditions = []
+    if low is not None:
+        conditions.append(f"{column} >= {low}")
+    if high is not None:
+        conditions.append(f"{column} <= {high}")
+    return " AND ".join(conditions)
+
+
+def _open_items_sql(ledger: str) -> str:
+    """Open items as of %(as_of)s, with balances rebuilt from allocations."""
+    return f"""
+        SELECT
+            d.id,
+            d.document_number,
+            d.contact_id,
+            d.document_date,
+            COALESCE(d.due_date, d.document_date) AS due_date,
+            d.currency,
+            d.total_amount,
+            d.total_amount - COALESCE(pa.paid, 0) AS balance,
+            -- Documents saved without base amounts fall back to the document rate
+            CASE
+                WHEN d.base_total_amount > 0 THEN d.base_total_amount
+                ELSE ROUND(d.total_amount * d.exchange_rate, 4)
+            END - COALESCE(pa.base_paid, 0) AS base_balance,
+            %(as_of)s::date - COALESCE(d.due_date, d.document_date) AS days_overdue
+        FROM invoicing.document d
+        LEFT JOIN LATERAL (
+            SELECT
+                SUM(a.allocated_amount) AS paid,
+                SUM(a.base_allocated_amount) AS base_paid
+            FROM banking.payment_allocation a
+            JOIN banking.payment p ON p.id = a.payment_id
+            WHERE a.document_id = d.id
+                AND NOT p.is_voided
+                AND p.payment_date <= %(as_of)s
+        ) pa ON TRUE
+        WHERE d.org_id = %(org_id)s
+            AND d.document_type IN ({_sql_list(LEDGER_DOCUMENT_TYPES[ledger])})
+            AND d.document_date <= %(as_of)s
+            AND (
+                d.status IN ({_sql_list(POSTED_STATUSES)})
+                OR (d.status = 'VOID' AND d.voided_at >= %(voided_after)s)
+            )
+            AND d.total_amount > COALESCE(pa.paid, 0)
+    """
+
+
+def _open_items_params(org_id: UUID, as_of: date) -> Dict[str, Any]:
+    """Parameters for _open_items_sql."""
+    return {
+        "org_id": str(org_id),
+        "as_of": as_of,
+        # Voids from the day after as_of onwards (local time) did not yet apply
+        "voided_after": timezone.make_aware(datetime.combine(as_of + timedelta(days=1), time.min)),
+    }
+
+
+def bucket_for(days_overdue: int) -> str:
+    """Return the bucket key for a number of days overdue."""
+    for key, low, high in BUCKETS:
+        if (low is None or days_overdue >= low) and (high is None or days_overdue <= high):
+            return key
+    return BUCKETS[-1][0]
+
+
+class AgeingService:
+    """Service class for aged receivables and payables."""
+
+    ITEM_COLUMNS = (
+        "document_id",
+        "document_number",
+        "contact_id",
+        "contact_name",
+        "document_date",
+        "due_date",
+        "currency",
+        "total_amount",
+        "balance",
+        "base_balance",
+        "days_overdue",
+        "bucket",
+    )
+
+    @staticmethod
+    def validate_params(ledger: str, as_of: Optional[date]) -> date:
+        """Validate the ledger name and return the effective as-of date."""
+        if ledger not in LEDGER_DOCUMENT_TYPES:
+            raise ValidationError(
+                f"Invalid ledger: {ledger}. Expected one of "
+                f"{', '.join(sorted(LEDGER_DOCUMENT_TYPES))}."
+            )
+        return as_of or date.today()
+
+    @staticmethod
+    def get_summary(
+        org_id: UUID,
+        ledger: str = "receivables",
+        as_of: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the ageing summary, from cache when available.
+
+        Args:
+            org_id: Organisation ID
+            ledger: 'receivables' or 'payables'
+            as_of: Report date (default: today)
+
+        Returns:
+            Dict with 'ledger', 'as_of', 'buckets', 'contacts' and 'totals'
+        """
+        as_of = AgeingService.validate_params(ledger, as_of)
+        return ReportCache.get_or_compute(
+            org_id,
+            "ageing",
+            [ledger, as_of.isoformat()],
+            lambda: AgeingService.compute_summary(org_id, ledger, as_of),
+        )
+
+    @staticmethod
+    def compute_summary(
+        org_id: UUID,
+        ledger: str = "receivables",
+        as_of: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """
+        Compute the ageing summary with a single grouped query.
+
+        Per-contact rows and the grand total come from one GROUPING SETS
+        aggregate, with one FILTER clause per bucket.
+
+        Args:
+            org_id: Organisation ID
+            ledger: 'receivables' or 'payables'
+            as_of: Report date (default: today)
+
+        Returns:
+            Dict with 'ledger', 'as_of', 'buckets', 'contacts' and 'totals'.
+            Amounts are SGD strings with 4 decimal places.
+        """
+        as_of = AgeingService.validate_params(ledger, as_of)
+
+        bucket_columns = ",\n".join(
+            f"COALESCE(SUM(o.base_balance) FILTER (WHERE "
+            f"{_bucket_sql('o.days_overdue', low, high)}), 0)"
+            for _, low, high in BUCKETS
+        )
+        query = f"""
+            SELECT
+                c.id,
+                c.name,
+                GROUPING(c.id) AS is_total,
+                COUNT(*),
+                {bucket_columns},
+                COALESCE(SUM(o.base_balance), 0)
+            FROM ({_open_items_sql(ledger)}) o
+            JOIN invoicing.contact c ON c.id = o.contact_id
+            GROUP BY GROUPING SETS ((c.id, c.name), ())
+            ORDER BY is_total, c.name, c.id
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, _open_items_params(org_id, as_of))
+            rows = cursor.fetchall()
+
+        contacts = []
+        totals = AgeingService._row_data(0, [Decimal("0")] * (len(BUCKETS) + 1))
+        for contact_id, name, is_total, count, *amounts in rows:
+            data = AgeingService._row_data(count, amounts)
+            if is_total:
+                totals = data
+            else:
+                contacts.append({"contact_id": str(contact_id), "contact_name": name, **data})
+
+        return {
+            "ledger": ledger,
+            "as_of": as_of.isoformat(),
+            "buckets": [key for key, _, _ in BUCKETS],
+            "contacts": contacts,
+            "totals": totals,
+        }
+
+    @staticmethod
+    def _row_data(count: int, amounts: List[Decimal]) -> Dict[str, Any]:
+        *bucket_amounts, total = amounts
+        return {
+            "document_count": count,
+            **{key: str(money(amount)) for (key, _, _), amount in zip(BUCKETS, bucket_amounts)},
+            "total": str(money(total)),
+        }
+
+    @staticmethod
+    def iter_open_items(
+        org_id: UUID,
+        ledger: str = "receivables",
+        as_of: Optional[date] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream open items ordered by contact and due date.
+
+        Rows are read from a server-side cursor in chunks of
+        STREAM_CHUNK_SIZE, so memory stays flat for any ledger size.
+        Validation happens on the first next() call.
+
+        Args:
+            org_id: Organisation ID
+            ledger: 'receivables' or 'payables'
+            as_of: Report date (default: today)
+
+        Yields:
+            Dicts with the keys in ITEM_COLUMNS
+        """
+        as_of = AgeingService.validate_params(ledger, as_of)
+
+        query = f"""
+            SELECT
+                o.id, o.document_number, o.contact_id, c.name, o.document_date,
+                o.due_date, o.currency, o.total_amount, o.balance, o.base_balance,
+                o.days_overdue
+            FROM ({_open_items_sql(ledger)}) o
+            JOIN invoicing.contact c ON c.id = o.contact_id
+            ORDER BY c.name, o.contact_id, o.due_date, o.document_number
+        """
+
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(query, _open_items_params(org_id, as_of))
+            while True:
+                rows = cursor.fetchmany(STREAM_CHUNK_SIZE)
+                if not rows:
+                    break
+                for (
+                    document_id, number, contact_id, contact_name, document_date,
+                    due_date, currency, total_amount, balance, base_balance, days_overdue,
+                ) in rows:
+                    yield {
+                        "document_id": str(document_id),
+                        "document_number": number,
+                        "contact_id": str(contact_id),
+                        "contact_name": contact_name,
+                        "document_date": document_date.isoformat(),
+                        "due_date": due_date.isoformat(),
+                        "currency": currency,
+                        "total_amount": str(money(total_amount)),
+                        "balance": str(money(balance)),
+                        "base_balance": str(money(base_balance)),
+                        "days_overdue": max(days_overdue, 0),
+                        "bucket": bucket_for(days_overdue),
+                    }
@@ -7,20 +7,23 @@ Phase 4: Redis Caching (TDD)
 """
 
 from datetime import date, datetime, timedelta
+from typing import Optional
 from decimal import Decimal
-from uuid import UUID
+from uuid import UUID, uuid4
 import logging
+import time
 
-from django.db.models import Sum, Q, F
+from django.db.models import Sum, Count, Q, F
 from django.db.models.functions import Coalesce
 from django.core.cache import cache
+from django.db import transaction
 
+from apps.journal.services.ledger_version_service import LedgerVersionService
 from apps.core.models import (
     InvoiceDocument,
     FiscalYear,
     FiscalPeriod,
     BankAccount,
-    Payment,
     JournalLine,
     BankTransaction,
 )
@@ -35,60 +38,192 @@ class DashboardService:
     GST_THRESHOLD_LIMIT = Decimal("1000000.00")
     GST_THRESHOLD_SAFE = Decimal("0.70")
     GST_THRESHOLD_WARNING = Decimal("0.90")
-    CACHE_TIMEOUT = 300  # 5 minutes
+    # Ledger figures are keyed by ledger version and date, but the DRAFT and
+    # Peppol pending counts are not versioned: they may lag by this long
+    CACHE_TIMEOUT = 300
+    STALE_TIMEOUT = 86400  # last known copy, served while a refresh is in flight
+    LOCK_TIMEOUT = 30  # single-flight lock; expires if the holder dies
+    LOCK_WAIT = 2.0  # how long a concurrent miss waits for the lock holder
+    LOCK_POLL_INTERVAL = 0.05
+
+    def _get_cache_key(self, org_id: str, version: Optional[int] = None) -> str:
+        """
+        Generate cache key for dashboard data.
+
+        Keyed by ledger version (read from the database when not given) and
+        today's date, since overdue counts and period figures move daily.
+        """
+        if version is None:
+            version = LedgerVersionService.get(org_id)
+        return f"dashboard:{org_id}:v{version}:{date.today().isoformat()}"
+
+    def _get_stale_key(self, org_id: str) -> str:
+        """Cache key for the last computed dashboard (outlives invalidation)."""
+        return f"dashboard:{org_id}:stale"
 
-    def _get_cache_key(self, org_id: str) -> str:
-        """Generate cache key for dashboard data."""
-        return f"dashboard:{org_id}"
+    def _get_lock_key(self, org_id: str) -> str:
+        """Cache key for the single-flight recompute lock."""
+        return f"dashboard:{org_id}:lock"
 
     def invalidate_dashboard_cache(self, org_id: str) -> None:
-        """Invalidate dashboard cache for organization."""
+        """
+        Drop the cached dashboard for the current ledger version.
+
+        Ledger changes do not need this: they bump the ledger version.
+        """
         cache_key = self._get_cache_key(org_id)
         cache.delete(cache_key)
         logger.info(f"Invalidated dashboard cache for org:{org_id}")
 
+    @staticmethod
+    def publish_invalidation(org_id) -> None:
+        """
+        Publish a ledger-change event for an organisation.
+
+        Called by the posting paths (document approval/void, payments,
+        reconciliation) inside their transaction. The ledger version is
+        bumped immediately, so every version-keyed cache (dashboard,
+        ReportCache) moves to new keys exactly when the change commits.
+        Once committed, a background warm-up is queued so the next reader
+        gets fresh numbers without a cold miss.
+        """
+        org_key = str(org_id)
+        LedgerVersionService.bump(org_id)
+
+        def _on_commit():
+            from apps.reporting.tasks import warm_dashboard_cache_task
+
+            try:
+                warm_dashboard_cache_task.delay(org_key)
+            except Exception as e:
+                # The posting has committed; a missed warm-up only costs a cold miss
+                logger.warning(f"Dashboard warm-up failed for org {org_key}: {e}")
+
+        transaction.on_commit(_on_commit)
+
     def get_dashboard_data(self, org_id: str) -> dict:
         """
-        Get dashboard data with 5-minute Redis caching.
+        Get dashboard data, cached per ledger version.
 
-        Phase 4 TDD Implementation - Uses cache with fallback to database queries.
+        On a miss only one caller recomputes (single-flight lock). Concurrent
+        callers are served the last known copy, or wait briefly for the lock
+        holder, before falling back to computing uncached.
         """
-        # Try to get from cache
+        # Try to get from cache (one ledger version read)
         cache_key = self._get_cache_key(org_id)
-        try:
-            cached_data = cache.get(cache_key)
+        cached_data = self._cache_get(cache_key)
+        if cached_data is not None:
+            logger.debug(f"Cache hit for dashboard:{org_id}")
+            return cached_data
+
+        logger.debug(f"Cache miss for dashboard:{org_id}")
+
+        token = self._acquire_lock(org_id)
+        if token:
+            try:
+                return self.refresh_dashboard_cache(org_id, cache_key)
+            finally:
+                self._release_lock(org_id, token)
+
+        # Another process is recomputing
+        stale_data = self._cache_get(self._get_stale_key(org_id))
+        if stale_data is not None:
+            return stale_data
+
+        deadline = time.monotonic() + self.LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(self.LOCK_POLL_INTERVAL)
+            cached_data = self._cache_get(cache_key)
             if cached_data is not None:
-                logger.debug(f"Cache hit for dashboard:{org_id}")
                 return cached_data
-        except Exception as e:
-            logger.warning(f"Cache get failed for org {org_id}: {e}")
 
-        logger.debug(f"Cache miss for dashboard:{org_id}")
+        return self._compute_dashboard_data(org_id)
 
-        # Compute from database
-        data = self._compute_dashboard_data(org_id)
+    def refresh_dashboard_cache(self, org_id: str, cache_key: Optional[str] = None) -> dict:
+        """
+        Recompute dashboard data from the database and cache it.
+
+        The key (and so the ledger version) is taken before computing, so
+        data is never stored under a version newer than it reflects. If the
+        computation fails nothing is cached, and the last known copy (or
+        the empty dashboard) is returned.
+        """
+        cache_key = cache_key or self._get_cache_key(org_id)
+        try:
+            data = self._query_dashboard_data(org_id)
+        except Exception as e:
+            # Not cached: a transient failure must not blank the dashboard
+            # until the entry expires
+            logger.error(f"Error computing dashboard data for org {org_id}: {e}")
+            return self._cache_get(self._get_stale_key(org_id)) or self._get_empty_dashboard()
 
-        # Cache for 5 minutes
         try:
             cache.set(cache_key, data, timeout=self.CACHE_TIMEOUT)
+            cache.set(self._get_stale_key(org_id), data, timeout=self.STALE_TIMEOUT)
             logger.debug(f"Cached dashboard data for org:{org_id}")
         except Exception as e:
             logger.warning(f"Failed to cache dashboard data: {e}")
 
         return data
 
+    def _cache_get(self, key: str):
+        """Read from cache, treating cache errors as a miss."""
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return None
+
+    def _acquire_lock(self, org_id: str) -> Optional[str]:
+        """
+        Take the single-flight recompute lock.
+
+        Returns:
+            Lock token if acquired, else None. If the cache is unavailable the
+            caller proceeds as if it holds the lock.
+        """
+        token = uuid4().hex
+        try:
+            if cache.add(self._get_lock_key(org_id), token, timeout=self.LOCK_TIMEOUT):
+                return token
+            return None
+        except Exception as e:
+            logger.warning(f"Dashboard lock unavailable for org {org_id}: {e}")
+            return token
+
+    def _release_lock(self, org_id: str, token: str) -> None:
+        """Release the lock if this caller still holds it."""
+        lock_key = self._get_lock_key(org_id)
+        try:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"Dashboard lock release failed for org {org_id}: {e}")
+
     def _compute_dashboard_data(self, org_id: str) -> dict:
         """
-        Compute dashboard data from database (original logic).
+        Compute dashboard data, falling back to the empty dashboard on error.
 
-        Phase 3 TDD Implementation - Uses real database queries.
+        Used where a result must always be returned; refresh_dashboard_cache
+        calls _query_dashboard_data directly so a failure is never cached.
         """
         try:
-            org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
-        except (ValueError, TypeError):
-            logger.error(f"Invalid org_id: {org_id}")
+            return self._query_dashboard_data(org_id)
+        except Exception as e:
+            logger.error(f"Error computing dashboard data for org {org_id}: {e}")
             return self._get_empty_dashboard()
 
+    def _query_dashboard_data(self, org_id: str) -> dict:
+        """
+        Compute dashboard data from database (original logic).
+
+        Phase 3 TDD Implementation - Uses real database queries.
+
+        Raises:
+            ValueError: If org_id is not a valid UUID
+        """
+        org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
+
         today = date.today()
 
         current_quarter = (today.month - 1) // 3 + 1
@@ -112,59 +247,53 @@ class DashboardService:
         filing_due_date = date(filing_year, filing_month, 30)
         days_remaining = (filing_due_date - today).days
 
-        try:
-            fiscal_year = FiscalYear.objects.filter(org_id=org_uuid, is_closed=False).first()
+        fiscal_year = FiscalYear.objects.filter(org_id=org_uuid, is_closed=False).first()
 
-            gst_result = self.calculate_gst_liability(org_id, period_start, period_end)
+        gst_result = self.calculate_gst_liability(org_id, period_start, period_end)
+        cash_on_hand = self.calculate_cash_on_hand(org_id)
 
-            revenue_mtd = self.query_revenue_mtd(org_id, today)
-            revenue_ytd = (
-                self.query_revenue_ytd(org_id, str(fiscal_year.id))
-                if fiscal_year
-                else Decimal("0.0000")
-            )
+        # Revenue, outstanding balances, threshold and invoice counts
+        # come from one conditional-aggregate pass over documents
+        metrics = self._query_document_metrics(org_uuid, today, fiscal_year)
 
-            outstanding_receivables = self.query_outstanding_receivables(org_id)
-            outstanding_payables = self.query_outstanding_payables(org_id)
-            cash_on_hand = self.calculate_cash_on_hand(org_id)
-
-            threshold_status = self.query_gst_threshold_status(org_id)
-            compliance_alerts = self.generate_compliance_alerts(org_id)
-
-            invoice_counts = self._get_invoice_counts(org_uuid)
-
-            gst_payable = gst_result.get("net_gst", Decimal("0.0000"))
-
-            return {
-                "gst_payable": str(gst_payable),
-                "gst_payable_display": self._format_display(gst_payable),
-                "outstanding_receivables": self._format_display(outstanding_receivables),
-                "outstanding_payables": self._format_display(outstanding_payables),
-                "revenue_mtd": self._format_display(revenue_mtd),
-                "revenue_ytd": self._format_display(revenue_ytd),
-                "cash_on_hand": self._format_display(cash_on_hand),
-                "gst_threshold_status": threshold_status.get("status", "SAFE"),
-                "gst_threshold_utilization": threshold_status.get("utilization", 0),
-                "gst_threshold_amount": self._format_display(
-                    threshold_status.get("amount", Decimal("0.0000"))
-                ),
-                "gst_threshold_limit": self._format_display(self.GST_THRESHOLD_LIMIT),
-                "compliance_alerts": compliance_alerts,
-                "invoices_pending": invoice_counts.get("pending", 0),
-                "invoices_overdue": invoice_counts.get("overdue", 0),
-                "invoices_peppol_pending": invoice_counts.get("peppol_pending", 0),
-                "current_gst_period": {
-                    "start_date": period_start.isoformat(),
-                    "end_date": period_end.isoformat(),
-                    "filing_due_date": filing_due_date.isoformat(),
-                    "days_remaining": max(days_remaining, 0),
-                },
-                "last_updated": datetime.now().isoformat(),
-            }
+        revenue_mtd = metrics["revenue_mtd"]
+        revenue_ytd = metrics["revenue_ytd"]
+        outstanding_receivables = metrics["outstanding_receivables"]
+        outstanding_payables = metrics["outstanding_payables"]
 
-        except Exception as e:
-            logger.error(f"Error computing dashboard data for org {org_id}: {e}")
-            return self._get_empty_dashboard()
+        threshold_status = self._threshold_status(metrics["threshold_amount"])
+        compliance_alerts = self.generate_compliance_alerts(
+            org_id, overdue_count=metrics["alert_overdue"]
+        )
+
+        gst_payable = gst_result.get("net_gst", Decimal("0.0000"))
+
+        return {
+            "gst_payable": str(gst_payable),
+            "gst_payable_display": self._format_display(gst_payable),
+            "outstanding_receivables": self._format_display(outstanding_receivables),
+            "outstanding_payables": self._format_display(outstanding_payables),
+            "revenue_mtd": self._format_display(revenue_mtd),
+            "revenue_ytd": self._format_display(revenue_ytd),
+            "cash_on_hand": self._format_display(cash_on_hand),
+            "gst_threshold_status": threshold_status.get("status", "SAFE"),
+            "gst_threshold_utilization": threshold_status.get("utilization", 0),
+            "gst_threshold_amount": self._format_display(
+                threshold_status.get("amount", Decimal("0.0000"))
+            ),
+            "gst_threshold_limit": self._format_display(self.GST_THRESHOLD_LIMIT),
+            "compliance_alerts": compliance_alerts,
+            "invoices_pending": metrics["pending"],
+            "invoices_overdue": metrics["overdue"],
+            "invoices_peppol_pending": metrics["peppol_pending"],
+            "current_gst_period": {
+                "start_date": period_start.isoformat(),
+                "end_date": period_end.isoformat(),
+                "filing_due_date": filing_due_date.isoformat(),
+                "days_remaining": max(days_remaining, 0),
+            },
+            "last_updated": datetime.now().isoformat(),
+        }
 
     def _get_empty_dashboard(self) -> dict:
         """Return empty dashboard structure."""
@@ -201,6 +330,93 @@ class DashboardService:
         except (ValueError, TypeError):
             return "SGD 0.00"
 
+    def _query_document_metrics(
+        self, org_uuid: UUID, today: date, fiscal_year: Optional[FiscalYear]
+    ) -> dict:
+        """
+        Compute every document-based dashboard figure in a single query.
+
+        Each figure is a conditional aggregate (FILTER clause) with the same
+        criteria as the standalone query_* method it replaces.
+        """
+        zero = Decimal("0.0000")
+        revenue = Q(
+            document_type__in=["SALES_INVOICE", "SALES_DEBIT_NOTE"],
+            status__in=["APPROVED", "PARTIALLY_PAID", "PAID"],
+        )
+        unpaid = Q(amount_paid__lt=F("total_incl"))
+        balance_due = F("total_incl") - Coalesce(F("amount_paid"), zero)
+        overdue = Q(
+            document_type__in=["SALES_INVOICE", "PURCHASE_INVOICE"],
+            due_date__lt=today,
+        ) & unpaid
+
+        aggregates = {
+            "revenue_mtd": Sum(
+                "total_excl",
+                filter=revenue & Q(issue_date__gte=today.replace(day=1), issue_date__lte=today),
+            ),
+            "threshold_amount": Sum(
+                "total_excl",
+                filter=revenue
+                & Q(issue_date__gte=today - timedelta(days=365), issue_date__lte=today),
+            ),
+            "outstanding_receivables": Sum(
+                balance_due,
+                filter=Q(
+                    document_type__in=["SALES_INVOICE", "SALES_DEBIT_NOTE"],
+                    status__in=["APPROVED", "PARTIALLY_PAID", "OVERDUE"],
+                )
+                & unpaid,
+            ),
+            "outstanding_payables": Sum(
+                balance_due,
+                filter=Q(
+                    document_type__in=["PURCHASE_INVOICE", "PURCHASE_DEBIT_NOTE"],
+                    status__in=["APPROVED", "OVERDUE"],
+                )
+                & unpaid,
+            ),
+            "pending": Count(
+                "id", filter=Q(document_type="SALES_INVOICE", status="DRAFT")
+            ),
+            "overdue": Count(
+                "id", filter=overdue & Q(status__in=["APPROVED", "PARTIALLY_PAID", "OVERDUE"])
+            ),
+            "alert_overdue": Count(
+                "id", filter=overdue & Q(status__in=["APPROVED", "PARTIALLY_PAID", "PAID"])
+            ),
+            "peppol_pending": Count(
+                "id",
+                filter=Q(
+                    document_type="SALES_INVOICE",
+                    status__in=["APPROVED", "PARTIALLY_PAID", "PAID"],
+                    invoicenow_status="PENDING",
+                ),
+            ),
+        }
+        if fiscal_year:
+            aggregates["revenue_ytd"] = Sum(
+                "total_excl",
+                filter=revenue
+                & Q(issue_date__gte=fiscal_year.start_date, issue_date__lte=fiscal_year.end_date),
+            )
+
+        result = InvoiceDocument.objects.filter(org_id=org_uuid).aggregate(**aggregates)
+
+        for key in (
+            "revenue_mtd",
+            "revenue_ytd",
+            "threshold_amount",
+            "outstanding_receivables",
+            "outstanding_payables",
+        ):
+            result[key] = money(result.get(key) or zero)
+        for key in ("outstanding_receivables", "outstanding_payables"):
+            result[key] = max(result[key], zero)
+
+        return result
+
     def query_revenue_mtd(self, org_id: str, today: date) -> Decimal:
         """Query month-to-date revenue from approved sales invoices."""
         org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
@@ -271,27 +487,19 @@ class DashboardService:
         """Calculate GST liability (output tax - input tax) for a period."""
         org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
 
-        # Output tax from sales (posted entries only)
-        output_result = JournalLine.objects.filter(
-            org_id=org_uuid,
-            entry__posted_at__isnull=False,  # Posted entries only
-            entry__entry_date__gte=period_start,
-            entry__entry_date__lte=period_end,
-            tax_code__is_output=True,
-        ).aggregate(total=Sum("tax_amount"))
-
-        output_tax = money(output_result.get("total") or Decimal("0.0000"))
-
-        # Input tax from purchases (posted entries only)
-        input_result = JournalLine.objects.filter(
+        # Output and input tax from posted entries in one pass
+        result = JournalLine.objects.filter(
             org_id=org_uuid,
             entry__posted_at__isnull=False,  # Posted entries only
             entry__entry_date__gte=period_start,
             entry__entry_date__lte=period_end,
-            tax_code__is_input=True,
-        ).aggregate(total=Sum("tax_amount"))
+        ).aggregate(
+            output_tax=Sum("tax_amount", filter=Q(tax_code__is_output=True)),
+            input_tax=Sum("tax_amount", filter=Q(tax_code__is_input=True)),
+        )
 
-        input_tax = money(input_result.get("total") or Decimal("0.0000"))
+        output_tax = money(result.get("output_tax") or Decimal("0.0000"))
+        input_tax = money(result.get("input_tax") or Decimal("0.0000"))
 
         net_gst = output_tax - input_tax
 
@@ -305,39 +513,26 @@ class DashboardService:
         """
         Calculate cash position across all bank accounts.
 
-        Formula: opening_balance + sum(reconciled payments received) - sum(reconciled payments made)
+        Formula: opening_balance + payments received - payments made (non-voided,
+        in SGD), read from the per-account totals in banking.cash_position:
+        one row per active account, no aggregation over payments.
         """
         org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
 
-        # Get all active bank accounts
-        bank_accounts = BankAccount.objects.filter(
+        totals = BankAccount.objects.filter(
             org_id=org_uuid,
             is_active=True,
+        ).aggregate(
+            opening=Sum("opening_balance"),
+            received=Sum("cash_position__base_received_total"),
+            made=Sum("cash_position__base_made_total"),
         )
 
-        total = Decimal("0.0000")
-
-        for account in bank_accounts:
-            # Add opening balance
-            total += account.opening_balance
-
-            # Add payments received (even if not reconciled, for visibility)
-            received = Payment.objects.filter(
-                bank_account=account,
-                payment_type="RECEIVED",
-                is_voided=False,
-            ).aggregate(total=Sum("base_amount"))
-
-            total += received.get("total") or Decimal("0.0000")
-
-            # Subtract payments made
-            made = Payment.objects.filter(
-                bank_account=account,
-                payment_type="MADE",
-                is_voided=False,
-            ).aggregate(total=Sum("base_amount"))
-
-            total -= made.get("total") or Decimal("0.0000")
+        total = (
+            (totals.get("opening") or Decimal("0.0000"))
+            + (totals.get("received") or Decimal("0.0000"))
+            - (totals.get("made") or Decimal("0.0000"))
+        )
 
         return money(total)
 
@@ -355,7 +550,10 @@ class DashboardService:
             issue_date__lte=today,
         ).aggregate(total=Sum("total_excl"))
 
-        amount = money(result.get("total") or Decimal("0.0000"))
+        return self._threshold_status(money(result.get("total") or Decimal("0.0000")))
+
+    def _threshold_status(self, amount: Decimal) -> dict:
+        """Classify 12-month rolling revenue against the registration threshold."""
         utilization = int((amount / self.GST_THRESHOLD_LIMIT) * 100)
 
         if utilization >= 90:
@@ -371,23 +569,33 @@ class DashboardService:
             "amount": amount,
         }
 
-    def generate_compliance_alerts(self, org_id: str) -> list:
-        """Generate compliance alerts based on business rules."""
+    def generate_compliance_alerts(
+        self, org_id: str, overdue_count: Optional[int] = None
+    ) -> list:
+        """
+        Generate compliance alerts based on business rules.
+
+        overdue_count may be passed in when it has already been computed
+        (see _query_document_metrics) to skip the overdue invoice query.
+        """
         org_uuid = UUID(org_id) if isinstance(org_id, str) else org_id
         alerts = []
 
         # Check for overdue invoices
         today = date.today()
-        overdue_invoices = (
-            InvoiceDocument.objects.filter(
-                org_id=org_uuid,
-                document_type__in=["SALES_INVOICE", "PURCHASE_INVOICE"],
-                status__in=["APPROVED", "PARTIALLY_PAID", "PAID"],
-                due_date__lt=today,
+        if overdue_count is not None:
+            overdue_invoices = overdue_count
+        else:
+            overdue_invoices = (
+                InvoiceDocument.objects.filter(
+                    org_id=org_uuid,
+                    document_type__in=["SALES_INVOICE", "PURCHASE_INVOICE"],
+                    status__in=["APPROVED", "PARTIALLY_PAID", "PAID"],
+                    due_date__lt=today,
+                )
+                .filter(amount_paid__lt=F("total_incl"))
+                .count()
             )
-            .filter(amount_paid__lt=F("total_incl"))
-            .count()
-        )
 
         if overdue_invoices > 0:
             alerts.append(
@@ -428,35 +636,3 @@ class DashboardService:
             )
 
         return alerts
-
-    def _get_invoice_counts(self, org_uuid: UUID) -> dict:
-        """Get counts of invoices by status."""
-        pending = InvoiceDocument.objects.filter(
-            org_id=org_uuid,
-            document_type="SALES_INVOICE",
-            status="DRAFT",
-        ).count()
-
-        overdue = (
-            InvoiceDocument.objects.filter(
-                org_id=org_uuid,
-                document_type__in=["SALES_INVOICE", "PURCHASE_INVOICE"],
-                status__in=["APPROVED", "PARTIALLY_PAID", "OVERDUE"],
-                due_date__lt=date.today(),
-            )
-            .filter(amount_paid__lt=F("total_incl"))
-            .count()
-        )
-
-        peppol_pending = InvoiceDocument.objects.filter(
-            org_id=org_uuid,
-            document_type="SALES_INVOICE",
-            status__in=["APPROVED", "PARTIALLY_PAID", "PAID"],
-            invoicenow_status="PENDING",
-        ).count()
-
-        return {
-            "pending": pending,
-            "overdue": overdue,
-            "peppol_pending": peppol_pending,
-        }
@@ -0,0 +1,511 @@
+"""
+Financial statements engine for LedgerSG.
+
+Produces the profit & loss and balance sheet with account-level and
+sub-type-level rows for one or more comparative columns. Every column
+comes from a single grouped pass: each column is a FILTER aggregate over
+the same rows, so adding comparatives does not add queries. Balance sheet
+(cumulative) columns read closed periods from the per-period balance
+snapshots and scan only the lines of the period still open at the column
+date, so their cost does not grow with the ledger's history.
+
+Accounts are classified by their coa.account_type / account_sub_type
+references, falling back to the account_type code used by the chart of
+accounts service (ACCOUNT_TYPE_GROUPS). Amounts are shown with their
+natural sign: debit-positive for assets and expenses, credit-positive
+for liabilities, equity and income.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional, List, Dict, Any, Tuple
+from uuid import UUID
+
+from django.db import connection
+
+from apps.coa.services import ACCOUNT_TYPE_GROUPS, AccountService
+from apps.reporting.services.report_cache import ReportCache
+from common.decimal_utils import money
+from common.exceptions import ValidationError
+
+
+MAX_COMPARATIVES = 3
+
+# (key, name, debit_positive)
+PROFIT_LOSS_SECTIONS = (
+    ("revenue", "Revenue", False),
+    ("cost_of_sales", "Cost of Sales", True),
+    ("operating_expenses", "Operating Expenses", True),
+    ("other_income", "Other Income", False),
+    ("other_expenses", "Other Expenses", True),
+    ("taxation", "Taxation", True),
+)
+BALANCE_SHEET_SECTIONS = (
+    ("assets", "Assets", True),
+    ("liabilities", "Liabilities", False),
+    ("equity", "Equity", False),
+)
+
+# coa.account_type.code -> section
+_TYPE_SECTIONS = {
+    "ASSET": "assets",
+    "LIABILITY": "liabilities",
+    "EQUITY": "equity",
+    "REVENUE": "revenue",
+    "COGS": "cost_of_sales",
+    "EXPENSE": "operating_expenses",
+    "OTHER_INCOME": "other_income",
+    "OTHER_EXPENSE": "other_expenses",
+}
+
+# ACCOUNT_TYPE_GROUPS category -> section, for accounts without a type reference
+_CATEGORY_SECTIONS = {
+    "ASSET": "assets",
+    "LIABILITY": "liabilities",
+    "EQUITY": "equity",
+}
+
+_INCOME_STATEMENT_SECTIONS = {key for key, _, _ in PROFIT_LOSS_SECTIONS}
+_DEBIT_POSITIVE = {
+    key: debit_positive
+    for key, _, debit_positive in PROFIT_LOSS_SECTIONS + BALANCE_SHEET_SECTIONS
+}
+
+
+def shift_years(value: date, years: int) -> date:
+    """Move a date by whole years (29 Feb maps to 28 Feb)."""
+    try:
+        return value.replace(year=value.year + years)
+    except ValueError:
+        return value.replace(year=value.year + years, day=28)
+
+
+def _signed(section: str, balances: List[Decimal]) -> List[Decimal]:
+    """Convert net debit balances to the section's natural sign."""
+    if _DEBIT_POSITIVE[section]:
+        return list(balances)
+    # 0 - b rather than -b, so zero stays 0.0000 rather than -0.0000
+    return [Decimal("0") - b for b in balances]
+
+
+def _classify(
+    account_type: Optional[str],
+    type_code: Optional[str],
+    type_name: Optional[str],
+    sub_code: Optional[str],
+    sub_name: Optional[str],
+) -> Optional[Tuple[str, str, str]]:
+    """Return (section, sub_type code, sub_type name), or None if unclassified."""
+    if type_code in _TYPE_SECTIONS:
+        if sub_code:
+            return _TYPE_SECTIONS[type_code], sub_code, sub_name
+        return _TYPE_SECTIONS[type_code], type_code, type_name
+
+    group = ACCOUNT_TYPE_GROUPS.get(account_type or "")
+    if not group:
+        return None
+    section = group.get("pl_section") or _CATEGORY_SECTIONS.get(group["category"])
+    if section not in _DEBIT_POSITIVE:
+        return None
+    return section, account_type, account_type.replace("_", " ").title()
+
+
+class FinancialStatementService:
+    """Service class for the profit & loss and balance sheet."""
+
+    @staticmethod
+    def _account_balances(
+        org_id: UUID,
+        columns: List[Tuple[Optional[date], date]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Net debit balance per account for each (start, end) column.
+
+        A start of None means "from the beginning": periods ending on or
+        before the column's end are read from journal.account_period_balance
+        (BalanceSnapshotService), and only the lines of the period still
+        open at that date are scanned. Columns with a start aggregate the
+        lines between the two dates. One query for any number of accounts
+        and columns.
+        """
+        aggregates = []
+        params: List[Any] = []
+        for start, end in columns:
+            if start:
+                aggregates.append(
+                    "COALESCE(SUM(x.amount) FILTER "
+                    "(WHERE NOT x.is_snapshot AND x.on_date BETWEEN %s AND %s), 0)"
+                )
+                params.extend([start, end])
+            else:
+                aggregates.append(
+                    "COALESCE(SUM(x.amount) FILTER (WHERE x.on_date <= %s "
+                    "AND (x.is_snapshot OR x.period_end > %s)), 0)"
+                )
+                params.extend([end, end])
+
+        cumulative_ends = [end for start, end in columns if not start]
+        period_starts = [start for start, _ in columns if start]
+
+        sources = []
+        if cumulative_ends:
+            sources.append(
+                """
+                SELECT s.account_id, TRUE, s.period_end, s.period_end,
+                    s.debit_total - s.credit_total
+                FROM journal.account_period_balance s
+                WHERE s.org_id = %s AND s.period_end <= %s
+                """
+            )
+            params.extend([str(org_id), max(cumulative_ends)])
+
+        # Lines of periods still open at a cumulative column's end, and
+        # lines inside a dated column's window
+        line_windows = []
+        window_params: List[Any] = []
+        if cumulative_ends:
+            line_windows.append("p.end_date > %s")
+            window_params.append(min(cumulative_ends))
+        if period_starts:
+            line_windows.append("e.entry_date >= %s")
+            window_params.append(min(period_starts))
+        sources.append(
+            f"""
+            SELECT l.account_id, FALSE, e.entry_date, p.end_date, l.debit - l.credit
+            FROM journal.line l
+            JOIN journal.entry e ON e.id = l.entry_id
+            JOIN core.fiscal_period p ON p.id = e.fiscal_period_id
+            WHERE l.org_id = %s AND e.entry_date <= %s AND ({" OR ".join(line_windows)})
+            """
+        )
+        params.extend([str(org_id), max(end for _, end in columns)] + window_params)
+
+        query = f"""
+            SELECT
+                a.id, a.code, a.name, a.account_type, a.parent_id,
+                t.code, t.name, st.code, st.name,
+                {", ".join(f"COALESCE(b.c{i}, 0)" for i in range(len(columns)))}
+            FROM coa.account a
+            LEFT JOIN coa.account_type t ON t.id = a.account_type_id
+            LEFT JOIN coa.account_sub_type st ON st.id = a.account_sub_type_id
+            LEFT JOIN (
+                SELECT
+                    x.account_id,
+                    {", ".join(f"{agg} AS c{i}" for i, agg in enumerate(aggregates))}
+                FROM ({" UNION ALL ".join(sources)}) AS x (
+                    account_id, is_snapshot, on_date, period_end, amount
+                )
+                GROUP BY x.account_id
+            ) b ON b.account_id = a.id
+            WHERE a.org_id = %s AND (a.is_active OR b.account_id IS NOT NULL)
+            ORDER BY t.display_order NULLS LAST, st.display_order NULLS LAST, a.code
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params + [str(org_id)])
+            rows = cursor.fetchall()
+
+        accounts = []
+        for (
+            account_id, code, name, account_type, parent_id,
+            type_code, type_name, sub_code, sub_name, *balances,
+        ) in rows:
+            classification = _classify(account_type, type_code, type_name, sub_code, sub_name)
+            if classification is None:
+                continue
+            section, sub_type_code, sub_type_name = classification
+            accounts.append(
+                {
+                    "id": str(account_id),
+                    "code": code,
+                    "name": name,
+                    "parent_id": str(parent_id) if parent_id else None,
+                    "section": section,
+                    "sub_type_code": sub_type_code,
+                    "sub_type_name": sub_type_name,
+                    "balances": [money(b) for b in balances],
+                }
+            )
+        return accounts
+
+    @staticmethod
+    def _build_sections(
+        accounts: List[Dict[str, Any]],
+        section_defs: Tuple[Tuple[str, str, bool], ...],
+        width: int,
+        include_zero: bool,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Group accounts into sections and sub-types with per-column totals."""
+        zero = [Decimal("0.0000")] * width
+        sections = {
+            key: {"key": key, "name": name, "totals": list(zero), "sub_types": {}}
+            for key, name, _ in section_defs
+        }
+
+        for account in accounts:
+            section = sections.get(account["section"])
+            if section is None:
+                continue
+            amounts = _signed(account["section"], account["balances"])
+            if not include_zero and not any(amounts):
+                continue
+
+            sub_type = section["sub_types"].setdefault(
+                account["sub_type_code"],
+                {
+                    "code": account["sub_type_code"],
+                    "name": account["sub_type_name"],
+                    "totals": list(zero),
+                    "accounts": [],
+                },
+            )
+            sub_type["accounts"].append(
+                {
+                    "id": account["id"],
+                    "code": account["code"],
+                    "name": account["name"],
+                    "amounts": amounts,
+                }
+            )
+            sub_type["totals"] = [t + a for t, a in zip(sub_type["totals"], amounts)]
+            section["totals"] = [t + a for t, a in zip(section["totals"], amounts)]
+
+        for section in sections.values():
+            section["sub_types"] = list(section["sub_types"].values())
+        return sections
+
+    @staticmethod
+    def _hierarchy(
+        org_id: UUID,
+        accounts: List[Dict[str, Any]],
+        include_zero: bool,
+    ) -> List[Dict[str, Any]]:
+        """
+        Roll account amounts up the chart-of-accounts tree.
+
+        Each node gets its own 'amounts' and a 'totals' subtotal that
+        includes every descendant. Branches with no amounts are pruned
+        unless include_zero is set, and accounts that belong to the other
+        statement are kept only as parents of this statement's accounts.
+        """
+        by_id = {a["id"]: a for a in accounts}
+        width = len(accounts[0]["balances"]) if accounts else 0
+
+        def visit(node):
+            account = by_id.get(node["id"])
+            if account:
+                amounts = _signed(account["section"], account["balances"])
+            else:
+                amounts = [Decimal("0.0000")] * width
+            children = [c for c in (visit(child) for child in node["children"]) if c]
+            totals = list(amounts)
+            for child in children:
+                totals = [t + c for t, c in zip(totals, child["totals"])]
+            # Accounts from the other statement only appear as parents
+            if not children and (account is None or not (include_zero or any(totals))):
+                return None
+            return {
+                "id": node["id"],
+                "code": node["code"],
+                "name": node["name"],
+                "amounts": amounts,
+                "totals": totals,
+                "children": children,
+            }
+
+        roots = AccountService.get_account_hierarchy(org_id)
+        return [n for n in (visit(root) for root in roots) if n]
+
+    @staticmethod
+    def _serialize(value):
+        """Convert Decimal amounts to strings recursively."""
+        if isinstance(value, Decimal):
+            return str(value)
+        if isinstance(value, list):
+            return [FinancialStatementService._serialize(v) for v in value]
+        if isinstance(value, dict):
+            return {k: FinancialStatementService._serialize(v) for k, v in value.items()}
+        return value
+
+    @staticmethod
+    def _comparatives(comparatives: int) -> int:
+        if comparatives < 0 or comparatives > MAX_COMPARATIVES:
+            raise ValidationError(
+                f"comparatives must be between 0 and {MAX_COMPARATIVES}."
+            )
+        return comparatives
+
+    @staticmethod
+    def profit_loss(
+        org_id: UUID,
+        start_date: date,
+        end_date: date,
+        comparatives: int = 0,
+        include_zero: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Profit & loss for a period, with the same period in prior years.
+
+        Args:
+            org_id: Organisation ID
+            start_date: First day of the period
+            end_date: Last day of the period
+            comparatives: Number of prior-year columns (0-3)
+            include_zero: Keep accounts with no amounts in any column
+
+        Returns:
+            Dict with 'columns', 'sections', 'gross_profit', 'net_profit'
+            and 'hierarchy'. Amounts are per column, in column order.
+        """
+        if start_date > end_date:
+            raise ValidationError("start_date must be on or before end_date.")
+        comparatives = FinancialStatementService._comparatives(comparatives)
+
+        return ReportCache.get_or_compute(
+            org_id,
+            "profit_loss",
+            [start_date.isoformat(), end_date.isoformat(), comparatives, include_zero],
+            lambda: FinancialStatementService._compute_profit_loss(
+                org_id, start_date, end_date, comparatives, include_zero
+            ),
+        )
+
+    @staticmethod
+    def _compute_profit_loss(
+        org_id: UUID,
+        start_date: date,
+        end_date: date,
+        comparatives: int,
+        include_zero: bool,
+    ) -> Dict[str, Any]:
+        columns = [
+            (shift_years(start_date, -n), shift_years(end_date, -n))
+            for n in range(comparatives + 1)
+        ]
+        accounts = [
+            a
+            for a in FinancialStatementService._account_balances(org_id, columns)
+            if a["section"] in _INCOME_STATEMENT_SECTIONS
+        ]
+        sections = FinancialStatementService._build_sections(
+            accounts, PROFIT_LOSS_SECTIONS, len(columns), include_zero
+        )
+
+        def total(key):
+            return sections[key]["totals"]
+
+        gross_profit = [r - c for r, c in zip(total("revenue"), total("cost_of_sales"))]
+        net_profit = [
+            g - opex + oi - oe - tax
+            for g, opex, oi, oe, tax in zip(
+                gross_profit,
+                total("operating_expenses"),
+                total("other_income"),
+                total("other_expenses"),
+                total("taxation"),
+            )
+        ]
+
+        return FinancialStatementService._serialize(
+            {
+                "report_type": "profit_loss",
+                "currency": "SGD",
+                "columns": [
+                    {"start_date": start.isoformat(), "end_date": end.isoformat()}
+                    for start, end in columns
+                ],
+                "sections": list(sections.values()),
+                "gross_profit": gross_profit,
+                "net_profit": net_profit,
+                "hierarchy": FinancialStatementService._hierarchy(
+                    org_id, accounts, include_zero
+                ),
+            }
+        )
+
+    @staticmethod
+    def balance_sheet(
+        org_id: UUID,
+        as_at_date: date,
+        comparatives: int = 0,
+        include_zero: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Balance sheet as at a date, with the same date in prior years.
+
+        Income statement accounts are not listed; their cumulative net is
+        shown under equity as current earnings, so assets always equal
+        liabilities plus equity.
+
+        Args:
+            org_id: Organisation ID
+            as_at_date: Balance date (inclusive)
+            comparatives: Number of prior-year columns (0-3)
+            include_zero: Keep accounts with no amounts in any column
+
+        Returns:
+            Dict with 'columns', 'sections', 'total_liabilities_and_equity',
+            'is_balanced' and 'hierarchy'.
+        """
+        comparatives = FinancialStatementService._comparatives(comparatives)
+
+        return ReportCache.get_or_compute(
+            org_id,
+            "balance_sheet",
+            [as_at_date.isoformat(), comparatives, include_zero],
+            lambda: FinancialStatementService._compute_balance_sheet(
+                org_id, as_at_date, comparatives, include_zero
+            ),
+        )
+
+    @staticmethod
+    def _compute_balance_sheet(
+        org_id: UUID,
+        as_at_date: date,
+        comparatives: int,
+        include_zero: bool,
+    ) -> Dict[str, Any]:
+        columns = [(None, shift_years(as_at_date, -n)) for n in range(comparatives + 1)]
+        all_accounts = FinancialStatementService._account_balances(org_id, columns)
+        accounts = [a for a in all_accounts if a["section"] not in _INCOME_STATEMENT_SECTIONS]
+        sections = FinancialStatementService._build_sections(
+            accounts, BALANCE_SHEET_SECTIONS, len(columns), include_zero
+        )
+
+        # Unclosed income statement balances (credit-positive) belong to equity
+        earnings = [Decimal("0.0000")] * len(columns)
+        for account in all_accounts:
+            if account["section"] in _INCOME_STATEMENT_SECTIONS:
+                earnings = [e - b for e, b in zip(earnings, account["balances"])]
+        equity = sections["equity"]
+        if include_zero or any(earnings):
+            equity["sub_types"].append(
+                {
+                    "code": "CURRENT_EARNINGS",
+                    "name": "Current Earnings",
+                    "totals": earnings,
+                    "accounts": [],
+                }
+            )
+            equity["totals"] = [t + e for t, e in zip(equity["totals"], earnings)]
+
+        liabilities_and_equity = [
+            li + eq for li, eq in zip(sections["liabilities"]["totals"], equity["totals"])
+        ]
+
+        return FinancialStatementService._serialize(
+            {
+                "report_type": "balance_sheet",
+                "currency": "SGD",
+                "columns": [{"as_at_date": end.isoformat()} for _, end in columns],
+                "sections": list(sections.values()),
+                "total_liabilities_and_equity": liabilities_and_equity,
+                "is_balanced": all(
+                    a == le
+                    for a, le in zip(sections["assets"]["totals"], liabilities_and_equity)
+                ),
+                "hierarchy": FinancialStatementService._hierarchy(
+                    org_id, accounts, include_zero
+                ),
+            }
+        )
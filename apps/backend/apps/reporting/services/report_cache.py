@@ -0,0 +1,66 @@
+"""
+Report cache for LedgerSG.
+
+Computed reports (ageing, financial statements, trial balance, F5
+preview) are cached under the organisation's ledger version
+(LedgerVersionService). Any ledger change bumps the version in its own
+transaction, so cached entries are never stale and can keep a long TTL;
+superseded versions simply expire.
+"""
+
+import logging
+from typing import Any, Callable, Iterable
+
+from django.core.cache import cache
+
+from apps.journal.services.ledger_version_service import LedgerVersionService
+
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """Ledger-version-keyed cache for computed reports."""
+
+    TIMEOUT = 86400
+
+    @staticmethod
+    def get_or_compute(
+        org_id,
+        name: str,
+        parts: Iterable[Any],
+        compute: Callable[[], Any],
+        timeout: int = TIMEOUT,
+    ) -> Any:
+        """
+        Return a cached report, computing and storing it on a miss.
+
+        The ledger version is read before computing, so a report is only
+        ever stored under a version no newer than the data it was built
+        from. Cache errors are treated as misses.
+
+        Args:
+            org_id: Organisation ID
+            name: Report name (e.g. 'ageing')
+            parts: Values identifying the report parameters
+            compute: Zero-argument callable producing the report
+            timeout: Cache TTL in seconds
+        """
+        key = ":".join(
+            ["report", str(org_id), f"v{LedgerVersionService.get(org_id)}", name]
+            + [str(p) for p in parts]
+        )
+        try:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+        except Exception as e:
+            logger.warning(f"Report cache read failed for {name}: {e}")
+
+        result = compute()
+
+        try:
+            cache.set(key, result, timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Failed to cache {name} report: {e}")
+
+        return result
@@ -0,0 +1,41 @@
+"""
+Asynchronous tasks for Reporting module.
+"""
+
+import logging
+from celery import shared_task
+
+from django.core.cache import cache
+
+from apps.reporting.services.dashboard_service import DashboardService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def warm_dashboard_cache_task(org_id: str) -> dict:
+    """
+    Recompute an organisation's dashboard after a ledger change.
+
+    Shares the single-flight lock with DashboardService.get_dashboard_data,
+    so a burst of events or concurrent cache misses results in one
+    recomputation rather than a stampede.
+    """
+    service = DashboardService()
+
+    cache_key = service._get_cache_key(org_id)
+    if cache.get(cache_key) is not None:
+        # Already refreshed by a reader since the ledger change
+        return {"status": "fresh", "org_id": org_id}
+
+    token = service._acquire_lock(org_id)
+    if not token:
+        return {"status": "skipped", "org_id": org_id}
+
+    try:
+        service.refresh_dashboard_cache(org_id, cache_key)
+    finally:
+        service._release_lock(org_id, token)
+
+    logger.info(f"Warmed dashboard cache for org:{org_id}")
+    return {"status": "warmed", "org_id": org_id}
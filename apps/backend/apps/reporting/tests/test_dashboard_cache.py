@@ -177,12 +177,12 @@ class TestDashboardCacheKeys:
     """Test cache key generation for dashboard data."""
 
     def test_cache_key_format(self, cache_test_org):
-        """Test cache key follows expected pattern: dashboard:{org_id}."""
+        """Test cache key follows expected pattern: dashboard:{org_id}:v{version}:{date}."""
         service = DashboardService()
         cache_key = service._get_cache_key(str(cache_test_org.id))
 
         assert cache_key is not None
-        assert cache_key == f"dashboard:{cache_test_org.id}"
+        assert cache_key == f"dashboard:{cache_test_org.id}:v0:{date.today().isoformat()}"
 
     def test_cache_key_consistency(self, cache_test_org):
         """Test cache key is consistent for same org_id."""
@@ -517,3 +517,26 @@ class TestDashboardCacheErrorHandling:
 
             assert "gst_payable" in result
             assert result is not None
+
+    def test_failed_computation_not_cached(self, cache_test_org, cache_test_fiscal_year):
+        """Test that the empty fallback dashboard is never cached."""
+        service = DashboardService()
+        org_id = str(cache_test_org.id)
+        cache_key = service._get_cache_key(org_id)
+        cache.delete(cache_key)
+        cache.delete(service._get_stale_key(org_id))
+
+        from unittest.mock import patch
+
+        with patch.object(
+            DashboardService, "_query_dashboard_data", side_effect=Exception("DB error")
+        ):
+            result = service.refresh_dashboard_cache(org_id, cache_key)
+
+        assert result["revenue_mtd"] == "SGD 0.00"
+        assert cache.get(cache_key) is None
+        assert cache.get(service._get_stale_key(org_id)) is None
+
+        # The next read recomputes and caches the real dashboard
+        service.get_dashboard_data(org_id)
+        assert cache.get(cache_key) is not None
@@ -29,6 +29,7 @@ from apps.core.models import (
     JournalEntry,
     JournalLine,
 )
+from apps.banking.services import CashPositionService
 from apps.reporting.services.dashboard_service import DashboardService
 
 
@@ -1090,6 +1091,9 @@ class TestCashPosition:
             is_voided=False,
         )
 
+        # Payments were inserted directly, bypassing PaymentService
+        CashPositionService.rebuild(test_org.id)
+
         # Execute
         service = DashboardService()
         result = service.calculate_cash_on_hand(str(test_org.id))
@@ -10,6 +10,7 @@ from .views import (
     DashboardMetricsView,
     DashboardAlertsView,
     FinancialReportView,
+    AgeingReportView,
 )
 
 app_name = "reporting"
@@ -20,4 +21,5 @@ urlpatterns = [
     path("dashboard/alerts/", DashboardAlertsView.as_view(), name="dashboard-alerts"),
     # Financial reports
     path("reports/financial/", FinancialReportView.as_view(), name="financial-report"),
+    path("ageing/", AgeingReportView.as_view(), name="ageing-report"),
 ]
@@ -9,12 +9,13 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework import status
-from django.db.models import Sum, F
+from django.http import StreamingHttpResponse
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
+import csv
+import json
 
-from apps.core.permissions import IsOrgMember, CanViewReports
-from apps.core.models import Account, JournalLine
+from apps.core.permissions import IsOrgMember, CanViewReports, CanExportData
 from common.views import wrap_response
 from common.exceptions import ValidationError
 
@@ -68,11 +69,92 @@ class DashboardAlertsView(APIView):
         )
 
 
-class FinancialReportView(APIView):
+class _Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+class AgeingReportView(APIView):
     """
-    GET: Financial reports (P&L, Balance Sheet).
+    GET: Aged receivables / payables.
 
-    Returns financial reports for the organization.
+    Query params:
+        ledger: receivables (default) or payables
+        as_of: Report date (YYYY-MM-DD, default today)
+        export: csv or json to stream every open item instead of the summary
+    """
+
+    authentication_classes = [JWTAuthentication]
+    permission_classes = [IsAuthenticated, IsOrgMember, CanViewReports]
+
+    @wrap_response
+    def get(self, request, org_id: str):
+        """Return the cached ageing summary, or stream open items."""
+        from apps.reporting.services.ageing_service import AgeingService
+
+        ledger = request.query_params.get("ledger", "receivables")
+        export = request.query_params.get("export")
+        as_of = request.query_params.get("as_of")
+        try:
+            as_of = date.fromisoformat(as_of) if as_of else None
+        except ValueError:
+            raise ValidationError(f"Invalid as_of date: {as_of}")
+
+        if not export:
+            return Response(AgeingService.get_summary(org_id, ledger, as_of))
+
+        if export not in ("csv", "json"):
+            raise ValidationError(f"Invalid export format: {export}")
+        if not CanExportData().has_permission(request, self):
+            return Response(
+                {"error": "You do not have permission to export data."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        # Validate before the response starts streaming
+        AgeingService.validate_params(ledger, as_of)
+        as_of = as_of or date.today()
+        items = AgeingService.iter_open_items(org_id, ledger, as_of)
+        filename = f"{ledger}-ageing-{as_of.isoformat()}.{export}"
+
+        if export == "csv":
+            content, content_type = self._csv_rows(items, AgeingService.ITEM_COLUMNS), "text/csv"
+        else:
+            content, content_type = self._json_chunks(items, ledger, as_of), "application/json"
+
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    @staticmethod
+    def _csv_rows(items, columns):
+        writer = csv.DictWriter(_Echo(), fieldnames=columns)
+        yield writer.writeheader()
+        for item in items:
+            yield writer.writerow(item)
+
+    @staticmethod
+    def _json_chunks(items, ledger, as_of):
+        yield json.dumps({"ledger": ledger, "as_of": as_of.isoformat()})[:-1] + ', "items": ['
+        separator = ""
+        for item in items:
+            yield separator + json.dumps(item)
+            separator = ","
+        yield "]}"
+
+
+class FinancialReportView(APIView):
+    """
+    GET: Financial reports (P&L, Balance Sheet, Trial Balance).
+
+    Query params:
+        report_type: profit_loss (default), balance_sheet or trial_balance
+        start_date, end_date: P&L period (default: year to date)
+        as_at_date: Balance sheet / trial balance date (default: today)
+        comparatives: Number of prior-year columns (0-3)
+        include_zero: true to list accounts with no amounts
     """
 
     authentication_classes = [JWTAuthentication]
@@ -83,91 +165,120 @@ class FinancialReportView(APIView):
         """Return financial reports with real calculations."""
 
         report_type = request.query_params.get("report_type", "profit_loss")
-        start_date = request.query_params.get("start_date")
-        end_date = request.query_params.get("end_date")
-        as_at_date = request.query_params.get("as_at_date")
 
         if report_type not in ["profit_loss", "balance_sheet", "trial_balance"]:
             raise ValidationError(f"Invalid report type: {report_type}")
 
+        start_date = self._date_param(request, "start_date")
+        end_date = self._date_param(request, "end_date")
+        as_at_date = self._date_param(request, "as_at_date")
+        include_zero = request.query_params.get("include_zero", "").lower() == "true"
+        try:
+            comparatives = int(request.query_params.get("comparatives", 0))
+        except ValueError:
+            raise ValidationError("comparatives must be an integer.")
+
         if report_type == "profit_loss":
-            return self._get_profit_loss(org_id, start_date, end_date)
+            return self._get_profit_loss(
+                org_id, start_date, end_date, comparatives, include_zero
+            )
         elif report_type == "balance_sheet":
-            return self._get_balance_sheet(org_id, as_at_date)
+            return self._get_balance_sheet(org_id, as_at_date, comparatives, include_zero)
         else:
-            # Trial balance - simplified
-            return Response({"report_type": report_type, "data": {}})
-
-    def _get_profit_loss(self, org_id, start_date, end_date):
-        # Query revenue and expenses
-        lines = JournalLine.objects.filter(org_id=org_id)
-        if start_date:
-            lines = lines.filter(entry__entry_date__gte=start_date)
-        if end_date:
-            lines = lines.filter(entry__entry_date__lte=end_date)
-
-        # Revenue (Credit positive)
-        # Use account_type_ref__code because account_type might be null
-        revenue_total = lines.filter(
-            account__account_type_ref__code__in=["REVENUE", "OTHER_INCOME"]
-        ).aggregate(
-            total=Sum(F("credit") - F("debit"), default=Decimal("0.0000"))
-        )["total"] or Decimal("0.0000")
-
-        # Expenses (Debit positive)
-        expense_total = lines.filter(
-            account__account_type_ref__code__in=["EXPENSE", "COGS", "OTHER_EXPENSE"]
-        ).aggregate(
-            total=Sum(F("debit") - F("credit"), default=Decimal("0.0000"))
-        )["total"] or Decimal("0.0000")
-
-        net_profit = revenue_total - expense_total
+            return self._get_trial_balance(org_id, as_at_date)
+
+    @staticmethod
+    def _date_param(request, name):
+        value = request.query_params.get(name)
+        try:
+            return date.fromisoformat(value) if value else None
+        except ValueError:
+            raise ValidationError(f"Invalid {name}: {value}")
+
+    def _get_profit_loss(self, org_id, start_date, end_date, comparatives, include_zero):
+        from apps.reporting.services.financial_statement_service import (
+            FinancialStatementService,
+        )
+
+        end_date = end_date or date.today()
+        start_date = start_date or end_date.replace(month=1, day=1)
+        report = FinancialStatementService.profit_loss(
+            org_id, start_date, end_date, comparatives, include_zero
+        )
+
+        totals = {s["key"]: Decimal(s["totals"][0]) for s in report["sections"]}
+        revenue_total = totals["revenue"] + totals["other_income"]
+        expense_total = (
+            totals["cost_of_sales"]
+            + totals["operating_expenses"]
+            + totals["other_expenses"]
+            + totals["taxation"]
+        )
 
         return Response({
-            "report_type": "profit_loss",
-            "period_start": start_date,
-            "period_end": end_date,
-            "currency": "SGD",
+            **report,
+            "period_start": start_date.isoformat(),
+            "period_end": end_date.isoformat(),
             "data": {
                 "revenue": {"Total": str(revenue_total)},
                 "expenses": {"Total": str(expense_total)},
-                "net_profit": str(net_profit)
-            }
+                "net_profit": report["net_profit"][0],
+            },
+        })
+
+    def _get_balance_sheet(self, org_id, as_at_date, comparatives, include_zero):
+        from apps.reporting.services.financial_statement_service import (
+            FinancialStatementService,
+        )
+
+        as_at_date = as_at_date or date.today()
+        report = FinancialStatementService.balance_sheet(
+            org_id, as_at_date, comparatives, include_zero
+        )
+
+        totals = {s["key"]: s["totals"][0] for s in report["sections"]}
+        return Response({
+            **report,
+            "as_at_date": as_at_date.isoformat(),
+            "data": {
+                "assets": {"Total": totals["assets"]},
+                "liabilities": {"Total": totals["liabilities"]},
+                "equity": {"Total": totals["equity"]},
+            },
         })
 
-    def _get_balance_sheet(self, org_id, as_at_date):
-        lines = JournalLine.objects.filter(org_id=org_id)
-        if as_at_date:
-            lines = lines.filter(entry__entry_date__lte=as_at_date)
-
-        # Assets (Debit positive)
-        assets_total = lines.filter(
-            account__account_type_ref__code__startswith="ASSET"
-        ).aggregate(
-            total=Sum(F("debit") - F("credit"), default=Decimal("0.0000"))
-        )["total"] or Decimal("0.0000")
-
-        # Liabilities (Credit positive)
-        liabilities_total = lines.filter(
-            account__account_type_ref__code__startswith="LIABILITY"
-        ).aggregate(
-            total=Sum(F("credit") - F("debit"), default=Decimal("0.0000"))
-        )["total"] or Decimal("0.0000")
-
-        # Equity (Credit positive)
-        equity_total = lines.filter(
-            account__account_type_ref__code__startswith="EQUITY"
-        ).aggregate(
-            total=Sum(F("credit") - F("debit"), default=Decimal("0.0000"))
-        )["total"] or Decimal("0.0000")
+    def _get_trial_balance(self, org_id, as_at_date):
+        from apps.journal.services import TrialBalanceService
+        from apps.reporting.services.report_cache import ReportCache
+
+        rows = ReportCache.get_or_compute(
+            org_id,
+            "trial_balance_rows",
+            [as_at_date],
+            lambda: TrialBalanceService.compute(org_id, date_to=as_at_date),
+        )
+        total_debit = sum((r["total_debit"] for r in rows), Decimal("0.0000"))
+        total_credit = sum((r["total_credit"] for r in rows), Decimal("0.0000"))
 
         return Response({
-            "report_type": "balance_sheet",
-            "as_at_date": as_at_date,
+            "report_type": "trial_balance",
+            "as_at_date": as_at_date.isoformat() if as_at_date else None,
             "currency": "SGD",
             "data": {
-                "assets": {"Total": str(assets_total)},
-                "liabilities": {"Total": str(liabilities_total)},
-                "equity": {"Total": str(equity_total)}
-            }
+                "accounts": [
+                    {
+                        "id": str(r["id"]),
+                        "code": r["code"],
+                        "name": r["name"],
+                        "account_type": r["account_type"],
+                        "total_debit": str(r["total_debit"]),
+                        "total_credit": str(r["total_credit"]),
+                        "balance": str(r["balance"]),
+                    }
+                    for r in rows
+                ],
+                "total_debit": str(total_debit),
+                "total_credit": str(total_credit),
+                "is_balanced": total_debit == total_credit,
+            },
         })
@@ -2,11 +2,17 @@
 Custom pagination classes for LedgerSG API.
 """
 
+import base64
+import json
+from typing import List, Any
+
 from rest_framework.pagination import (
     PageNumberPagination,
     CursorPagination,
 )
 
+from common.exceptions import ValidationError
+
 
 class StandardPagination(PageNumberPagination):
     """
@@ -54,3 +60,33 @@ class SmallResultPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
     page_query_param = "page"
+
+
+def encode_keyset_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort-key values of the last row on a page as a cursor token.
+
+    Used by service-level keyset pagination, where the position is a tuple
+    of ordering columns rather than a single field.
+    """
+    payload = json.dumps([str(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(token: str, size: int) -> List[str]:
+    """
+    Decode a cursor token produced by encode_keyset_cursor.
+
+    Raises:
+        ValidationError: If the token is malformed
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError("Invalid cursor.")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError("Invalid cursor.")
+
+    return values
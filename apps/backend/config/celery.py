@@ -7,7 +7,7 @@ Auto-discovers tasks from all apps/ modules.
 import os
 
 from celery import Celery
-from celery.signals import setup_logging
+from celery.signals import setup_logging, worker_init
 
 # Set the default Django settings module
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
@@ -34,3 +34,10 @@ def config_loggers(*args, **kwargs):
     from logging.config import dictConfig
     from django.conf import settings
     dictConfig(settings.LOGGING)
+
+
+@worker_init.connect
+def preload_peppol_schemas(*args, **kwargs):
+    """Compile Peppol schemas in the worker parent so pool processes inherit them."""
+    from apps.peppol.services.schema_registry import SchemaRegistry
+    SchemaRegistry.load()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import tempfile
 
 from decouple import config, Csv
 
@@ -263,6 +264,16 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_ENABLE_UTC = True
 
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "peppol-poll-transmission-statuses": {
+        "task": "apps.peppol.tasks.poll_transmission_statuses_task",
+        "schedule": 60.0,
+    },
+    "peppol-transmit-pending-batches": {
+        "task": "apps.peppol.tasks.transmit_pending_peppol_batches_task",
+        "schedule": 300.0,
+    },
+}
 
 # =============================================================================
 # RATE LIMITING CONFIGURATION
@@ -389,6 +400,48 @@ DISPLAY_PRECISION = 2
 # Default currency for Singapore
 DEFAULT_CURRENCY = "SGD"
 
+# =============================================================================
+# PDF RENDERING
+# =============================================================================
+
+# WeasyPrint worker processes per web process (0 renders in-process)
+PDF_RENDER_WORKERS = config("PDF_RENDER_WORKERS", default=2, cast=int)
+PDF_RENDER_TIMEOUT = config("PDF_RENDER_TIMEOUT", default=60, cast=int)
+
+# Rendered PDFs are content-addressed and stored on disk under PDF_CACHE_DIR
+# (files never go stale; prune by age if space matters). Setting it to ""
+# keeps them in the default cache instead, which shares Redis with the
+# Celery broker, so entries there expire after PDF_CACHE_TIMEOUT.
+PDF_CACHE_DIR = config(
+    "PDF_CACHE_DIR", default=os.path.join(tempfile.gettempdir(), "ledgersg-pdf-cache")
+)
+PDF_CACHE_TIMEOUT = config("PDF_CACHE_TIMEOUT", default=3600, cast=int)
+
+# Bulk PDF export ZIP files: written by Celery workers, served by the web
+# process, so outside single-host setups this must be shared storage
+# (required in production; the temp dir default only suits eager/dev runs)
+PDF_EXPORT_DIR = config(
+    "PDF_EXPORT_DIR", default=os.path.join(tempfile.gettempdir(), "ledgersg-exports")
+)
+
+# =============================================================================
+# PEPPOL TRANSMISSION
+# =============================================================================
+
+# Pending transmissions claimed per batch, and threads mapping, validating
+# and sending them (also the keep-alive pool size per access point)
+PEPPOL_BATCH_SIZE = config("PEPPOL_BATCH_SIZE", default=200, cast=int)
+PEPPOL_BATCH_WORKERS = config("PEPPOL_BATCH_WORKERS", default=8, cast=int)
+
+# Minutes before a claimed (TRANSMITTING) log whose batch never finished,
+# e.g. after a worker crash, goes back to PENDING. Must exceed the longest
+# batch, or a log still being sent may be sent again.
+PEPPOL_CLAIM_TIMEOUT = config("PEPPOL_CLAIM_TIMEOUT", default=30, cast=int)
+
+# Delivery status polling: messages per run and concurrent AP requests
+PEPPOL_POLL_BATCH_SIZE = config("PEPPOL_POLL_BATCH_SIZE", default=500, cast=int)
+PEPPOL_POLL_WORKERS = config("PEPPOL_POLL_WORKERS", default=8, cast=int)
+
 # =============================================================================
 # LOGGING
 # =============================================================================
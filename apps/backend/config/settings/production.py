@@ -69,6 +69,14 @@ CACHES = {
 
 CELERY_TASK_ALWAYS_EAGER = False
 
+# =============================================================================
+# PDF EXPORT (Production)
+# =============================================================================
+
+# Workers write export ZIPs that the web processes serve, so this must be
+# storage both can reach (e.g. a volume mounted on every web and worker host)
+PDF_EXPORT_DIR = config("PDF_EXPORT_DIR")
+
 # =============================================================================
 # LOGGING (Production)
 # =============================================================================
@@ -64,6 +64,15 @@ RATELIMIT_USE_CACHE = "default"
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
 
+# =============================================================================
+# PDF RENDERING (Testing - In-process)
+# =============================================================================
+
+PDF_RENDER_WORKERS = 0
+
+# Rendered PDFs in the test cache; disk-cache tests set PDF_CACHE_DIR
+PDF_CACHE_DIR = ""
+
 # =============================================================================
 # THROTTLING (Testing - Disabled)
 # =============================================================================
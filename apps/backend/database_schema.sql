@@ -897,6 +897,73 @@ COMMENT ON COLUMN journal.line.base_debit
     IS 'Debit amount converted to SGD at the entry date exchange rate. Used for all reporting.';
 
 
+-- ──────────────────────────────────────────────
+-- 6c. Account Period Balance (Running Totals)
+-- ──────────────────────────────────────────────
+-- Added: 2026-10-17
+-- Per-(org, account, fiscal period) debit/credit totals, maintained
+-- incrementally by the application whenever a journal entry is posted.
+-- Journal lines are immutable, so totals only ever accumulate.
+-- Existing ledgers are backfilled below, in the same change.
+-- Rebuild / verify with: manage.py rebuild_balance_snapshots [--verify]
+
+CREATE TABLE journal.account_period_balance (
+    id                  UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id              UUID NOT NULL REFERENCES core.organisation(id) ON DELETE CASCADE,
+    account_id          UUID NOT NULL REFERENCES coa.account(id),
+    fiscal_period_id    UUID NOT NULL REFERENCES core.fiscal_period(id),
+
+    -- Denormalised period bounds for as-of-date lookups without a join
+    period_start        DATE NOT NULL,
+    period_end          DATE NOT NULL,
+
+    debit_total         NUMERIC(19,4) NOT NULL DEFAULT 0,
+    credit_total        NUMERIC(19,4) NOT NULL DEFAULT 0,
+    line_count          INTEGER NOT NULL DEFAULT 0,
+
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT uq_account_period_balance UNIQUE(org_id, account_id, fiscal_period_id)
+);
+
+COMMENT ON TABLE journal.account_period_balance
+    IS 'Running debit/credit totals per account per fiscal period. Updated at posting time; historical balances are an O(periods) lookup.';
+
+-- Backfill from the lines already posted (same query as
+-- BalanceSnapshotService.rebuild), so snapshot reads are correct for
+-- existing organisations without a manual rebuild.
+INSERT INTO journal.account_period_balance (
+    org_id, account_id, fiscal_period_id, period_start, period_end,
+    debit_total, credit_total, line_count
+)
+SELECT
+    l.org_id, l.account_id, e.fiscal_period_id, p.start_date, p.end_date,
+    SUM(l.debit), SUM(l.credit), COUNT(*)
+FROM journal.line l
+JOIN journal.entry e ON e.id = l.entry_id
+JOIN core.fiscal_period p ON p.id = e.fiscal_period_id
+GROUP BY l.org_id, l.account_id, e.fiscal_period_id, p.start_date, p.end_date
+ON CONFLICT (org_id, account_id, fiscal_period_id) DO NOTHING;
+
+
+-- ──────────────────────────────────────────────
+-- 6d. Ledger Version (Report Cache Keys)
+-- ──────────────────────────────────────────────
+-- Added: 2026-10-17
+-- Monotonic per-organisation counter, bumped by the application in the
+-- same transaction as every journal posting, payment and reconciliation.
+-- Report caches are keyed by it, so a cached report is never stale.
+
+CREATE TABLE journal.ledger_version (
+    org_id              UUID PRIMARY KEY REFERENCES core.organisation(id) ON DELETE CASCADE,
+    version             BIGINT NOT NULL DEFAULT 0,
+    updated_at          TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE journal.ledger_version
+    IS 'Per-organisation ledger change counter. Report cache keys include it; a missing row means version 0.';
+
+
 -- ============================================================================
 -- §7  INVOICING SCHEMA — Contacts, Documents, Lines
 -- ============================================================================
@@ -1199,8 +1266,35 @@ COMMENT ON TABLE gst.peppol_transmission_log
 -- Performance indexes
 CREATE INDEX idx_peppol_log_doc ON gst.peppol_transmission_log(document_id, attempt_number);
 CREATE INDEX idx_peppol_log_org ON gst.peppol_transmission_log(org_id, transmitted_at DESC);
-CREATE INDEX idx_peppol_log_status ON gst.peppol_transmission_log(status)
-WHERE status IN ('PENDING', 'FAILED');
+-- idx_peppol_log_status is created with the log extensions below (it covers mlr_status)
+
+-- ──────────────────────────────────────────────
+-- 7g. GST Return Box Index (F5 Drill-Down)
+-- ──────────────────────────────────────────────
+-- Added: 2026-10-17
+-- Per-(return, box, document) contribution written by the F5 engine.
+-- Box totals are SUM(amount) over this table, so a DRAFT recalculation only
+-- rewrites the rows of documents approved or voided since the last run, and
+-- the audit view reads box → documents directly instead of rescanning lines.
+-- Boxes 4 and 8 are derived and never stored here.
+
+CREATE TABLE gst.return_box_document (
+    id                  UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id              UUID NOT NULL REFERENCES core.organisation(id) ON DELETE CASCADE,
+    return_id           UUID NOT NULL REFERENCES gst.return(id) ON DELETE CASCADE,
+    box                 SMALLINT NOT NULL,
+    document_id         UUID NOT NULL REFERENCES invoicing.document(id) ON DELETE CASCADE,
+    amount              NUMERIC(10,4) NOT NULL,             -- Signed: credit notes are negative
+    line_count          INTEGER NOT NULL,
+
+    CONSTRAINT chk_return_box_range CHECK (box BETWEEN 1 AND 15 AND box NOT IN (4, 8)),
+    CONSTRAINT uq_return_box_document UNIQUE(return_id, box, document_id)
+);
+
+COMMENT ON TABLE gst.return_box_document
+    IS 'F5 drill-down index: contribution of each document to each box of a GST return. Box totals are sums over this table.';
+
+CREATE INDEX idx_return_box_document_doc ON gst.return_box_document(return_id, document_id);
 
 -- ============================================
 -- PEPPOL TRANSMISSION LOG EXTENSIONS
@@ -1214,13 +1308,36 @@ ADD COLUMN IF NOT EXISTS xml_payload_hash VARCHAR(64),
 ADD COLUMN IF NOT EXISTS access_point_provider VARCHAR(100),
 ADD COLUMN IF NOT EXISTS mlr_status VARCHAR(50),
 ADD COLUMN IF NOT EXISTS mlr_received_at TIMESTAMPTZ,
-ADD COLUMN IF NOT EXISTS iras_submission_id VARCHAR(100);
+ADD COLUMN IF NOT EXISTS iras_submission_id VARCHAR(100),
+ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ,
+ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ;
 
 COMMENT ON COLUMN gst.peppol_transmission_log.xml_payload_hash IS 'SHA-256 hash of complete XML payload for audit trail';
 COMMENT ON COLUMN gst.peppol_transmission_log.access_point_provider IS 'IMDA-accredited AP provider name (e.g., Storecove)';
 COMMENT ON COLUMN gst.peppol_transmission_log.mlr_status IS 'Message Level Response status from AP';
 COMMENT ON COLUMN gst.peppol_transmission_log.mlr_received_at IS 'Timestamp when MLR received from AP';
 COMMENT ON COLUMN gst.peppol_transmission_log.iras_submission_id IS 'IRAS submission reference for 5th corner reporting';
+COMMENT ON COLUMN gst.peppol_transmission_log.claimed_at IS 'When a batch claimed the log (TRANSMITTING); stale claims go back to PENDING';
+COMMENT ON COLUMN gst.peppol_transmission_log.next_attempt_at IS 'Earliest time a retryable failure put back to PENDING may be sent again';
+
+-- Work queue index: pending and failed transmissions, plus in-flight ones
+-- (TRANSMITTING, or accepted by the AP with the recipient MLR outstanding)
+-- for the delivery status poller. Settled rows are not indexed, so the
+-- index stays the size of the outstanding work.
+-- Updated: 2026-10-17 (in-flight rows and response_at for poll ordering)
+--
+-- Rows written before mlr_status existed hold NULL, which the poller's
+-- mlr_status = '' match (and this index) would skip: backfill them and
+-- default the column to ''. The index is dropped first so databases with
+-- the earlier PENDING/FAILED-only definition get the new one.
+UPDATE gst.peppol_transmission_log SET mlr_status = '' WHERE mlr_status IS NULL;
+ALTER TABLE gst.peppol_transmission_log ALTER COLUMN mlr_status SET DEFAULT '';
+
+DROP INDEX IF EXISTS gst.idx_peppol_log_status;
+CREATE INDEX idx_peppol_log_status
+ON gst.peppol_transmission_log(status, response_at)
+WHERE status IN ('PENDING', 'FAILED', 'TRANSMITTING')
+   OR (status = 'DELIVERED' AND mlr_status = '');
 
 -- ============================================
 -- ORGANISATION PEPPOL SETTINGS
@@ -1425,6 +1542,68 @@ CREATE TRIGGER trg_bank_transaction_updated_at
     BEFORE UPDATE ON banking.bank_transaction
     FOR EACH ROW EXECUTE FUNCTION core.set_updated_at();
 
+-- ──────────────────────────────────────────────
+-- 8e. Cash Position (Running Totals per Bank Account)
+-- ──────────────────────────────────────────────
+-- Added: 2026-10-17
+-- Per-bank-account payment totals, maintained by the application in the
+-- same transaction as payment creation, voiding and reconciliation.
+-- Balance = bank_account.opening_balance + received_total - made_total;
+-- the reconciled balance uses the reconciled_* totals.
+-- Existing payments are backfilled below, in the same change.
+-- Rebuild / verify with: manage.py rebuild_cash_positions [--verify]
+
+CREATE TABLE banking.cash_position (
+    id                          UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    org_id                      UUID NOT NULL REFERENCES core.organisation(id) ON DELETE CASCADE,
+    bank_account_id             UUID NOT NULL REFERENCES banking.bank_account(id) ON DELETE CASCADE,
+
+    -- Non-voided payments, in the bank account currency
+    received_total              NUMERIC(19,4) NOT NULL DEFAULT 0,
+    made_total                  NUMERIC(19,4) NOT NULL DEFAULT 0,
+
+    -- Same, in SGD (payment.base_amount)
+    base_received_total         NUMERIC(19,4) NOT NULL DEFAULT 0,
+    base_made_total             NUMERIC(19,4) NOT NULL DEFAULT 0,
+
+    -- Non-voided payments matched to the bank feed
+    reconciled_received_total   NUMERIC(19,4) NOT NULL DEFAULT 0,
+    reconciled_made_total       NUMERIC(19,4) NOT NULL DEFAULT 0,
+
+    updated_at                  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT uq_cash_position_bank_account UNIQUE(bank_account_id)
+);
+
+COMMENT ON TABLE banking.cash_position
+    IS 'Running payment totals per bank account. Cash on hand and account balances are read without aggregating payments.';
+
+-- Backfill from the payments already recorded (same totals as
+-- CashPositionService.rebuild; reconciled_* come from the payments matched
+-- to bank feed transactions), so balances are correct for existing bank
+-- accounts without a manual rebuild.
+INSERT INTO banking.cash_position (
+    org_id, bank_account_id,
+    received_total, made_total,
+    base_received_total, base_made_total,
+    reconciled_received_total, reconciled_made_total
+)
+SELECT
+    p.org_id,
+    p.bank_account_id,
+    COALESCE(SUM(p.amount) FILTER (WHERE p.payment_type = 'RECEIVED'), 0),
+    COALESCE(SUM(p.amount) FILTER (WHERE p.payment_type = 'MADE'), 0),
+    COALESCE(SUM(p.base_amount) FILTER (WHERE p.payment_type = 'RECEIVED'), 0),
+    COALESCE(SUM(p.base_amount) FILTER (WHERE p.payment_type = 'MADE'), 0),
+    COALESCE(SUM(p.amount) FILTER (
+        WHERE p.payment_type = 'RECEIVED' AND p.is_reconciled), 0),
+    COALESCE(SUM(p.amount) FILTER (
+        WHERE p.payment_type = 'MADE' AND p.is_reconciled), 0)
+FROM banking.payment p
+WHERE NOT p.is_voided
+GROUP BY p.org_id, p.bank_account_id
+ON CONFLICT (bank_account_id) DO NOTHING;
+
 
 -- ============================================================================
 -- §9  AUDIT SCHEMA — Immutable Event Log
@@ -1708,6 +1887,48 @@ $$;
 COMMENT ON FUNCTION core.get_next_document_number
 IS 'Returns next sequential number (without prefix) for banking payment numbering.';
 
+-- ──────────────────────────────────────────────
+-- 10c3. Reserve a Block of Document Numbers
+-- ──────────────────────────────────────────────
+-- Reserves p_count consecutive numbers in one statement and returns the first.
+-- Used by batch posting so N journal entries cost one sequence round trip.
+-- Added: 2026-10-17
+
+CREATE OR REPLACE FUNCTION core.reserve_document_numbers(
+    p_org_id UUID,
+    p_document_type VARCHAR(30),
+    p_count INTEGER
+)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_first BIGINT;
+BEGIN
+    IF p_count < 1 THEN
+        RAISE EXCEPTION 'Cannot reserve % document numbers', p_count;
+    END IF;
+
+    -- UPDATE takes the row lock, so concurrent reservations never overlap
+    UPDATE core.document_sequence
+    SET next_number = next_number + p_count,
+        updated_at = NOW()
+    WHERE org_id = p_org_id AND document_type = p_document_type
+    RETURNING next_number - p_count
+    INTO v_first;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'No document sequence configured for org % type %',
+            p_org_id, p_document_type;
+    END IF;
+
+    RETURN v_first;
+END;
+$$;
+
+COMMENT ON FUNCTION core.reserve_document_numbers
+IS 'Reserves a contiguous block of sequential numbers; returns the first number in the block.';
+
 -- ──────────────────────────────────────────────
 -- 10d. Validate Journal Entry Balance
 -- ──────────────────────────────────────────────
@@ -2362,8 +2583,11 @@ BEGIN
             ('gst', 'return'),
             ('gst', 'threshold_snapshot'),
             ('gst', 'peppol_transmission_log'),
+            ('gst', 'return_box_document'),
             ('journal', 'entry'),
             ('journal', 'line'),
+            ('journal', 'account_period_balance'),
+            ('journal', 'ledger_version'),
             ('invoicing', 'contact'),
             ('invoicing', 'document'),
             ('invoicing', 'document_line'),
@@ -2371,7 +2595,8 @@ BEGIN
             ('banking', 'bank_account'),
             ('banking', 'payment'),
             ('banking', 'payment_allocation'),
-            ('banking', 'bank_transaction')
+            ('banking', 'bank_transaction'),
+            ('banking', 'cash_position')
         ) AS t(schemaname, tablename)
     LOOP
         -- Enable RLS
@@ -2465,6 +2690,7 @@ CREATE INDEX idx_gst_return_org ON gst.return(org_id, period_start, period_end);
 
 -- ── Journal ──
 CREATE INDEX idx_journal_entry_org_date ON journal.entry(org_id, entry_date DESC);
+CREATE INDEX idx_journal_entry_org_keyset ON journal.entry(org_id, entry_date, entry_number, id);  -- entry list keyset: (entry_date, entry_number, id) < cursor, scanned backward
 CREATE INDEX idx_journal_entry_source ON journal.entry(source_type, source_id)
     WHERE source_id IS NOT NULL;
 CREATE INDEX idx_journal_entry_period ON journal.entry(org_id, fiscal_period_id);
@@ -2472,6 +2698,8 @@ CREATE INDEX idx_journal_line_entry ON journal.line(entry_id);
 CREATE INDEX idx_journal_line_account ON journal.line(account_id, org_id);
 CREATE INDEX idx_journal_line_tax_code ON journal.line(tax_code_id)
     WHERE tax_code_id IS NOT NULL;
+CREATE INDEX idx_account_period_balance_end
+    ON journal.account_period_balance(org_id, account_id, period_end);
 
 -- ── Invoicing ──
 CREATE INDEX idx_contact_org_name ON invoicing.contact(org_id, name);
@@ -2481,9 +2709,12 @@ CREATE INDEX idx_contact_search ON invoicing.contact
 
 CREATE INDEX idx_document_org_status ON invoicing.document(org_id, status, document_date DESC);
 CREATE INDEX idx_document_org_type ON invoicing.document(org_id, document_type, document_date DESC);
+CREATE INDEX idx_document_gst_period ON invoicing.document(org_id, document_date)
+    WHERE status NOT IN ('DRAFT', 'VOID');  -- F5 engine: period range over GST-relevant documents
+CREATE INDEX idx_document_org_keyset ON invoicing.document(org_id, document_date, document_number, id);  -- document list keyset: (document_date, document_number, id) < cursor, scanned backward
 CREATE INDEX idx_document_contact ON invoicing.document(contact_id);
 CREATE INDEX idx_document_due_date ON invoicing.document(org_id, due_date)
-    WHERE status IN ('APPROVED', 'SENT', 'PARTIALLY_PAID');  -- For aging reports
+    WHERE status IN ('APPROVED', 'SENT', 'PARTIALLY_PAID', 'OVERDUE');  -- For aging reports
 CREATE INDEX idx_document_invoicenow ON invoicing.document(org_id, invoicenow_status)
     WHERE invoicenow_status NOT IN ('NOT_APPLICABLE');
 
@@ -0,0 +1,299 @@
+"""
+Integration tests for the aged receivables / payables report.
+
+Covers:
+- Bucketing by days overdue as of a date, per contact and in total
+- Historical reports ignore payments and voids made after the as-of date
+- Totals in SGD across document currencies
+- Summary computed with one query regardless of open items
+- Cached summary invalidated by ledger changes
+- GET /reports/ageing/ summary and streamed CSV/JSON exports
+"""
+
+import csv
+import io
+import json
+import pytest
+from decimal import Decimal
+from datetime import date, datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core.models import (
+    Account,
+    BankAccount,
+    Contact,
+    InvoiceDocument,
+    Payment,
+    PaymentAllocation,
+)
+from apps.reporting.services.ageing_service import AgeingService
+from apps.reporting.services.dashboard_service import DashboardService
+from common.exceptions import ValidationError
+
+AS_OF = date(2024, 6, 30)
+
+
+def _contact(org, name, contact_type="CUSTOMER"):
+    return Contact.objects.create(
+        org=org,
+        contact_type=contact_type,
+        name=name,
+        is_customer=contact_type == "CUSTOMER",
+        is_supplier=contact_type == "SUPPLIER",
+    )
+
+
+def _document(org, contact, number, days_overdue, total, **kwargs):
+    due_date = AS_OF - timedelta(days=days_overdue)
+    defaults = {
+        "document_type": "SALES_INVOICE",
+        "status": "APPROVED",
+        "issue_date": due_date - timedelta(days=30),
+        "base_total_amount": Decimal(total),
+    }
+    defaults.update(kwargs)
+    return InvoiceDocument.objects.create(
+        org=org,
+        contact=contact,
+        document_number=number,
+        due_date=due_date,
+        total_excl=Decimal(total),
+        total_incl=Decimal(total),
+        **defaults,
+    )
+
+
+@pytest.fixture
+def bank_account(test_organisation):
+    gl_account = Account.objects.create(
+        org=test_organisation,
+        code="1110",
+        name="Operating Bank",
+        account_type="ASSET_CURRENT",
+        is_bank=True,
+        is_system=False,
+        is_active=True,
+    )
+    return BankAccount.objects.create(
+        org=test_organisation,
+        account_name="Operating",
+        bank_name="DBS Bank",
+        account_number="ACC00001",
+        currency="SGD",
+        gl_account=gl_account,
+        opening_balance=Decimal("0.0000"),
+        opening_balance_date=date(2024, 1, 1),
+        is_active=True,
+    )
+
+
+def _pay(bank_account, document, amount, payment_date=AS_OF, is_voided=False):
+    """Record a receipt allocated to `document` and update its amount_paid."""
+    amount = Decimal(amount)
+    payment = Payment.objects.create(
+        org=document.org,
+        payment_type="RECEIVED",
+        payment_number=f"RCP-{Payment.objects.count() + 1:05d}",
+        payment_date=payment_date,
+        contact=document.contact,
+        bank_account=bank_account,
+        currency="SGD",
+        exchange_rate=Decimal("1.000000"),
+        amount=amount,
+        base_amount=amount,
+        is_voided=is_voided,
+    )
+    PaymentAllocation.objects.create(
+        org=document.org,
+        payment=payment,
+        document=document,
+        allocated_amount=amount,
+        base_allocated_amount=amount,
+    )
+    if not is_voided:
+        InvoiceDocument.objects.filter(id=document.id).update(
+            amount_paid=document.amount_paid + amount
+        )
+        document.refresh_from_db()
+    return payment
+
+
+@pytest.fixture
+def open_items(test_organisation, bank_account):
+    acme = _contact(test_organisation, "Acme Trading")
+    zenith = _contact(test_organisation, "Zenith Foods")
+    supplier = _contact(test_organisation, "Harbour Logistics", "SUPPLIER")
+
+    _document(test_organisation, acme, "INV-00001", -5, "100.00")  # current
+    partly_paid = _document(test_organisation, acme, "INV-00002", 10, "200.00")  # 1-30
+    _pay(bank_account, partly_paid, "50.00")
+    _document(test_organisation, acme, "INV-00003", 45, "300.00")  # 31-60
+    _document(test_organisation, zenith, "INV-00004", 75, "400.00", status="OVERDUE")  # 61-90
+    _document(test_organisation, zenith, "INV-00005", 120, "500.00")  # 90+
+    # Excluded: fully paid, draft, issued after the as-of date, other ledger
+    paid = _document(test_organisation, zenith, "INV-00006", 20, "600.00", status="PAID")
+    _pay(bank_account, paid, "600.00")
+    _document(test_organisation, zenith, "INV-00007", 20, "700.00", status="DRAFT")
+    _document(
+        test_organisation, zenith, "INV-00008", -40, "800.00", issue_date=AS_OF + timedelta(days=1)
+    )
+    _document(
+        test_organisation, supplier, "BILL-00001", 15, "900.00", document_type="PURCHASE_INVOICE"
+    )
+
+
+@pytest.mark.django_db
+class TestAgeingSummary:
+    """AgeingService.compute_summary / get_summary."""
+
+    def test_buckets_per_contact_and_total(self, test_organisation, open_items):
+        summary = AgeingService.compute_summary(test_organisation.id, "receivables", AS_OF)
+
+        acme, zenith = summary["contacts"]
+        assert acme["contact_name"] == "Acme Trading"
+        assert acme["document_count"] == 3
+        assert (acme["current"], acme["1_30"], acme["31_60"]) == (
+            "100.0000", "150.0000", "300.0000"
+        )
+        assert acme["total"] == "550.0000"
+        assert (zenith["61_90"], zenith["over_90"]) == ("400.0000", "500.0000")
+        assert summary["totals"]["document_count"] == 5
+        assert summary["totals"]["total"] == "1450.0000"
+
+        payables = AgeingService.compute_summary(test_organisation.id, "payables", AS_OF)
+        assert payables["totals"]["1_30"] == "900.0000"
+
+    def test_one_query_for_any_number_of_items(self, test_organisation, open_items):
+        contact = _contact(test_organisation, "Bulk Customer")
+        for i in range(50):
+            _document(test_organisation, contact, f"BULK-{i:05d}", i * 3, "10.00")
+
+        with CaptureQueriesContext(connection) as ctx:
+            summary = AgeingService.compute_summary(test_organisation.id, "receivables", AS_OF)
+
+        assert len(ctx.captured_queries) == 1
+        assert summary["totals"]["document_count"] == 55
+
+    def test_later_payments_and_voids_ignored(self, test_organisation, open_items, bank_account):
+        contact = Contact.objects.get(org=test_organisation, name="Acme Trading")
+        paid_later = _document(
+            test_organisation, contact, "INV-00009", 5, "1000.00", status="PAID"
+        )
+        _pay(bank_account, paid_later, "1000.00", payment_date=AS_OF + timedelta(days=1))
+        voided_later = _document(
+            test_organisation, contact, "INV-00010", 5, "2000.00",
+            status="VOID", void_reason="Duplicate",
+            voided_at=timezone.make_aware(datetime.combine(AS_OF + timedelta(days=3), time())),
+        )
+        _document(
+            test_organisation, contact, "INV-00011", 5, "4000.00",
+            status="VOID", void_reason="Duplicate",
+            voided_at=timezone.make_aware(datetime.combine(AS_OF, time(12))),
+        )
+        # A voided receipt never reduced the balance
+        _pay(bank_account, voided_later, "2000.00", is_voided=True)
+
+        summary = AgeingService.compute_summary(test_organisation.id, "receivables", AS_OF)
+        assert summary["totals"]["1_30"] == "3150.0000"
+        assert summary["totals"]["document_count"] == 7
+
+        after = AgeingService.compute_summary(
+            test_organisation.id, "receivables", AS_OF + timedelta(days=5)
+        )
+        numbers = {i["document_number"] for i in AgeingService.iter_open_items(
+            test_organisation.id, "receivables", AS_OF + timedelta(days=5)
+        )}
+        assert {"INV-00009", "INV-00010", "INV-00011"}.isdisjoint(numbers)
+        # INV-00008 is issued by then
+        assert after["totals"]["document_count"] == 6
+
+    def test_totals_in_base_currency(self, test_organisation):
+        contact = _contact(test_organisation, "Pacific Imports")
+        _document(test_organisation, contact, "INV-00001", 10, "100.00")
+        _document(
+            test_organisation, contact, "INV-00002", 10, "100.00",
+            currency="USD", exchange_rate=Decimal("1.350000"),
+            base_total_amount=Decimal("135.0000"),
+        )
+
+        summary = AgeingService.compute_summary(test_organisation.id, "receivables", AS_OF)
+        assert summary["totals"]["1_30"] == "235.0000"
+
+        items = list(AgeingService.iter_open_items(test_organisation.id, "receivables", AS_OF))
+        usd = next(i for i in items if i["currency"] == "USD")
+        assert (usd["balance"], usd["base_balance"]) == ("100.0000", "135.0000")
+
+    def test_invalid_ledger(self, test_organisation):
+        with pytest.raises(ValidationError):
+            AgeingService.compute_summary(test_organisation.id, "inventory", AS_OF)
+
+    def test_cache_invalidated_on_ledger_change(
+        self, test_organisation, open_items, bank_account, django_capture_on_commit_callbacks
+    ):
+        cache.clear()
+        first = AgeingService.get_summary(test_organisation.id, "receivables", AS_OF)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert AgeingService.get_summary(test_organisation.id, "receivables", AS_OF) == first
+        # Only the ledger version read
+        assert len(ctx.captured_queries) == 1
+
+        _pay(
+            bank_account,
+            InvoiceDocument.objects.get(org=test_organisation, document_number="INV-00001"),
+            "100.00",
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            DashboardService.publish_invalidation(test_organisation.id)
+
+        refreshed = AgeingService.get_summary(test_organisation.id, "receivables", AS_OF)
+        assert refreshed["totals"]["current"] == "0.0000"
+
+
+@pytest.mark.django_db
+class TestAgeingEndpoint:
+    """GET /reports/ageing/."""
+
+    def _url(self, org):
+        return f"/api/v1/{org.id}/reports/ageing/"
+
+    def test_summary(self, auth_client, test_organisation, open_items):
+        response = auth_client.get(self._url(test_organisation), {"as_of": AS_OF.isoformat()})
+
+        assert response.status_code == 200
+        assert response.data["totals"]["total"] == "1450.0000"
+
+    def test_csv_export_streams_items(self, auth_client, test_organisation, open_items):
+        response = auth_client.get(
+            self._url(test_organisation), {"as_of": AS_OF.isoformat(), "export": "csv"}
+        )
+
+        assert response.status_code == 200
+        assert response.streaming
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        assert [r["document_number"] for r in rows] == [
+            "INV-00001", "INV-00002", "INV-00003", "INV-00005", "INV-00004",
+        ]
+        assert rows[1]["balance"] == "150.0000"
+        assert rows[1]["bucket"] == "1_30"
+
+    def test_json_export_streams_items(self, auth_client, test_organisation, open_items):
+        response = auth_client.get(
+            self._url(test_organisation),
+            {"as_of": AS_OF.isoformat(), "export": "json", "ledger": "payables"},
+        )
+
+        assert response.status_code == 200
+        data = json.loads(b"".join(response.streaming_content))
+        assert data["ledger"] == "payables"
+        assert [i["document_number"] for i in data["items"]] == ["BILL-00001"]
+
+    def test_invalid_params(self, auth_client, test_organisation):
+        url = self._url(test_organisation)
+        assert auth_client.get(url, {"ledger": "inventory"}).status_code == 400
+        assert auth_client.get(url, {"as_of": "30/06/2024"}).status_code == 400
+        assert auth_client.get(url, {"export": "xlsx"}).status_code == 400
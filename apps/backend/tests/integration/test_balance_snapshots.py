@@ -0,0 +1,162 @@
+"""
+Integration tests for per-period account balance snapshots.
+
+Covers:
+- Snapshots updated incrementally on posting and on reversal
+- Historical (as-of-date) balances from snapshots
+- Verify detects drift and rebuild repairs it
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from apps.core.models import AccountPeriodBalance, FiscalPeriod
+from apps.journal.services import JournalService, BalanceSnapshotService
+
+
+def _post_entry(org, accounts, period, user, entry_date, amount):
+    """Post a simple AR/Revenue entry."""
+    return JournalService.create_entry(
+        org_id=org.id,
+        entry_date=entry_date,
+        source_type="MANUAL",
+        narration="Snapshot test entry",
+        lines=[
+            {"account_id": accounts["1200"].id, "debit": amount, "credit": Decimal("0.00")},
+            {"account_id": accounts["4000"].id, "debit": Decimal("0.00"), "credit": amount},
+        ],
+        fiscal_period_id=period.id,
+        user_id=user.id,
+    )
+
+
+@pytest.fixture
+def february_period(test_organisation, test_fiscal_period) -> FiscalPeriod:
+    return FiscalPeriod.objects.create(
+        org=test_organisation,
+        fiscal_year=test_fiscal_period.fiscal_year,
+        label="February 2024",
+        period_number=2,
+        start_date=date(2024, 2, 1),
+        end_date=date(2024, 2, 29),
+        is_open=True,
+    )
+
+
+@pytest.mark.django_db
+class TestBalanceSnapshotMaintenance:
+    """Snapshots follow postings and reversals."""
+
+    def test_posting_updates_snapshot(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("100.00"),
+        )
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 12), Decimal("25.00"),
+        )
+
+        snapshot = AccountPeriodBalance.objects.get(
+            org=test_organisation,
+            account=test_accounts["1200"],
+            fiscal_period=test_fiscal_period,
+        )
+
+        assert snapshot.debit_total == Decimal("125.0000")
+        assert snapshot.credit_total == Decimal("0.0000")
+        assert snapshot.line_count == 2
+
+    def test_reversal_updates_snapshot(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        entry = _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("100.00"),
+        )
+
+        JournalService.create_reversal(
+            org_id=test_organisation.id,
+            original_entry_id=entry.id,
+            reversal_date=date(2024, 1, 20),
+            reason="Test reversal",
+            user_id=test_user.id,
+        )
+
+        balance = JournalService.get_account_balance(
+            test_organisation.id, test_accounts["1200"].id
+        )
+        assert balance == Decimal("0.0000")
+
+
+@pytest.mark.django_db
+class TestBalanceSnapshotLookup:
+    """Historical balances read from snapshots."""
+
+    def test_as_of_date_balance(
+        self, test_organisation, test_accounts, test_fiscal_period, february_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("100.00"),
+        )
+        _post_entry(
+            test_organisation, test_accounts, february_period, test_user,
+            date(2024, 2, 5), Decimal("40.00"),
+        )
+        _post_entry(
+            test_organisation, test_accounts, february_period, test_user,
+            date(2024, 2, 20), Decimal("10.00"),
+        )
+
+        ar_id = test_accounts["1200"].id
+        org_id = test_organisation.id
+
+        assert JournalService.get_account_balance(org_id, ar_id, date(2024, 1, 31)) == Decimal(
+            "100.0000"
+        )
+        # Mid-period: closed January snapshot + February lines up to the date
+        assert JournalService.get_account_balance(org_id, ar_id, date(2024, 2, 10)) == Decimal(
+            "140.0000"
+        )
+        assert JournalService.get_account_balance(org_id, ar_id) == Decimal("150.0000")
+        assert JournalService.get_account_balance(
+            org_id, test_accounts["4000"].id
+        ) == Decimal("-150.0000")
+
+
+@pytest.mark.django_db
+class TestBalanceSnapshotRebuild:
+    """Verify / rebuild against a full recomputation."""
+
+    def test_verify_clean_after_posting(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("100.00"),
+        )
+
+        assert BalanceSnapshotService.verify(test_organisation.id) == []
+
+    def test_rebuild_repairs_drift(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("100.00"),
+        )
+        AccountPeriodBalance.objects.filter(
+            org=test_organisation, account=test_accounts["1200"]
+        ).update(debit_total=Decimal("999.0000"))
+
+        mismatches = BalanceSnapshotService.verify(test_organisation.id)
+        assert len(mismatches) == 1
+        assert mismatches[0]["account_id"] == str(test_accounts["1200"].id)
+
+        BalanceSnapshotService.rebuild(test_organisation.id)
+
+        assert BalanceSnapshotService.verify(test_organisation.id) == []
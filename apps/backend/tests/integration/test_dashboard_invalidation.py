@@ -0,0 +1,152 @@
+"""
+Integration tests for event-driven dashboard invalidation.
+
+Covers:
+- Posting paths invalidate and re-warm the cached dashboard on commit
+- Nothing is published when the posting transaction rolls back
+- Concurrent misses are single-flight: one recompute, others served the last copy
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import Contact, InvoiceDocument, InvoiceLine
+from apps.invoicing.services import DocumentService
+from apps.reporting.services.dashboard_service import DashboardService
+from apps.reporting.tasks import warm_dashboard_cache_task
+
+
+def _draft_invoice(org, accounts, tax_codes):
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name="Dashboard Customer",
+        is_customer=True,
+        is_active=True,
+    )
+    invoice = InvoiceDocument.objects.create(
+        org=org,
+        document_type="SALES_INVOICE",
+        document_number="INV-00001",
+        contact=contact,
+        issue_date=date(2024, 1, 15),
+        due_date=date(2024, 2, 15),
+        status="DRAFT",
+        total_excl=Decimal("100.0000"),
+        gst_total=Decimal("9.0000"),
+        total_incl=Decimal("109.0000"),
+    )
+    InvoiceLine.objects.create(
+        org=org,
+        document=invoice,
+        line_number=1,
+        description="Services",
+        account=accounts["4000"],
+        quantity=Decimal("1"),
+        unit_price=Decimal("100.0000"),
+        tax_code=tax_codes["SR"],
+        tax_rate=Decimal("0.09"),
+        line_amount=Decimal("100.0000"),
+        gst_amount=Decimal("9.0000"),
+        total_amount=Decimal("109.0000"),
+    )
+    return invoice
+
+
+@pytest.fixture
+def dashboard_service(test_organisation):
+    service = DashboardService()
+    org_id = str(test_organisation.id)
+    for key in (
+        service._get_cache_key(org_id),
+        service._get_stale_key(org_id),
+        service._get_lock_key(org_id),
+    ):
+        cache.delete(key)
+    return service
+
+
+@pytest.mark.django_db
+class TestDashboardInvalidation:
+    """Posting paths publish invalidation events."""
+
+    def test_approval_rewarms_dashboard(
+        self,
+        django_capture_on_commit_callbacks,
+        dashboard_service,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+        test_fiscal_period,
+        test_user,
+    ):
+        org_id = str(test_organisation.id)
+        invoice = _draft_invoice(test_organisation, test_accounts, test_tax_codes)
+        assert dashboard_service.get_dashboard_data(org_id)["invoices_pending"] == 1
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            DocumentService.approve_document(test_organisation.id, invoice.id, test_user)
+
+        assert len(callbacks) >= 1
+        # The warm-up task (eager in tests) has already recomputed the cache
+        with CaptureQueriesContext(connection) as ctx:
+            data = dashboard_service.get_dashboard_data(org_id)
+        assert data["invoices_pending"] == 0
+        # Only the ledger version read
+        assert len(ctx.captured_queries) == 1
+
+    def test_rolled_back_posting_publishes_nothing(
+        self, django_capture_on_commit_callbacks, dashboard_service, test_organisation
+    ):
+        org_id = str(test_organisation.id)
+        cache.set(dashboard_service._get_cache_key(org_id), {"cached": True})
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    DashboardService.publish_invalidation(test_organisation.id)
+                    raise RuntimeError("posting failed")
+            except RuntimeError:
+                pass
+
+        assert callbacks == []
+        assert cache.get(dashboard_service._get_cache_key(org_id)) == {"cached": True}
+
+
+@pytest.mark.django_db
+class TestDashboardSingleFlight:
+    """Only one recompute runs per organisation at a time."""
+
+    def test_concurrent_miss_served_last_copy(self, dashboard_service, test_organisation):
+        org_id = str(test_organisation.id)
+        cache.add(dashboard_service._get_lock_key(org_id), "other-worker", timeout=30)
+        cache.set(dashboard_service._get_stale_key(org_id), {"stale": True})
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = dashboard_service.get_dashboard_data(org_id)
+
+        assert data == {"stale": True}
+        # Only the ledger version read
+        assert len(ctx.captured_queries) == 1
+
+    def test_warm_up_skipped_while_locked(self, dashboard_service, test_organisation):
+        org_id = str(test_organisation.id)
+        cache.add(dashboard_service._get_lock_key(org_id), "other-worker", timeout=30)
+
+        result = warm_dashboard_cache_task(org_id)
+
+        assert result["status"] == "skipped"
+        assert cache.get(dashboard_service._get_cache_key(org_id)) is None
+
+    def test_lock_released_after_recompute(self, dashboard_service, test_organisation):
+        org_id = str(test_organisation.id)
+
+        dashboard_service.get_dashboard_data(org_id)
+
+        assert cache.get(dashboard_service._get_lock_key(org_id)) is None
+        assert cache.get(dashboard_service._get_stale_key(org_id)) is not None
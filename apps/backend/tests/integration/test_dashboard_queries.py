@@ -0,0 +1,156 @@
+"""
+Integration tests for the consolidated dashboard queries.
+
+Covers:
+- Cold-miss dashboard computed with a fixed number of queries
+- Query count independent of the number of bank accounts
+- Cash on hand across accounts matches the per-account formula
+- Many bank accounts stay within the query budget
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.banking.services import CashPositionService
+from apps.core.models import Account, BankAccount, Contact, InvoiceDocument, Payment
+from apps.reporting.services.dashboard_service import DashboardService
+
+
+def _bank_accounts(org, count, start=1):
+    """Create `count` active bank accounts with 1,000.00 opening balance and one receipt each."""
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name=f"Dashboard Customer {start}",
+        is_customer=True,
+        is_active=True,
+    )
+    for i in range(start, start + count):
+        gl_account = Account.objects.create(
+            org=org,
+            code=f"11{i:02d}",
+            name=f"Bank {i}",
+            account_type="ASSET_CURRENT",
+            is_bank=True,
+            is_system=False,
+            is_active=True,
+        )
+        bank_account = BankAccount.objects.create(
+            org=org,
+            account_name=f"Operating {i}",
+            bank_name="DBS Bank",
+            account_number=f"ACC{i:05d}",
+            currency="SGD",
+            gl_account=gl_account,
+            opening_balance=Decimal("1000.0000"),
+            opening_balance_date=date(2024, 1, 1),
+            is_active=True,
+        )
+        Payment.objects.create(
+            org=org,
+            payment_type="RECEIVED",
+            payment_number=f"RCP-{i:05d}",
+            payment_date=date(2024, 1, 10),
+            contact=contact,
+            bank_account=bank_account,
+            currency="SGD",
+            exchange_rate=Decimal("1.000000"),
+            amount=Decimal("250.0000"),
+            base_amount=Decimal("250.0000"),
+            is_voided=False,
+        )
+    # Payments were inserted directly, bypassing PaymentService
+    CashPositionService.rebuild(org.id)
+
+
+def _cold_miss(org_id):
+    service = DashboardService()
+    cache.delete(service._get_cache_key(org_id))
+
+    with CaptureQueriesContext(connection) as ctx:
+        data = service.get_dashboard_data(org_id)
+
+    return data, len(ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestDashboardQueries:
+    """Fixed-cost dashboard computation."""
+
+    def test_query_count_independent_of_bank_accounts(
+        self, test_organisation, test_fiscal_period
+    ):
+        org_id = str(test_organisation.id)
+
+        _bank_accounts(test_organisation, 1)
+        _, one_account = _cold_miss(org_id)
+
+        _bank_accounts(test_organisation, 9, start=2)
+        data, ten_accounts = _cold_miss(org_id)
+
+        assert ten_accounts == one_account
+        assert one_account <= 6
+        assert data["cash_on_hand"] == "SGD 12,500.00"
+
+    def test_document_metrics_in_one_pass(self, test_organisation, test_fiscal_period):
+        contact = Contact.objects.create(
+            org=test_organisation,
+            contact_type="CUSTOMER",
+            name="Metrics Customer",
+            is_customer=True,
+            is_active=True,
+        )
+        today = date.today()
+        InvoiceDocument.objects.create(
+            org=test_organisation,
+            document_type="SALES_INVOICE",
+            document_number="INV-00001",
+            contact=contact,
+            issue_date=today,
+            due_date=date(2000, 1, 1),
+            status="APPROVED",
+            total_excl=Decimal("1000.0000"),
+            gst_total=Decimal("90.0000"),
+            total_incl=Decimal("1090.0000"),
+            amount_paid=Decimal("90.0000"),
+        )
+        InvoiceDocument.objects.create(
+            org=test_organisation,
+            document_type="SALES_INVOICE",
+            document_number="INV-00002",
+            contact=contact,
+            issue_date=today,
+            due_date=today,
+            status="DRAFT",
+            total_excl=Decimal("500.0000"),
+            gst_total=Decimal("45.0000"),
+            total_incl=Decimal("545.0000"),
+        )
+
+        service = DashboardService()
+        with CaptureQueriesContext(connection) as ctx:
+            metrics = service._query_document_metrics(test_organisation.id, today, None)
+
+        assert len(ctx.captured_queries) == 1
+        assert metrics["revenue_mtd"] == Decimal("1000.0000")
+        assert metrics["outstanding_receivables"] == Decimal("1000.0000")
+        assert metrics["pending"] == 1
+        assert metrics["overdue"] == 1
+        assert metrics["revenue_ytd"] == Decimal("0.0000")
+
+
+@pytest.mark.django_db
+class TestManyBankAccounts:
+    """Cold miss with many bank accounts."""
+
+    def test_cold_miss_query_budget(self, test_organisation, test_fiscal_period):
+        _bank_accounts(test_organisation, 50)
+
+        _, queries = _cold_miss(str(test_organisation.id))
+
+        assert queries <= 6
@@ -0,0 +1,232 @@
+"""
+Integration tests for the financial statements engine.
+
+Covers:
+- P&L sections, sub-types and account rows with prior-year comparatives
+- Balance sheet balances through current earnings
+- Balance sheet reads closed periods from the balance snapshots and only
+  the lines of the period open at the balance date
+- Report computed with one journal query for any number of columns
+- Chart-of-accounts hierarchy subtotals
+- GET /reports/reports/financial/ for every report type
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import Account, FiscalPeriod, FiscalYear
+from apps.journal.services import JournalService
+from apps.reporting.services.financial_statement_service import FinancialStatementService
+from common.exceptions import ValidationError
+
+
+@pytest.fixture
+def prior_period(test_organisation):
+    """Open January 2023 period for comparative postings."""
+    fy = FiscalYear.objects.create(
+        org=test_organisation,
+        label="FY2023",
+        start_date=date(2023, 1, 1),
+        end_date=date(2023, 12, 31),
+        is_closed=False,
+    )
+    return FiscalPeriod.objects.create(
+        org=test_organisation,
+        fiscal_year=fy,
+        label="January 2023",
+        period_number=1,
+        start_date=date(2023, 1, 1),
+        end_date=date(2023, 1, 31),
+        is_open=True,
+    )
+
+
+@pytest.fixture
+def ledger(test_organisation, test_accounts, test_fiscal_period, prior_period, test_user):
+    """Post a small ledger in January 2024 and January 2023."""
+    cache.clear()
+    accounts = dict(test_accounts)
+    accounts["3000"] = Account.objects.create(
+        org=test_organisation,
+        code="3000",
+        name="Share Capital",
+        account_type="EQUITY",
+        is_active=True,
+    )
+    accounts["1000"] = Account.objects.create(
+        org=test_organisation,
+        code="1000",
+        name="Current Assets",
+        account_type="ASSET_CURRENT",
+        is_header=True,
+        is_active=True,
+    )
+    Account.objects.filter(id=accounts["1200"].id).update(parent_id=accounts["1000"].id)
+
+    def entry(entry_date, period, debit, credit, amount):
+        return {
+            "entry_date": entry_date,
+            "fiscal_period": period,
+            "source_type": "MANUAL",
+            "narration": f"{debit}/{credit}",
+            "lines": [
+                {"account_id": accounts[debit].id, "debit": Decimal(amount), "credit": 0},
+                {"account_id": accounts[credit].id, "debit": 0, "credit": Decimal(amount)},
+            ],
+        }
+
+    JournalService.create_entries(
+        test_organisation.id,
+        [
+            entry(date(2024, 1, 5), test_fiscal_period, "1200", "3000", "500.00"),
+            entry(date(2024, 1, 10), test_fiscal_period, "1200", "4000", "1000.00"),
+            entry(date(2024, 1, 12), test_fiscal_period, "5000", "1200", "300.00"),
+            entry(date(2024, 1, 20), test_fiscal_period, "6100", "2200", "200.00"),
+            entry(date(2023, 1, 10), prior_period, "1200", "4000", "400.00"),
+        ],
+        test_user.id,
+    )
+    return accounts
+
+
+def _section(report, key):
+    return next(s for s in report["sections"] if s["key"] == key)
+
+
+@pytest.mark.django_db
+class TestProfitLoss:
+    """FinancialStatementService.profit_loss."""
+
+    def test_sections_and_comparatives(self, test_organisation, ledger):
+        report = FinancialStatementService.profit_loss(
+            test_organisation.id, date(2024, 1, 1), date(2024, 1, 31), comparatives=1
+        )
+
+        assert [c["start_date"] for c in report["columns"]] == ["2024-01-01", "2023-01-01"]
+        assert _section(report, "revenue")["totals"] == ["1000.0000", "400.0000"]
+        assert _section(report, "cost_of_sales")["totals"] == ["300.0000", "0.0000"]
+        assert report["gross_profit"] == ["700.0000", "400.0000"]
+        assert report["net_profit"] == ["500.0000", "400.0000"]
+
+        opex = _section(report, "operating_expenses")
+        (sub_type,) = opex["sub_types"]
+        assert sub_type["code"] == "EXPENSE_ADMIN"
+        assert [a["code"] for a in sub_type["accounts"]] == ["6100"]
+        assert sub_type["accounts"][0]["amounts"] == ["200.0000", "0.0000"]
+
+    def test_one_journal_query_for_any_number_of_columns(self, test_organisation, ledger):
+        counts = []
+        for comparatives in (0, 3):
+            with CaptureQueriesContext(connection) as ctx:
+                FinancialStatementService._compute_profit_loss(
+                    test_organisation.id, date(2024, 1, 1), date(2024, 1, 31),
+                    comparatives, False,
+                )
+            counts.append(
+                sum("journal" in q["sql"] for q in ctx.captured_queries)
+            )
+
+        assert counts == [1, 1]
+
+    def test_invalid_parameters(self, test_organisation):
+        with pytest.raises(ValidationError):
+            FinancialStatementService.profit_loss(
+                test_organisation.id, date(2024, 2, 1), date(2024, 1, 1)
+            )
+        with pytest.raises(ValidationError):
+            FinancialStatementService.profit_loss(
+                test_organisation.id, date(2024, 1, 1), date(2024, 1, 31), comparatives=4
+            )
+
+
+@pytest.mark.django_db
+class TestBalanceSheet:
+    """FinancialStatementService.balance_sheet."""
+
+    def test_balances_through_current_earnings(self, test_organisation, ledger):
+        report = FinancialStatementService.balance_sheet(
+            test_organisation.id, date(2024, 1, 31), comparatives=1
+        )
+
+        assert _section(report, "assets")["totals"] == ["1600.0000", "400.0000"]
+        assert _section(report, "liabilities")["totals"] == ["200.0000", "0.0000"]
+        equity = _section(report, "equity")
+        assert equity["totals"] == ["1400.0000", "400.0000"]
+        assert equity["sub_types"][-1]["code"] == "CURRENT_EARNINGS"
+        assert equity["sub_types"][-1]["totals"] == ["900.0000", "400.0000"]
+        assert report["is_balanced"] is True
+
+    def test_closed_periods_read_from_snapshots(self, test_organisation, ledger):
+        with CaptureQueriesContext(connection) as ctx:
+            report = FinancialStatementService._compute_balance_sheet(
+                test_organisation.id, date(2024, 1, 15), 1, False
+            )
+
+        # 15 Jan 2024: January 2023 (400.00) comes from its snapshot and
+        # January 2024 from its lines up to that date (the 20 Jan posting to
+        # 2200 is excluded). The comparative falls inside January 2023.
+        assert _section(report, "assets")["totals"] == ["1600.0000", "400.0000"]
+        assert _section(report, "liabilities")["totals"] == ["0.0000", "0.0000"]
+        assert report["is_balanced"] is True
+
+        (journal_query,) = [q["sql"] for q in ctx.captured_queries if "journal" in q["sql"]]
+        assert "account_period_balance" in journal_query
+
+    def test_hierarchy_subtotals(self, test_organisation, ledger):
+        report = FinancialStatementService.balance_sheet(test_organisation.id, date(2024, 1, 31))
+
+        header = next(n for n in report["hierarchy"] if n["code"] == "1000")
+        assert header["amounts"] == ["0.0000"]
+        assert header["totals"] == ["1600.0000"]
+        assert [c["code"] for c in header["children"]] == ["1200"]
+        # Income statement accounts are not part of the balance sheet tree
+        assert not any(n["code"] in ("4000", "5000", "6100") for n in report["hierarchy"])
+
+
+@pytest.mark.django_db
+class TestFinancialReportEndpoint:
+    """GET /reports/reports/financial/."""
+
+    def _url(self, org):
+        return f"/api/v1/{org.id}/reports/reports/financial/"
+
+    def test_profit_loss(self, auth_client, test_organisation, ledger):
+        response = auth_client.get(
+            self._url(test_organisation),
+            {"start_date": "2024-01-01", "end_date": "2024-01-31", "comparatives": 1},
+        )
+
+        assert response.status_code == 200
+        assert response.data["net_profit"] == ["500.0000", "400.0000"]
+        assert response.data["data"]["revenue"]["Total"] == "1000.0000"
+
+    def test_balance_sheet(self, auth_client, test_organisation, ledger):
+        response = auth_client.get(
+            self._url(test_organisation),
+            {"report_type": "balance_sheet", "as_at_date": "2024-01-31"},
+        )
+
+        assert response.status_code == 200
+        assert response.data["is_balanced"] is True
+        assert response.data["data"]["assets"]["Total"] == "1600.0000"
+
+    def test_trial_balance(self, auth_client, test_organisation, ledger):
+        response = auth_client.get(
+            self._url(test_organisation),
+            {"report_type": "trial_balance", "as_at_date": "2024-01-31"},
+        )
+
+        assert response.status_code == 200
+        data = response.data["data"]
+        assert data["is_balanced"] is True
+        assert data["total_debit"] == "2400.0000"
+
+    def test_invalid_date(self, auth_client, test_organisation):
+        response = auth_client.get(self._url(test_organisation), {"start_date": "01/01/2024"})
+
+        assert response.status_code == 400
@@ -0,0 +1,242 @@
+"""
+Integration tests for the set-based F5 computation engine.
+
+Covers:
+- Box totals from sales, purchases and credit notes in one pass
+- DRAFT recalculation reprocesses only unindexed or voided documents
+- Per-box drill-down index and GET /gst/returns/{id}/boxes/{box}/
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from apps.core.models import (
+    Contact,
+    GSTReturn,
+    GSTReturnBoxDocument,
+    InvoiceDocument,
+    InvoiceLine,
+)
+from apps.gst.services import F5ComputationService, GSTCalculationService, GSTReturnService
+
+
+def _document(org, contact, accounts, tax_code, document_type, number, net, gst):
+    """Create an approved single-line document dated inside January 2024."""
+    document = InvoiceDocument.objects.create(
+        org=org,
+        document_type=document_type,
+        document_number=number,
+        contact=contact,
+        issue_date=date(2024, 1, 15),
+        due_date=date(2024, 2, 15),
+        status="APPROVED",
+        approved_at=timezone.now(),
+        total_excl=net,
+        gst_total=gst,
+        total_incl=net + gst,
+    )
+    InvoiceLine.objects.create(
+        org=org,
+        document=document,
+        line_number=1,
+        description="F5 line",
+        account=accounts["4000"],
+        quantity=Decimal("1"),
+        unit_price=net,
+        tax_code=tax_code,
+        tax_rate=tax_code.rate,
+        line_amount=net,
+        gst_amount=gst,
+        total_amount=net + gst,
+        base_line_amount=net,
+        base_gst_amount=gst,
+        base_total_amount=net + gst,
+    )
+    return document
+
+
+@pytest.fixture
+def f5_contact(test_organisation):
+    return Contact.objects.create(
+        org=test_organisation,
+        contact_type="BOTH",
+        name="F5 Contact",
+        is_customer=True,
+        is_supplier=True,
+        is_active=True,
+    )
+
+
+@pytest.fixture
+def f5_return(test_organisation, test_fiscal_period):
+    return GSTReturn.objects.create(
+        org=test_organisation,
+        return_type="F5",
+        period_start=test_fiscal_period.start_date,
+        period_end=test_fiscal_period.end_date,
+        filing_due_date=date(2024, 2, 29),
+        status="DRAFT",
+    )
+
+
+@pytest.fixture
+def f5_documents(test_organisation, test_accounts, test_tax_codes, f5_contact):
+    org, tc = test_organisation, test_tax_codes
+    return {
+        "sr": _document(
+            org, f5_contact, test_accounts, tc["SR"], "SALES_INVOICE",
+            "INV-00001", Decimal("1000.0000"), Decimal("90.0000"),
+        ),
+        "zr": _document(
+            org, f5_contact, test_accounts, tc["ZR"], "SALES_INVOICE",
+            "INV-00002", Decimal("500.0000"), Decimal("0.0000"),
+        ),
+        "cn": _document(
+            org, f5_contact, test_accounts, tc["SR"], "SALES_CREDIT_NOTE",
+            "CN-00001", Decimal("100.0000"), Decimal("9.0000"),
+        ),
+        "tx": _document(
+            org, f5_contact, test_accounts, tc["TX"], "PURCHASE_INVOICE",
+            "BILL-00001", Decimal("400.0000"), Decimal("36.0000"),
+        ),
+    }
+
+
+@pytest.mark.django_db
+class TestF5Computation:
+    """Box totals."""
+
+    def test_box_totals(self, test_organisation, f5_return, f5_documents):
+        gst_return = GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+
+        assert gst_return.box1_std_rated_supplies == Decimal("900.0000")
+        assert gst_return.box2_zero_rated_supplies == Decimal("500.0000")
+        assert gst_return.box4_total_supplies == Decimal("1400.0000")
+        assert gst_return.box5_total_taxable_purchases == Decimal("400.0000")
+        assert gst_return.box6_output_tax == Decimal("81.0000")
+        assert gst_return.box7_input_tax_claimable == Decimal("36.0000")
+        assert gst_return.box8_net_gst == Decimal("45.0000")
+        assert gst_return.box13_total_revenue == Decimal("1400.0000")
+        assert gst_return.computed_at is not None
+
+    def test_box_amounts_match_stored_return(self, test_organisation, f5_return, f5_documents):
+        boxes = GSTCalculationService.get_f5_box_amounts(
+            test_organisation.id, "2024-01-01", "2024-01-31"
+        )
+        gst_return = GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+
+        assert boxes["box1"] == "900.00"
+        assert boxes["box8"] == "45.00"
+        assert Decimal(boxes["box6"]) == gst_return.box6_output_tax
+
+
+@pytest.mark.django_db
+class TestIncrementalRecalculation:
+    """DRAFT returns only reprocess changed documents."""
+
+    def test_only_new_and_voided_documents_reprocessed(
+        self, test_organisation, test_accounts, test_tax_codes, f5_contact, f5_return, f5_documents
+    ):
+        GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+        untouched = set(
+            GSTReturnBoxDocument.objects.filter(
+                gst_return=f5_return, document=f5_documents["tx"]
+            ).values_list("id", flat=True)
+        )
+
+        InvoiceDocument.objects.filter(id=f5_documents["zr"].id).update(
+            status="VOID", voided_at=timezone.now()
+        )
+        new_invoice = _document(
+            test_organisation, f5_contact, test_accounts, test_tax_codes["SR"],
+            "SALES_INVOICE", "INV-00003", Decimal("200.0000"), Decimal("18.0000"),
+        )
+
+        gst_return = GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+
+        assert gst_return.box1_std_rated_supplies == Decimal("1100.0000")
+        assert gst_return.box2_zero_rated_supplies == Decimal("0.0000")
+        assert gst_return.box6_output_tax == Decimal("99.0000")
+        indexed = set(
+            GSTReturnBoxDocument.objects.filter(gst_return=f5_return).values_list(
+                "document_id", flat=True
+            )
+        )
+        assert f5_documents["zr"].id not in indexed
+        assert new_invoice.id in indexed
+        # Rows for unchanged documents are left in place
+        assert untouched <= set(
+            GSTReturnBoxDocument.objects.filter(gst_return=f5_return).values_list("id", flat=True)
+        )
+
+    def test_late_commit_with_earlier_approval_indexed(
+        self, test_organisation, test_accounts, test_tax_codes, f5_contact, f5_return, f5_documents
+    ):
+        first = GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+        # Approved before the last computation finished, committed after it
+        late = _document(
+            test_organisation, f5_contact, test_accounts, test_tax_codes["SR"],
+            "SALES_INVOICE", "INV-00004", Decimal("300.0000"), Decimal("27.0000"),
+        )
+        InvoiceDocument.objects.filter(id=late.id).update(
+            approved_at=first.computed_at - timedelta(minutes=1)
+        )
+
+        gst_return = GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+
+        assert gst_return.box1_std_rated_supplies == first.box1_std_rated_supplies + Decimal(
+            "300.0000"
+        )
+        assert GSTReturnBoxDocument.objects.filter(gst_return=f5_return, document=late).exists()
+
+    def test_incremental_matches_full_recompute(
+        self, test_organisation, test_accounts, test_tax_codes, f5_contact, f5_return, f5_documents
+    ):
+        GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+        InvoiceDocument.objects.filter(id=f5_documents["cn"].id).update(status="VOID")
+        _document(
+            test_organisation, f5_contact, test_accounts, test_tax_codes["TX"],
+            "PURCHASE_INVOICE", "BILL-00002", Decimal("50.0000"), Decimal("4.5000"),
+        )
+
+        incremental = GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+        full = F5ComputationService.compute(test_organisation.id, f5_return, full=True)
+
+        for field in ("box1_std_rated_supplies", "box5_total_taxable_purchases", "box8_net_gst"):
+            assert getattr(incremental, field) == getattr(full, field)
+
+
+@pytest.mark.django_db
+class TestBoxDrillDown:
+    """Per-box contributing documents."""
+
+    def test_box_documents(self, test_organisation, f5_return, f5_documents):
+        GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+
+        rows = F5ComputationService.get_box_documents(test_organisation.id, f5_return.id, 1)
+
+        assert {r["document_number"]: r["amount"] for r in rows} == {
+            "INV-00001": "1000.0000",
+            "CN-00001": "-100.0000",
+        }
+
+    def test_box_documents_endpoint(self, auth_client, test_organisation, f5_return, f5_documents):
+        GSTReturnService.generate_f5(test_organisation.id, f5_return.id)
+
+        response = auth_client.get(
+            f"/api/v1/{test_organisation.id}/gst/returns/{f5_return.id}/boxes/7/"
+        )
+
+        assert response.status_code == 200
+        assert response.data["count"] == 1
+        assert response.data["data"][0]["document_number"] == "BILL-00001"
+
+    def test_derived_box_rejected(self, auth_client, test_organisation, f5_return):
+        response = auth_client.get(
+            f"/api/v1/{test_organisation.id}/gst/returns/{f5_return.id}/boxes/4/"
+        )
+
+        assert response.status_code == 400
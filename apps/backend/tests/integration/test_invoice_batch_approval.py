@@ -0,0 +1,252 @@
+"""
+Integration tests for batch invoice approval.
+
+Covers:
+- All valid documents approved and posted in one call
+- Invalid documents reported per document without blocking the batch
+- A line account outside the org fails only its own document
+- Peppol transmission queued only once the approval commits
+- POST /invoicing/documents/batch-approve/
+- Statement count independent of batch size
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import (
+    Account,
+    Contact,
+    InvoiceDocument,
+    InvoiceLine,
+    JournalEntry,
+    Organisation,
+)
+from apps.invoicing.services import DocumentService
+from apps.journal.services import BalanceSnapshotService
+from apps.peppol import tasks as peppol_tasks
+from apps.peppol.models import OrganisationPeppolSettings, PeppolTransmissionLog
+
+
+def _draft_invoices(org, accounts, tax_codes, count, issue_date=date(2024, 1, 15), start=1):
+    """Create `count` DRAFT sales invoices of 100.00 + 9% GST each."""
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name="Batch Customer",
+        is_customer=True,
+        is_active=True,
+    )
+    invoices = []
+    for i in range(start, start + count):
+        invoice = InvoiceDocument.objects.create(
+            org=org,
+            document_type="SALES_INVOICE",
+            document_number=f"INV-{i:05d}",
+            contact=contact,
+            issue_date=issue_date,
+            due_date=issue_date,
+            status="DRAFT",
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+        )
+        InvoiceLine.objects.create(
+            org=org,
+            document=invoice,
+            line_number=1,
+            description="Services",
+            account=accounts["4000"],
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.0000"),
+            tax_code=tax_codes["SR"],
+            tax_rate=Decimal("0.09"),
+            line_amount=Decimal("100.0000"),
+            gst_amount=Decimal("9.0000"),
+            total_amount=Decimal("109.0000"),
+        )
+        invoices.append(invoice)
+    return invoices
+
+
+@pytest.mark.django_db
+class TestBatchApproval:
+    """DocumentService.approve_documents."""
+
+    def test_batch_approves_and_posts(
+        self, test_organisation, test_accounts, test_tax_codes, test_fiscal_period, test_user
+    ):
+        invoices = _draft_invoices(test_organisation, test_accounts, test_tax_codes, 3)
+
+        result = DocumentService.approve_documents(
+            test_organisation.id, [inv.id for inv in invoices], test_user
+        )
+
+        assert result["approved_count"] == 3
+        assert result["failed_count"] == 0
+        assert all(r["success"] for r in result["results"])
+
+        for invoice in invoices:
+            invoice.refresh_from_db()
+            assert invoice.status == "APPROVED"
+            assert invoice.approved_by_id == test_user.id
+            entry = JournalEntry.objects.get(id=invoice.journal_entry_id)
+            assert entry.source_id == invoice.id
+            assert entry.lines.count() == 3
+
+        numbers = sorted(
+            JournalEntry.objects.filter(org=test_organisation).values_list(
+                "entry_number", flat=True
+            )
+        )
+        assert numbers == [1, 2, 3]
+        assert BalanceSnapshotService.verify(test_organisation.id) == []
+
+    def test_invalid_documents_reported_individually(
+        self, test_organisation, test_accounts, test_tax_codes, test_fiscal_period, test_user
+    ):
+        good, already_approved = _draft_invoices(
+            test_organisation, test_accounts, test_tax_codes, 2
+        )
+        (closed_period,) = _draft_invoices(
+            test_organisation, test_accounts, test_tax_codes, 1,
+            issue_date=date(2023, 6, 1), start=10,
+        )
+        InvoiceDocument.objects.filter(id=already_approved.id).update(status="APPROVED")
+        missing_id = uuid4()
+
+        result = DocumentService.approve_documents(
+            test_organisation.id,
+            [good.id, already_approved.id, closed_period.id, missing_id],
+            test_user,
+        )
+
+        by_id = {r["document_id"]: r for r in result["results"]}
+        assert result["approved_count"] == 1
+        assert result["failed_count"] == 3
+        assert by_id[str(good.id)]["success"] is True
+        assert "status" in by_id[str(already_approved.id)]["error"]
+        assert "fiscal period" in by_id[str(closed_period.id)]["error"]
+        assert "not found" in by_id[str(missing_id)]["error"]
+
+        closed_period.refresh_from_db()
+        assert closed_period.status == "DRAFT"
+        assert closed_period.journal_entry_id is None
+
+    def test_unknown_account_fails_only_its_document(
+        self, test_organisation, test_accounts, test_tax_codes, test_fiscal_period, test_user
+    ):
+        good, bad = _draft_invoices(test_organisation, test_accounts, test_tax_codes, 2)
+        other_org = Organisation.objects.create(
+            name="Other Organisation",
+            legal_name="Other Organisation Pte Ltd",
+            uen="987654321B",
+            entity_type="PRIVATE_LIMITED",
+            fy_start_month=1,
+            base_currency="SGD",
+            is_active=True,
+        )
+        foreign_account = Account.objects.create(
+            org=other_org,
+            code="4000",
+            name="Sales Revenue",
+            account_type="REVENUE",
+            is_system=False,
+            is_active=True,
+        )
+        InvoiceLine.objects.filter(document=bad).update(account=foreign_account)
+
+        result = DocumentService.approve_documents(
+            test_organisation.id, [good.id, bad.id], test_user
+        )
+
+        by_id = {r["document_id"]: r for r in result["results"]}
+        assert (result["approved_count"], result["failed_count"]) == (1, 1)
+        assert by_id[str(good.id)]["success"] is True
+        assert by_id[str(bad.id)]["error"] == f"Account {foreign_account.id} not found"
+
+        bad.refresh_from_db()
+        assert bad.status == "DRAFT"
+        assert bad.journal_entry_id is None
+        assert JournalEntry.objects.filter(org=test_organisation).count() == 1
+
+    def test_peppol_batch_queued_on_commit(
+        self,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+        test_fiscal_period,
+        test_user,
+    ):
+        OrganisationPeppolSettings.objects.create(
+            org=test_organisation,
+            access_point_provider="Storecove",
+            access_point_api_url="https://ap.example.com",
+            access_point_api_key="key",
+            access_point_client_id="client",
+            auto_transmit=True,
+        )
+        invoices = _draft_invoices(test_organisation, test_accounts, test_tax_codes, 2)
+        Contact.objects.filter(id=invoices[0].contact_id).update(peppol_id="0195:202398765B")
+        queued = []
+        monkeypatch.setattr(
+            peppol_tasks.transmit_peppol_batch_task,
+            "delay",
+            lambda org_id, log_ids: queued.append((org_id, log_ids)),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True) as callbacks:
+            log_ids = DocumentService._queue_peppol_transmissions(
+                test_organisation.id,
+                list(
+                    InvoiceDocument.objects.filter(id__in=[inv.id for inv in invoices])
+                    .select_related("contact")
+                ),
+            )
+            assert queued == []
+
+        assert len(callbacks) == 1
+        assert queued == [(str(test_organisation.id), log_ids)]
+        assert PeppolTransmissionLog.objects.filter(id__in=log_ids, status="PENDING").count() == 2
+
+    def test_batch_approve_endpoint(
+        self, auth_client, test_organisation, test_accounts, test_tax_codes, test_fiscal_period
+    ):
+        invoices = _draft_invoices(test_organisation, test_accounts, test_tax_codes, 2)
+
+        response = auth_client.post(
+            f"/api/v1/{test_organisation.id}/invoicing/documents/batch-approve/",
+            {"document_ids": [str(inv.id) for inv in invoices]},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["approved_count"] == 2
+
+
+@pytest.mark.django_db
+class TestBatchApprovalQueryCount:
+    """Statement count must not grow with the number of documents."""
+
+    def _approve(self, org, invoices, user):
+        with CaptureQueriesContext(connection) as ctx:
+            result = DocumentService.approve_documents(org.id, [inv.id for inv in invoices], user)
+        assert result["approved_count"] == len(invoices)
+        return len(ctx.captured_queries)
+
+    def test_query_count_constant_as_batch_grows(
+        self, test_organisation, test_accounts, test_tax_codes, test_fiscal_period, test_user
+    ):
+        small = _draft_invoices(test_organisation, test_accounts, test_tax_codes, 5)
+        large = _draft_invoices(test_organisation, test_accounts, test_tax_codes, 200, start=100)
+
+        small_queries = self._approve(test_organisation, small, test_user)
+        large_queries = self._approve(test_organisation, large, test_user)
+
+        assert large_queries == small_queries
@@ -0,0 +1,119 @@
+"""
+Integration tests for the keyset-paginated document list.
+
+Covers:
+- Pages follow (issue_date, document_number, id) without gaps or repeats
+- One query per page, contact joined (no per-row lookups)
+- GET /invoicing/documents/ next links, total count and cursor validation
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import Contact, InvoiceDocument
+from apps.invoicing.services import DocumentService
+
+
+def _documents(org, count):
+    """Create `count` invoices, three per issue date, so keys tie on date."""
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name="List Customer",
+        is_customer=True,
+        is_active=True,
+    )
+    return [
+        InvoiceDocument.objects.create(
+            org=org,
+            document_type="SALES_INVOICE",
+            document_number=f"INV-{i:05d}",
+            contact=contact,
+            issue_date=date(2024, 1, 1 + i // 3),
+            due_date=date(2024, 2, 28),
+            status="DRAFT",
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.django_db
+class TestDocumentKeysetPagination:
+    """DocumentService.list_documents_page."""
+
+    def test_pages_cover_all_documents_in_order(self, test_organisation):
+        _documents(test_organisation, 8)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = DocumentService.list_documents_page(
+                test_organisation.id, cursor=cursor, page_size=3
+            )
+            seen.extend(d.document_number for d in page)
+            if cursor is None:
+                break
+
+        assert seen == [f"INV-{i:05d}" for i in reversed(range(8))]
+
+    def test_one_query_per_page(self, test_organisation):
+        _documents(test_organisation, 10)
+
+        with CaptureQueriesContext(connection) as ctx:
+            page, _ = DocumentService.list_documents_page(test_organisation.id, page_size=5)
+            names = [d.contact.name for d in page]
+
+        assert len(ctx.captured_queries) == 1
+        assert names == ["List Customer"] * 5
+
+    def test_filters_apply_with_cursor(self, test_organisation):
+        documents = _documents(test_organisation, 6)
+        InvoiceDocument.objects.filter(id=documents[4].id).update(status="APPROVED")
+
+        page, cursor = DocumentService.list_documents_page(
+            test_organisation.id, status="DRAFT", page_size=2
+        )
+        rest, _ = DocumentService.list_documents_page(
+            test_organisation.id, status="DRAFT", cursor=cursor, page_size=10
+        )
+
+        numbers = [d.document_number for d in page + rest]
+        assert "INV-00004" not in numbers
+        assert len(numbers) == 5
+
+
+@pytest.mark.django_db
+class TestDocumentListEndpoint:
+    """GET /api/v1/{org_id}/invoicing/documents/."""
+
+    def test_follow_next_link(self, auth_client, test_organisation):
+        _documents(test_organisation, 5)
+        url = f"/api/v1/{test_organisation.id}/invoicing/documents/?page_size=3"
+
+        first = auth_client.get(url)
+        assert first.status_code == 200
+        assert len(first.data["results"]) == 3
+        assert first.data["count"] == 5
+        assert first.data["next"] is not None
+
+        second = auth_client.get(first.data["next"])
+        assert second.status_code == 200
+        assert len(second.data["results"]) == 2
+        assert second.data["count"] == 5
+        assert second.data["next"] is None
+        assert {r["id"] for r in first.data["results"]}.isdisjoint(
+            r["id"] for r in second.data["results"]
+        )
+
+    def test_invalid_cursor_rejected(self, auth_client, test_organisation):
+        response = auth_client.get(
+            f"/api/v1/{test_organisation.id}/invoicing/documents/?cursor=not-a-cursor"
+        )
+
+        assert response.status_code == 400
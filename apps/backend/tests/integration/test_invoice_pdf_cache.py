@@ -0,0 +1,149 @@
+"""
+Integration tests for content-addressed invoice PDFs.
+
+Covers:
+- An unchanged document is rendered once and then served from cache
+- Content edits produce a new hash; bookkeeping changes (status, payments) do not
+- The disk-backed cache (PDF_CACHE_DIR)
+- A real in-process WeasyPrint render
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.core.cache import cache
+
+from apps.core.models import Contact, InvoiceDocument, InvoiceLine, Organisation
+from apps.invoicing import pdf_renderer
+from apps.invoicing.services import DocumentService, PDFService
+
+
+def _invoice(org, accounts, tax_codes):
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name="PDF Customer",
+        is_customer=True,
+        is_active=True,
+    )
+    invoice = InvoiceDocument.objects.create(
+        org=org,
+        document_type="SALES_INVOICE",
+        document_number="INV-00001",
+        contact=contact,
+        issue_date=date(2024, 1, 15),
+        due_date=date(2024, 2, 15),
+        status="DRAFT",
+        total_excl=Decimal("100.0000"),
+        gst_total=Decimal("9.0000"),
+        total_incl=Decimal("109.0000"),
+    )
+    InvoiceLine.objects.create(
+        org=org,
+        document=invoice,
+        line_number=1,
+        description="Services",
+        account=accounts["4000"],
+        quantity=Decimal("1"),
+        unit_price=Decimal("100.0000"),
+        tax_code=tax_codes["SR"],
+        tax_rate=Decimal("0.09"),
+        line_amount=Decimal("100.0000"),
+        gst_amount=Decimal("9.0000"),
+        total_amount=Decimal("109.0000"),
+    )
+    return invoice
+
+
+def _hash(invoice):
+    document = InvoiceDocument.objects.select_related("contact").get(id=invoice.id)
+    lines = document.lines.select_related("tax_code").order_by("line_number")
+    return PDFService.content_hash(document, Organisation.objects.get(id=document.org_id), lines)
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Count renders; the fake renderer returns a numbered marker instead of a PDF."""
+    calls = []
+
+    def fake_render(html, workers, warmup_html="", timeout=60):
+        calls.append(html)
+        return f"%PDF-fake-{len(calls)}".encode()
+
+    monkeypatch.setattr(pdf_renderer, "render", fake_render)
+    return calls
+
+
+@pytest.mark.django_db
+class TestPDFCache:
+    """Unchanged documents are never re-rendered."""
+
+    def test_unchanged_document_rendered_once(
+        self, renders, test_organisation, test_accounts, test_tax_codes
+    ):
+        invoice = _invoice(test_organisation, test_accounts, test_tax_codes)
+        cache.delete(f"pdf:{test_organisation.id}:{_hash(invoice)}")
+
+        _, first = PDFService.get_pdf(test_organisation.id, invoice.id)
+        second = DocumentService.generate_pdf(test_organisation.id, invoice.id).getvalue()
+
+        assert first == second == b"%PDF-fake-1"
+        assert len(renders) == 1
+
+    def test_content_edit_changes_hash(self, test_organisation, test_accounts, test_tax_codes):
+        invoice = _invoice(test_organisation, test_accounts, test_tax_codes)
+        original = _hash(invoice)
+
+        InvoiceLine.objects.filter(document=invoice).update(description="Consulting")
+
+        assert _hash(invoice) != original
+
+    def test_bookkeeping_changes_keep_hash(
+        self, test_organisation, test_accounts, test_tax_codes
+    ):
+        invoice = _invoice(test_organisation, test_accounts, test_tax_codes)
+        original = _hash(invoice)
+
+        InvoiceDocument.objects.filter(id=invoice.id).update(
+            status="PARTIALLY_PAID", amount_paid=Decimal("50.0000")
+        )
+
+        assert _hash(invoice) == original
+
+    def test_branding_change_changes_hash(
+        self, test_organisation, test_accounts, test_tax_codes
+    ):
+        invoice = _invoice(test_organisation, test_accounts, test_tax_codes)
+        original = _hash(invoice)
+
+        Organisation.objects.filter(id=test_organisation.id).update(name="Renamed Pte Ltd")
+
+        assert _hash(invoice) != original
+
+    def test_disk_cache(
+        self, settings, tmp_path, renders, test_organisation, test_accounts, test_tax_codes
+    ):
+        settings.PDF_CACHE_DIR = str(tmp_path)
+        invoice = _invoice(test_organisation, test_accounts, test_tax_codes)
+
+        PDFService.get_pdf(test_organisation.id, invoice.id)
+        _, pdf = PDFService.get_pdf(test_organisation.id, invoice.id)
+
+        stored = tmp_path / str(test_organisation.id) / f"{_hash(invoice)}.pdf"
+        assert stored.read_bytes() == pdf
+        assert len(renders) == 1
+
+
+@pytest.mark.django_db
+class TestPDFRender:
+    """Renders produce a real PDF."""
+
+    def test_in_process_render(self, test_organisation, test_accounts, test_tax_codes):
+        invoice = _invoice(test_organisation, test_accounts, test_tax_codes)
+        cache.delete(f"pdf:{test_organisation.id}:{_hash(invoice)}")
+
+        document, pdf = PDFService.get_pdf(test_organisation.id, invoice.id)
+
+        assert document.id == invoice.id
+        assert pdf.startswith(b"%PDF")
@@ -0,0 +1,161 @@
+"""
+Integration tests for bulk PDF export.
+
+Covers:
+- POST /invoicing/documents/pdf-export/ renders the filtered documents and packs a ZIP
+- GET  /invoicing/documents/pdf-export/{job_id}/ reports progress and throughput
+- GET  /invoicing/documents/pdf-export/{job_id}/download/ streams the ZIP
+- Jobs are scoped to their organisation
+- A failing chunk marks the job FAILED
+"""
+
+import io
+import zipfile
+import pytest
+from decimal import Decimal
+from datetime import date
+from uuid import uuid4
+
+from apps.core.models import Contact, InvoiceDocument, InvoiceLine
+from apps.invoicing import pdf_renderer
+from django.core.cache import cache
+
+from apps.invoicing.services import PDFExportService
+from apps.invoicing.services import pdf_export_service
+from apps.invoicing.tasks import fail_pdf_export_task
+
+
+def _invoices(org, accounts, tax_codes, count):
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name="Export Customer",
+        is_customer=True,
+        is_active=True,
+    )
+    invoices = []
+    for i in range(1, count + 1):
+        invoice = InvoiceDocument.objects.create(
+            org=org,
+            document_type="SALES_INVOICE",
+            document_number=f"INV-{i:05d}",
+            contact=contact,
+            issue_date=date(2024, 1, i),
+            due_date=date(2024, 2, i),
+            status="APPROVED",
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+        )
+        InvoiceLine.objects.create(
+            org=org,
+            document=invoice,
+            line_number=1,
+            description=f"Services {i}",
+            account=accounts["4000"],
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.0000"),
+            tax_code=tax_codes["SR"],
+            tax_rate=Decimal("0.09"),
+            line_amount=Decimal("100.0000"),
+            gst_amount=Decimal("9.0000"),
+            total_amount=Decimal("109.0000"),
+        )
+        invoices.append(invoice)
+    return invoices
+
+
+@pytest.fixture
+def export_settings(settings, tmp_path, monkeypatch):
+    settings.PDF_EXPORT_DIR = str(tmp_path / "exports")
+    settings.PDF_CACHE_DIR = str(tmp_path / "pdf-cache")
+    monkeypatch.setattr(pdf_renderer, "render", lambda html, **kwargs: b"%PDF-fake")
+    return settings
+
+
+@pytest.mark.django_db
+class TestPDFExport:
+    """Bulk export end to end (Celery runs eagerly in tests)."""
+
+    def _url(self, org, suffix=""):
+        return f"/api/v1/{org.id}/invoicing/documents/pdf-export/{suffix}"
+
+    def test_export_builds_zip(
+        self, export_settings, auth_client, test_organisation, test_accounts, test_tax_codes
+    ):
+        _invoices(test_organisation, test_accounts, test_tax_codes, 30)
+
+        response = auth_client.post(
+            self._url(test_organisation),
+            {"document_type": "SALES_INVOICE", "date_to": "2024-01-28"},
+            format="json",
+        )
+
+        assert response.status_code == 202
+        job = response.data
+        assert job["status"] == "COMPLETED"
+        assert job["total"] == 28
+        assert job["processed"] == 28
+        assert job["rendered"] == 28
+        assert job["progress"] == 100.0
+        assert job["documents_per_second"] > 0
+
+        status_response = auth_client.get(self._url(test_organisation, f"{job['job_id']}/"))
+        assert status_response.status_code == 200
+        assert status_response.data["file_size"] > 0
+
+        download = auth_client.get(self._url(test_organisation, f"{job['job_id']}/download/"))
+        assert download.status_code == 200
+        assert download["Content-Type"] == "application/zip"
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(download.streaming_content)))
+        names = archive.namelist()
+        assert len(names) == 28
+        assert names[0] == "INV-00001.pdf"
+        assert archive.read(names[0]).startswith(b"%PDF")
+
+    def test_second_export_served_from_pdf_cache(
+        self, export_settings, test_organisation, test_accounts, test_tax_codes
+    ):
+        _invoices(test_organisation, test_accounts, test_tax_codes, 3)
+
+        PDFExportService.start_export(test_organisation.id)
+        job = PDFExportService.start_export(test_organisation.id)
+
+        assert job["cached"] == 3
+        assert job["rendered"] == 0
+
+    def test_no_matching_documents(self, export_settings, auth_client, test_organisation):
+        response = auth_client.post(
+            self._url(test_organisation), {"status": "PAID"}, format="json"
+        )
+
+        assert response.status_code == 400
+
+    def test_unknown_job(self, export_settings, auth_client, test_organisation):
+        response = auth_client.get(self._url(test_organisation, f"{uuid4()}/"))
+
+        assert response.status_code == 404
+
+    def test_failed_chunk_fails_job(
+        self, export_settings, monkeypatch, test_organisation, test_accounts, test_tax_codes
+    ):
+        invoices = _invoices(test_organisation, test_accounts, test_tax_codes, 2)
+        # Queue nothing; run the chunk and the errback by hand
+        monkeypatch.setattr(pdf_export_service, "chord", lambda header: lambda body: None)
+        job = PDFExportService.start_export(test_organisation.id)
+        assert job["status"] == "RENDERING"
+
+        # An evicted progress counter is re-created rather than raising
+        cache.delete(pdf_export_service._counter_key(job["job_id"], "rendered"))
+        PDFExportService.render_chunk(
+            test_organisation.id, job["job_id"], [str(invoices[0].id)]
+        )
+        assert PDFExportService.get_status(test_organisation.id, job["job_id"])["rendered"] == 1
+
+        fail_pdf_export_task(
+            None, RuntimeError("worker lost"), None, str(test_organisation.id), job["job_id"]
+        )
+
+        status = PDFExportService.get_status(test_organisation.id, job["job_id"])
+        assert status["status"] == "FAILED"
+        assert status["error"] == "worker lost"
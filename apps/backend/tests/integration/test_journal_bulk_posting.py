@@ -0,0 +1,96 @@
+"""
+Integration tests for bulk journal line insertion.
+
+Covers:
+- Large entries post with a fixed number of statements
+- Line numbering follows input order
+- Unknown accounts are rejected before anything is written
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import JournalEntry, JournalLine
+from apps.journal.services import JournalService
+from common.exceptions import ResourceNotFound
+
+
+def _payroll_lines(accounts, count):
+    """Build a balanced entry with `count` expense debits and one AR credit."""
+    lines = [
+        {
+            "account_id": accounts["6100"].id,
+            "debit": Decimal("10.00"),
+            "credit": Decimal("0.00"),
+            "description": f"Line {i + 1}",
+        }
+        for i in range(count)
+    ]
+    lines.append(
+        {
+            "account_id": accounts["1200"].id,
+            "debit": Decimal("0.00"),
+            "credit": Decimal("10.00") * count,
+            "description": "Offset",
+        }
+    )
+    return lines
+
+
+def _post(org, period, user, lines):
+    return JournalService.create_entry(
+        org_id=org.id,
+        entry_date=date(2024, 1, 31),
+        source_type="MANUAL",
+        narration="Bulk posting test",
+        lines=lines,
+        fiscal_period_id=period.id,
+        user_id=user.id,
+    )
+
+
+@pytest.mark.django_db
+class TestBulkJournalPosting:
+    """create_entry writes all lines in bulk."""
+
+    def test_statement_count_independent_of_line_count(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        with CaptureQueriesContext(connection) as small:
+            _post(test_organisation, test_fiscal_period, test_user, _payroll_lines(test_accounts, 5))
+
+        with CaptureQueriesContext(connection) as large:
+            _post(
+                test_organisation, test_fiscal_period, test_user, _payroll_lines(test_accounts, 500)
+            )
+
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+    def test_line_numbers_follow_input_order(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        entry = _post(
+            test_organisation, test_fiscal_period, test_user, _payroll_lines(test_accounts, 3)
+        )
+
+        lines = list(entry.lines.order_by("line_number"))
+        assert [line.line_number for line in lines] == [1, 2, 3, 4]
+        assert [line.description for line in lines] == ["Line 1", "Line 2", "Line 3", "Offset"]
+
+    def test_unknown_account_rejected_before_write(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        lines = _payroll_lines(test_accounts, 2)
+        lines[1]["account_id"] = uuid4()
+        entries_before = JournalEntry.objects.filter(org=test_organisation).count()
+
+        with pytest.raises(ResourceNotFound):
+            _post(test_organisation, test_fiscal_period, test_user, lines)
+
+        assert JournalEntry.objects.filter(org=test_organisation).count() == entries_before
+        assert not JournalLine.objects.filter(org=test_organisation, description="Line 1").exists()
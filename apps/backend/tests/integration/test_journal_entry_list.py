@@ -0,0 +1,126 @@
+"""
+Integration tests for the journal entry list.
+
+Covers:
+- Totals and line counts annotated in SQL (one query for any number of entries)
+- Account filter as a semi-join
+- Keyset pages on (entry_date, entry_number, id), unique across date ties
+- GET /journal-entries/entries/ cursor pagination
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.journal.serializers import JournalEntryListSerializer
+from apps.journal.services import JournalService
+from common.exceptions import ValidationError
+
+
+def _post_entries(org, period, accounts, user, count, expense="6100"):
+    """Post `count` balanced two-line entries of 10.00 each."""
+    return JournalService.create_entries(
+        org.id,
+        [
+            {
+                "entry_date": date(2024, 1, 10 + i % 20),
+                "fiscal_period": period,
+                "source_type": "MANUAL",
+                "narration": f"Entry {i}",
+                "lines": [
+                    {"account_id": accounts[expense].id, "debit": Decimal("10.00"), "credit": 0},
+                    {"account_id": accounts["1200"].id, "debit": 0, "credit": Decimal("10.00")},
+                ],
+            }
+            for i in range(count)
+        ],
+        user.id,
+    )
+
+
+@pytest.mark.django_db
+class TestJournalEntryList:
+    """JournalService.list_entries."""
+
+    def test_totals_serialized_without_line_queries(
+        self, test_organisation, test_fiscal_period, test_accounts, test_user
+    ):
+        _post_entries(test_organisation, test_fiscal_period, test_accounts, test_user, 25)
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = JournalEntryListSerializer(
+                JournalService.list_entries(test_organisation.id), many=True
+            ).data
+
+        assert len(ctx.captured_queries) == 1
+        assert len(data) == 25
+        assert all(row["total_debits"] == "10.0000" for row in data)
+        assert all(row["total_credits"] == "10.0000" for row in data)
+        assert all(row["line_count"] == 2 for row in data)
+
+    def test_account_filter_is_semi_join(
+        self, test_organisation, test_fiscal_period, test_accounts, test_user
+    ):
+        _post_entries(test_organisation, test_fiscal_period, test_accounts, test_user, 3)
+        _post_entries(
+            test_organisation, test_fiscal_period, test_accounts, test_user, 2, expense="5000"
+        )
+
+        entries = JournalService.list_entries(
+            test_organisation.id, account_id=test_accounts["5000"].id
+        )
+
+        assert "EXISTS" in str(entries.query).upper()
+        assert len(entries) == 2
+        # Totals still cover every line of the entry, not just the matching one
+        assert all(e.line_count == 2 for e in entries)
+
+    def test_keyset_pages_through_date_ties(
+        self, test_organisation, test_fiscal_period, test_accounts, test_user
+    ):
+        # 30 entries over 20 dates: pages must split runs of equal entry_date
+        _post_entries(test_organisation, test_fiscal_period, test_accounts, test_user, 30)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = JournalService.list_entries_page(
+                test_organisation.id, cursor=cursor, page_size=4
+            )
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        assert len(seen) == len({e.id for e in seen}) == 30
+        assert [(e.entry_date, e.entry_number) for e in seen] == sorted(
+            ((e.entry_date, e.entry_number) for e in seen), reverse=True
+        )
+        assert all(e.line_count == 2 for e in seen)
+
+    def test_invalid_cursor(self, test_organisation):
+        with pytest.raises(ValidationError):
+            JournalService.list_entries_page(test_organisation.id, cursor="not-a-cursor")
+
+
+@pytest.mark.django_db
+class TestJournalEntryListEndpoint:
+    """Cursor pagination on the list endpoint."""
+
+    def test_cursor_pages(
+        self, auth_client, test_organisation, test_fiscal_period, test_accounts, test_user
+    ):
+        _post_entries(test_organisation, test_fiscal_period, test_accounts, test_user, 5)
+        url = f"/api/v1/{test_organisation.id}/journal-entries/entries/?page_size=2"
+
+        seen, next_url = [], url
+        while next_url:
+            response = auth_client.get(next_url)
+            assert response.status_code == 200
+            assert len(response.data["results"]) <= 2
+            assert response.data["count"] == 5
+            seen.extend(r["id"] for r in response.data["results"])
+            next_url = response.data["next"]
+
+        assert len(seen) == len(set(seen)) == 5
@@ -0,0 +1,121 @@
+"""
+Integration tests for the per-organisation ledger version.
+
+Covers:
+- Journal postings bump the version inside their transaction
+- A rolled-back change leaves the version untouched
+- Version-keyed caches (ReportCache, trial balance, account balance)
+  never serve figures from before a posting
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.coa.services import AccountService
+from apps.journal.services import JournalService, LedgerVersionService
+from apps.reporting.services.dashboard_service import DashboardService
+from apps.reporting.services.report_cache import ReportCache
+
+
+def _post_entry(org, accounts, period, user, amount):
+    """Post a simple AR/Revenue entry."""
+    return JournalService.create_entry(
+        org_id=org.id,
+        entry_date=date(2024, 1, 10),
+        source_type="MANUAL",
+        narration="Ledger version test entry",
+        lines=[
+            {"account_id": accounts["1200"].id, "debit": amount, "credit": Decimal("0.00")},
+            {"account_id": accounts["4000"].id, "debit": Decimal("0.00"), "credit": amount},
+        ],
+        fiscal_period_id=period.id,
+        user_id=user.id,
+    )
+
+
+@pytest.mark.django_db
+class TestLedgerVersion:
+    """Version bumps follow ledger commits."""
+
+    def test_posting_bumps_version(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        assert LedgerVersionService.get(test_organisation.id) == 0
+
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user, Decimal("10.00")
+        )
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user, Decimal("20.00")
+        )
+
+        assert LedgerVersionService.get(test_organisation.id) == 2
+
+    def test_rolled_back_change_keeps_version(self, test_organisation):
+        try:
+            with transaction.atomic():
+                DashboardService.publish_invalidation(test_organisation.id)
+                assert LedgerVersionService.get(test_organisation.id) == 1
+                raise RuntimeError("posting failed")
+        except RuntimeError:
+            pass
+
+        assert LedgerVersionService.get(test_organisation.id) == 0
+
+
+@pytest.mark.django_db
+class TestVersionKeyedCaches:
+    """Cached reports move to new keys when the ledger changes."""
+
+    def test_report_cache_recomputes_after_bump(self, test_organisation):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert ReportCache.get_or_compute(test_organisation.id, "test", ["a"], compute) == 1
+        with CaptureQueriesContext(connection) as ctx:
+            assert ReportCache.get_or_compute(test_organisation.id, "test", ["a"], compute) == 1
+        # A cache hit costs only the ledger version read
+        assert len(ctx.captured_queries) == 1
+
+        LedgerVersionService.bump(test_organisation.id)
+
+        assert ReportCache.get_or_compute(test_organisation.id, "test", ["a"], compute) == 2
+
+    def test_trial_balance_fresh_after_posting(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user, Decimal("100.00")
+        )
+        first = JournalService.get_trial_balance(test_organisation.id)
+
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user, Decimal("50.00")
+        )
+        second = JournalService.get_trial_balance(test_organisation.id)
+
+        assert sum(Decimal(r["total_debits"]) for r in first) == Decimal("100.0000")
+        assert sum(Decimal(r["total_debits"]) for r in second) == Decimal("150.0000")
+
+    def test_account_balance_fresh_after_posting(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        receivables = test_accounts["1200"]
+        assert AccountService.get_account_balance(
+            test_organisation.id, receivables.id
+        ) == Decimal("0")
+
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user, Decimal("40.00")
+        )
+
+        assert AccountService.get_account_balance(
+            test_organisation.id, receivables.id
+        ) == Decimal("40.0000")
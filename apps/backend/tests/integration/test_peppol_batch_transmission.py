@@ -0,0 +1,350 @@
+"""
+Integration tests for batched Peppol transmission.
+
+Runs against a local stub Access Point (Storecove API shape) over HTTP.
+
+Covers:
+- A batch delivers every pending log over a few keep-alive connections
+- Database queries per batch do not grow with the number of invoices
+- Repeat parties are served from the party fragment cache
+- Retryable AP errors put logs back to PENDING for the next attempt,
+  which the periodic sweep leaves alone until its backoff has passed
+- Invalid XML is rejected without reaching the AP
+- Claims left by a dead batch go back to PENDING after the timeout,
+  unless their send was attempted
+- The batch task
+"""
+
+import json
+import threading
+import pytest
+from decimal import Decimal
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core.models import Contact, InvoiceDocument, InvoiceLine
+from apps.peppol.models import OrganisationPeppolSettings, PeppolTransmissionLog
+from apps.peppol.services.ap_session_pool import APSessionPool
+from apps.peppol.services.batch_transmission_service import BatchTransmissionService
+from apps.peppol.services.xml_validation_service import XMLValidationService
+from apps.peppol.tasks import transmit_peppol_batch_task, transmit_pending_peppol_batches_task
+
+
+class _StubAPHandler(BaseHTTPRequestHandler):
+    """POST /api/v2/document_submissions, answering with the server's status."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+            self.server.received.append(
+                {
+                    "path": self.path,
+                    "authorization": self.headers.get("Authorization"),
+                    "payload": json.loads(body),
+                }
+            )
+
+        status = self.server.status
+        data = json.dumps(
+            {"id": str(uuid4())} if status == 201 else {"message": "stub error"}
+        ).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ap():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubAPHandler)
+    server.lock = threading.Lock()
+    server.connections = set()
+    server.received = []
+    server.status = 201
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    APSessionPool.reset()
+
+    yield server
+
+    APSessionPool.reset()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def valid_xml(monkeypatch):
+    """Treat generated XML as valid; validation has its own tests."""
+    monkeypatch.setattr(
+        XMLValidationService,
+        "validate_document",
+        lambda self, xml_doc, document_type: {
+            "is_valid": True,
+            "schema_errors": [],
+            "schematron_errors": [],
+        },
+    )
+
+
+@pytest.fixture
+def peppol_settings(stub_ap, test_organisation):
+    return OrganisationPeppolSettings.objects.create(
+        org=test_organisation,
+        access_point_provider="Storecove",
+        access_point_api_url=stub_ap.url,
+        access_point_api_key="stub-key",
+        access_point_client_id="stub-client",
+        auto_transmit=True,
+    )
+
+
+def _pending_logs(org, accounts, tax_codes, count):
+    contact = Contact.objects.create(
+        org=org,
+        contact_type="CUSTOMER",
+        name="Peppol Customer",
+        uen="202398765B",
+        peppol_id="0195:202398765B",
+        is_customer=True,
+        is_active=True,
+    )
+    invoices = []
+    for i in range(1, count + 1):
+        invoice = InvoiceDocument.objects.create(
+            org=org,
+            document_type="SALES_INVOICE",
+            document_number=f"INV-{i:05d}",
+            contact=contact,
+            issue_date=date(2024, 1, 31),
+            due_date=date(2024, 2, 29),
+            status="APPROVED",
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+        )
+        InvoiceLine.objects.create(
+            org=org,
+            document=invoice,
+            line_number=1,
+            description=f"Services {i}",
+            account=accounts["4000"],
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.0000"),
+            tax_code=tax_codes["SR"],
+            tax_rate=Decimal("0.09"),
+            line_amount=Decimal("100.0000"),
+            gst_amount=Decimal("9.0000"),
+            total_amount=Decimal("109.0000"),
+        )
+        invoices.append(invoice)
+
+    return PeppolTransmissionLog.objects.bulk_create(
+        [
+            PeppolTransmissionLog(
+                org=org,
+                document_id=invoice.id,
+                status="PENDING",
+                access_point_provider="Storecove",
+                attempt_number=1,
+            )
+            for invoice in invoices
+        ]
+    )
+
+
+@pytest.mark.django_db
+class TestBatchTransmission:
+    """Pending logs are transmitted in one batch per organisation."""
+
+    def test_batch_delivers_over_shared_connections(
+        self,
+        settings,
+        stub_ap,
+        valid_xml,
+        peppol_settings,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+    ):
+        settings.PEPPOL_BATCH_WORKERS = 4
+        _pending_logs(test_organisation, test_accounts, test_tax_codes, 40)
+
+        with CaptureQueriesContext(connection) as ctx:
+            summary = BatchTransmissionService().transmit_pending(str(test_organisation.id))
+
+        assert summary["total"] == 40
+        assert summary["delivered"] == 40
+        assert summary["more_pending"] is False
+
+        logs = PeppolTransmissionLog.objects.filter(org=test_organisation)
+        assert {log.status for log in logs} == {"DELIVERED"}
+        assert all(log.peppol_message_id and log.xml_payload_hash for log in logs)
+        assert all(log.request_hash == log.xml_payload_hash for log in logs)
+
+        assert len(stub_ap.received) == 40
+        assert {r["path"] for r in stub_ap.received} == {"/api/v2/document_submissions"}
+        assert {r["authorization"] for r in stub_ap.received} == {"Bearer stub-key"}
+        assert {r["payload"]["recipient"]["id"] for r in stub_ap.received} == {"202398765B"}
+        assert len(stub_ap.connections) <= 4
+
+        # Constant per batch, plus one result write per sent invoice (each
+        # delivery is recorded as soon as its send returns)
+        assert len(ctx.captured_queries) <= 15 + 40
+
+        # One supplier and one customer version: mapped and compiled once
+        # (or once per worker racing on the first invoices), then reused
+        assert summary["party_cache"]["hit_rate"] >= 0.9
+
+    def test_batch_size_limit(
+        self,
+        settings,
+        stub_ap,
+        valid_xml,
+        peppol_settings,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+    ):
+        settings.PEPPOL_BATCH_SIZE = 5
+        _pending_logs(test_organisation, test_accounts, test_tax_codes, 8)
+
+        summary = BatchTransmissionService().transmit_pending(str(test_organisation.id))
+
+        assert summary["total"] == 5
+        assert summary["more_pending"] is True
+        assert PeppolTransmissionLog.objects.filter(status="PENDING").count() == 3
+
+    def test_retryable_errors_back_to_pending(
+        self, stub_ap, valid_xml, peppol_settings, test_organisation, test_accounts, test_tax_codes
+    ):
+        stub_ap.status = 429
+        logs = _pending_logs(test_organisation, test_accounts, test_tax_codes, 3)
+
+        summary = BatchTransmissionService().transmit_pending(
+            str(test_organisation.id), [str(log.id) for log in logs]
+        )
+
+        assert sorted(summary["retry_log_ids"]) == sorted(str(log.id) for log in logs)
+        assert summary["retry_attempt"] == 2
+        for log in PeppolTransmissionLog.objects.filter(org=test_organisation):
+            assert log.status == "PENDING"
+            assert log.attempt_number == 2
+            assert log.error_code == "RATE_LIMITED"
+            assert log.next_attempt_at == log.response_at + timedelta(seconds=60)
+
+        # The periodic sweep leaves them to the scheduled retry
+        stub_ap.status = 201
+        assert transmit_pending_peppol_batches_task.delay().get() == 0
+        assert BatchTransmissionService().transmit_pending(str(test_organisation.id))["total"] == 0
+
+        PeppolTransmissionLog.objects.filter(org=test_organisation).update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        assert transmit_pending_peppol_batches_task.delay().get() == 1
+
+    def test_invalid_xml_not_sent(
+        self,
+        monkeypatch,
+        stub_ap,
+        peppol_settings,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+    ):
+        monkeypatch.setattr(
+            XMLValidationService,
+            "validate_document",
+            lambda self, xml_doc, document_type: {
+                "is_valid": False,
+                "schema_errors": [{"message": "Missing ID", "line": 1, "column": 1}],
+                "schematron_errors": [],
+            },
+        )
+        _pending_logs(test_organisation, test_accounts, test_tax_codes, 2)
+
+        summary = BatchTransmissionService().transmit_pending(str(test_organisation.id))
+
+        assert summary["rejected"] == 2
+        assert stub_ap.received == []
+        log = PeppolTransmissionLog.objects.filter(org=test_organisation).first()
+        assert log.error_code == "VALIDATION_ERROR"
+        assert log.error_message == "Missing ID"
+
+    def test_batch_task(
+        self, stub_ap, valid_xml, peppol_settings, test_organisation, test_accounts, test_tax_codes
+    ):
+        _pending_logs(test_organisation, test_accounts, test_tax_codes, 3)
+
+        summary = transmit_peppol_batch_task.delay(str(test_organisation.id)).get()
+
+        assert summary["delivered"] == 3
+        assert len(stub_ap.received) == 3
+
+    def test_stale_claims_reclaimed(
+        self,
+        settings,
+        stub_ap,
+        valid_xml,
+        peppol_settings,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+    ):
+        settings.PEPPOL_CLAIM_TIMEOUT = 30
+        stale, fresh = _pending_logs(test_organisation, test_accounts, test_tax_codes, 2)
+        now = timezone.now()
+        # A batch claimed both, then its worker died before writing results
+        PeppolTransmissionLog.objects.filter(id=stale.id).update(
+            status="TRANSMITTING", claimed_at=now - timedelta(minutes=31)
+        )
+        PeppolTransmissionLog.objects.filter(id=fresh.id).update(
+            status="TRANSMITTING", claimed_at=now - timedelta(minutes=5)
+        )
+
+        assert transmit_pending_peppol_batches_task.delay().get() == 1
+
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        assert stale.status == "DELIVERED"
+        assert fresh.status == "TRANSMITTING"
+        assert len(stub_ap.received) == 1
+
+    def test_interrupted_send_not_resent(
+        self,
+        settings,
+        stub_ap,
+        valid_xml,
+        peppol_settings,
+        test_organisation,
+        test_accounts,
+        test_tax_codes,
+    ):
+        settings.PEPPOL_CLAIM_TIMEOUT = 30
+        (log,) = _pending_logs(test_organisation, test_accounts, test_tax_codes, 1)
+        # The batch recorded the send, then died before the AP answered
+        PeppolTransmissionLog.objects.filter(id=log.id).update(
+            status="TRANSMITTING",
+            claimed_at=timezone.now() - timedelta(minutes=31),
+            request_hash="a" * 64,
+        )
+
+        assert BatchTransmissionService.reclaim_stale_claims() == 0
+
+        log.refresh_from_db()
+        assert log.status == "FAILED"
+        assert log.error_code == "SEND_INTERRUPTED"
+        assert transmit_pending_peppol_batches_task.delay().get() == 0
+        assert stub_ap.received == []
@@ -0,0 +1,204 @@
+"""
+Integration tests for the Peppol delivery status poller.
+
+Runs against a local stub Access Point (Storecove API shape) over HTTP.
+
+Covers:
+- Delivered, rejected and still-processing messages are written in one pass
+- Messages back off by age and settled messages are never polled
+- Messages older than the poll schedule expire without calling the AP
+- Queries per poll do not grow with the number of messages
+- check_transmission_status_task polls a single message
+"""
+
+import json
+import threading
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core.models import InvoiceDocument
+from apps.peppol.models import OrganisationPeppolSettings, PeppolTransmissionLog
+from apps.peppol.services.ap_session_pool import APSessionPool
+from apps.peppol.services.status_poller_service import StatusPollerService
+from apps.peppol.tasks import check_transmission_status_task
+
+
+class _StubAPHandler(BaseHTTPRequestHandler):
+    """GET /api/v2/document_submissions/{id}, answering from server.statuses."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        message_id = self.path.rstrip("/").rsplit("/", 1)[-1]
+        with self.server.lock:
+            self.server.polled.append(message_id)
+
+        status = self.server.statuses.get(message_id)
+        if status is None:
+            code, data = 404, {"message": "not found"}
+        else:
+            code, data = 200, {"id": message_id, "status": status}
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_ap():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubAPHandler)
+    server.lock = threading.Lock()
+    server.statuses = {}
+    server.polled = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    APSessionPool.reset()
+
+    yield server
+
+    APSessionPool.reset()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def peppol_settings(stub_ap, test_organisation):
+    return OrganisationPeppolSettings.objects.create(
+        org=test_organisation,
+        access_point_provider="Storecove",
+        access_point_api_url=f"http://127.0.0.1:{stub_ap.server_address[1]}",
+        access_point_api_key="stub-key",
+        access_point_client_id="stub-client",
+    )
+
+
+def _in_flight(org, count, age=timedelta(minutes=5), last_checked=timedelta(minutes=2)):
+    """Accepted transmissions awaiting their MLR, sent `age` ago."""
+    now = timezone.now()
+    logs = []
+    for i in range(count):
+        invoice = InvoiceDocument.objects.create(
+            org=org,
+            document_type="SALES_INVOICE",
+            document_number=f"INV-{uuid4().hex[:8]}",
+            issue_date=date(2024, 1, 31),
+            due_date=date(2024, 2, 29),
+            status="APPROVED",
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+        )
+        logs.append(
+            PeppolTransmissionLog(
+                org=org,
+                document_id=invoice.id,
+                status="DELIVERED",
+                peppol_message_id=uuid4(),
+                response_code="201",
+                response_at=now - last_checked,
+                access_point_provider="Storecove",
+            )
+        )
+    logs = PeppolTransmissionLog.objects.bulk_create(logs)
+    # transmitted_at is set on insert
+    PeppolTransmissionLog.objects.filter(id__in=[log.id for log in logs]).update(
+        transmitted_at=now - age
+    )
+    return logs
+
+
+@pytest.mark.django_db
+class TestStatusPoller:
+    """In-flight messages are polled in bulk on an age-based schedule."""
+
+    def test_outcomes_written(self, stub_ap, peppol_settings, test_organisation):
+        delivered, rejected, processing = _in_flight(test_organisation, 3)
+        stub_ap.statuses = {
+            str(delivered.peppol_message_id): "delivered",
+            str(rejected.peppol_message_id): "rejected",
+            str(processing.peppol_message_id): "processing",
+        }
+
+        summary = StatusPollerService().poll()
+
+        assert summary["polled"] == 3
+        assert (summary["delivered"], summary["rejected"], summary["in_flight"]) == (1, 1, 1)
+
+        delivered.refresh_from_db()
+        assert delivered.status == "DELIVERED"
+        assert delivered.mlr_status == "ACCEPTED"
+        assert delivered.mlr_received_at is not None
+
+        rejected.refresh_from_db()
+        assert rejected.status == "REJECTED"
+        assert rejected.mlr_status == "REJECTED"
+        assert rejected.error_code == "DELIVERY_FAILED"
+
+        processing.refresh_from_db()
+        assert processing.status == "DELIVERED"
+        assert processing.mlr_status == ""
+
+        # Polled a moment ago, so not due again; settled messages never are
+        assert StatusPollerService().poll()["polled"] == 0
+        assert len(stub_ap.polled) == 3
+
+    def test_backoff_by_age(self, stub_ap, peppol_settings, test_organisation):
+        # Three hours old: polled every 15 minutes
+        recent = _in_flight(
+            test_organisation, 1, age=timedelta(hours=3), last_checked=timedelta(minutes=10)
+        )[0]
+        due = _in_flight(
+            test_organisation, 1, age=timedelta(hours=3), last_checked=timedelta(minutes=20)
+        )[0]
+        stub_ap.statuses = {
+            str(recent.peppol_message_id): "processing",
+            str(due.peppol_message_id): "processing",
+        }
+
+        summary = StatusPollerService().poll()
+
+        assert summary["polled"] == 1
+        assert stub_ap.polled == [str(due.peppol_message_id)]
+
+    def test_stale_messages_expire(self, stub_ap, peppol_settings, test_organisation):
+        (log,) = _in_flight(test_organisation, 1, age=timedelta(days=8))
+
+        summary = StatusPollerService().poll()
+
+        assert summary["expired"] == 1
+        assert summary["polled"] == 0
+        assert stub_ap.polled == []
+        log.refresh_from_db()
+        assert log.mlr_status == "UNKNOWN"
+
+    def test_queries_constant(self, stub_ap, peppol_settings, test_organisation):
+        logs = _in_flight(test_organisation, 30)
+        stub_ap.statuses = {str(log.peppol_message_id): "delivered" for log in logs}
+
+        with CaptureQueriesContext(connection) as ctx:
+            summary = StatusPollerService().poll()
+
+        assert summary["delivered"] == 30
+        assert len(ctx.captured_queries) <= 8
+
+    def test_check_status_task(self, stub_ap, peppol_settings, test_organisation):
+        (log,) = _in_flight(test_organisation, 1)
+        stub_ap.statuses = {str(log.peppol_message_id): "delivered"}
+
+        result = check_transmission_status_task(str(log.peppol_message_id))
+
+        assert result["status"] == "DELIVERED"
+        assert result["delivered_at"] is not None
+        assert check_transmission_status_task(str(uuid4())) is None
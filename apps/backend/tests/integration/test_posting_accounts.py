@@ -0,0 +1,148 @@
+"""
+Integration tests for the per-org posting account resolver.
+
+Covers:
+- Control accounts resolved in one query and then served from cache
+- AccountService changes invalidate the cached set once committed
+- Invoice posting no longer scans the chart of accounts per control account
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.coa.services import AccountService
+from apps.core.models import Account, Contact, InvoiceDocument, InvoiceLine
+from apps.journal.services import JournalService, PostingAccountService
+from common.exceptions import ValidationError
+
+
+def _account_queries(ctx) -> int:
+    return sum(1 for q in ctx.captured_queries if 'coa"."account' in q["sql"])
+
+
+@pytest.fixture
+def gst_accounts(test_organisation, test_accounts):
+    """The seeded chart's GST control accounts (1600 / 2600)."""
+    return {
+        code: Account.objects.create(
+            org=test_organisation,
+            code=code,
+            name=name,
+            account_type=account_type,
+            is_system=True,
+            is_active=True,
+        )
+        for code, name, account_type in [
+            ("1600", "GST Input Tax", "ASSET_CURRENT"),
+            ("2600", "GST Output Tax", "LIABILITY_CURRENT"),
+        ]
+    }
+
+
+@pytest.mark.django_db
+class TestPostingAccountResolver:
+    """Resolution and caching."""
+
+    def test_resolves_once_then_cached(self, test_organisation, test_accounts, gst_accounts):
+        with CaptureQueriesContext(connection) as cold:
+            accounts = PostingAccountService.get_accounts(test_organisation.id)
+
+        # Conventional codes win over earlier accounts of the same type
+        assert accounts["ar"].id == test_accounts["1200"].id
+        assert accounts["gst_input"].id == gst_accounts["1600"].id
+        assert accounts["gst_output"].id == gst_accounts["2600"].id
+        assert len(cold.captured_queries) == 1
+
+        with CaptureQueriesContext(connection) as warm:
+            for role in ("ar", "gst_output"):
+                PostingAccountService.get_account(test_organisation.id, role)
+
+        assert len(warm.captured_queries) == 0
+
+    def test_account_update_invalidates_on_commit(
+        self, test_organisation, test_accounts, gst_accounts, django_capture_on_commit_callbacks
+    ):
+        assert (
+            PostingAccountService.get_account(test_organisation.id, "gst_output").id
+            == gst_accounts["2600"].id
+        )
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            AccountService.update_account(
+                test_organisation.id, gst_accounts["2600"].id, is_active=False
+            )
+
+        # Still cached until the transaction commits
+        assert (
+            PostingAccountService.get_account(test_organisation.id, "gst_output").id
+            == gst_accounts["2600"].id
+        )
+        for callback in callbacks:
+            callback()
+
+        # Falls back to the first current liability
+        assert (
+            PostingAccountService.get_account(test_organisation.id, "gst_output").id
+            == test_accounts["2200"].id
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            AccountService.update_account(
+                test_organisation.id, test_accounts["2200"].id, is_active=False
+            )
+
+        with pytest.raises(ValidationError):
+            PostingAccountService.get_account(test_organisation.id, "gst_output")
+
+
+@pytest.mark.django_db
+class TestPostingWithResolver:
+    """post_invoice uses the cached control accounts."""
+
+    def test_post_invoice_only_validates_accounts(
+        self, test_organisation, test_accounts, test_tax_codes, test_fiscal_period, test_user
+    ):
+        contact = Contact.objects.create(
+            org=test_organisation,
+            contact_type="CUSTOMER",
+            name="Resolver Customer",
+            is_customer=True,
+            is_active=True,
+        )
+        invoice = InvoiceDocument.objects.create(
+            org=test_organisation,
+            document_type="SALES_INVOICE",
+            document_number="INV-00001",
+            contact=contact,
+            issue_date=date(2024, 1, 15),
+            due_date=date(2024, 2, 15),
+            status="DRAFT",
+            total_excl=Decimal("100.0000"),
+            gst_total=Decimal("9.0000"),
+            total_incl=Decimal("109.0000"),
+        )
+        InvoiceLine.objects.create(
+            org=test_organisation,
+            document=invoice,
+            line_number=1,
+            description="Services",
+            account=test_accounts["4000"],
+            quantity=Decimal("1"),
+            unit_price=Decimal("100.0000"),
+            tax_code=test_tax_codes["SR"],
+            tax_rate=Decimal("0.09"),
+            line_amount=Decimal("100.0000"),
+            gst_amount=Decimal("9.0000"),
+            total_amount=Decimal("109.0000"),
+        )
+        PostingAccountService.get_accounts(test_organisation.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            JournalService.post_invoice(test_organisation.id, invoice, test_user.id)
+
+        # Only the set-based existence check in create_entry touches coa.account
+        assert _account_queries(ctx) == 1
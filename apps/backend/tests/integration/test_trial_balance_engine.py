@@ -0,0 +1,176 @@
+"""
+Integration tests for the set-based trial balance engine.
+
+Covers:
+- Totals per account from a single grouped aggregate
+- As-of-date, fiscal-year and fiscal-period filters
+- Benchmark: query count stays constant as the chart of accounts grows
+"""
+
+import pytest
+from decimal import Decimal
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import Account, FiscalPeriod
+from apps.journal.services import JournalService, TrialBalanceService
+from apps.coa.services import AccountService
+
+
+def _post_entry(org, accounts, period, user, entry_date, amount):
+    """Post a simple AR/Revenue entry."""
+    return JournalService.create_entry(
+        org_id=org.id,
+        entry_date=entry_date,
+        source_type="MANUAL",
+        narration="Trial balance test entry",
+        lines=[
+            {"account_id": accounts["1200"].id, "debit": amount, "credit": Decimal("0.00")},
+            {"account_id": accounts["4000"].id, "debit": Decimal("0.00"), "credit": amount},
+        ],
+        fiscal_period_id=period.id,
+        user_id=user.id,
+    )
+
+
+def _add_accounts(org, count, start_code):
+    """Bulk-create additional active accounts."""
+    Account.objects.bulk_create(
+        [
+            Account(
+                org=org,
+                code=str(start_code + i),
+                name=f"Expense {start_code + i}",
+                account_type="EXPENSE_ADMIN",
+                is_active=True,
+            )
+            for i in range(count)
+        ]
+    )
+
+
+@pytest.mark.django_db
+class TestTrialBalanceEngine:
+    """Correctness of the grouped trial balance."""
+
+    def test_totals_per_account(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("150.00"),
+        )
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 20), Decimal("50.00"),
+        )
+
+        rows = {r["code"]: r for r in TrialBalanceService.compute(test_organisation.id)}
+
+        assert rows["1200"]["total_debit"] == Decimal("200.0000")
+        assert rows["1200"]["balance"] == Decimal("200.0000")
+        assert rows["4000"]["total_credit"] == Decimal("200.0000")
+        assert rows["4000"]["balance"] == Decimal("-200.0000")
+        # Accounts without activity are still listed
+        assert rows["6100"]["total_debit"] == Decimal("0.0000")
+
+    def test_as_of_date_filter(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("150.00"),
+        )
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 20), Decimal("50.00"),
+        )
+
+        rows = {
+            r["code"]: r
+            for r in TrialBalanceService.compute(test_organisation.id, date_to=date(2024, 1, 15))
+        }
+
+        assert rows["1200"]["total_debit"] == Decimal("150.0000")
+
+    def test_fiscal_period_and_year_filters(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        february = FiscalPeriod.objects.create(
+            org=test_organisation,
+            fiscal_year=test_fiscal_period.fiscal_year,
+            label="February 2024",
+            period_number=2,
+            start_date=date(2024, 2, 1),
+            end_date=date(2024, 2, 29),
+            is_open=True,
+        )
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("150.00"),
+        )
+        _post_entry(
+            test_organisation, test_accounts, february, test_user,
+            date(2024, 2, 10), Decimal("50.00"),
+        )
+
+        by_period = {
+            r["code"]: r
+            for r in TrialBalanceService.compute(
+                test_organisation.id, fiscal_period_id=february.id
+            )
+        }
+        by_year = {
+            r["code"]: r
+            for r in TrialBalanceService.compute(
+                test_organisation.id, fiscal_year_id=test_fiscal_period.fiscal_year_id
+            )
+        }
+
+        assert by_period["1200"]["total_debit"] == Decimal("50.0000")
+        assert by_year["1200"]["total_debit"] == Decimal("200.0000")
+
+    def test_journal_and_coa_services_agree(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("75.00"),
+        )
+
+        journal_rows = JournalService.get_trial_balance(test_organisation.id)
+        coa_rows = AccountService.get_trial_balance(test_organisation.id)
+
+        assert [r["account_code"] for r in journal_rows] == [r["code"] for r in coa_rows]
+        assert sum(Decimal(r["total_debits"]) for r in journal_rows) == sum(
+            r["total_debit"] for r in coa_rows
+        )
+
+
+@pytest.mark.django_db
+class TestTrialBalanceBenchmark:
+    """Query count must not grow with the number of accounts."""
+
+    def _count_queries(self, org_id) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            TrialBalanceService.compute(org_id)
+        return len(ctx.captured_queries)
+
+    def test_query_count_constant_as_accounts_grow(
+        self, test_organisation, test_accounts, test_fiscal_period, test_user
+    ):
+        _post_entry(
+            test_organisation, test_accounts, test_fiscal_period, test_user,
+            date(2024, 1, 10), Decimal("100.00"),
+        )
+
+        _add_accounts(test_organisation, 20, 6200)
+        small = self._count_queries(test_organisation.id)
+
+        _add_accounts(test_organisation, 400, 6300)
+        large = self._count_queries(test_organisation.id)
+
+        assert small == 1
+        assert large == small
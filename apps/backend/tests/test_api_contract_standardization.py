@@ -39,7 +39,6 @@ class TestAPIContractStandardization:
         assert "count" in response.data
         assert isinstance(response.data["results"], list)
 
-    @pytest.mark.skip(reason="Requires coa.account_balance view not present in test DB")
     def test_trial_balance_contract(self, auth_client, test_organisation):
         """GET /api/v1/{org_id}/accounts/trial-balance/ - Should use 'results' and 'count'."""
         response = auth_client.get(f"/api/v1/{test_organisation.id}/accounts/trial-balance/")
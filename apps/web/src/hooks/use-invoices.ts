@@ -17,7 +17,15 @@ import { api, endpoints } from "@/lib/api-client";
 import { toast } from "@/hooks/use-toast";
 import type { Invoice, InvoiceInput } from "@/shared/schemas/invoice";
 
-// List invoices with optional filters
+// Invoice list page: keyset-paginated, `count` is the total across pages
+interface InvoiceListPage {
+  results: Invoice[];
+  count: number;
+  next: string | null;
+  next_cursor: string | null;
+}
+
+// List invoices with optional filters (follows next_cursor through every page)
 export function useInvoices(
   orgId: string,
   filters?: {
@@ -28,20 +36,28 @@ export function useInvoices(
     date_to?: string;
   }
 ) {
-  const queryString = filters
-    ? "?" + new URLSearchParams(Object.entries(filters).filter(([, v]) => v)).toString()
-    : "";
-
   return useQuery({
     queryKey: [orgId, "invoices", filters],
     queryFn: async () => {
-      const response = await api.get<{
-        results: Invoice[];
-        count: number;
-        next?: string;
-        previous?: string;
-      }>(endpoints.invoices(orgId).list + queryString);
-      return response;
+      const params = new URLSearchParams(
+        Object.entries(filters ?? {}).filter(([, v]) => v) as [string, string][]
+      );
+      const results: Invoice[] = [];
+      let count = 0;
+      let cursor: string | null = null;
+
+      do {
+        if (cursor) params.set("cursor", cursor);
+        const query = params.toString();
+        const page: InvoiceListPage = await api.get<InvoiceListPage>(
+          endpoints.invoices(orgId).list + (query ? `?${query}` : "")
+        );
+        results.push(...page.results);
+        count = page.count;
+        cursor = page.next_cursor;
+      } while (cursor);
+
+      return { results, count };
     },
     enabled: !!orgId,
   });